@@ -4,7 +4,7 @@ from .paths import (
     DATA_DIR, DB_PATH, TO_SCAN_DIR, SORTED_DIR, PROBLEMATIC_DIR,
     REVENUS_A_TRAITER, REVENUS_TRAITES,
     OCR_LOGS_DIR, LOG_PATH, OCR_PERFORMANCE_LOG, PATTERN_STATS_LOG, OCR_SCAN_LOG,
-    POTENTIAL_PATTERNS_LOG, CSV_EXPORT_DIR, CSV_TRANSACTIONS_SANS_TICKETS
+    POTENTIAL_PATTERNS_LOG, OCR_CACHE_DB, OCR_STATS_DB, CSV_EXPORT_DIR, CSV_TRANSACTIONS_SANS_TICKETS
 )
 
 from .ocr_config import (
@@ -13,7 +13,19 @@ from .ocr_config import (
     UBER_KEYWORDS,
     OCR_SUCCESS_THRESHOLD,
     OCR_DETECTION_MINIMUM,
-    SUCCESS_LEVELS
+    SUCCESS_LEVELS,
+    OCR_MAX_WORKERS,
+    OCR_MAX_IN_FLIGHT,
+    OCR_CACHE_ENABLED,
+    OCR_CACHE_MAX_BYTES,
+    OCR_SCAN_HISTORY_SEGMENT_BYTES,
+    OCR_SCAN_HISTORY_MAX_SEGMENTS,
+    OCR_PREPROCESSING_PROFILES,
+    OCR_PREPROCESSING_PROFILE,
+    OCR_ENGINE,
+    OCR_ROI_ENABLED,
+    OCR_ROI_LAYOUT_MAX_SIDE,
+    OCR_ROI_CONTEXT_LINES
 )
 from .ui_config import (
     PRIMARY_COLOR,
@@ -32,11 +44,15 @@ __all__ = [
     'DATA_DIR', 'DB_PATH', 'TO_SCAN_DIR', 'SORTED_DIR', 'PROBLEMATIC_DIR',
     'REVENUS_A_TRAITER', 'REVENUS_TRAITES',
     'OCR_LOGS_DIR', 'LOG_PATH', 'OCR_PERFORMANCE_LOG', 'PATTERN_STATS_LOG', 'OCR_SCAN_LOG',
-    'POTENTIAL_PATTERNS_LOG', 'CSV_EXPORT_DIR', 'CSV_TRANSACTIONS_SANS_TICKETS',
+    'POTENTIAL_PATTERNS_LOG', 'OCR_CACHE_DB', 'OCR_STATS_DB', 'CSV_EXPORT_DIR', 'CSV_TRANSACTIONS_SANS_TICKETS',
 
     # OCR Config
     'UBER_TAX_RATE', 'UBER_NET_MULTIPLIER', 'UBER_KEYWORDS',
     'OCR_SUCCESS_THRESHOLD', 'OCR_DETECTION_MINIMUM', 'SUCCESS_LEVELS',
+    'OCR_MAX_WORKERS', 'OCR_MAX_IN_FLIGHT', 'OCR_CACHE_ENABLED', 'OCR_CACHE_MAX_BYTES',
+    'OCR_SCAN_HISTORY_SEGMENT_BYTES', 'OCR_SCAN_HISTORY_MAX_SEGMENTS',
+    'OCR_PREPROCESSING_PROFILES', 'OCR_PREPROCESSING_PROFILE', 'OCR_ENGINE',
+    'OCR_ROI_ENABLED', 'OCR_ROI_LAYOUT_MAX_SIDE', 'OCR_ROI_CONTEXT_LINES',
 
     # UI Config
     'PRIMARY_COLOR', 'SECONDARY_COLOR', 'DANGER_COLOR', 'WARNING_COLOR',
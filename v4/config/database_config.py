@@ -8,6 +8,16 @@ from .paths import DB_PATH
 
 DATABASE_PATH = DB_PATH
 DATABASE_TIMEOUT = 30.0  # seconds
+DATABASE_POOL_SIZE = 8  # connections kept open across threads
+
+# Minimum delay between two checks of the sorted folders by the file index
+FILE_INDEX_REFRESH_SECONDS = 30.0
+
+# Rows per executemany call of the bulk transaction import
+IMPORT_CHUNK_SIZE = 1000
+
+# CSV rows read and committed together by the chunked CSV import
+IMPORT_CSV_CHUNK_ROWS = 5000
 
 # ==============================
 # TABLE SCHEMAS
@@ -1,5 +1,7 @@
 """OCR and tax configuration."""
 
+import os
+
 # ==============================
 # TAX CONFIGURATION
 # ==============================
@@ -38,3 +40,93 @@ PATTERN_RELIABILITY = {
     'medium': 10,      # 10-49 detections
     'low': 0           # Below 10
 }
+
+# ==============================
+# IMAGE PREPROCESSING
+# ==============================
+
+# Named pipelines applied before tesseract: ordered (stage, parameters) steps.
+# Stages: grayscale, resize, crop_receipt, deskew, gaussian_blur, otsu,
+# adaptive_threshold (see domains/ocr/preprocessing.py)
+OCR_PREPROCESSING_PROFILES = {
+    # Historical pipeline, full resolution (default)
+    'legacy': [
+        ('grayscale', {}),
+        ('gaussian_blur', {'ksize': 3}),
+        ('otsu', {}),
+    ],
+    # Legacy steps on a downscaled image (12 MP photos are far above 300 DPI)
+    'standard': [
+        ('grayscale', {}),
+        ('resize', {'max_side': 2000}),
+        ('gaussian_blur', {'ksize': 3}),
+        ('otsu', {}),
+    ],
+    # Phone photos of receipts: crop the paper, straighten it, local threshold
+    'receipt': [
+        ('grayscale', {}),
+        ('resize', {'max_side': 2000}),
+        ('crop_receipt', {'min_area_ratio': 0.15, 'margin': 10}),
+        ('deskew', {'max_angle': 15.0}),
+        ('adaptive_threshold', {'block_size': 31, 'c': 15}),
+    ],
+}
+
+# Profile used by full_ocr. 'standard' and 'receipt' are opt-in: switch the
+# default only once scripts/bench_ocr_preprocessing.py shows amount-detection
+# parity with 'legacy' on a labelled ticket corpus.
+OCR_PREPROCESSING_PROFILE = 'legacy'
+
+# ==============================
+# OCR ENGINE
+# ==============================
+
+# "tesserocr": keep libtesseract and the fra+eng model loaded (one per process)
+# "pytesseract": run the tesseract executable for every image
+# "auto": tesserocr when installed, pytesseract otherwise
+OCR_ENGINE = 'auto'
+
+# ==============================
+# REGION-OF-INTEREST OCR
+# ==============================
+
+# Two-pass OCR: a low-resolution layout pass finds the keyword lines (totals,
+# payment, VAT, date), then only those strips are read at full resolution.
+# Falls back to full OCR when no keyword line is found.
+OCR_ROI_ENABLED = False
+
+# Longest side of the image used for the layout pass
+OCR_ROI_LAYOUT_MAX_SIDE = 1000
+
+# Lines kept after each keyword line (amount printed under its label)
+OCR_ROI_CONTEXT_LINES = 1
+
+# ==============================
+# BATCH SCANNING
+# ==============================
+
+# Worker processes for batch OCR (one core left for Streamlit)
+OCR_MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Tickets submitted at once: bounds the decoded images held in memory
+OCR_MAX_IN_FLIGHT = 2 * OCR_MAX_WORKERS
+
+# ==============================
+# OCR RESULT CACHE
+# ==============================
+
+# Reuse the text of an already OCR'd file (same bytes, same settings)
+OCR_CACHE_ENABLED = True
+
+# Cached text kept before the least recently used entries are evicted
+OCR_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# ==============================
+# SCAN HISTORY
+# ==============================
+
+# Size at which scan_history.jsonl is rotated into a sealed segment
+OCR_SCAN_HISTORY_SEGMENT_BYTES = 5 * 1024 * 1024
+
+# Sealed segments kept before they are compacted into one
+OCR_SCAN_HISTORY_MAX_SEGMENTS = 8
@@ -37,6 +37,8 @@ OCR_PERFORMANCE_LOG = os.path.join(OCR_LOGS_DIR, "performance_stats.json")
 PATTERN_STATS_LOG = os.path.join(OCR_LOGS_DIR, "pattern_stats.json")
 OCR_SCAN_LOG = os.path.join(OCR_LOGS_DIR, "scan_history.jsonl")
 POTENTIAL_PATTERNS_LOG = os.path.join(OCR_LOGS_DIR, "potential_patterns.jsonl")
+OCR_CACHE_DB = os.path.join(OCR_LOGS_DIR, "ocr_cache.db")
+OCR_STATS_DB = os.path.join(OCR_LOGS_DIR, "ocr_stats.db")
 
 # CSV Export
 CSV_EXPORT_DIR = os.path.join(DATA_DIR, "exports")
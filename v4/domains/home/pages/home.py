@@ -14,8 +14,9 @@ import pandas as pd
 import sqlite3
 from datetime import datetime, date, timedelta
 import plotly.graph_objects as go
-from shared.ui import load_transactions
-from shared.database import get_db_connection
+from domains.transactions.repository import TransactionRepository
+from shared.services.day_summary import get_day_summary
+from shared.database import db_connection
 
 
 def interface_accueil() -> None:
@@ -26,11 +27,6 @@ def interface_accueil() -> None:
     """
     st.title("🏠 Tableau de Bord Financier")
     
-    # Charger les données
-    df_trans = load_transactions()
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     # Sélecteur de période
     today = date.today()
     
@@ -69,10 +65,8 @@ def interface_accueil() -> None:
         date_fin = today
         nb_mois_periode = 3
     elif periode_option == "Depuis le début":
-        if not df_trans.empty:
-            date_debut = pd.to_datetime(df_trans["date"]).min().date()
-        else:
-            date_debut = today.replace(day=1)
+        premiere_date, _ = TransactionRepository.get_date_bounds()
+        date_debut = premiere_date or today.replace(day=1)
         date_fin = today
         # Calculer le nombre de mois depuis le début
         from dateutil.relativedelta import relativedelta
@@ -97,25 +91,24 @@ def interface_accueil() -> None:
         nb_mois_periode = ((date_fin.year - date_debut.year) * 12 + 
                           (date_fin.month - date_debut.month) + 1)
     
-    # Filtrer les données selon la période
-    if not df_trans.empty:
-        df_mois = df_trans[
-            (pd.to_datetime(df_trans["date"]).dt.date >= date_debut) &
-            (pd.to_datetime(df_trans["date"]).dt.date <= date_fin)
-        ]
-        
-        revenus_mois = df_mois[df_mois["type"] == "revenu"]["montant"].sum()
-        depenses_mois = df_mois[df_mois["type"] == "dépense"]["montant"].sum()
-        solde_mois = revenus_mois - depenses_mois
-        
-        # Solde total
-        revenus_total = df_trans[df_trans["type"] == "revenu"]["montant"].sum()
-        depenses_total = df_trans[df_trans["type"] == "dépense"]["montant"].sum()
-        solde_total = revenus_total - depenses_total
-    else:
-        df_mois = pd.DataFrame()  # Initialize empty DataFrame
-        revenus_mois = depenses_mois = solde_mois = 0.0
-        revenus_total = depenses_total = solde_total = 0.0
+    # Totaux de la période lus dans le résumé par jour partagé avec le
+    # calendrier (reconstruit une fois par révision des données)
+    resume_periode = get_day_summary().totals(date_debut, date_fin)
+    revenus_mois = resume_periode["revenu"]
+    depenses_mois = resume_periode["dépense"]
+    solde_mois = revenus_mois - depenses_mois
+    
+    # Agrégats par catégorie, calculés par SQLite (index sur la date)
+    df_mois = TransactionRepository.sum_by(["type", "categorie"], start_date=date_debut, end_date=date_fin)
+    depenses_par_categorie = df_mois[df_mois["type"] == "dépense"].groupby("categorie")["montant"].sum()
+    
+    # Solde total
+    df_total = TransactionRepository.sum_by(["type"])
+    totaux = dict(zip(df_total["type"], df_total["montant"]))
+    revenus_total = totaux.get("revenu", 0.0)
+    depenses_total = totaux.get("dépense", 0.0)
+    solde_total = revenus_total - depenses_total
+    nb_trans = int(df_total["nombre"].sum())
     
     # ===== SECTION 1 & 2: STATUT GLOBAL + ÉCHÉANCES =====
     col1, col2 = st.columns([1, 1])
@@ -201,26 +194,20 @@ def interface_accueil() -> None:
         st.markdown("**📈 Évolution mensuelle**")
         
         if not df_mois.empty:
-            # Créer données mensuelles (utiliser df_mois pour respecter la période)
-            df_mois_copy = df_mois.copy()
-            df_mois_copy["date"] = pd.to_datetime(df_mois_copy["date"])
-            df_mois_copy["mois_str"] = df_mois_copy["date"].dt.strftime("%b %Y")
-            
-            # Grouper par mois et type
-            df_evolution = df_mois_copy.groupby(["mois_str", "type"])["montant"].sum().unstack(fill_value=0)
-            df_evolution = df_evolution.reindex(sorted(df_evolution.index, key=lambda x: pd.to_datetime(x, format='%b %Y')))
+            # Totaux par mois et type sur la période (mois ISO, déjà triés)
+            df_evolution = TransactionRepository.sum_by(
+                ["type"], period="month", start_date=date_debut, end_date=date_fin
+            ).pivot_table(index="periode", columns="type", values="montant_cents", aggfunc="sum", fill_value=0)
+            df_evolution.index = pd.to_datetime(df_evolution.index, format="%Y-%m").strftime("%b %Y")
             
             if "revenu" not in df_evolution.columns:
                 df_evolution["revenu"] = 0
             if "dépense" not in df_evolution.columns:
                 df_evolution["dépense"] = 0
             
-            # Arrondir les valeurs
-            df_evolution["dépense"] = df_evolution["dépense"].round(2)
-            df_evolution["revenu"] = df_evolution["revenu"].round(2)
-            
-            # Calculer le solde
-            solde = (df_evolution["revenu"] - df_evolution["dépense"]).round(2)
+            # Solde calculé en centimes exacts, puis passage en euros
+            solde = (df_evolution["revenu"] - df_evolution["dépense"]) / 100
+            df_evolution = df_evolution / 100
             
             # Graphique avec barres + ligne
             fig = go.Figure()
@@ -300,15 +287,16 @@ def interface_accueil() -> None:
         
         # Récupérer toutes les échéances (prévues + récurrentes) du mois
         try:
-            echeances = cursor.execute("""
-                SELECT type, categorie, montant, date_echeance, description, type_echeance
-                FROM echeances
-                WHERE statut = 'active' 
-                  AND date_echeance >= ?
-                  AND date_echeance <= ?
-                ORDER BY date_echeance
-                LIMIT 5
-            """, (today.isoformat(), fin_mois.isoformat())).fetchall()
+            with db_connection() as conn:
+                echeances = conn.execute("""
+                    SELECT type, categorie, montant, date_echeance, description, type_echeance
+                    FROM echeances
+                    WHERE statut = 'active'
+                      AND date_echeance >= ?
+                      AND date_echeance <= ?
+                    ORDER BY date_echeance
+                    LIMIT 5
+                """, (today.isoformat(), fin_mois.isoformat())).fetchall()
         except sqlite3.OperationalError:
             # Table doesn't exist (test mode or first run)
             echeances = []
@@ -355,7 +343,7 @@ def interface_accueil() -> None:
         
         if not df_mois.empty:
             # Pie chart dépenses par catégorie
-            depenses_cat = df_mois[df_mois["type"] == "dépense"].groupby("categorie")["montant"].sum()
+            depenses_cat = depenses_par_categorie
             
             if not depenses_cat.empty:
                 fig_pie = go.Figure()
@@ -391,21 +379,20 @@ def interface_accueil() -> None:
             st.rerun()
         
         # Compteur transactions
-        if not df_trans.empty:
-            nb_trans = len(df_trans)
-            nb_trans_mois = len(df_mois) if not df_mois.empty else 0
+        if nb_trans > 0:
+            nb_trans_mois = resume_periode["count"]
             st.caption(f"📊 {nb_trans_mois} transactions ce mois ({nb_trans} au total)")
     
     with col4:
         st.markdown("### 🕒 Dernières transactions")
         
-        if not df_trans.empty:
+        if nb_trans > 0:
             # Initialiser le nombre à afficher
             if "nb_trans_affichees" not in st.session_state:
                 st.session_state.nb_trans_affichees = 5
             
             nb_afficher = st.session_state.nb_trans_affichees
-            df_recent = df_trans.sort_values("date", ascending=False).head(nb_afficher)
+            df_recent = TransactionRepository.get_recent(nb_afficher)
             
             for _, trans in df_recent.iterrows():
                 col1, col2, col3 = st.columns([1, 3, 1])
@@ -428,9 +415,9 @@ def interface_accueil() -> None:
             # Boutons pour afficher plus/moins
             col_plus, col_moins = st.columns(2)
             with col_plus:
-                if nb_afficher < len(df_trans) and nb_afficher < 20:
+                if nb_afficher < nb_trans and nb_afficher < 20:
                     if st.button("➕ Afficher plus", key="btn_plus_trans"):
-                        st.session_state.nb_trans_affichees = min(nb_afficher + 5, 20, len(df_trans))
+                        st.session_state.nb_trans_affichees = min(nb_afficher + 5, 20, nb_trans)
                         st.rerun()
             with col_moins:
                 if nb_afficher > 5:
@@ -457,20 +444,15 @@ def interface_accueil() -> None:
         
         # Récupérer budgets
         try:
-            df_budgets = pd.read_sql_query("SELECT * FROM budgets_categories", conn)
+            with db_connection() as conn:
+                df_budgets = pd.read_sql_query("SELECT * FROM budgets_categories", conn)
         except (sqlite3.OperationalError, pd.errors.DatabaseError):
             df_budgets = pd.DataFrame()
         
         if not df_budgets.empty:
             # Afficher top 5 budgets avec barres de progression
             for _, budget in df_budgets.head(5).iterrows():
-                if not df_mois.empty:
-                    depenses_cat = df_mois[
-                        (df_mois["type"] == "dépense") &
-                        (df_mois["categorie"] == budget["categorie"])
-                    ]["montant"].sum()
-                else:
-                    depenses_cat = 0.0
+                depenses_cat = float(depenses_par_categorie.get(budget["categorie"], 0.0))
                 
                 # Ajuster le budget cible selon la période (multiplicateur exact)
                 budget_ajuste = budget["budget_mensuel"] * nb_mois_periode
@@ -496,13 +478,14 @@ def interface_accueil() -> None:
         
         # Récupérer objectifs
         try:
-            objectifs = cursor.execute("""
-                SELECT id, titre, montant_cible, type_objectif
-                FROM objectifs_financiers
-                WHERE statut = 'en_cours'
-                ORDER BY date_creation DESC
-                LIMIT 5
-            """).fetchall()
+            with db_connection() as conn:
+                objectifs = conn.execute("""
+                    SELECT id, titre, montant_cible, type_objectif
+                    FROM objectifs_financiers
+                    WHERE statut = 'en_cours'
+                    ORDER BY date_creation DESC
+                    LIMIT 5
+                """).fetchall()
         except sqlite3.OperationalError:
             objectifs = []
         
@@ -544,5 +527,3 @@ def interface_accueil() -> None:
             if st.button("➕ Créer un objectif", key="btn_create_obj"):
                 st.session_state.requested_page = "💼 Portefeuille"
                 st.rerun()
-    
-    conn.close()
@@ -1,33 +1,27 @@
 """OCR performance analysis and diagnostics functions."""
 
 import json
-import os
 import logging
 from typing import Dict, List, Optional, Any
 
-from config import OCR_PERFORMANCE_LOG, PATTERN_STATS_LOG, OCR_SCAN_LOG
+from .stats_store import get_stats_store
+from .scan_history import get_scan_history_store
 
 logger = logging.getLogger(__name__)
 
 
 def get_ocr_performance_report() -> Dict[str, Any]:
     """
-    Retrieve performance report from local files.
+    Retrieve performance report from the statistics store.
 
     Returns:
         Dictionary containing performance statistics by document type,
         or empty dict if no data available
     """
     try:
-        logger.debug(f"get_ocr_performance_report() - Path: {OCR_PERFORMANCE_LOG}")
-        if os.path.exists(OCR_PERFORMANCE_LOG):
-            logger.debug("File exists, reading...")
-            with open(OCR_PERFORMANCE_LOG, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.debug(f"Data loaded: {data}")
-                return data
-        else:
-            logger.debug("File does not exist")
+        data = get_stats_store().performance_stats()
+        logger.debug(f"Data loaded: {data}")
+        return data
     except Exception as e:
         logger.error(f"Error reading performance report: {e}", exc_info=True)
     return {}
@@ -45,21 +39,19 @@ def get_best_patterns(min_detections: int, min_success_rate: float) -> List[Dict
         List of pattern dictionaries with success metrics
     """
     try:
-        if os.path.exists(PATTERN_STATS_LOG):
-            with open(PATTERN_STATS_LOG, 'r', encoding='utf-8') as f:
-                stats = json.load(f)
-                return [
-                    {
-                        'pattern': k,
-                        'success_rate': v.get('success_rate', 0),
-                        'reliability_score': v.get('reliability_score', 0),
-                        'detections': v.get('total_detections', 0),
-                        'corrections': v.get('correction_count', 0)
-                    }
-                    for k, v in stats.items()
-                    if v.get('total_detections', 0) >= min_detections
-                    and v.get('success_rate', 0) >= min_success_rate
-                ]
+        stats = get_stats_store().pattern_stats()
+        return [
+            {
+                'pattern': k,
+                'success_rate': v.get('success_rate', 0),
+                'reliability_score': v.get('reliability_score', 0),
+                'detections': v.get('total_detections', 0),
+                'corrections': v.get('correction_count', 0)
+            }
+            for k, v in stats.items()
+            if v.get('total_detections', 0) >= min_detections
+            and v.get('success_rate', 0) >= min_success_rate
+        ]
     except Exception as e:
         logger.error(f"Error retrieving best patterns: {e}")
     return []
@@ -77,48 +69,45 @@ def get_worst_patterns(min_detections: int, max_success_rate: float) -> List[Dic
         List of problematic pattern dictionaries
     """
     try:
-        if os.path.exists(PATTERN_STATS_LOG):
-            with open(PATTERN_STATS_LOG, 'r', encoding='utf-8') as f:
-                stats = json.load(f)
-                return [
-                    {
-                        'pattern': k,
-                        'success_rate': v.get('success_rate', 0),
-                        'detections': v.get('total_detections', 0),
-                        'corrections': v.get('correction_count', 0)
-                    }
-                    for k, v in stats.items()
-                    if v.get('total_detections', 0) >= min_detections
-                    and v.get('success_rate', 0) <= max_success_rate
-                ]
+        stats = get_stats_store().pattern_stats()
+        return [
+            {
+                'pattern': k,
+                'success_rate': v.get('success_rate', 0),
+                'detections': v.get('total_detections', 0),
+                'corrections': v.get('correction_count', 0)
+            }
+            for k, v in stats.items()
+            if v.get('total_detections', 0) >= min_detections
+            and v.get('success_rate', 0) <= max_success_rate
+        ]
     except Exception as e:
         logger.error(f"Error retrieving worst patterns: {e}")
     return []
 
 
-def get_scan_history(document_type: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+def get_scan_history(
+    document_type: Optional[str] = None,
+    limit: int = 100,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """
-    Retrieve scan history from JSONL log file.
+    Retrieve the most recent scans from the scan history.
+
+    Only the newest records are read; filters go through the history index.
 
     Args:
         document_type: Optional filter by document type
         limit: Maximum number of scans to return
+        since: Optional first day included (ISO date)
+        until: Optional last day included (ISO date)
 
     Returns:
-        List of scan records
+        List of scan records, most recent first
     """
     try:
-        if os.path.exists(OCR_SCAN_LOG):
-            scans = []
-            with open(OCR_SCAN_LOG, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        scan = json.loads(line)
-                        if document_type is None or scan.get('document_type') == document_type:
-                            scans.append(scan)
-                    except json.JSONDecodeError:
-                        continue
-            return scans[:limit]
+        return get_scan_history_store().tail(limit, document_type, since, until)
     except Exception as e:
         logger.error(f"Error retrieving scan history: {e}")
     return []
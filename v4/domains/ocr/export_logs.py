@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 
 from config import OCR_LOGS_DIR, DATA_DIR
+from .stats_store import get_stats_store
+from .scan_history import get_scan_history_store
 
 import logging
 logger = logging.getLogger(__name__)
@@ -29,12 +31,10 @@ def get_logs_summary() -> Dict[str, Any]:
     }
 
     try:
-        # Count scan history
-        scan_log = os.path.join(OCR_LOGS_DIR, "scan_history.jsonl")
-        if os.path.exists(scan_log):
-            with open(scan_log, 'r', encoding='utf-8') as f:
-                summary["total_scans"] = sum(1 for _ in f)
-            summary["log_files"].append("scan_history.jsonl")
+        # Count scan history (all segments)
+        history = get_scan_history_store()
+        summary["total_scans"] = history.count()
+        summary["log_files"].extend(os.path.basename(path) for path in history.segments())
 
         # Count potential patterns
         patterns_log = os.path.join(OCR_LOGS_DIR, "potential_patterns.jsonl")
@@ -49,20 +49,16 @@ def get_logs_summary() -> Dict[str, Any]:
             summary["log_files"].append("potential_patterns.jsonl")
 
         # Get performance stats
-        perf_log = os.path.join(OCR_LOGS_DIR, "performance_stats.json")
-        if os.path.exists(perf_log):
-            with open(perf_log, 'r', encoding='utf-8') as f:
-                perf_data = json.load(f)
-                for doc_type, stats in perf_data.items():
-                    if doc_type != "last_updated":
-                        summary["performance_by_type"][doc_type] = {
-                            "total": stats.get("total", 0),
-                            "success_rate": stats.get("success_rate", 0)
-                        }
-            summary["log_files"].append("performance_stats.json")
+        perf_data = get_stats_store().performance_stats()
+        for doc_type, stats in perf_data.items():
+            if doc_type != "last_updated":
+                summary["performance_by_type"][doc_type] = {
+                    "total": stats.get("total", 0),
+                    "success_rate": stats.get("success_rate", 0)
+                }
 
         # Check for other log files
-        for log_file in ["pattern_log.json", "pattern_stats.json"]:
+        for log_file in ["ocr_stats.db", "performance_stats.json", "pattern_log.json", "pattern_stats.json"]:
             log_path = os.path.join(OCR_LOGS_DIR, log_file)
             if os.path.exists(log_path):
                 summary["log_files"].append(log_file)
@@ -106,6 +102,9 @@ def prepare_logs_for_support(
     zip_path = os.path.join(output_dir, zip_filename)
 
     try:
+        # Counters live in SQLite: write the JSON snapshots shipped to support
+        get_stats_store().export_json()
+
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             # Add all OCR log files
             if os.path.exists(OCR_LOGS_DIR):
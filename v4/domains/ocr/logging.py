@@ -6,10 +6,9 @@ import logging
 from datetime import datetime
 from typing import List, Optional
 
-from config import (
-    OCR_LOGS_DIR, LOG_PATH, OCR_PERFORMANCE_LOG, PATTERN_STATS_LOG,
-    OCR_SCAN_LOG, POTENTIAL_PATTERNS_LOG
-)
+from config import OCR_LOGS_DIR, OCR_SCAN_LOG, POTENTIAL_PATTERNS_LOG
+from .stats_store import get_stats_store
+from .scan_history import get_scan_history_store
 
 logger = logging.getLogger(__name__)
 
@@ -19,22 +18,13 @@ os.makedirs(OCR_LOGS_DIR, exist_ok=True)
 
 def log_pattern_occurrence(pattern_name: str) -> None:
     """
-    Record each OCR-detected keyword in a JSON log.
+    Record each OCR-detected keyword in the statistics store.
 
     Args:
         pattern_name: Name of the detected pattern/keyword
     """
     try:
-        data = {}
-        if os.path.exists(LOG_PATH):
-            with open(LOG_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-        data[pattern_name] = data.get(pattern_name, 0) + 1
-
-        with open(LOG_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
+        get_stats_store().record_pattern_occurrence(pattern_name)
     except Exception as e:
         logger.error(f"[OCR-LOG] Error logging pattern occurrence: {e}")
 
@@ -89,8 +79,7 @@ def log_ocr_scan(
         }
 
         logger.debug(f"[OCR-LOG] Writing to {OCR_SCAN_LOG}")
-        with open(OCR_SCAN_LOG, "a", encoding="utf-8") as f:
-            f.write(json.dumps(scan_entry, ensure_ascii=False) + "\n")
+        get_scan_history_store().append(scan_entry)
         logger.debug("[OCR-LOG] Scan history recorded")
 
         # 2. Update performance statistics
@@ -117,48 +106,7 @@ def update_performance_stats(document_type: str, success_level: str) -> None:
         success_level: Success level ("exact", "partial", "failed")
     """
     try:
-        # Load existing stats
-        stats = {}
-        if os.path.exists(OCR_PERFORMANCE_LOG):
-            with open(OCR_PERFORMANCE_LOG, "r", encoding="utf-8") as f:
-                stats = json.load(f)
-
-        # Initialize if necessary
-        if document_type not in stats:
-            stats[document_type] = {
-                "total": 0,
-                "success": 0,
-                "partial": 0,
-                "failed": 0,
-                "success_rate": 0.0,
-                "correction_rate": 0.0
-            }
-
-        # Update counters
-        stats[document_type]["total"] += 1
-        if success_level == "exact":
-            stats[document_type]["success"] += 1
-        elif success_level == "partial":
-            stats[document_type]["partial"] += 1
-        else:
-            stats[document_type]["failed"] += 1
-
-        # Calculate rates
-        total = stats[document_type]["total"]
-        stats[document_type]["success_rate"] = (
-            stats[document_type]["success"] / total * 100 if total > 0 else 0
-        )
-        stats[document_type]["correction_rate"] = (
-            stats[document_type]["failed"] / total * 100 if total > 0 else 0
-        )
-
-        # Add update timestamp
-        stats["last_updated"] = datetime.now().isoformat()
-
-        # Save
-        with open(OCR_PERFORMANCE_LOG, "w", encoding="utf-8") as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False)
-
+        get_stats_store().record_scan(document_type, success_level)
     except Exception as e:
         logger.error(f"[OCR-LOG] Error updating performance stats: {e}")
 
@@ -172,46 +120,7 @@ def update_pattern_stats(patterns_detectes: List[str], success_level: str) -> No
         success_level: Success level of the scan
     """
     try:
-        # Load existing stats
-        stats = {}
-        if os.path.exists(PATTERN_STATS_LOG):
-            with open(PATTERN_STATS_LOG, "r", encoding="utf-8") as f:
-                stats = json.load(f)
-
-        # Update each pattern
-        for pattern in patterns_detectes:
-            if pattern not in stats:
-                stats[pattern] = {
-                    "total_detections": 0,
-                    "success_count": 0,
-                    "partial_count": 0,
-                    "failure_count": 0,
-                    "success_rate": 0.0,
-                    "reliability_score": 0.0
-                }
-
-            stats[pattern]["total_detections"] += 1
-
-            if success_level == "exact":
-                stats[pattern]["success_count"] += 1
-            elif success_level == "partial":
-                stats[pattern]["partial_count"] += 1
-            else:
-                stats[pattern]["failure_count"] += 1
-
-            # Calculate success rate
-            total = stats[pattern]["total_detections"]
-            success = stats[pattern]["success_count"] + stats[pattern]["partial_count"]
-            stats[pattern]["success_rate"] = (success / total * 100) if total > 0 else 0
-
-            # Reliability score (weighted by detection count)
-            weight = min(total / 10, 1.0)
-            stats[pattern]["reliability_score"] = stats[pattern]["success_rate"] * weight
-
-        # Save
-        with open(PATTERN_STATS_LOG, "w", encoding="utf-8") as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False)
-
+        get_stats_store().record_patterns(patterns_detectes, success_level)
     except Exception as e:
         logger.error(f"[OCR-LOG] Error updating pattern stats: {e}")
 
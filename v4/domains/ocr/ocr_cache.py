@@ -0,0 +1,192 @@
+"""Content-addressed cache of OCR results.
+
+The key is a SHA-256 of the file bytes plus everything that influences the
+extracted text (preprocessing steps, tesseract language and version, PDF
+extractor version). A Streamlit rerun on an unchanged file therefore costs a
+hash and one indexed lookup instead of a tesseract run.
+
+Entries live in a small SQLite database under ``OCR_LOGS_DIR`` so they are
+shared by the app and the batch OCR worker processes. When the cached text
+exceeds ``OCR_CACHE_MAX_BYTES``, least recently used entries are evicted.
+Hit/miss/eviction counters are persisted alongside.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config import OCR_CACHE_DB, OCR_CACHE_ENABLED, OCR_CACHE_MAX_BYTES
+from shared.database import db_connection
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(data: bytes, params: str) -> str:
+    """
+    Build the cache key of a file.
+
+    Args:
+        data: Raw file bytes
+        params: Description of the extraction settings (e.g. "fra+eng|otsu|5.3.0")
+
+    Returns:
+        Hex digest identifying (content, settings)
+    """
+    digest = hashlib.sha256(data)
+    digest.update(b"\0")
+    digest.update(params.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """SQLite-backed OCR text cache with size-based LRU eviction."""
+
+    def __init__(self, db_path: str = OCR_CACHE_DB, max_bytes: int = OCR_CACHE_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up cached text and refresh its LRU position.
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            Cached text (possibly empty) or None on a miss
+        """
+        try:
+            with db_connection(self.db_path) as conn:
+                self._ensure_schema(conn)
+                row = conn.execute("SELECT text FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE ocr_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._bump(conn, "hits" if row is not None else "misses")
+                conn.commit()
+                return row[0] if row is not None else None
+        except sqlite3.Error as e:
+            logger.warning(f"[OCR-CACHE] Lookup failed: {e}")
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        """
+        Store extracted text, then evict old entries if over budget.
+
+        Args:
+            key: Key from make_cache_key
+            text: Extracted text
+        """
+        size = len(text.encode("utf-8"))
+        try:
+            with db_connection(self.db_path) as conn:
+                self._ensure_schema(conn)
+                conn.execute("""
+                    INSERT INTO ocr_cache (key, text, size, last_access) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        text = excluded.text, size = excluded.size, last_access = excluded.last_access
+                """, (key, text, size, time.time()))
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"[OCR-CACHE] Store failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes
+        """
+        stats = {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}
+        try:
+            with db_connection(self.db_path) as conn:
+                self._ensure_schema(conn)
+                for name, value in conn.execute("SELECT name, value FROM ocr_cache_stats"):
+                    stats[name] = value
+                entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+                stats["entries"], stats["bytes"] = entries, total
+        except sqlite3.Error as e:
+            logger.warning(f"[OCR-CACHE] Stats unavailable: {e}")
+        return stats
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            conn.execute("DELETE FROM ocr_cache")
+            conn.execute("DELETE FROM ocr_cache_stats")
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_cache (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_access ON ocr_cache(last_access)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.commit()
+            self._ready = True
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute("""
+            INSERT INTO ocr_cache_stats (name, value) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+        """, (name, amount))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Free down to 90% of the budget so eviction does not run on every insert
+        to_free = total - int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM ocr_cache ORDER BY last_access"):
+            victims.append((key,))
+            to_free -= size
+            if to_free <= 0:
+                break
+
+        conn.executemany("DELETE FROM ocr_cache WHERE key = ?", victims)
+        self._bump(conn, "evictions", len(victims))
+        logger.info(f"[OCR-CACHE] Evicted {len(victims)} entries")
+
+
+_cache: Optional[OCRCache] = None
+
+
+def get_ocr_cache() -> Optional[OCRCache]:
+    """
+    Get the process-wide OCR cache.
+
+    Returns:
+        OCRCache instance, or None when OCR_CACHE_ENABLED is False
+    """
+    global _cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = OCRCache()
+    return _cache
@@ -12,7 +12,7 @@ import pandas as pd
 import plotly.express as px
 from typing import Optional
 
-from config import OCR_PERFORMANCE_LOG, PATTERN_STATS_LOG, OCR_SCAN_LOG
+from config import OCR_STATS_DB, OCR_SCAN_LOG
 from shared.ui import toast_success, toast_error, toast_warning
 from domains.ocr.diagnostics import (
     get_ocr_performance_report,
@@ -93,7 +93,7 @@ def interface_own_scans() -> None:
         perf = get_ocr_performance_report()
 
         # DEBUG: Afficher ce qui a été chargé
-        print(f"[DEBUG-ANALYSE] Fichier existe: {os.path.exists(OCR_PERFORMANCE_LOG)}")
+        print(f"[DEBUG-ANALYSE] Base stats existe: {os.path.exists(OCR_STATS_DB)}")
         print(f"[DEBUG-ANALYSE] Contenu perf: {perf}")
         print(f"[DEBUG-ANALYSE] Type perf: {type(perf)}")
         print(f"[DEBUG-ANALYSE] Clés: {list(perf.keys()) if perf else 'None'}")
@@ -109,14 +109,12 @@ def interface_own_scans() -> None:
             - 💼 Ajoutez des revenus avec OCR
             - 📸 Utilisez la fonction d'analyse de documents
 
-            **Fichiers requis :**
-            - `data/ocr_logs/performance_stats.json` - Statistiques de performance
-            - `data/ocr_logs/pattern_stats.json` - Statistiques des patterns
+            **Fichiers utilisés :**
+            - `data/ocr_logs/ocr_stats.db` - Statistiques de performance et des patterns
             - `data/ocr_logs/scan_history.jsonl` - Historique des scans
 
             **📍 Localisation actuelle :**
-            - Performance: `{"✅ Existe" if os.path.exists(OCR_PERFORMANCE_LOG) else "❌ Inexistant"}`
-            - Patterns: `{"✅ Existe" if os.path.exists(PATTERN_STATS_LOG) else "❌ Inexistant"}`
+            - Statistiques: `{"✅ Existe" if os.path.exists(OCR_STATS_DB) else "❌ Inexistant"}`
             - Historique: `{"✅ Existe" if os.path.exists(OCR_SCAN_LOG) else "❌ Inexistant"}`
 
             🚀 **Commencez à scanner des documents pour voir les statistiques !**
@@ -199,10 +197,10 @@ def interface_own_scans() -> None:
             **Solutions :**
             1. 🔧 Réduisez les critères de filtrage ci-dessus
             2. 🧾 Scannez plus de documents pour générer des statistiques
-            3. 📍 Vérifiez que le fichier `data/ocr_logs/pattern_stats.json` existe
+            3. 📍 Vérifiez que la base `data/ocr_logs/ocr_stats.db` existe
 
             **État actuel :**
-            - Fichier patterns: `{"✅ Existe" if os.path.exists(PATTERN_STATS_LOG) else "❌ Inexistant - Créez-le en scannant des documents"}`
+            - Base statistiques: `{"✅ Existe" if os.path.exists(OCR_STATS_DB) else "❌ Inexistant - Créée en scannant des documents"}`
 
             🚀 **Astuce :** Commencez par scanner quelques tickets pour alimenter les statistiques !
             """)
@@ -256,8 +254,8 @@ def interface_own_scans() -> None:
             - 📭 Aucune donnée disponible (fichiers logs vides)
             - 🔍 Les patterns n'ont pas encore été testés suffisamment
 
-            **Fichier patterns :**
-            - État: `{"✅ Existe" if os.path.exists(PATTERN_STATS_LOG) else "❌ Inexistant - Commencez à scanner pour générer des stats"}`
+            **Base statistiques (ocr_stats.db) :**
+            - État: `{"✅ Existe" if os.path.exists(OCR_STATS_DB) else "❌ Inexistant - Commencez à scanner pour générer des stats"}`
 
             💡 **Conseil :** Continuez à scanner des documents pour maintenir ces bonnes performances !
             """)
@@ -637,7 +635,7 @@ Dossier des logs OCR :
 Fichiers inclus :
 - scan_history.jsonl : Historique complet
 - potential_patterns.jsonl : Patterns découverts
-- performance_stats.json : Statistiques globales
-- pattern_stats.json : Fiabilité des patterns
-- pattern_log.json : Occurrences
+- ocr_stats.db : Statistiques globales, fiabilité et occurrences des patterns
+- performance_stats.json, pattern_stats.json, pattern_log.json :
+  exports JSON de ocr_stats.db, générés lors de la préparation des logs
         """, language="text")
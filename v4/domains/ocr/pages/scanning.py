@@ -5,13 +5,14 @@ Clean Streamlit interface using scanning_service for business logic.
 This file contains ONLY UI code - no business logic.
 """
 
+import os
 import streamlit as st
 import logging
 from typing import List
 
 from domains.ocr.scanning_service import (
     scan_ticket_files,
-    process_single_ticket,
+    process_tickets_batch,
     validate_ticket_data,
     deduce_subcategory,
     prepare_ticket_for_db,
@@ -128,10 +129,21 @@ def process_all_tickets_in_folder():
     
     st.success(f"🧮 {len(files)} ticket(s)")
     
+    progress = st.progress(0.0, text="🔍 OCR...")
+
+    def _on_progress(done: int, total: int, filename: str):
+        progress.progress(done / total, text=f"🔍 OCR {done}/{total} : {filename}")
+
+    # Results stream back in completion order; restore folder order for stable form keys
+    results = sorted(process_tickets_batch(files, progress_callback=_on_progress), key=lambda r: r[0])
+    progress.empty()
+
     tickets = []
-    with st.spinner("🔍 OCR..."):
-        for f in files:
-            tickets.append(process_single_ticket(f))
+    for _, path, ticket, error in results:
+        if error is not None:
+            toast_error(f"OCR impossible : {os.path.basename(path)}")
+        else:
+            tickets.append(ticket)
     
     st.markdown("### 📋 Tickets détectés")
     
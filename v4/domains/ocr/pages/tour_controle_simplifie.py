@@ -14,54 +14,42 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 
-from config import OCR_LOGS_DIR, OCR_SCAN_LOG, OCR_PERFORMANCE_LOG, PATTERN_STATS_LOG
+from config import OCR_LOGS_DIR
 from domains.ocr.parsers import parse_ticket_metadata_v2
 from domains.ocr.scanner import full_ocr
 from domains.ocr.learning_ui import show_learning_suggestion
 from domains.ocr.export_logs import get_logs_summary, export_logs_to_desktop
+from domains.ocr.stats_store import get_stats_store
+from domains.ocr.scan_history import get_scan_history_store
 from shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
 def load_scan_history(limit: int = 10) -> List[Dict]:
-    """Load recent scans from scan_history.jsonl."""
-    scans = []
+    """Load recent scans from the scan history (most recent first)."""
     try:
-        if os.path.exists(OCR_SCAN_LOG):
-            with open(OCR_SCAN_LOG, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                # Get last N lines
-                for line in lines[-limit:]:
-                    try:
-                        scans.append(json.loads(line))
-                    except:
-                        pass
-            scans.reverse()  # Most recent first
+        return get_scan_history_store().tail(limit)
     except Exception as e:
         logger.error(f"Error loading scan history: {e}")
-    return scans
+    return []
 
 
 def load_performance_stats() -> Dict:
     """Load performance statistics."""
     try:
-        if os.path.exists(OCR_PERFORMANCE_LOG):
-            with open(OCR_PERFORMANCE_LOG, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except:
-        pass
+        return get_stats_store().performance_stats()
+    except Exception as e:
+        logger.error(f"Error loading performance stats: {e}")
     return {}
 
 
 def load_pattern_stats() -> Dict:
     """Load pattern reliability statistics."""
     try:
-        if os.path.exists(PATTERN_STATS_LOG):
-            with open(PATTERN_STATS_LOG, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except:
-        pass
+        return get_stats_store().pattern_stats()
+    except Exception as e:
+        logger.error(f"Error loading pattern stats: {e}")
     return {}
 
 
@@ -13,9 +13,41 @@ from dateutil import parser as date_parser
 from shared.utils import safe_convert
 from shared.logging_config import get_logger
 from .pattern_manager import get_pattern_manager
+from .parsers_OLD_BACKUP import get_montants_from_lines
 
 logger = get_logger(__name__)
 
+_AMOUNT_REGEX = re.compile(r"(\d{1,5}[.,]\d{1,2})")
+_HT_REGEX = re.compile(r"HT|NET", re.IGNORECASE)
+_TVA_REGEX = re.compile(r"TVA|T\.V\.A", re.IGNORECASE)
+_DATE_REGEXES = [
+    re.compile(r"\b\d{1,2}[./\-]\d{1,2}[./\-]\d{2,4}\b", re.IGNORECASE),
+    re.compile(r"\b\d{1,2}\s*(janv|févr|mars|avr|mai|juin|juil|août|sept|oct|nov|déc)\.?\s*\d{2,4}\b", re.IGNORECASE)
+]
+
+
+def is_keyword_line(line: str) -> bool:
+    """
+    Tell whether a line can contribute to parse_ticket_metadata_v2.
+
+    True for amount labels, payment lines, HT/TVA lines and dates: the
+    only lines region-of-interest OCR needs to read at full resolution.
+
+    Args:
+        line: OCR text line
+
+    Returns:
+        True if any detection method would look at the line
+    """
+    compiled = get_pattern_manager().get_compiled_patterns()
+    return bool(
+        compiled.amount_candidates([line])
+        or compiled.is_payment_line(line)
+        or _HT_REGEX.search(line)
+        or _TVA_REGEX.search(line)
+        or any(regex.search(line) for regex in _DATE_REGEXES)
+    )
+
 
 def _normalize_ocr_text(text: str) -> List[str]:
     """
@@ -53,26 +85,14 @@ def _detect_amount_method_a(lines: List[str]) -> Tuple[List[float], List[str]]:
     """
     logger.info("🔍 METHOD A: Looking for TOTAL/MONTANT patterns...")
     
-    pattern_mgr = get_pattern_manager()
-    total_patterns = pattern_mgr.get_amount_patterns()
+    compiled = get_pattern_manager().get_compiled_patterns()
     
     montants = []
     patterns_matched = []
     
-    # Import function from old parser
-    from domains.ocr.parsers_OLD_BACKUP import get_montant_from_line
-    
-    for pattern_config in total_patterns:
-        # Extraire pattern string si c'est un dict
-        if isinstance(pattern_config, dict):
-            pattern = pattern_config.get('pattern', '')
-        else:
-            pattern = pattern_config
-        
-        # get_montant_from_line est déjà case-insensitive et cherche sur ligne suivante
-        montant, matched = get_montant_from_line(pattern, lines, allow_next_line=True)
-        
-        if matched and montant > 0:
+    # Same semantics as get_montant_from_line (case-insensitive, next line fallback)
+    for pattern, montant in get_montants_from_lines(compiled, lines):
+        if montant > 0:
             montants.append(round(montant, 2))
             patterns_matched.append(pattern)
             logger.info(f"  ✅ Pattern '{pattern}' → {montant}€")
@@ -97,15 +117,13 @@ def _detect_amount_method_b(lines: List[str]) -> float:
     """
     logger.info("🔍 METHOD B: Looking for PAYMENT patterns (CB, CARTE, etc.)...")
     
-    pattern_mgr = get_pattern_manager()
-    paiement_patterns = pattern_mgr.get_payment_patterns()
-    montant_regex = r"(\d{1,5}[.,]\d{1,2})"
+    compiled = get_pattern_manager().get_compiled_patterns()
     
     montants_found = []
     
     for line in lines:
-        if any(re.search(p, line, re.IGNORECASE) for p in paiement_patterns):
-            amounts = re.findall(montant_regex, line)
+        if compiled.is_payment_line(line):
+            amounts = _AMOUNT_REGEX.findall(line)
             for val in amounts:
                 amount = safe_convert(val)
                 montants_found.append(amount)
@@ -133,21 +151,19 @@ def _detect_amount_method_c(lines: List[str]) -> float:
     """
     logger.info("🔍 METHOD C: Looking for HT + TVA...")
     
-    montant_regex = r"(\d{1,5}[.,]\d{1,2})"
-    
     # Find HT (net) lines
-    net_lines = [l for l in lines if re.search(r"HT|NET", l, re.IGNORECASE)]
+    net_lines = [l for l in lines if _HT_REGEX.search(l)]
     total_HT = 0.0
     for line in net_lines:
-        vals = re.findall(montant_regex, line)
+        vals = _AMOUNT_REGEX.findall(line)
         for v in vals:
             total_HT += safe_convert(v)
     
     # Find TVA lines
-    tva_lines = [l for l in lines if re.search(r"TVA|T\.V\.A", l, re.IGNORECASE)]
+    tva_lines = [l for l in lines if _TVA_REGEX.search(l)]
     total_TVA = 0.0
     for line in tva_lines:
-        vals = re.findall(montant_regex, line)
+        vals = _AMOUNT_REGEX.findall(line)
         for v in vals:
             total_TVA += safe_convert(v)
     
@@ -243,13 +259,8 @@ def _detect_date(ocr_text: str) -> str:
     """
     logger.info("📅 Detecting date...")
     
-    date_patterns = [
-        r"\b\d{1,2}[./\-]\d{1,2}[./\-]\d{2,4}\b",
-        r"\b\d{1,2}\s*(janv|févr|mars|avr|mai|juin|juil|août|sept|oct|nov|déc)\.?\s*\d{2,4}\b"
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, ocr_text, re.IGNORECASE)
+    for regex in _DATE_REGEXES:
+        match = regex.search(ocr_text)
         if match:
             try:
                 detected = date_parser.parse(match.group(0), dayfirst=True, fuzzy=True).date().isoformat()
@@ -6,17 +6,52 @@ import shutil
 import logging
 from datetime import datetime, date
 from calendar import monthrange
-from typing import Dict, Tuple, List, Optional, Any
+from typing import Callable, Dict, Tuple, List, Optional, Any
 from dateutil import parser
-from pdfminer.high_level import extract_text
 
 from config import SORTED_DIR, PROBLEMATIC_DIR
 from shared.utils import safe_convert
-from .pattern_manager import get_pattern_manager
+from .pattern_manager import CompiledPatterns, get_pattern_manager
+from .pdf_text import extract_pdf_text
+from shared.services.file_index import get_file_index
 
 logger = logging.getLogger(__name__)
 
 
+# (regex, replacement) applied in order by clean_ocr_text
+_OCR_DIGIT_FIXES = [
+    # Replace O with 0 ONLY in numeric context
+    (re.compile(r'(\d)[Oo](\d)'), r'\g<1>0\g<2>'),  # 1O5 → 105
+    (re.compile(r'(\d)[Oo](?=\s|$|,|\.)'), r'\g<1>0'),  # 1O → 10
+    (re.compile(r'(^|[\s,\.])[Oo](\d)'), r'\g<1>0\g<2>'),  # O5 at start/after delimiter → 05
+    # Replace I/l with 1 ONLY in numeric context
+    (re.compile(r'(\d)[Il](\d)'), r'\g<1>1\g<2>'),  # 2I5 → 215
+    (re.compile(r'(\d)[Il](?=\s|$|,|\.)'), r'\g<1>1'),  # 2I → 21
+    (re.compile(r'(^|[\s,\.])[Il](\d)'), r'\g<1>1\g<2>'),  # I5 at start/after delimiter → 15
+]
+_OCR_SPACES = re.compile(r"[\u200b\s]+")
+MONTANT_REGEX = re.compile(r"(\d{1,5}[.,]?\d{0,2})\s*(?:€|eur|euros?)?", re.IGNORECASE)
+
+
+def clean_ocr_text(txt: str) -> str:
+    """Correct common OCR reading errors (O/0, I/1, etc.)."""
+    for regex, replacement in _OCR_DIGIT_FIXES:
+        txt = regex.sub(replacement, txt)
+
+    # Clean spaces
+    txt = _OCR_SPACES.sub(" ", txt)
+    return txt.strip()
+
+
+def _largest_amount(line: str) -> Optional[float]:
+    """Largest amount on an already cleaned line, or None if there is none."""
+    found = MONTANT_REGEX.findall(line)
+    if not found:
+        return None
+    # Take the largest amount on the line (often the TTC total)
+    return safe_convert(max(found, key=lambda x: safe_convert(x)))
+
+
 def get_montant_from_line(
     label_pattern: str,
     all_lines: List[str],
@@ -36,45 +71,65 @@ def get_montant_from_line(
     Returns:
         Tuple of (amount, found) where found indicates if pattern matched
     """
-    montant_regex = r"(\d{1,5}[.,]?\d{0,2})\s*(?:€|eur|euros?)?"
-
-    def clean_ocr_text(txt: str) -> str:
-        """Correct common OCR reading errors (O/0, I/1, etc.)."""
-        # Replace O with 0 ONLY in numeric context
-        txt = re.sub(r'(\d)[Oo](\d)', r'\g<1>0\g<2>', txt)  # 1O5 → 105
-        txt = re.sub(r'(\d)[Oo](?=\s|$|,|\.)', r'\g<1>0', txt)  # 1O → 10
-        txt = re.sub(r'(^|[\s,\.])[Oo](\d)', r'\g<1>0\g<2>', txt)  # O5 at start/after delimiter → 05
-
-        # Replace I/l with 1 ONLY in numeric context
-        txt = re.sub(r'(\d)[Il](\d)', r'\g<1>1\g<2>', txt)  # 2I5 → 215
-        txt = re.sub(r'(\d)[Il](?=\s|$|,|\.)', r'\g<1>1', txt)  # 2I → 21
-        txt = re.sub(r'(^|[\s,\.])[Il](\d)', r'\g<1>1\g<2>', txt)  # I5 at start/after delimiter → 15
-
-        # Clean spaces
-        txt = re.sub(r"[\u200b\s]+", " ", txt)
-        return txt.strip()
-
     for i, l in enumerate(all_lines):
         l_clean = clean_ocr_text(l)
 
         # Search for label (e.g., 'TOTAL', 'MONTANT', etc.)
         if re.search(label_pattern, l_clean, re.IGNORECASE):
-            found_same = re.findall(montant_regex, l_clean, re.IGNORECASE)
-            if found_same:
-                # Take the largest amount on the line (often the TTC total)
-                return (safe_convert(max(found_same, key=lambda x: safe_convert(x))), True)
+            montant = _largest_amount(l_clean)
+            if montant is not None:
+                return (montant, True)
 
             # Check next line if allowed
             if allow_next_line and i + 1 < len(all_lines):
-                next_line = clean_ocr_text(all_lines[i + 1])
-                found_next = re.findall(montant_regex, next_line, re.IGNORECASE)
-                if found_next:
-                    return (safe_convert(max(found_next, key=lambda x: safe_convert(x))), True)
+                montant = _largest_amount(clean_ocr_text(all_lines[i + 1]))
+                if montant is not None:
+                    return (montant, True)
 
     # Pattern not found
     return (0.0, False)
 
 
+def get_montants_from_lines(
+    compiled: CompiledPatterns,
+    all_lines: List[str]
+) -> List[Tuple[str, float]]:
+    """
+    Run get_montant_from_line for every amount pattern in a single pass.
+
+    Lines are cleaned once, lines matched by no pattern are skipped with one
+    combined search, and amounts are extracted at most once per line.
+
+    Args:
+        compiled: Compiled patterns from PatternManager.get_compiled_patterns()
+        all_lines: List of all text lines
+
+    Returns:
+        (pattern, amount) for each pattern that matched, in priority order
+    """
+    cleaned = [clean_ocr_text(l) for l in all_lines]
+    candidates = compiled.amount_candidates(cleaned)
+    amounts: Dict[int, Optional[float]] = {}
+
+    def amount_at(i: int) -> Optional[float]:
+        if i not in amounts:
+            amounts[i] = _largest_amount(cleaned[i])
+        return amounts[i]
+
+    results = []
+    for source, regex in compiled.amount:
+        for i in candidates:
+            if not regex.search(cleaned[i]):
+                continue
+            montant = amount_at(i)
+            if montant is None and i + 1 < len(cleaned):
+                montant = amount_at(i + 1)
+            if montant is not None:
+                results.append((source, montant))
+                break
+    return results
+
+
 def detect_potential_patterns(ocr_text: str, known_patterns: List[str]) -> List[Dict[str, Any]]:
     """
     Detect potential new patterns in OCR text that might contain amounts.
@@ -407,6 +462,7 @@ def move_ticket_to_sorted(ticket_path: str, categorie: str, sous_categorie: str,
                 counter += 1
 
     shutil.move(ticket_path, dest_path)
+    get_file_index().add(dest_path)
     logger.info(f"Ticket moved to: {dest_path}")
 
 
@@ -480,23 +536,55 @@ def move_ticket_to_problematic(
     return dest_path
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+def extract_text_from_pdf(
+    pdf_path: str,
+    max_pages: Optional[int] = None,
+    stop_when: Optional[Callable[[str], bool]] = None
+) -> str:
     """
-    Read a PDF and return raw text.
+    Read a PDF and return raw text (pages cached by file content).
 
     Args:
         pdf_path: Path to PDF file
+        max_pages: Optional maximum number of pages read (all by default)
+        stop_when: Optional predicate on the text read so far; reading stops
+            at the first page after which it returns True
 
     Returns:
         Extracted text or empty string on error
     """
     try:
-        return extract_text(pdf_path)
+        return extract_pdf_text(pdf_path, max_pages=max_pages, stop_when=stop_when)
     except Exception as e:
         logger.warning(f"Unable to read PDF {pdf_path} ({e})")
         return ""
 
 
+# Pages read by the revenue PDF parsers: totals and periods are on the first ones
+UBER_PDF_MAX_PAGES = 2
+FICHE_PAIE_MAX_PAGES = 2
+
+# First-choice patterns of the revenue parsers: once both fields of a document
+# matched them, later pages cannot change the result and are not read
+_UBER_PERIOD_REGEX = re.compile(
+    r"P[eé]riode de facturation\s*[:\-]?\s*([0-3]?\d[\/\-\.][ ]?[01]?\d[\/\-\.]\d{2,4})\s*[\-–]\s*([0-3]?\d[\/\-\.][ ]?[01]?\d[\/\-\.]\d{2,4})",
+    re.IGNORECASE
+)
+_UBER_TOTAL_REGEX = re.compile(r"Montant total [aà] payer\s*[:\-–]?\s*([0-9]+[., ][0-9]{2})\s*€?", re.IGNORECASE)
+_PAIE_NET_REGEX = re.compile(r"NET\s*A\s*PAYER\s*[:\-\–]?\s*([0-9]+[.,][0-9]{2})", re.IGNORECASE)
+_PAIE_PERIOD_REGEX = re.compile(
+    r"(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})\s*[\-–]\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})"
+)
+
+
+def _uber_fields_found(text: str) -> bool:
+    return bool(_UBER_PERIOD_REGEX.search(text) and _UBER_TOTAL_REGEX.search(text))
+
+
+def _fiche_paie_fields_found(text: str) -> bool:
+    return bool(_PAIE_NET_REGEX.search(text) and _PAIE_PERIOD_REGEX.search(text))
+
+
 def parse_uber_pdf(pdf_path: str) -> Dict[str, Any]:
     """
     Parse an Uber Eats PDF invoice to extract revenue information.
@@ -513,7 +601,7 @@ def parse_uber_pdf(pdf_path: str) -> Dict[str, Any]:
         Dictionary with montant (net), date, categorie, sous_categorie, source,
         montant_brut, and tax_amount
     """
-    text = extract_text_from_pdf(pdf_path)
+    text = extract_text_from_pdf(pdf_path, max_pages=UBER_PDF_MAX_PAGES, stop_when=_uber_fields_found)
     if not text:
         return {
             "montant": 0.0,
@@ -525,11 +613,7 @@ def parse_uber_pdf(pdf_path: str) -> Dict[str, Any]:
 
     # Look for billing period: "Période de facturation : 01/07/2025 - 31/07/2025"
     date_fin = None
-    periode_match = re.search(
-        r"P[eé]riode de facturation\s*[:\-]?\s*([0-3]?\d[\/\-\.][ ]?[01]?\d[\/\-\.]\d{2,4})\s*[\-–]\s*([0-3]?\d[\/\-\.][ ]?[01]?\d[\/\-\.]\d{2,4})",
-        text,
-        re.IGNORECASE
-    )
+    periode_match = _UBER_PERIOD_REGEX.search(text)
     if periode_match:
         debut_str, fin_str = periode_match.groups()
         fin_str = fin_str.replace(" ", "")  # Remove spaces
@@ -580,7 +664,7 @@ def parse_uber_pdf(pdf_path: str) -> Dict[str, Any]:
     # Net amount: varies by Uber PDF (Net earnings, Total to be paid, etc.)
     montant = 0.0
     montant_patterns = [
-        r"Montant total [aà] payer\s*[:\-–]?\s*([0-9]+[., ][0-9]{2})\s*€?",
+        _UBER_TOTAL_REGEX.pattern,
         r"(?:Net earnings|Net to driver|Total net|Montant net|Net earnings \(driver\))\s*[:\-\–]?\s*([0-9]+[.,][0-9]{2})\s*€?",
         r"([\d]{1,3}(?:[ .,]\d{3})*[.,]\d{2})\s*€\s*(?:net|netto|net earnings|to driver)?"
     ]
@@ -644,7 +728,7 @@ def parse_fiche_paie(pdf_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary with montant, date, categorie, sous_categorie, and source
     """
-    text = extract_text_from_pdf(pdf_path)
+    text = extract_text_from_pdf(pdf_path, max_pages=FICHE_PAIE_MAX_PAGES, stop_when=_fiche_paie_fields_found)
     if not text:
         return {
             "montant": 0.0,
@@ -657,7 +741,7 @@ def parse_fiche_paie(pdf_path: str) -> Dict[str, Any]:
     # 1) Find net pay (patterns: NET A PAYER, Net à payer, Net pay, Net salary)
     montant = 0.0
     net_patterns = [
-        r"NET\s*A\s*PAYER\s*[:\-\–]?\s*([0-9]+[.,][0-9]{2})",
+        _PAIE_NET_REGEX.pattern,
         r"Net à payer\s*[:\-\–]?\s*([0-9]+[.,][0-9]{2})",
         r"Net à payer \(à vous\)\s*[:\-\–]?\s*([0-9]+[.,][0-9]{2})",
         r"Net\s*[:\-\–]?\s*([0-9]+[.,][0-9]{2})"  # fallback
@@ -681,10 +765,7 @@ def parse_fiche_paie(pdf_path: str) -> Dict[str, Any]:
 
     # 2) Find period or date: search for "période" or interval "01/07/2025 - 31/07/2025"
     date_found = None
-    periode_match = re.search(
-        r"(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})\s*[\-–]\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})",
-        text
-    )
+    periode_match = _PAIE_PERIOD_REGEX.search(text)
     if periode_match:
         fin_str = periode_match.groups()[1]
         for fmt in ("%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d-%m-%y"):
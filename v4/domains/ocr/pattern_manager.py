@@ -5,15 +5,53 @@ This module manages OCR patterns loaded from YAML configuration,
 allowing easy addition and modification of patterns without code changes.
 """
 
+import re
 import yaml
 import os
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Backreferences are renumbered when patterns are joined into one alternation
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+@dataclass(frozen=True)
+class CompiledPatterns:
+    """Regex objects built once from the active configuration."""
+    amount: List[Tuple[str, "re.Pattern"]]  # (source, compiled) in priority order
+    amount_any: Optional["re.Pattern"]  # Alternation of all amount patterns
+    payment: List["re.Pattern"]
+    payment_any: Optional["re.Pattern"]  # Alternation of all payment patterns
+
+    def amount_candidates(self, lines: List[str]) -> List[int]:
+        """Indices of the lines matched by at least one amount pattern."""
+        if self.amount_any is None:
+            return list(range(len(lines))) if self.amount else []
+        search = self.amount_any.search
+        return [i for i, line in enumerate(lines) if search(line)]
+
+    def is_payment_line(self, line: str) -> bool:
+        """True if any payment pattern matches the line."""
+        if self.payment_any is not None:
+            return self.payment_any.search(line) is not None
+        return any(p.search(line) for p in self.payment)
+
+
+def _compile_alternation(patterns: List[str]) -> Optional["re.Pattern"]:
+    """Join patterns into one case-insensitive regex (None if not combinable)."""
+    if not patterns or any(_BACKREFERENCE.search(p) for p in patterns):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    except re.error as e:
+        logger.warning(f"Patterns cannot be combined, testing them one by one: {e}")
+        return None
+
 
 class PatternManager:
     """Manages OCR patterns from YAML configuration."""
@@ -32,6 +70,7 @@ class PatternManager:
         
         self.config_path = config_path
         self.config = self._load_config()
+        self._compiled: Optional[CompiledPatterns] = None
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -76,6 +115,41 @@ class PatternManager:
         # Extract just the pattern strings
         return [p['pattern'] for p in sorted_patterns]
     
+    def get_compiled_patterns(self) -> CompiledPatterns:
+        """
+        Get the active patterns as compiled regex objects.
+
+        Built on first use and rebuilt after any configuration change, so
+        parsing a ticket never recompiles a pattern.
+
+        Returns:
+            CompiledPatterns for amount and payment detection
+        """
+        compiled = self._compiled
+        if compiled is None:
+            amount = []
+            for pattern in self.get_amount_patterns():
+                try:
+                    amount.append((pattern, re.compile(pattern, re.IGNORECASE)))
+                except re.error as e:
+                    logger.error(f"Invalid amount pattern '{pattern}' ignored: {e}")
+
+            payment = []
+            for pattern in self.get_payment_patterns():
+                try:
+                    payment.append(re.compile(pattern, re.IGNORECASE))
+                except re.error as e:
+                    logger.error(f"Invalid payment pattern '{pattern}' ignored: {e}")
+
+            compiled = CompiledPatterns(
+                amount=amount,
+                amount_any=_compile_alternation([source for source, _ in amount]),
+                payment=payment,
+                payment_any=_compile_alternation([p.pattern for p in payment])
+            )
+            self._compiled = compiled
+        return compiled
+
     def get_payment_patterns(self) -> List[str]:
         """
         Get payment method patterns.
@@ -131,6 +205,7 @@ class PatternManager:
             }
             
             self.config['amount_patterns'].append(new_pattern)
+            self._compiled = None
             self._save_config()
             logger.info(f"Added new pattern: {pattern}")
             return True
@@ -152,6 +227,7 @@ class PatternManager:
             for p in self.config.get('amount_patterns', []):
                 if p['pattern'] == pattern:
                     p['enabled'] = False
+                    self._compiled = None
                     self._save_config()
                     logger.info(f"Disabled pattern: {pattern}")
                     return True
@@ -174,6 +250,7 @@ class PatternManager:
             for p in self.config.get('amount_patterns', []):
                 if p['pattern'] == pattern:
                     p['enabled'] = True
+                    self._compiled = None
                     self._save_config()
                     logger.info(f"Enabled pattern: {pattern}")
                     return True
@@ -208,6 +285,7 @@ class PatternManager:
     def reload(self) -> None:
         """Reload configuration from file."""
         self.config = self._load_config()
+        self._compiled = None
         logger.info("Configuration reloaded")
     
     def get_pattern_stats(self) -> Dict[str, int]:
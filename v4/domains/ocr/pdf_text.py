@@ -0,0 +1,128 @@
+"""Page-streaming PDF text extraction.
+
+``pdfminer.high_level.extract_text`` lays out every page of a document before
+returning. Revenue documents (Uber statements, payslips) carry their totals
+and periods on the first page or two, so their parsers read pages one at a
+time, up to a page limit, and stop as soon as the fields they need are found.
+
+Pages are laid out exactly as ``extract_text`` does (same converter and
+layout parameters, form feed after each page): the concatenation of all pages
+is the text ``extract_text`` returns. Each page is cached in the OCR cache
+under the SHA-256 of the file and its page number, so a document that was
+already opened costs one lookup per page read.
+"""
+
+import hashlib
+import logging
+import time
+from io import BytesIO, StringIO
+from typing import Callable, Iterator, List, Optional
+
+from pdfminer import __version__ as PDFMINER_VERSION
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+from .ocr_cache import get_ocr_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Cache entry holding the page count, stored once the last page was read
+_PAGE_COUNT = "count"
+
+
+def _page_key(file_hash: str, page: object) -> str:
+    return make_cache_key(file_hash.encode("ascii"), f"pdf-page|{page}|pdfminer|{PDFMINER_VERSION}")
+
+
+def _layout_pages(raw: bytes, start: int) -> Iterator[str]:
+    """Lay out the pages of a PDF from page ``start`` (0-based), one at a time."""
+    output = StringIO()
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = TextConverter(rsrcmgr, output, codec="utf-8", laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    try:
+        for number, page in enumerate(PDFPage.get_pages(BytesIO(raw), caching=True)):
+            if number < start:
+                continue
+            interpreter.process_page(page)
+            text = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            yield text
+    finally:
+        device.close()
+
+
+def iter_pdf_pages(pdf_path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF, reading cached pages first.
+
+    Pages are only laid out when the consumer asks for them: stopping the
+    iteration early skips the remaining pages.
+
+    Args:
+        pdf_path: Path to PDF file
+        max_pages: Optional maximum number of pages to yield
+
+    Yields:
+        Page text, each ending with a form feed (as extract_text)
+    """
+    with open(pdf_path, "rb") as f:
+        raw = f.read()
+
+    cache = get_ocr_cache()
+    file_hash = hashlib.sha256(raw).hexdigest()
+    count = cache.get(_page_key(file_hash, _PAGE_COUNT)) if cache is not None else None
+    limit = int(count) if count is not None else None
+    if max_pages is not None:
+        limit = max_pages if limit is None else min(limit, max_pages)
+
+    number = 0
+    pages = None  # pdfminer layout, opened on the first cache miss
+    while limit is None or number < limit:
+        key = _page_key(file_hash, number)
+        text = cache.get(key) if cache is not None and pages is None else None
+        if text is None:
+            if pages is None:
+                pages = _layout_pages(raw, number)
+            text = next(pages, None)
+            if text is None:  # Past the last page
+                if cache is not None:
+                    cache.put(_page_key(file_hash, _PAGE_COUNT), str(number))
+                return
+            if cache is not None:
+                cache.put(key, text)
+        yield text
+        number += 1
+
+
+def extract_pdf_text(
+    pdf_path: str,
+    max_pages: Optional[int] = None,
+    stop_when: Optional[Callable[[str], bool]] = None
+) -> str:
+    """
+    Extract the text of the first pages of a PDF.
+
+    Args:
+        pdf_path: Path to PDF file
+        max_pages: Optional maximum number of pages read
+        stop_when: Optional predicate called with the text read so far after
+            each page; reading stops once it returns True
+
+    Returns:
+        Text of the pages read
+    """
+    start = time.perf_counter()
+    pages: List[str] = []
+    for text in iter_pdf_pages(pdf_path, max_pages):
+        pages.append(text)
+        if stop_when is not None and stop_when("".join(pages)):
+            break
+
+    logger.debug(
+        f"[PDF] {pdf_path}: {len(pages)} page(s) read in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+    return "".join(pages)
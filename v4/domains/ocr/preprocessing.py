@@ -0,0 +1,208 @@
+"""Configurable image preprocessing pipeline for OCR.
+
+A profile (``OCR_PREPROCESSING_PROFILES`` in config/ocr_config.py) is an
+ordered list of ``(stage, parameters)`` steps. Each stage takes and returns a
+numpy image; the time spent in every stage is reported so slow steps show up
+in the logs and in ``scripts/bench_ocr_preprocessing.py``.
+
+The profile signature (name + steps) is part of the OCR cache key: changing a
+profile never serves text produced by another pipeline.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config import OCR_PREPROCESSING_PROFILES, OCR_PREPROCESSING_PROFILE
+
+logger = logging.getLogger(__name__)
+
+Step = Tuple[str, Dict[str, Any]]
+
+
+# ----------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------
+
+def _grayscale(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def _resize(image: np.ndarray, max_side: int = 2000) -> np.ndarray:
+    """Downscale so the longest side is at most max_side (never upscales)."""
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return image
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def _crop_receipt(image: np.ndarray, min_area_ratio: float = 0.15, margin: int = 10) -> np.ndarray:
+    """Crop to the largest bright region (the paper) when one stands out."""
+    gray = _grayscale(image)
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, mask = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Close the gaps left by the printed text so the paper is one blob
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 25))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return image
+
+    x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    height, width = gray.shape[:2]
+    ratio = (w * h) / float(width * height)
+    if ratio < min_area_ratio or ratio > 0.98:
+        return image  # No distinct paper, or the paper already fills the frame
+
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+    return image[y0:y1, x0:x1]
+
+
+def _text_angle(gray: np.ndarray) -> float:
+    """Estimate the rotation of the text block in degrees (counter-clockwise)."""
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    # Smear characters horizontally into lines: the rectangle then follows the lines
+    ink = cv2.dilate(ink, cv2.getStructuringElement(cv2.MORPH_RECT, (15, 3)))
+    coords = cv2.findNonZero(ink)
+    if coords is None or len(coords) < 50:
+        return 0.0
+
+    (_, _), (w, h), angle = cv2.minAreaRect(coords)
+    # Bring the angle of the long side of the block into (-45, 45]
+    if w < h:
+        angle -= 90
+    while angle <= -45:
+        angle += 90
+    while angle > 45:
+        angle -= 90
+    return -angle
+
+
+def _deskew(image: np.ndarray, max_angle: float = 15.0, min_angle: float = 0.5) -> np.ndarray:
+    """Rotate the image so text lines are horizontal."""
+    angle = _text_angle(_grayscale(image))
+    if abs(angle) < min_angle or abs(angle) > max_angle:
+        return image
+
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), -angle, 1.0)
+    return cv2.warpAffine(
+        image, matrix, (width, height),
+        flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+    )
+
+
+def _gaussian_blur(image: np.ndarray, ksize: int = 3) -> np.ndarray:
+    return cv2.GaussianBlur(image, (ksize, ksize), 0)
+
+
+def _otsu(image: np.ndarray) -> np.ndarray:
+    _, thresh = cv2.threshold(_grayscale(image), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+def _adaptive_threshold(image: np.ndarray, block_size: int = 31, c: int = 15) -> np.ndarray:
+    """Local threshold: robust to shadows and uneven lighting on photos."""
+    return cv2.adaptiveThreshold(
+        _grayscale(image), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, c
+    )
+
+
+STAGES: Dict[str, Callable[..., np.ndarray]] = {
+    'grayscale': _grayscale,
+    'resize': _resize,
+    'crop_receipt': _crop_receipt,
+    'deskew': _deskew,
+    'gaussian_blur': _gaussian_blur,
+    'otsu': _otsu,
+    'adaptive_threshold': _adaptive_threshold,
+}
+
+
+# ----------------------------------------------------------------------
+# Pipeline
+# ----------------------------------------------------------------------
+
+def get_profile(name: Optional[str] = None) -> List[Step]:
+    """
+    Get the steps of a preprocessing profile.
+
+    Args:
+        name: Profile name (defaults to OCR_PREPROCESSING_PROFILE)
+
+    Returns:
+        Ordered list of (stage, parameters)
+
+    Raises:
+        ValueError: If the profile or one of its stages is unknown
+    """
+    name = name or OCR_PREPROCESSING_PROFILE
+    if name not in OCR_PREPROCESSING_PROFILES:
+        raise ValueError(f"Unknown OCR preprocessing profile: {name}")
+    steps = [(stage, dict(params)) for stage, params in OCR_PREPROCESSING_PROFILES[name]]
+    for stage, _ in steps:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown preprocessing stage '{stage}' in profile '{name}'")
+    return steps
+
+
+def profile_signature(name: Optional[str] = None) -> str:
+    """
+    Describe a profile for the OCR cache key.
+
+    Args:
+        name: Profile name (defaults to OCR_PREPROCESSING_PROFILE)
+
+    Returns:
+        String such as "standard:grayscale|resize(max_side=2000)|otsu"
+    """
+    name = name or OCR_PREPROCESSING_PROFILE
+    parts = []
+    for stage, params in get_profile(name):
+        args = ",".join(f"{k}={params[k]}" for k in sorted(params))
+        parts.append(f"{stage}({args})" if args else stage)
+    return f"{name}:" + "|".join(parts)
+
+
+def preprocess_image(
+    image: np.ndarray,
+    profile: Optional[str] = None
+) -> Tuple[np.ndarray, Dict[str, float]]:
+    """
+    Run a preprocessing profile on a decoded image.
+
+    Args:
+        image: BGR or grayscale image
+        profile: Profile name (defaults to OCR_PREPROCESSING_PROFILE)
+
+    Returns:
+        Tuple of (processed image, seconds spent per stage)
+    """
+    timings: Dict[str, float] = {}
+    for stage, params in get_profile(profile):
+        start = time.perf_counter()
+        image = STAGES[stage](image, **params)
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+    return image, timings
+
+
+def format_timings(timings: Dict[str, float]) -> str:
+    """
+    Format stage timings for logs.
+
+    Args:
+        timings: Seconds per stage
+
+    Returns:
+        String such as "grayscale=3.1ms resize=12.0ms"
+    """
+    return " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings.items())
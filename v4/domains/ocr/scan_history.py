@@ -0,0 +1,342 @@
+"""Segmented, indexed store for the OCR scan history (JSONL).
+
+The history used to be one ever-growing ``scan_history.jsonl`` parsed in full
+on every OCR page render. It is now split into segments:
+
+- ``scan_history.jsonl``: active segment, new scans are appended to it
+- ``scan_history.00001.jsonl``...: sealed segments, rotated out once the active
+  one exceeds ``OCR_SCAN_HISTORY_SEGMENT_BYTES``; when there are more than
+  ``OCR_SCAN_HISTORY_MAX_SEGMENTS`` they are compacted into one
+
+Each segment has a sidecar ``.idx`` file with one line per record
+(``offset<TAB>length<TAB>timestamp<TAB>document_type``). Unfiltered reads walk
+the data backwards and parse only the newest N lines; filtered reads (document
+type, date range) scan the small index backwards and seek to matching records.
+An index that lags behind its segment (lines written by an older version, a
+crash between the two appends) is caught up from its last indexed offset.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import OCR_SCAN_LOG, OCR_SCAN_HISTORY_SEGMENT_BYTES, OCR_SCAN_HISTORY_MAX_SEGMENTS
+
+logger = logging.getLogger(__name__)
+
+_BLOCK_SIZE = 64 * 1024
+
+# (offset, length, timestamp, document_type)
+IndexEntry = Tuple[int, int, str, str]
+
+
+def _reverse_lines(path: str) -> Iterator[bytes]:
+    """Yield the non-empty lines of a file from last to first."""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b"\n")
+            remainder = lines.pop(0)  # May continue in the previous block
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _index_field(value: Any) -> str:
+    return re.sub(r"[\t\r\n]", " ", str(value or ""))
+
+
+class ScanHistory:
+    """Append-only scan history with tail reads and a per-segment index."""
+
+    def __init__(
+        self,
+        path: str = OCR_SCAN_LOG,
+        segment_max_bytes: int = OCR_SCAN_HISTORY_SEGMENT_BYTES,
+        max_segments: int = OCR_SCAN_HISTORY_MAX_SEGMENTS
+    ):
+        self.path = path
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._base, self._ext = os.path.splitext(path)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Append a scan record to the active segment and its index.
+
+        Args:
+            entry: Scan record (JSON-serializable, with "timestamp" and "document_type")
+        """
+        data = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._catch_up(self.path)
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(data)
+            self._write_index(self.path, [
+                (offset, len(data), _index_field(entry.get("timestamp")), _index_field(entry.get("document_type")))
+            ])
+
+            if offset + len(data) >= self.segment_max_bytes:
+                self._rotate()
+
+    def compact(self) -> None:
+        """Merge all sealed segments into one, dropping unreadable lines."""
+        with self._lock:
+            self._compact()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def tail(
+        self,
+        limit: int = 100,
+        document_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the newest scan records, most recent first.
+
+        Args:
+            limit: Maximum number of records
+            document_type: Optional filter by document type
+            since: Optional first day included (ISO date, "YYYY-MM-DD")
+            until: Optional last day included (ISO date, "YYYY-MM-DD")
+
+        Returns:
+            List of scan records
+        """
+        if limit <= 0:
+            return []
+        with self._lock:  # No rotation while segments are being read
+            if document_type is None and since is None and until is None:
+                return self._tail_unfiltered(limit)
+            return self._tail_indexed(limit, document_type, since, until)
+
+    def count(self) -> int:
+        """
+        Count the records of all segments.
+
+        Returns:
+            Number of indexed records
+        """
+        with self._lock:
+            total = 0
+            for path in self.segments():
+                self._catch_up(path)
+                total += len(self._load_index(path))
+            return total
+
+    def segments(self) -> List[str]:
+        """
+        Get the data files of the history, newest first.
+
+        Returns:
+            Paths of the active segment and the sealed ones
+        """
+        sealed = self._sealed_segments()
+        paths = [path for _, path in sorted(sealed, reverse=True)]
+        if os.path.exists(self.path):
+            paths.insert(0, self.path)
+        return paths
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _tail_unfiltered(self, limit: int) -> List[Dict[str, Any]]:
+        records = []
+        for path in self.segments():
+            for line in _reverse_lines(path):
+                record = _parse(line)
+                if record is not None:
+                    records.append(record)
+                    if len(records) >= limit:
+                        return records
+        return records
+
+    def _tail_indexed(
+        self,
+        limit: int,
+        document_type: Optional[str],
+        since: Optional[str],
+        until: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        records = []
+        for path in self.segments():
+            self._catch_up(path)
+            with open(path, "rb") as data:
+                for offset, length, timestamp, doc_type in self._reverse_index(path):
+                    if document_type is not None and doc_type != document_type:
+                        continue
+                    day = timestamp[:10]
+                    if (since is not None and day < since) or (until is not None and day > until):
+                        continue
+                    data.seek(offset)
+                    record = _parse(data.read(length))
+                    if record is not None:
+                        records.append(record)
+                        if len(records) >= limit:
+                            return records
+        return records
+
+    def _index_path(self, path: str) -> str:
+        return os.path.splitext(path)[0] + ".idx"
+
+    def _sealed_segments(self) -> List[Tuple[int, str]]:
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self._base) + "."
+        sealed = []
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                number = name[len(prefix):-len(self._ext)] if name.endswith(self._ext) else ""
+                if name.startswith(prefix) and number.isdigit():
+                    sealed.append((int(number), os.path.join(directory, name)))
+        return sealed
+
+    def _load_index(self, path: str) -> List[IndexEntry]:
+        index_path = self._index_path(path)
+        entries = []
+        if not os.path.exists(index_path):
+            return entries
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 4 and parts[0].isdigit() and parts[1].isdigit():
+                    entries.append((int(parts[0]), int(parts[1]), parts[2], parts[3]))
+        return entries
+
+    def _reverse_index(self, path: str) -> Iterator[IndexEntry]:
+        index_path = self._index_path(path)
+        if not os.path.exists(index_path):
+            return
+        for line in _reverse_lines(index_path):
+            parts = line.decode("utf-8", "replace").split("\t")
+            if len(parts) == 4 and parts[0].isdigit() and parts[1].isdigit():
+                yield int(parts[0]), int(parts[1]), parts[2], parts[3]
+
+    def _write_index(self, path: str, entries: List[IndexEntry], mode: str = "a") -> None:
+        with open(self._index_path(path), mode, encoding="utf-8") as f:
+            f.writelines(f"{o}\t{n}\t{ts}\t{dt}\n" for o, n, ts, dt in entries)
+
+    def _indexed_end(self, path: str) -> int:
+        for offset, length, _, _ in self._reverse_index(path):
+            return offset + length
+        return 0
+
+    def _catch_up(self, path: str) -> None:
+        """Index the records appended to a segment after its last indexed one."""
+        if not os.path.exists(path):
+            return
+        size = os.path.getsize(path)
+        start = self._indexed_end(path)
+        if start > size:  # Segment replaced or truncated: rebuild
+            start = 0
+            open(self._index_path(path), "w").close()
+        if start == size:
+            return
+
+        entries = []
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written record, indexed once complete
+                record = _parse(line) if line.strip() else None
+                if record is not None:
+                    entries.append((
+                        offset, len(line),
+                        _index_field(record.get("timestamp")), _index_field(record.get("document_type"))
+                    ))
+                offset += len(line)
+        if entries:
+            self._write_index(path, entries)
+            logger.debug(f"[SCAN-HISTORY] Indexed {len(entries)} record(s) of {os.path.basename(path)}")
+
+    def _rotate(self) -> None:
+        sealed = self._sealed_segments()
+        number = max((n for n, _ in sealed), default=0) + 1
+        target = f"{self._base}.{number:05d}{self._ext}"
+        os.replace(self._index_path(self.path), self._index_path(target))
+        os.replace(self.path, target)
+        logger.info(f"[SCAN-HISTORY] Rotated to {os.path.basename(target)}")
+
+        if len(sealed) + 1 > self.max_segments:
+            self._compact()
+
+    def _compact(self) -> None:
+        sealed = sorted(self._sealed_segments())
+        if len(sealed) < 2:
+            return
+
+        first_number, first_path = sealed[0]
+        tmp_path = f"{self._base}.compact.tmp"
+        entries = []
+        offset = 0
+        with open(tmp_path, "wb") as out:
+            for _, path in sealed:
+                with open(path, "rb") as f:
+                    for line in f:
+                        record = _parse(line) if line.strip() else None
+                        if record is None:
+                            continue
+                        if not line.endswith(b"\n"):
+                            line += b"\n"
+                        out.write(line)
+                        entries.append((
+                            offset, len(line),
+                            _index_field(record.get("timestamp")), _index_field(record.get("document_type"))
+                        ))
+                        offset += len(line)
+
+        self._write_index(tmp_path, entries, mode="w")
+        # Replace the oldest segment first: a crash before the deletions below
+        # duplicates records instead of losing them
+        os.replace(self._index_path(tmp_path), self._index_path(first_path))
+        os.replace(tmp_path, first_path)
+        for _, path in sealed[1:]:
+            os.remove(path)
+            if os.path.exists(self._index_path(path)):
+                os.remove(self._index_path(path))
+        logger.info(f"[SCAN-HISTORY] Compacted {len(sealed)} segments ({len(entries)} records)")
+
+
+_history: Optional[ScanHistory] = None
+
+
+def get_scan_history_store() -> ScanHistory:
+    """
+    Get the process-wide scan history.
+
+    Returns:
+        ScanHistory instance
+    """
+    global _history
+    if _history is None:
+        _history = ScanHistory()
+    return _history
@@ -1,31 +1,322 @@
 """OCR scanning functionality for image-based document processing."""
 
 import os
+import time
 import logging
+import threading
+from abc import ABC, abstractmethod
 import cv2
 import numpy as np
 import pytesseract
 from PIL import Image
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
+from config import OCR_ENGINE, OCR_ROI_ENABLED, OCR_ROI_LAYOUT_MAX_SIDE, OCR_ROI_CONTEXT_LINES
 from .logging import log_pattern_occurrence
+from .ocr_cache import get_ocr_cache, make_cache_key
+from .preprocessing import preprocess_image, profile_signature, format_timings
+from .parsers import is_keyword_line
 
 logger = logging.getLogger(__name__)
 
+# Tesseract language (part of the OCR cache key with the preprocessing profile)
+OCR_LANG = "fra+eng"
 
-def full_ocr(image_path: str, show_ticket: bool = False) -> str:
+# (text, (left, top, width, height)) of a recognized line
+OCRLine = Tuple[str, Tuple[int, int, int, int]]
+
+
+class OCREngine(ABC):
+    """Text recognition backend used by full_ocr (engines implement the abstract methods)."""
+
+    name = "base"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+
+    @abstractmethod
+    def image_to_string(self, image: Image.Image) -> str:
+        """
+        Recognize the text of a preprocessed image.
+
+        Args:
+            image: PIL image (binarized by the preprocessing profile)
+
+        Returns:
+            Raw text returned by tesseract
+        """
+
+    @abstractmethod
+    def image_to_lines(self, image: Image.Image) -> List[OCRLine]:
+        """
+        Recognize an image line by line, with line bounding boxes.
+
+        Args:
+            image: PIL image
+
+        Returns:
+            Recognized lines with their (left, top, width, height) box
+        """
+
+    def version(self) -> str:
+        """Backend and tesseract version (part of the OCR cache key)."""
+        return "unknown"
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+
+class PytesseractEngine(OCREngine):
+    """Runs the tesseract executable once per image (reloads the model every time)."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str = OCR_LANG):
+        super().__init__(lang)
+        self._version: Optional[str] = None
+
+    def image_to_string(self, image: Image.Image) -> str:
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+    def image_to_lines(self, image: Image.Image) -> List[OCRLine]:
+        data = pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+        lines: Dict[Tuple[int, int, int], list] = {}
+        for i, word in enumerate(data["text"]):
+            if not str(word).strip():
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            x0, y0 = data["left"][i], data["top"][i]
+            x1, y1 = x0 + data["width"][i], y0 + data["height"][i]
+            line = lines.get(key)
+            if line is None:
+                lines[key] = [[str(word)], x0, y0, x1, y1]
+            else:
+                line[0].append(str(word))
+                line[1:] = [min(line[1], x0), min(line[2], y0), max(line[3], x1), max(line[4], y1)]
+        return [(" ".join(words), (x0, y0, x1 - x0, y1 - y0)) for words, x0, y0, x1, y1 in lines.values()]
+
+    def version(self) -> str:
+        if self._version is None:
+            try:
+                self._version = str(pytesseract.get_tesseract_version())
+            except Exception:
+                self._version = "unknown"
+        return self._version
+
+
+class TesserocrEngine(OCREngine):
+    """Keeps a libtesseract instance with the language model loaded (tesserocr)."""
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = OCR_LANG):
+        super().__init__(lang)
+        import tesserocr  # Optional dependency, see get_ocr_engine()
+
+        self._tesserocr = tesserocr
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+        self._lock = threading.Lock()  # One API instance, Streamlit sessions run in threads
+
+    def image_to_string(self, image: Image.Image) -> str:
+        with self._lock:
+            self._api.SetImage(image)
+            text = self._api.GetUTF8Text()
+            self._api.Clear()
+        return text
+
+    def image_to_lines(self, image: Image.Image) -> List[OCRLine]:
+        level = self._tesserocr.RIL.TEXTLINE
+        lines = []
+        with self._lock:
+            self._api.SetImage(image)
+            self._api.Recognize()
+            for item in self._tesserocr.iterate_level(self._api.GetIterator(), level):
+                text, box = item.GetUTF8Text(level), item.BoundingBox(level)
+                if text and text.strip() and box:
+                    x0, y0, x1, y1 = box
+                    lines.append((text.strip(), (x0, y0, x1 - x0, y1 - y0)))
+            self._api.Clear()
+        return lines
+
+    def version(self) -> str:
+        return self._tesserocr.tesseract_version().splitlines()[0].strip()
+
+    def close(self) -> None:
+        with self._lock:
+            self._api.End()
+
+
+_engine: Optional[OCREngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_ocr_engine() -> OCREngine:
+    """
+    Get the process-wide OCR engine selected by OCR_ENGINE.
+
+    "auto" uses tesserocr when it is installed and can load the language
+    model, and falls back to pytesseract otherwise. Each process (batch OCR
+    worker) creates its own engine.
+
+    Returns:
+        OCREngine instance
+    """
+    global _engine
+    if _engine is not None:
+        return _engine
+
+    with _engine_lock:
+        if _engine is None:
+            engine: Optional[OCREngine] = None
+            if OCR_ENGINE in ("auto", "tesserocr"):
+                try:
+                    engine = TesserocrEngine()
+                except Exception as e:  # Not installed, or traineddata not found
+                    log = logger.warning if OCR_ENGINE == "tesserocr" else logger.debug
+                    log(f"[OCR] tesserocr unavailable, using pytesseract: {e}")
+            _engine = engine or PytesseractEngine()
+            logger.info(f"[OCR] Engine: {_engine.name} ({_engine.version()})")
+    return _engine
+
+
+def _reset_engine_after_fork() -> None:
+    """A forked worker must not share the parent's libtesseract instance."""
+    global _engine, _engine_lock
+    _engine = None
+    _engine_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
+_roi_stats = {
+    "roi_runs": 0, "roi_seconds": 0.0, "roi_pixels": 0, "roi_ocr_pixels": 0,
+    "roi_fallbacks": 0, "roi_fallback_seconds": 0.0,
+    "full_runs": 0, "full_seconds": 0.0, "full_pixels": 0,
+}
+_roi_stats_lock = threading.Lock()
+
+
+def _record_ocr_run(kind: str, seconds: float, pixels: int, ocr_pixels: int = 0) -> None:
+    with _roi_stats_lock:
+        if kind == "roi_fallback":
+            _roi_stats["roi_fallbacks"] += 1
+            _roi_stats["roi_fallback_seconds"] += seconds
+            return
+        _roi_stats[f"{kind}_runs"] += 1
+        _roi_stats[f"{kind}_seconds"] += seconds
+        _roi_stats[f"{kind}_pixels"] += pixels
+        if kind == "roi":
+            _roi_stats["roi_ocr_pixels"] += ocr_pixels
+
+
+def get_roi_stats() -> Dict[str, float]:
+    """
+    Get region-of-interest OCR metrics for this process.
+
+    The time saved is estimated from the full OCR throughput measured on the
+    same process (seconds per pixel of full runs, ROI fallbacks included),
+    minus the layout passes wasted on fallbacks.
+
+    Returns:
+        Dictionary with run counts, seconds, share of pixels read at full
+        resolution and estimated_saved_seconds (None until a full OCR ran)
+    """
+    with _roi_stats_lock:
+        stats = dict(_roi_stats)
+
+    stats["roi_pixel_share"] = stats["roi_ocr_pixels"] / stats["roi_pixels"] if stats["roi_pixels"] else None
+    stats["estimated_saved_seconds"] = None
+    if stats["full_pixels"]:
+        seconds_per_pixel = stats["full_seconds"] / stats["full_pixels"]
+        stats["estimated_saved_seconds"] = (
+            stats["roi_pixels"] * seconds_per_pixel - stats["roi_seconds"] - stats["roi_fallback_seconds"]
+        )
+    return stats
+
+
+def _roi_ocr(processed: np.ndarray, engine: OCREngine, timings: Dict[str, float]) -> Optional[str]:
+    """
+    Two-pass OCR: locate keyword lines on a small copy, then read only them.
+
+    1. Layout pass on the image downscaled to OCR_ROI_LAYOUT_MAX_SIDE
+    2. Lines accepted by is_keyword_line (amount labels, payments, HT/TVA,
+       dates) plus OCR_ROI_CONTEXT_LINES following lines (amounts printed
+       under their label) become full-width horizontal strips
+    3. Each merged strip is OCR'd at full resolution
+
+    Returns:
+        Text of the strips, top to bottom, or None if no keyword line was found
+    """
+    height, width = processed.shape[:2]
+    start = time.perf_counter()
+
+    scale = min(1.0, OCR_ROI_LAYOUT_MAX_SIDE / max(height, width))
+    layout = processed
+    if scale < 1.0:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        layout = cv2.resize(processed, size, interpolation=cv2.INTER_AREA)
+    lines = sorted(engine.image_to_lines(Image.fromarray(layout)), key=lambda line: line[1][1])
+    timings["layout"] = time.perf_counter() - start
+
+    hits = [i for i, (text, _) in enumerate(lines) if is_keyword_line(text)]
+    if not hits:
+        return None
+
+    strips: List[List[int]] = []
+    for i in hits:
+        boxes = [box for _, box in lines[i:i + OCR_ROI_CONTEXT_LINES + 1]]
+        top = min(box[1] for box in boxes)
+        bottom = max(box[1] + box[3] for box in boxes)
+        pad = max(box[3] for box in boxes) / 2
+        y0 = max(0, int((top - pad) / scale))
+        y1 = min(height, int((bottom + pad) / scale) + 1)
+        if strips and y0 <= strips[-1][1]:
+            strips[-1][1] = max(strips[-1][1], y1)
+        else:
+            strips.append([y0, y1])
+
+    start = time.perf_counter()
+    texts = []
+    for y0, y1 in strips:
+        text = engine.image_to_string(Image.fromarray(processed[y0:y1])).replace("\x0c", "").strip()
+        if text:
+            texts.append(text)
+    timings["roi_ocr"] = time.perf_counter() - start
+
+    _record_ocr_run(
+        "roi", timings["layout"] + timings["roi_ocr"], height * width,
+        sum(y1 - y0 for y0, y1 in strips) * width
+    )
+    return "\n".join(texts)
+
+
+def full_ocr(
+    image_path: str,
+    show_ticket: bool = False,
+    profile: Optional[str] = None,
+    roi: Optional[bool] = None
+) -> str:
     """
     Perform full OCR on an image file with preprocessing.
 
     This function:
-    1. Reads the image file robustly
-    2. Applies preprocessing (grayscale, blur, threshold)
-    3. Performs multi-language OCR (French + English)
+    1. Reads the image file robustly (a cached result for the same bytes
+       and settings is returned without running tesseract)
+    2. Applies the preprocessing profile (downscale, threshold... see
+       OCR_PREPROCESSING_PROFILES), logging the time spent per stage
+    3. Performs multi-language OCR (French + English) with the engine
+       selected by OCR_ENGINE (see get_ocr_engine), either on the whole
+       image or, in ROI mode, only on the keyword lines (see _roi_ocr)
     4. Returns extracted text
 
     Args:
         image_path: Path to the image file
         show_ticket: If True, display the ticket in Streamlit (requires streamlit context)
+        profile: Preprocessing profile name (defaults to OCR_PREPROCESSING_PROFILE)
+        roi: Two-pass region-of-interest OCR (defaults to OCR_ROI_ENABLED);
+            falls back to full OCR when no keyword line is found
 
     Returns:
         Extracted text from the image, or empty string if OCR fails
@@ -37,31 +328,63 @@ def full_ocr(image_path: str, show_ticket: bool = False) -> str:
     """
     try:
         # --- Robust image file reading ---
-        image_data = np.fromfile(image_path, dtype=np.uint8)
-        image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)
+        with open(image_path, "rb") as f:
+            raw = f.read()
 
-        if image is None:
-            raise FileNotFoundError(f"Unable to read or decode image: {image_path}")
+        # --- Cached result for the same bytes and settings ---
+        roi = OCR_ROI_ENABLED if roi is None else roi
+        cache = get_ocr_cache()
+        cache_key = None
+        text = None
+        if cache is not None:
+            engine = get_ocr_engine()
+            cache_key = make_cache_key(
+                raw, f"image|{profile_signature(profile)}|{'roi' if roi else 'full'}|"
+                     f"{OCR_LANG}|{engine.name}:{engine.version()}"
+            )
+            text = cache.get(cache_key)
 
-        # --- Preprocessing for OCR ---
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (3, 3), 0)
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        pil_img = Image.fromarray(thresh)
+        image = None
+        if text is None:
+            image = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
 
-        # --- MULTI-LANGUAGE OCR (French + English) ---
-        # Uses fra+eng to better recognize TOTAL, PAYMENT, AMOUNT, etc.
-        text = pytesseract.image_to_string(pil_img, lang="fra+eng")
-        text = text.replace("\x0c", "").strip()
+            if image is None:
+                raise FileNotFoundError(f"Unable to read or decode image: {image_path}")
 
-        # Log detected languages for statistics
-        if text:
-            log_pattern_occurrence("ocr_success_fra+eng")
+            # --- Preprocessing for OCR ---
+            processed, timings = preprocess_image(image, profile)
+            pil_img = Image.fromarray(processed)
+
+            # --- MULTI-LANGUAGE OCR (French + English) ---
+            # Uses fra+eng to better recognize TOTAL, PAYMENT, AMOUNT, etc.
+            engine = get_ocr_engine()
+            text = _roi_ocr(processed, engine, timings) if roi else None
+            if roi:
+                log_pattern_occurrence("ocr_roi_hit" if text is not None else "ocr_roi_fallback")
+
+            if text is None:
+                start = time.perf_counter()
+                text = engine.image_to_string(pil_img)
+                text = text.replace("\x0c", "").strip()
+                timings["tesseract"] = time.perf_counter() - start
+                _record_ocr_run("full", timings["tesseract"], processed.shape[0] * processed.shape[1])
+                if roi:
+                    _record_ocr_run("roi_fallback", timings["layout"], 0)
+            logger.debug(f"[OCR] {os.path.basename(image_path)}: {format_timings(timings)}")
+
+            # Log detected languages for statistics
+            if text:
+                log_pattern_occurrence("ocr_success_fra+eng")
+
+            if cache is not None:
+                cache.put(cache_key, text)
 
         # --- Optional: Display in Streamlit ---
         if show_ticket:
             try:
                 import streamlit as st
+                if image is None:
+                    image = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
                 with st.expander(f"🧾 Receipt preview: {os.path.basename(image_path)}", expanded=False):
                     st.image(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), caption=os.path.basename(image_path))
                     if text:
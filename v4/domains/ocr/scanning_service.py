@@ -6,12 +6,14 @@ Separated from UI concerns for better testability and maintainability.
 """
 
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from datetime import datetime
 
-from config import TO_SCAN_DIR
+from config import TO_SCAN_DIR, OCR_MAX_WORKERS, OCR_MAX_IN_FLIGHT
 from domains.ocr import full_ocr, parse_ticket_metadata_v2
 from domains.ocr.parsers_OLD_BACKUP import extract_text_from_pdf
+from domains.ocr.scanner import get_ocr_engine
 from shared.utils import safe_convert, safe_date_convert
 from shared.logging_config import get_logger
 from shared.exceptions import OCRError
@@ -142,6 +144,108 @@ def process_single_ticket(file_path: str) -> TicketData:
         return TicketData(filename=filename, path=file_path, ocr_text=ocr_text)
 
 
+# ==============================
+# BATCH PROCESSING
+# ==============================
+
+BatchResult = Tuple[int, str, Optional[TicketData], Optional[Exception]]
+
+
+def _init_ocr_worker() -> None:
+    """Pool initializer: one tesseract thread per worker, the pool provides the parallelism.
+
+    The OCR engine is created up front so each worker loads the language
+    model once, before its first ticket.
+    """
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    get_ocr_engine()
+
+
+def _process_ticket_job(file_path: str) -> TicketData:
+    """Worker entry point (module-level so the pool can pickle it)."""
+    return process_single_ticket(file_path)
+
+
+def process_tickets_batch(
+    file_paths: List[str],
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None
+) -> Iterator[BatchResult]:
+    """
+    Process ticket files in parallel (preprocessing + OCR + parsing).
+
+    Files are fanned out to a process pool and results are yielded as soon as
+    each one completes. At most ``max_in_flight`` files are submitted at a
+    time, which bounds the images decoded in memory. A failing file is
+    reported with its error instead of aborting the batch.
+
+    Args:
+        file_paths: Ticket files (see scan_ticket_files)
+        max_workers: Worker processes (default: OCR_MAX_WORKERS, 1 = in-process)
+        max_in_flight: Files submitted at once (default: OCR_MAX_IN_FLIGHT)
+        progress_callback: Called with (done, total, filename) after each file
+
+    Yields:
+        Tuples (index, file_path, ticket, error) in completion order;
+        ``index`` is the position in ``file_paths``, one of ticket/error is None
+
+    Example:
+        >>> results = sorted(process_tickets_batch(files), key=lambda r: r[0])
+        >>> tickets = [ticket for _, _, ticket, error in results if error is None]
+    """
+    total = len(file_paths)
+    if total == 0:
+        return
+
+    workers = max(1, min(max_workers or OCR_MAX_WORKERS, total))
+    limit = max(workers, max_in_flight or OCR_MAX_IN_FLIGHT)
+    done = 0
+
+    def _finish(index: int, path: str, ticket: Optional[TicketData], error: Optional[Exception]) -> BatchResult:
+        nonlocal done
+        done += 1
+        if error is not None:
+            logger.error(f"Batch OCR failed for {os.path.basename(path)}: {error}")
+        if progress_callback:
+            progress_callback(done, total, os.path.basename(path))
+        return index, path, ticket, error
+
+    if workers == 1:
+        for index, path in enumerate(file_paths):
+            try:
+                ticket, error = process_single_ticket(path), None
+            except Exception as e:
+                ticket, error = None, e
+            yield _finish(index, path, ticket, error)
+        return
+
+    logger.info(f"Batch OCR: {total} file(s), {workers} worker(s), {limit} in flight")
+    queue = iter(enumerate(file_paths))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker) as executor:
+        in_flight = {}
+
+        def _submit_next() -> None:
+            for index, path in queue:
+                in_flight[executor.submit(_process_ticket_job, path)] = (index, path)
+                return
+
+        for _ in range(limit):
+            _submit_next()
+
+        while in_flight:
+            completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                index, path = in_flight.pop(future)
+                _submit_next()
+                try:
+                    ticket, error = future.result(), None
+                except Exception as e:
+                    ticket, error = None, e
+                yield _finish(index, path, ticket, error)
+
+
 def validate_ticket_data(ticket: TicketData) -> Tuple[bool, List[str]]:
     """
     Validate ticket data before saving.
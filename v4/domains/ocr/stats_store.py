@@ -0,0 +1,315 @@
+"""SQLite store for OCR statistics counters.
+
+Pattern occurrences, per-document-type performance and per-pattern
+reliability used to live in JSON files that were read, modified and rewritten
+on every scan. They are now counters updated with a single UPSERT each, so a
+logged scan costs a few indexed writes whatever the history size, and
+concurrent scans (batch OCR workers) cannot lose each other's updates.
+
+Rates (success rate, reliability score...) are derived on read with the same
+formulas as before. ``export_json()`` writes the historical JSON files as
+atomic snapshots for the support archive, and existing JSON files are
+imported once when the store is created.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import OCR_STATS_DB, OCR_LOGS_DIR, LOG_PATH, OCR_PERFORMANCE_LOG, PATTERN_STATS_LOG
+from shared.database import db_connection
+
+logger = logging.getLogger(__name__)
+
+# Column incremented for each success level
+_LEVEL_COLUMNS = {"exact": "success", "partial": "partial"}
+_PATTERN_LEVEL_COLUMNS = {"exact": "success_count", "partial": "partial_count"}
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON to a temporary file, then rename it over the target."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class OCRStatsStore:
+    """UPSERT-based counters behind the OCR logging functions."""
+
+    def __init__(self, db_path: str = OCR_STATS_DB, json_dir: str = OCR_LOGS_DIR):
+        self.db_path = db_path
+        self.json_dir = json_dir
+        self._ready = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record_pattern_occurrence(self, pattern_name: str) -> None:
+        """
+        Increment the occurrence counter of a pattern.
+
+        Args:
+            pattern_name: Name of the detected pattern/keyword
+        """
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            conn.execute("""
+                INSERT INTO ocr_pattern_log (pattern, count) VALUES (?, 1)
+                ON CONFLICT(pattern) DO UPDATE SET count = count + 1
+            """, (pattern_name,))
+            conn.commit()
+
+    def record_scan(self, document_type: str, success_level: str) -> None:
+        """
+        Count a scan in the performance statistics of its document type.
+
+        Args:
+            document_type: Type of document processed
+            success_level: Success level ("exact", "partial", "failed")
+        """
+        column = _LEVEL_COLUMNS.get(success_level, "failed")
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            conn.execute(f"""
+                INSERT INTO ocr_performance_stats (document_type, total, {column}, last_updated)
+                VALUES (?, 1, 1, ?)
+                ON CONFLICT(document_type) DO UPDATE SET
+                    total = total + 1,
+                    {column} = {column} + 1,
+                    last_updated = excluded.last_updated
+            """, (document_type, datetime.now().isoformat()))
+            conn.commit()
+
+    def record_patterns(self, patterns: List[str], success_level: str) -> None:
+        """
+        Count a detection for each pattern of a scan.
+
+        Args:
+            patterns: Patterns detected in the scan
+            success_level: Success level of the scan
+        """
+        column = _PATTERN_LEVEL_COLUMNS.get(success_level, "failure_count")
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            conn.executemany(f"""
+                INSERT INTO ocr_pattern_stats (pattern, total_detections, {column}) VALUES (?, 1, 1)
+                ON CONFLICT(pattern) DO UPDATE SET
+                    total_detections = total_detections + 1,
+                    {column} = {column} + 1
+            """, [(pattern,) for pattern in patterns])
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # Reads (same shapes as the historical JSON files)
+    # ------------------------------------------------------------------
+
+    def pattern_occurrences(self) -> Dict[str, int]:
+        """
+        Get occurrence counts, as in pattern_log.json.
+
+        Returns:
+            Dictionary {pattern: count}
+        """
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            return {row[0]: row[1] for row in conn.execute("SELECT pattern, count FROM ocr_pattern_log")}
+
+    def performance_stats(self) -> Dict[str, Any]:
+        """
+        Get per-document-type statistics, as in performance_stats.json.
+
+        Returns:
+            Dictionary {document_type: {total, success, partial, failed,
+            success_rate, correction_rate}} plus "last_updated"
+        """
+        stats: Dict[str, Any] = {}
+        last_updated = None
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            rows = conn.execute("""
+                SELECT document_type, total, success, partial, failed, last_updated
+                FROM ocr_performance_stats
+            """).fetchall()
+
+        for doc_type, total, success, partial, failed, updated in rows:
+            stats[doc_type] = {
+                "total": total,
+                "success": success,
+                "partial": partial,
+                "failed": failed,
+                "success_rate": success / total * 100 if total > 0 else 0,
+                "correction_rate": failed / total * 100 if total > 0 else 0
+            }
+            if updated and (last_updated is None or updated > last_updated):
+                last_updated = updated
+
+        if last_updated:
+            stats["last_updated"] = last_updated
+        return stats
+
+    def pattern_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-pattern reliability, as in pattern_stats.json.
+
+        Returns:
+            Dictionary {pattern: {total_detections, success_count,
+            partial_count, failure_count, success_rate, reliability_score}}
+        """
+        stats = {}
+        with db_connection(self.db_path) as conn:
+            self._ensure_schema(conn)
+            rows = conn.execute("""
+                SELECT pattern, total_detections, success_count, partial_count, failure_count
+                FROM ocr_pattern_stats
+            """).fetchall()
+
+        for pattern, total, success, partial, failure in rows:
+            success_rate = (success + partial) / total * 100 if total > 0 else 0
+            stats[pattern] = {
+                "total_detections": total,
+                "success_count": success,
+                "partial_count": partial,
+                "failure_count": failure,
+                "success_rate": success_rate,
+                # Reliability score (weighted by detection count)
+                "reliability_score": success_rate * min(total / 10, 1.0)
+            }
+        return stats
+
+    def export_json(self) -> List[str]:
+        """
+        Write the statistics as the historical JSON files (atomic replace).
+
+        Returns:
+            Paths of the files written
+        """
+        snapshots = {
+            LOG_PATH: self.pattern_occurrences(),
+            OCR_PERFORMANCE_LOG: self.performance_stats(),
+            PATTERN_STATS_LOG: self.pattern_stats(),
+        }
+        written = []
+        for default_path, data in snapshots.items():
+            path = os.path.join(self.json_dir, os.path.basename(default_path))
+            _write_json_atomic(path, data)
+            written.append(path)
+        return written
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            # Serialize first-time creation across processes (batch OCR workers)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ocr_performance_stats'"
+                ).fetchone()
+                if not exists:
+                    self._create_tables(conn)
+                    self._import_json(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._ready = True
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_pattern_log (
+                pattern TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_pattern_stats (
+                pattern TEXT PRIMARY KEY,
+                total_detections INTEGER NOT NULL DEFAULT 0,
+                success_count INTEGER NOT NULL DEFAULT 0,
+                partial_count INTEGER NOT NULL DEFAULT 0,
+                failure_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_performance_stats (
+                document_type TEXT PRIMARY KEY,
+                total INTEGER NOT NULL DEFAULT 0,
+                success INTEGER NOT NULL DEFAULT 0,
+                partial INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                last_updated TEXT
+            )
+        """)
+
+    def _import_json(self, conn: sqlite3.Connection) -> None:
+        """Seed the counters from the JSON files written by older versions."""
+        occurrences = self._read_json(LOG_PATH)
+        conn.executemany(
+            "INSERT INTO ocr_pattern_log (pattern, count) VALUES (?, ?)",
+            [(k, int(v)) for k, v in occurrences.items() if isinstance(v, (int, float))]
+        )
+
+        performance = self._read_json(OCR_PERFORMANCE_LOG)
+        last_updated = performance.get("last_updated")
+        conn.executemany("""
+            INSERT INTO ocr_performance_stats (document_type, total, success, partial, failed, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (doc_type, s.get("total", 0), s.get("success", 0), s.get("partial", 0), s.get("failed", 0), last_updated)
+            for doc_type, s in performance.items() if isinstance(s, dict)
+        ])
+
+        patterns = self._read_json(PATTERN_STATS_LOG)
+        conn.executemany("""
+            INSERT INTO ocr_pattern_stats (pattern, total_detections, success_count, partial_count, failure_count)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (pattern, s.get("total_detections", 0), s.get("success_count", 0),
+             s.get("partial_count", 0), s.get("failure_count", 0))
+            for pattern, s in patterns.items() if isinstance(s, dict)
+        ])
+
+        if occurrences or performance or patterns:
+            logger.info("[OCR-STATS] Imported existing JSON statistics")
+
+    def _read_json(self, default_path: str) -> Dict[str, Any]:
+        path = os.path.join(self.json_dir, os.path.basename(default_path))
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[OCR-STATS] Ignoring unreadable {path}: {e}")
+            return {}
+
+
+_store: Optional[OCRStatsStore] = None
+
+
+def get_stats_store() -> OCRStatsStore:
+    """
+    Get the process-wide OCR statistics store.
+
+    Returns:
+        OCRStatsStore instance
+    """
+    global _store
+    if _store is None:
+        _store = OCRStatsStore()
+    return _store
@@ -13,21 +13,15 @@ import pandas as pd
 import sqlite3
 from datetime import datetime, date, timedelta
 import plotly.graph_objects as go
-from shared.ui import load_transactions
+from domains.transactions.repository import TransactionRepository
 
 
 def render_forecast_chart(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
     """Graphique de projection du solde sur 6-12 mois"""
     
-    df_trans = load_transactions()
-    
-    # Calculer solde actuel
-    if not df_trans.empty:
-        revenus_total = df_trans[df_trans["type"] == "revenu"]["montant"].sum()
-        depenses_total = df_trans[df_trans["type"] == "dépense"]["montant"].sum()
-        solde_actuel = revenus_total - depenses_total
-    else:
-        solde_actuel = 0.0
+    # Calculer solde actuel (sommes de monthly_rollup)
+    totaux = TransactionRepository.totals_by_type()
+    solde_actuel = totaux["revenu"] - totaux["dépense"]
     
     # Récupérer récurrences actives
     recurrences = cursor.execute("""
@@ -109,21 +103,16 @@ def render_detailed_metrics(conn: sqlite3.Connection, cursor: sqlite3.Cursor) ->
     """Afficher les métriques détaillées selon l'image fournie"""
     
     # Charger données
-    df_trans = load_transactions()
     df_budgets = pd.read_sql_query("SELECT * FROM budgets_categories", conn)
     
     # Calculer période actuelle
     today = date.today()
     premier_jour_mois = today.replace(day=1)
     
-    if not df_trans.empty:
-        df_mois = df_trans[pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois]
-        
-        revenus_mois = df_mois[df_mois["type"] == "revenu"]["montant"].sum()
-        depenses_mois = df_mois[df_mois["type"] == "dépense"]["montant"].sum()
-    else:
-        df_mois = pd.DataFrame()
-        revenus_mois = depenses_mois = 0.0
+    # Totaux du mois par type et catégorie, calculés par SQLite
+    df_mois = TransactionRepository.sum_by(["type", "categorie"], start_date=premier_jour_mois)
+    revenus_mois = df_mois[df_mois["type"] == "revenu"]["montant"].sum()
+    depenses_mois = df_mois[df_mois["type"] == "dépense"]["montant"].sum()
     
     # ===== SECTION 1: VOS REVENUS =====
     st.markdown("#### 💰 Vos revenus")
@@ -223,12 +212,8 @@ def render_detailed_metrics(conn: sqlite3.Connection, cursor: sqlite3.Cursor) ->
     st.markdown("#### 💼 Votre situation financière")
     
     # Calculer solde total
-    if not df_trans.empty:
-        rev_total = df_trans[df_trans["type"] == "revenu"]["montant"].sum()
-        dep_total = df_trans[df_trans["type"] == "dépense"]["montant"].sum()
-        solde_final = rev_total - dep_total
-    else:
-        solde_final = 0.0
+    totaux = TransactionRepository.totals_by_type()
+    solde_final = totaux["revenu"] - totaux["dépense"]
     
     # Déficit prévu (différence revenus - budgets)
     if not df_budgets.empty:
@@ -268,17 +253,17 @@ def render_detailed_metrics(conn: sqlite3.Connection, cursor: sqlite3.Cursor) ->
 def render_strategy(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
     """Stratégie de rattrapage en cas d'écarts"""
     
-    df_trans = load_transactions()
     df_budgets = pd.read_sql_query("SELECT * FROM budgets_categories", conn)
     
     today = date.today()
     premier_jour_mois = today.replace(day=1)
     
-    if df_trans.empty or df_budgets.empty:
+    premiere_date, _ = TransactionRepository.get_date_bounds()
+    if premiere_date is None or df_budgets.empty:
         st.info("Données insuffisantes pour générer une stratégie")
         return
     
-    df_mois = df_trans[pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois]
+    df_mois = TransactionRepository.sum_by(["type", "categorie"], start_date=premier_jour_mois)
     
     # Détecter budgets dépassés
     budgets_depasses = []
@@ -310,9 +295,9 @@ def render_strategy(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
 def render_advice(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
     """Conseils personnalisés basés sur l'analyse"""
     
-    df_trans = load_transactions()
+    premiere_date, _ = TransactionRepository.get_date_bounds()
     
-    if df_trans.empty:
+    if premiere_date is None:
         st.info("Pas encore assez de données pour générer des conseils")
         return
     
@@ -320,12 +305,11 @@ def render_advice(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
     premier_jour_mois = today.replace(day=1)
     premier_jour_mois_dernier = (premier_jour_mois - timedelta(days=1)).replace(day=1)
     
-    # Comparer avec mois précédent
-    df_mois_actuel = df_trans[pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois]
-    df_mois_dernier = df_trans[
-        (pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois_dernier) &
-        (pd.to_datetime(df_trans["date"]).dt.date < premier_jour_mois)
-    ]
+    # Comparer avec mois précédent (totaux par type et catégorie)
+    df_mois_actuel = TransactionRepository.sum_by(["type", "categorie"], start_date=premier_jour_mois)
+    df_mois_dernier = TransactionRepository.sum_by(
+        ["type", "categorie"], start_date=premier_jour_mois_dernier, end_date=premier_jour_mois - timedelta(days=1)
+    )
     
     if not df_mois_actuel.empty and not df_mois_dernier.empty:
         dep_actuel = df_mois_actuel[df_mois_actuel["type"] == "dépense"]["montant"].sum()
@@ -14,7 +14,7 @@ import logging
 from datetime import date
 from dateutil.relativedelta import relativedelta
 from config import DB_PATH
-from shared.ui import load_transactions
+from domains.transactions.repository import TransactionRepository
 
 logger = logging.getLogger(__name__)
 
@@ -113,12 +113,8 @@ def analyze_exceptional_expenses(period_start_date: date | None = None) -> dict:
     Returns:
         Dictionary with budget metrics
     """
-    df_transactions = load_transactions()
-
-    # Filtrer par période si fournie
-    if period_start_date is not None:
-        df_transactions["date"] = pd.to_datetime(df_transactions["date"])
-        df_transactions = df_transactions[df_transactions["date"].dt.date >= period_start_date]
+    # Totaux par type et catégorie sur la période, calculés par SQLite
+    df_transactions = TransactionRepository.sum_by(["type", "categorie"], start_date=period_start_date)
 
     conn = sqlite3.connect(DB_PATH)
     df_budgets = pd.read_sql_query("SELECT categorie, budget_mensuel FROM budgets_categories", conn)
@@ -139,7 +135,7 @@ def analyze_exceptional_expenses(period_start_date: date | None = None) -> dict:
     # Calculer le nombre de mois dans la période
     if period_start_date is None:
         # "Depuis le début" - calculer depuis la première transaction
-        first_transaction_date = pd.to_datetime(df_transactions["date"]).min().date()
+        first_transaction_date, _ = TransactionRepository.get_date_bounds()
         nb_mois = calculate_months_in_period(first_transaction_date)
         if nb_mois is None:
             nb_mois = 1
@@ -262,32 +262,8 @@ def render_recurrences_form(conn: sqlite3.Connection, cursor: sqlite3.Cursor) ->
                     conn.commit()
                     
                     # Générer les occurrences passées SEULEMENT (pas futures)
-                    from shared.services.recurrence_generation import generate_occurrences_for_recurrence
-                    
-                    today = date.today()
-                    start_gen = date_debut
-                    end_gen = today  # IMPORTANT : Seulement jusqu'à aujourd'hui
-                    
-                    occurrences = generate_occurrences_for_recurrence(recurrence_id, start_gen, end_gen)
-                    
-                    # Insérer les transactions
-                    nb_created = 0
-                    for occ in occurrences:
-                        cursor.execute("""
-                            INSERT INTO transactions
-                            (type, categorie, sous_categorie, montant, date, source, description)
-                            VALUES (?, ?, ?, ?, ?, 'récurrente_auto', ?)
-                        """, (
-                            occ['type'],
-                            occ['categorie'],
-                            occ.get('sous_categorie', ''),
-                            occ['montant'],
-                            occ['date'],
-                            occ.get('description', '')
-                        ))
-                        nb_created += 1
-                    
-                    conn.commit()
+                    from shared.services.recurrence_generation import backfill_all_recurrences
+                    nb_created = backfill_all_recurrences([recurrence_id])
                     
                     toast_success(f"Récurrence '{categorie_rec}' ajoutée - {nb_created} occurrence(s) passée(s) générée(s)")
                     refresh_and_rerun()
@@ -12,7 +12,7 @@ import pandas as pd
 import sqlite3
 from datetime import datetime, date
 import plotly.graph_objects as go
-from shared.ui import load_transactions
+from domains.transactions.repository import TransactionRepository
 
 
 def render_upcoming_deadlines(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
@@ -45,31 +45,23 @@ def render_budget_overview_chart(conn: sqlite3.Connection, cursor: sqlite3.Curso
     """Graphique Budget vs Dépenses du mois"""
     
     df_budgets = pd.read_sql_query("SELECT * FROM budgets_categories", conn)
-    df_trans = load_transactions()
     
     if df_budgets.empty:
         st.info("Définissez des budgets pour voir le graphique")
         return
     
-    # Calculer dépenses du mois
+    # Calculer dépenses du mois (sommes par catégorie faites par SQLite)
     today = datetime.now()
     premier_jour_mois = today.replace(day=1).date()
     
-    if not df_trans.empty:
-        df_mois = df_trans[pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois]
-    else:
-        df_mois = pd.DataFrame()
+    depenses_mois = TransactionRepository.sum_by(
+        ["categorie"], transaction_type="dépense", start_date=premier_jour_mois
+    ).set_index("categorie")["montant"]
     
     # Préparer données
     data = []
     for _, budget in df_budgets.iterrows():
-        if not df_mois.empty:
-            depenses = df_mois[
-                (df_mois["type"] == "dépense") &
-                (df_mois["categorie"] == budget["categorie"])
-            ]["montant"].sum()
-        else:
-            depenses = 0.0
+        depenses = float(depenses_mois.get(budget["categorie"], 0.0))
         
         data.append({
             "Catégorie": budget["categorie"],
@@ -127,15 +119,9 @@ def render_objectives_progress(conn: sqlite3.Connection, cursor: sqlite3.Cursor)
         st.info("Aucun objectif défini")
         return
     
-    df_trans = load_transactions()
-    
-    # Calculer solde actuel
-    if not df_trans.empty:
-        revenus = df_trans[df_trans["type"] == "revenu"]["montant"].sum()
-        depenses = df_trans[df_trans["type"] == "dépense"]["montant"].sum()
-        solde = revenus - depenses
-    else:
-        solde = 0.0
+    # Calculer solde actuel (sommes de monthly_rollup)
+    totaux = TransactionRepository.totals_by_type()
+    solde = totaux["revenu"] - totaux["dépense"]
     
     for obj in objectifs:
         type_obj, titre, cible = obj[1], obj[2], obj[3]
@@ -5,22 +5,17 @@ Clean Streamlit interface for revenue processing.
 Business logic in revenues_service, DB in revenues_db.
 """
 
+import os
 import streamlit as st
 import logging
 from typing import List
 
 from domains.revenues.revenues_service import (
     scan_revenue_files,
-    process_single_revenue,
-    validate_revenue_data,
-    prepare_revenue_for_db,
+    process_revenues_batch,
+    save_revenues_batch,
     RevenueData
 )
-from domains.revenues.revenues_db import (
-    save_revenue_to_database,
-    move_revenue_file,
-    log_revenue_scan
-)
 from domains.revenues import is_uber_transaction
 from shared.ui import toast_success, toast_warning, toast_error
 from shared.utils import safe_convert
@@ -108,13 +103,24 @@ def interface_process_all_revenues_in_folder():
             toast_warning("Aucun PDF trouvé")
             return
         
-        revenues = []
-        with st.spinner(f"📄 Traitement de {len(files)} PDF..."):
-            for f in files:
-                rev = process_single_revenue(f)
-                if rev:
-                    revenues.append(rev)
+        progress = st.progress(0.0, text=f"📄 Traitement de {len(files)} PDF...")
+        status = st.empty()
+        parsed = [None] * len(files)
+        for index, path, rev, error in process_revenues_batch(
+            files,
+            progress_callback=lambda done, total, name: progress.progress(
+                done / total, text=f"📄 {done}/{total} - {name}"
+            )
+        ):
+            if error is not None:
+                toast_error(f"Erreur: {os.path.basename(path)}")
+            elif rev:
+                parsed[index] = rev
+                status.caption(f"✔️ {rev.filename} : {rev.montant:.2f}€")
+        progress.empty()
+        status.empty()
         
+        revenues = [rev for rev in parsed if rev]
         st.session_state["revenus_data"] = revenues
         toast_success(f"✅ {len(revenues)} revenu(s) scanné(s)")
     
@@ -147,30 +153,20 @@ def interface_process_all_revenues_in_folder():
         
         # Confirm button
         if st.button("✅ Confirmer et enregistrer", type="primary"):
-            success_count = 0
+            progress = st.progress(0.0, text="💾 Enregistrement...")
+            results = save_revenues_batch(
+                updated_revenues,
+                apply_uber_tax,
+                progress_callback=lambda done, total: progress.progress(done / total, text="💾 Enregistrement...")
+            )
+            progress.empty()
             
-            for rev in updated_revenues:
-                is_valid, errors = validate_revenue_data(rev)
-                if not is_valid:
-                    for err in errors:
-                        toast_error(f"{rev.filename}: {err}")
-                    continue
-                
-                try:
-                    data = prepare_revenue_for_db(rev, apply_uber_tax)
-                    tx_id = save_revenue_to_database(data)
-                    move_revenue_file(rev.path, rev.categorie, rev.sous_categorie, tx_id)
-                    log_revenue_scan(
-                        rev.filename,
-                        rev.montant_initial,
-                        rev.montant,
-                        rev.categorie,
-                        rev.sous_categorie
-                    )
+            success_count = 0
+            for rev, tx_id, errors in results:
+                for err in errors:
+                    toast_error(f"{rev.filename}: {err}")
+                if tx_id is not None and not errors:
                     success_count += 1
-                except Exception as e:
-                    logger.error(f"Save failed for {rev.filename}: {e}")
-                    toast_error(f"Erreur: {rev.filename}")
             
             toast_success(f"✅ {success_count} revenu(s) enregistré(s)")
             st.session_state.pop("revenus_data")
@@ -6,23 +6,34 @@ Handles persistence for revenue processing.
 
 import os
 import shutil
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Callable
 
 from config import REVENUS_TRAITES
-from shared.database import get_db_connection
+from shared.database import get_db_connection, db_connection
 from domains.transactions.service import normalize_category, normalize_subcategory
 from domains.ocr.logging import log_ocr_scan, determine_success_level
 from shared.logging_config import get_logger
 from shared.exceptions import DatabaseError
+from shared.services.file_index import get_file_index
 
 logger = get_logger(__name__)
 
 
-def save_revenue_to_database(transaction_data: Dict[str, Any]) -> int:
-    """Save revenue transaction to database."""
+def save_revenue_to_database(
+    transaction_data: Dict[str, Any],
+    commit: bool = True,
+    db_path: Optional[str] = None
+) -> int:
+    """Save revenue transaction to database.
+
+    With ``commit=False`` the insert joins the transaction of the connection
+    the caller holds on this thread (see save_revenues_to_database), and a
+    failed insert is left for the caller to handle instead of rolling back
+    the whole transaction.
+    """
     logger.info(f"Saving revenue: {transaction_data.get('categorie', 'N/A')}/{transaction_data.get('sous_categorie', 'N/A')} - {transaction_data.get('montant', 0)}€")
     
-    conn = get_db_connection()
+    conn = get_db_connection(db_path=db_path)
     cursor = conn.cursor()
     
     try:
@@ -40,19 +51,65 @@ def save_revenue_to_database(transaction_data: Dict[str, Any]) -> int:
         ))
         
         transaction_id = cursor.lastrowid
-        conn.commit()
+        if commit:
+            conn.commit()
         
         logger.info(f"Saved revenue ID {transaction_id}: {transaction_data['montant']}€")
         return transaction_id
         
     except Exception as e:
         logger.error(f"Database save failed: {e}", exc_info=True)
-        conn.rollback()
+        if commit:
+            conn.rollback()
         raise DatabaseError(f"Failed to save revenue: {e}") from e
     finally:
         conn.close()
 
 
+def save_revenues_to_database(
+    transactions: List[Dict[str, Any]],
+    bulk: bool = True,
+    db_path: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> List[Tuple[Optional[int], Optional[Exception]]]:
+    """
+    Save several revenues from a single writer (the calling thread).
+
+    Args:
+        transactions: Prepared transactions (see prepare_revenue_for_db)
+        bulk: One commit for the whole batch instead of one per revenue
+        db_path: Optional custom database path (for testing)
+        progress_callback: Called with (done, total) after each insert
+
+    Returns:
+        One (transaction_id, error) per transaction, in order; one of them is None
+
+    Raises:
+        DatabaseError: If the bulk commit fails (nothing is saved)
+    """
+    results: List[Tuple[Optional[int], Optional[Exception]]] = []
+    total = len(transactions)
+    with db_connection(db_path) as conn:
+        for done, data in enumerate(transactions, start=1):
+            try:
+                results.append((save_revenue_to_database(data, commit=not bulk, db_path=db_path), None))
+            except DatabaseError as e:
+                results.append((None, e))
+            if progress_callback:
+                progress_callback(done, total)
+
+        if bulk:
+            try:
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise DatabaseError(f"Failed to save revenues: {e}") from e
+
+    logger.info(f"Saved {sum(1 for tx_id, _ in results if tx_id is not None)}/{total} revenue(s)"
+                + (" in one transaction" if bulk else ""))
+    return results
+
+
 def move_revenue_file(
     file_path: str,
     categorie: str,
@@ -68,6 +125,7 @@ def move_revenue_file(
     target_path = os.path.join(target_dir, new_filename)
     
     shutil.move(file_path, target_path)
+    get_file_index().add(target_path)
     logger.info(f"Moved revenue to {target_path}")
     return target_path
 
@@ -7,13 +7,15 @@ Separated from UI for testability.
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from datetime import datetime
 
-from config import REVENUS_A_TRAITER
+from config import REVENUS_A_TRAITER, OCR_MAX_WORKERS
 from domains.ocr import parse_uber_pdf, parse_fiche_paie
 from shared.utils import safe_convert, safe_date_convert, numero_to_mois
 from domains.revenues import is_uber_transaction, process_uber_revenue
+from domains.revenues.revenues_db import save_revenues_to_database, move_revenue_file, log_revenue_scan
 
 logger = logging.getLogger(__name__)
 
@@ -143,3 +145,141 @@ def prepare_revenue_for_db(revenue: RevenueData, apply_uber_tax: bool = False) -
         transaction_data, _ = process_uber_revenue(transaction_data, apply_tax=apply_uber_tax)
     
     return transaction_data
+
+
+# ==============================
+# BATCH PROCESSING
+# ==============================
+
+RevenueBatchResult = Tuple[int, str, Optional[RevenueData], Optional[Exception]]
+RevenueSaveResult = Tuple[RevenueData, Optional[int], List[str]]
+
+
+def process_revenues_batch(
+    file_paths: List[str],
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None
+) -> Iterator[RevenueBatchResult]:
+    """
+    Parse revenue PDFs in parallel.
+
+    pdfminer is pure Python, so files are fanned out to a process pool and
+    results are yielded as soon as each one completes: the page can show
+    them while the rest of the folder is parsed. Nothing is written to the
+    database here (see save_revenues_batch).
+
+    Args:
+        file_paths: Revenue PDFs (see scan_revenue_files)
+        max_workers: Worker processes (default: OCR_MAX_WORKERS, 1 = in-process)
+        progress_callback: Called with (done, total, filename) after each file
+
+    Yields:
+        Tuples (index, file_path, revenue, error) in completion order;
+        ``index`` is the position in ``file_paths``, one of revenue/error is None
+    """
+    total = len(file_paths)
+    if total == 0:
+        return
+
+    workers = max(1, min(max_workers or OCR_MAX_WORKERS, total))
+    done = 0
+
+    def _finish(index: int, path: str, revenue: Optional[RevenueData], error: Optional[Exception]) -> RevenueBatchResult:
+        nonlocal done
+        done += 1
+        if error is not None:
+            logger.error(f"Batch revenue parsing failed for {os.path.basename(path)}: {error}")
+        if progress_callback:
+            progress_callback(done, total, os.path.basename(path))
+        return index, path, revenue, error
+
+    if workers == 1:
+        for index, path in enumerate(file_paths):
+            try:
+                revenue, error = process_single_revenue(path), None
+            except Exception as e:
+                revenue, error = None, e
+            yield _finish(index, path, revenue, error)
+        return
+
+    logger.info(f"Batch revenues: {total} file(s), {workers} worker(s)")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_single_revenue, path): (index, path)
+                   for index, path in enumerate(file_paths)}
+        for future in as_completed(futures):
+            index, path = futures[future]
+            try:
+                revenue, error = future.result(), None
+            except Exception as e:
+                revenue, error = None, e
+            yield _finish(index, path, revenue, error)
+
+
+def save_revenues_batch(
+    revenues: List[RevenueData],
+    apply_uber_tax: bool = False,
+    bulk: bool = True,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    db_path: Optional[str] = None
+) -> List[RevenueSaveResult]:
+    """
+    Validate, save, file and log confirmed revenues.
+
+    Inserts go through save_revenue_to_database on the calling thread (single
+    writer). In bulk mode they share one commit, and files are only moved to
+    REVENUS_TRAITES once that commit succeeded.
+
+    Args:
+        revenues: Revenues confirmed by the user
+        apply_uber_tax: Apply the Uber tax (see prepare_revenue_for_db)
+        bulk: One commit for the whole batch instead of one per revenue
+        progress_callback: Called with (done, total) after each insert
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        One (revenue, transaction_id, errors) per revenue, in order;
+        transaction_id is None when the revenue was not saved
+    """
+    results: List[RevenueSaveResult] = []
+    to_save: List[Tuple[int, Dict[str, Any]]] = []
+    for revenue in revenues:
+        # One failing revenue (e.g. in process_uber_revenue) must not stop the others
+        try:
+            is_valid, errors = validate_revenue_data(revenue)
+            data = prepare_revenue_for_db(revenue, apply_uber_tax) if is_valid else None
+        except Exception as e:
+            logger.error(f"Revenue preparation failed for {revenue.filename}: {e}")
+            is_valid, errors, data = False, [str(e)], None
+        results.append((revenue, None, errors))
+        if is_valid:
+            to_save.append((len(results) - 1, data))
+
+    try:
+        saved = save_revenues_to_database(
+            [data for _, data in to_save], bulk=bulk, db_path=db_path, progress_callback=progress_callback
+        )
+    except Exception as e:
+        logger.error(f"Revenue batch save failed: {e}")
+        saved = [(None, e)] * len(to_save)
+
+    for (position, _), (tx_id, error) in zip(to_save, saved):
+        revenue = results[position][0]
+        if error is not None:
+            results[position] = (revenue, None, [str(error)])
+            continue
+        errors = []
+        try:
+            move_revenue_file(revenue.path, revenue.categorie, revenue.sous_categorie, tx_id)
+            log_revenue_scan(
+                revenue.filename,
+                revenue.montant_initial,
+                revenue.montant,
+                revenue.categorie,
+                revenue.sous_categorie
+            )
+        except Exception as e:
+            logger.error(f"Post-save step failed for {revenue.filename}: {e}")
+            errors.append(str(e))
+        results[position] = (revenue, tx_id, errors)
+
+    return results
@@ -10,53 +10,96 @@ Transaction Export Service
 Handles exporting transactions to CSV format.
 """
 
+import os
+import sqlite3
 import pandas as pd
 from typing import List, Dict, Any, Optional
 from datetime import date
 
-from config import CSV_TRANSACTIONS_SANS_TICKETS
-from domains.transactions import TransactionRepository
-from shared.services import trouver_fichiers_associes
+from config import CSV_TRANSACTIONS_SANS_TICKETS, REVENUS_TRAITES, SORTED_DIR
+from shared.database import db_connection
+from shared.services.file_index import get_file_index
 from shared.logging_config import get_logger
 from shared.exceptions import ServiceError
 
 logger = get_logger(__name__)
 
 
-def get_transactions_sans_tickets() -> List[Dict[str, Any]]:
+def get_transactions_sans_tickets(db_path: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get all transactions with source='import_csv' that have no associated tickets.
-    
+
+    Same rule as ``trouver_fichiers_associes`` (a document in the transaction's
+    categorie/sous_categorie folder), evaluated in one query against the file
+    index instead of one directory scan per transaction.
+
+    Args:
+        db_path: Database path (defaults to DB_PATH)
+
     Returns:
         List of transaction dictionaries without associated files
     """
-    # Get all transactions
-    df = TransactionRepository.get_all()
-    
-    if df.empty:
-        return []
-    
-    # Filter only transactions with source='import_csv'
-    df_import_csv = df[df['source'] == 'import_csv']
-    
-    transactions_sans_tickets = []
-    
-    for _, row in df_import_csv.iterrows():
-        transaction = row.to_dict()
-        
-        # Check if transaction has associated files
-        fichiers = trouver_fichiers_associes(transaction)
-        
-        if not fichiers:  # No files found
-            transactions_sans_tickets.append(transaction)
-    
-    return transactions_sans_tickets
+    get_file_index().refresh()
+
+    try:
+        with db_connection(db_path) as conn:
+            df = pd.read_sql_query(_SANS_TICKETS_QUERY, conn, params={
+                "sorted_dir": os.path.normpath(SORTED_DIR),
+                "revenus_dir": os.path.normpath(REVENUS_TRAITES),
+            })
+    except sqlite3.Error as e:
+        logger.error(f"Error fetching transactions without tickets: {e}")
+        raise ServiceError(f"Impossible de lister les transactions sans ticket : {e}") from e
+
+    return df.drop(columns=['cat', 'souscat']).to_dict('records')
+
+
+# Folder of a transaction as built by trouver_fichiers_associes: an empty
+# category moves the subcategory up one level; the base follows the type.
+_SANS_TICKETS_QUERY = """
+    WITH dossiers AS (
+        SELECT t.*,
+               TRIM(COALESCE(t.categorie, '')) AS cat,
+               TRIM(COALESCE(t.sous_categorie, '')) AS souscat
+        FROM transactions t
+        WHERE t.source = 'import_csv'
+    )
+    SELECT d.* FROM dossiers d
+    WHERE NOT EXISTS (
+        SELECT 1 FROM fichiers_index f
+        WHERE f.eligible = 1
+          AND f.categorie = CASE WHEN d.cat = '' THEN d.souscat ELSE d.cat END
+          AND f.sous_categorie = CASE WHEN d.cat = '' THEN '' ELSE d.souscat END
+          AND f.base IN (
+              CASE WHEN instr(d.type, 'dépense') > 0 THEN :sorted_dir
+                   WHEN instr(d.type, 'revenu') > 0 THEN :revenus_dir
+                   ELSE :sorted_dir END,
+              CASE WHEN instr(d.type, 'dépense') > 0 THEN :sorted_dir
+                   ELSE :revenus_dir END
+          )
+    )
+    ORDER BY d.date DESC
+"""
 
 
 def export_transactions_sans_tickets_to_csv() -> int:
     """
     Export transactions without tickets to a CSV file.
-    
+
+    Returns:
+        Number of transactions exported (0 if there is nothing to export)
+    """
+    transactions = get_transactions_sans_tickets()
+    if not transactions:
+        logger.info("No transaction without ticket to export")
+        return 0
+
+    df = pd.DataFrame(transactions)
+    os.makedirs(os.path.dirname(CSV_TRANSACTIONS_SANS_TICKETS), exist_ok=True)
+    export_to_csv(df, CSV_TRANSACTIONS_SANS_TICKETS)
+    return len(df)
+
+
 def export_to_csv(
     df: pd.DataFrame,
     filepath: str,
@@ -0,0 +1,456 @@
+"""
+Transaction Import Service
+
+Bulk insertion of transactions with validation and deduplication.
+
+The batch is validated and normalized column by column, checked against the
+existing rows with a single join on a temporary table, and inserted with
+chunked ``executemany`` calls in one transaction. CSV files are imported
+chunk by chunk with a resumable checkpoint.
+"""
+
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from config.database_config import IMPORT_CHUNK_SIZE, IMPORT_CSV_CHUNK_ROWS
+from domains.revenues import process_uber_revenue
+from domains.transactions.service import normalize_category
+from shared.database import db_connection
+from shared.exceptions import DatabaseError
+from shared.logging_config import get_logger
+from shared.utils import cents_sql, from_cents_series, safe_convert_series, safe_date_series, to_cents_series
+
+logger = get_logger(__name__)
+
+# Two transactions with the same key are duplicates (amounts compared in cents)
+DEDUP_KEY = ["type", "categorie", "sous_categorie", "montant_cents", "date"]
+
+# Looser match of the CSV page's "Ignorer les doublons" option
+LOOSE_DEDUP_KEY = ["date", "montant_cents", "categorie"]
+
+# Column conditions of the join on import_keys
+_KEY_CONDITIONS = {
+    "type": "t.type = k.type",
+    "categorie": "t.categorie = k.categorie",
+    "sous_categorie": "t.sous_categorie IS k.sous_categorie",
+    "montant_cents": f"{cents_sql('t.montant')} = k.montant_cents",
+    "date": "t.date = k.date",
+}
+
+COLUMNS = ["type", "categorie", "sous_categorie", "montant", "date", "description", "source", "recurrence", "date_fin"]
+
+
+@dataclass
+class ImportReport:
+    """Result of a bulk import."""
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: List[Tuple[int, List[str]]] = field(default_factory=list)
+    uber_messages: List[str] = field(default_factory=list)
+    rows_read: int = 0
+    resumed_from: int = 0
+
+    @property
+    def skipped(self) -> int:
+        """Rows not inserted (duplicates and invalid rows)."""
+        return self.duplicates + len(self.invalid)
+
+    def merge(self, other: "ImportReport", offset: int = 0) -> None:
+        """Add the counts of a chunk whose first row is at ``offset``."""
+        self.inserted += other.inserted
+        self.duplicates += other.duplicates
+        self.invalid.extend((position + offset, errors) for position, errors in other.invalid)
+        self.uber_messages.extend(other.uber_messages)
+
+
+Transactions = Union[List[Dict[str, Any]], pd.DataFrame]
+
+
+def _column(transactions: Transactions, key: str, default: Any = "") -> pd.Series:
+    """One field of the batch, indexed by position (dict.get semantics for lists)."""
+    if isinstance(transactions, pd.DataFrame):
+        if key in transactions:
+            return transactions[key].reset_index(drop=True)
+        return pd.Series([default] * len(transactions), dtype=object)
+    return pd.Series([t.get(key, default) for t in transactions])
+
+
+def _normalize_names(values: pd.Series) -> pd.Series:
+    """``normalize_category`` applied once per distinct value."""
+    values = values.astype(str).str.strip()
+    normalized = {value: normalize_category(value) for value in values.unique()}
+    # Series.map would turn the None of empty names into NaN
+    return pd.Series([normalized[value] for value in values], index=values.index, dtype=object)
+
+
+def prepare_transactions(
+    transactions: Transactions
+) -> Tuple[pd.DataFrame, List[Tuple[int, List[str]]]]:
+    """
+    Validate and normalize a batch of transaction dictionaries.
+
+    Same rules as ``validate_transaction_data`` and the cleaning done by
+    ``insert_transaction_batch`` (safe conversions, normalized names),
+    applied to whole columns.
+
+    Args:
+        transactions: Transaction dictionaries (see insert_transaction_batch),
+            or a DataFrame with the same columns
+
+    Returns:
+        Tuple of (frame of valid rows in COLUMNS order indexed by position in
+        the input, list of (position, errors) for the invalid rows)
+    """
+    if len(transactions) == 0:
+        return pd.DataFrame(columns=COLUMNS), []
+
+    types = _column(transactions, "type").astype(str)
+    categories = _column(transactions, "categorie")
+    montants = safe_convert_series(_column(transactions, "montant", 0))
+    dates = safe_date_series(_column(transactions, "date", None))
+
+    # Validation (messages of validate_transaction_data)
+    checks = [
+        (~types.str.lower().isin(["revenu", "dépense"]), "Type must be 'revenu' or 'dépense'"),
+        (categories.isna() | (categories.astype(str).str.strip() == ""), "Catégorie is required"),
+        (montants <= 0, "Montant must be positive"),
+        (dates > pd.Timestamp(datetime.now().date()), "Date cannot be in the future"),
+    ]
+    failed = pd.concat([mask.rename(message) for mask, message in checks], axis=1)
+    invalid_mask = failed.any(axis=1)
+    invalid = [
+        (int(position), [message for message, hit in row.items() if hit])
+        for position, row in failed[invalid_mask].iterrows()
+    ]
+    valid = ~invalid_mask
+
+    raw_fin = _column(transactions, "date_fin", None)
+    has_fin = raw_fin.map(lambda v: not pd.isna(v) and bool(v))
+    date_fin = pd.Series("", index=raw_fin.index, dtype=object)
+    if has_fin.any():
+        date_fin[has_fin] = safe_date_series(raw_fin[has_fin]).dt.strftime("%Y-%m-%d")
+
+    df = pd.DataFrame({
+        "type": types.str.strip().str.lower(),
+        "categorie": _normalize_names(categories.fillna("")),
+        "sous_categorie": _normalize_names(_column(transactions, "sous_categorie").fillna("")),
+        "montant": montants,
+        "date": dates.dt.strftime("%Y-%m-%d"),
+        "description": _column(transactions, "description").astype(str).str.strip(),
+        "source": _column(transactions, "source", "manuel").astype(str).str.strip(),
+        "recurrence": _column(transactions, "recurrence").astype(str).str.strip(),
+        "date_fin": date_fin,
+    })[valid].copy()
+
+    return df, invalid
+
+
+def _apply_uber_tax(df: pd.DataFrame) -> List[str]:
+    """Apply the Uber tax to revenue rows in place; returns the tax messages."""
+    revenues = df.index[df["type"] == "revenu"]
+    records = df.loc[revenues, ["categorie", "description", "montant"]].to_dict("records")
+    taxed, messages = {}, []
+    for position, record in zip(revenues, records):
+        record, message = process_uber_revenue(record)
+        if message:
+            taxed[position] = float(record["montant"])
+            messages.append(message)
+    if taxed:
+        df.loc[list(taxed), "montant"] = list(taxed.values())
+    return messages
+
+
+def _existing_positions(
+    conn: sqlite3.Connection,
+    df: pd.DataFrame,
+    chunk_size: int,
+    key: List[str] = DEDUP_KEY
+) -> List[int]:
+    """Positions of the rows whose ``key`` columns match a row of the transactions table."""
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS import_keys (
+            position INTEGER PRIMARY KEY,
+            type TEXT, categorie TEXT, sous_categorie TEXT, montant_cents INTEGER, date TEXT
+        )
+    """)
+    try:
+        conn.execute("DELETE FROM import_keys")
+        keys = list(zip(df.index.tolist(), *(df[c].tolist() for c in DEDUP_KEY)))
+        for start in range(0, len(keys), chunk_size):
+            conn.executemany(
+                "INSERT INTO import_keys VALUES (?, ?, ?, ?, ?, ?)", keys[start:start + chunk_size]
+            )
+        # Integer equality on the expression index idx_transactions_date_cents
+        return [row[0] for row in conn.execute(f"""
+            SELECT k.position FROM import_keys k
+            WHERE EXISTS (
+                SELECT 1 FROM transactions t
+                WHERE {" AND ".join(_KEY_CONDITIONS[column] for column in key)}
+            )
+        """)]
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.import_keys")
+
+
+def _write_batch(
+    conn: sqlite3.Connection,
+    transactions: Transactions,
+    deduplicate: bool,
+    chunk_size: int,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    loose_duplicates: bool = False
+) -> ImportReport:
+    """Validate, deduplicate and insert on ``conn`` without committing."""
+    report = ImportReport()
+    df, report.invalid = prepare_transactions(transactions)
+    for position, errors in report.invalid:
+        logger.warning(f"Transaction {position} validation failed: {errors}")
+    if df.empty:
+        return report
+
+    report.uber_messages = _apply_uber_tax(df)
+    # Amounts stored on the cent grid, keyed by their exact cents
+    df["montant_cents"] = to_cents_series(df["montant"])
+    df["montant"] = from_cents_series(df["montant_cents"])
+
+    if deduplicate:
+        # Same key earlier in the batch, then already in the database
+        df = df[~df.duplicated(subset=DEDUP_KEY)]
+        df = df.drop(index=_existing_positions(conn, df, chunk_size))
+        if loose_duplicates and not df.empty:
+            df = df.drop(index=_existing_positions(conn, df, chunk_size, LOOSE_DEDUP_KEY))
+    report.duplicates = len(transactions) - len(report.invalid) - len(df)
+
+    rows = list(df[COLUMNS].itertuples(index=False, name=None))
+    for start in range(0, len(rows), chunk_size):
+        conn.executemany(f"""
+            INSERT INTO transactions ({', '.join(COLUMNS)})
+            VALUES ({', '.join('?' * len(COLUMNS))})
+        """, rows[start:start + chunk_size])
+        if progress_callback:
+            progress_callback(min(start + chunk_size, len(rows)), len(rows))
+    report.inserted = len(rows)
+    return report
+
+
+def bulk_insert_transactions(
+    transactions: Transactions,
+    db_path: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    deduplicate: bool = True
+) -> ImportReport:
+    """
+    Validate, deduplicate and insert a batch of transactions.
+
+    A row is a duplicate when a transaction with the same (type, categorie,
+    sous_categorie, montant, date) exists in the database or earlier in the
+    batch. Everything is inserted in one transaction: if an insert fails,
+    nothing is written.
+
+    Args:
+        transactions: Transaction dictionaries (see insert_transaction_batch),
+            or a DataFrame with the same columns
+        db_path: Database path (defaults to DB_PATH)
+        chunk_size: Rows per executemany call
+        progress_callback: Optional callback(rows_inserted, rows_to_insert)
+            called after each chunk
+        deduplicate: Skip duplicates (default: True)
+
+    Returns:
+        ImportReport with the inserted, duplicate and invalid counts
+
+    Raises:
+        DatabaseError: If the insertion fails
+    """
+    try:
+        with db_connection(db_path) as conn:
+            report = _write_batch(conn, transactions, deduplicate, chunk_size, progress_callback)
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Bulk insert failed: {e}")
+        raise DatabaseError(f"Échec de l'import des transactions : {e}") from e
+
+    logger.info(
+        f"Bulk import: {report.inserted} inserted, {report.duplicates} duplicate(s), "
+        f"{len(report.invalid)} invalid"
+    )
+    return report
+
+
+# ==============================
+# CSV IMPORT
+# ==============================
+
+# Values used when a column of the CSV template is missing or a cell is empty
+CSV_DEFAULTS = {"type": "dépense", "categorie": "Divers", "sous_categorie": "Autre", "description": ""}
+
+CsvSource = Union[str, os.PathLike, BinaryIO]
+
+
+def csv_chunk_to_transactions(chunk: pd.DataFrame, source: str = "CSV Import") -> pd.DataFrame:
+    """
+    Map rows of the CSV template (type, date, categorie, sous_categorie,
+    montant, description) to transaction dictionaries.
+
+    Args:
+        chunk: Rows read from the CSV file
+        source: Source recorded on the transactions
+
+    Returns:
+        Transactions frame (one row per CSV row, in file order)
+    """
+    columns = {}
+    for name, default in CSV_DEFAULTS.items():
+        if name in chunk:
+            columns[name] = chunk[name].where(chunk[name].notna(), default).astype(str).str.strip()
+        else:
+            columns[name] = pd.Series(default, index=chunk.index)
+    columns["type"] = columns["type"].str.lower()
+    columns["montant"] = (
+        safe_convert_series(chunk["montant"]) if "montant" in chunk else pd.Series(0.0, index=chunk.index)
+    )
+    columns["date"] = chunk["date"] if "date" in chunk else pd.Series(None, index=chunk.index)
+    columns["source"] = pd.Series(source, index=chunk.index)
+    return pd.DataFrame(columns)
+
+
+def csv_fingerprint(source: CsvSource) -> str:
+    """SHA-256 of the CSV content, the key of its import checkpoint."""
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        position = source.tell()
+        source.seek(0)
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def get_import_checkpoint(fingerprint: str, db_path: Optional[str] = None) -> int:
+    """
+    Rows already committed by an interrupted import of a CSV file.
+
+    Args:
+        fingerprint: csv_fingerprint of the file
+        db_path: Database path (defaults to DB_PATH)
+
+    Returns:
+        Number of data rows to skip (0 if the file was never imported or its
+        last import completed)
+    """
+    with db_connection(db_path) as conn:
+        row = conn.execute(
+            "SELECT lignes_importees, termine FROM imports_csv WHERE empreinte = ?", (fingerprint,)
+        ).fetchone()
+    return row[0] if row and not row[1] else 0
+
+
+def _save_checkpoint(conn: sqlite3.Connection, fingerprint: str, name: str, rows: int, finished: bool) -> None:
+    conn.execute("""
+        INSERT INTO imports_csv (empreinte, nom, lignes_importees, termine, mis_a_jour)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(empreinte) DO UPDATE SET
+            nom = excluded.nom, lignes_importees = excluded.lignes_importees,
+            termine = excluded.termine, mis_a_jour = excluded.mis_a_jour
+    """, (fingerprint, name, rows, int(finished), datetime.now().isoformat(timespec="seconds")))
+
+
+def import_csv(
+    source: CsvSource,
+    name: Optional[str] = None,
+    chunk_rows: int = IMPORT_CSV_CHUNK_ROWS,
+    deduplicate: bool = True,
+    db_path: Optional[str] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    loose_duplicates: bool = False
+) -> ImportReport:
+    """
+    Import a CSV file of transactions chunk by chunk.
+
+    The file is read ``chunk_rows`` rows at a time, so memory stays bounded
+    whatever its size. Each chunk is converted, validated, deduplicated and
+    inserted in its own transaction, together with the number of rows done
+    (``imports_csv`` table, keyed by the file's SHA-256). If the import
+    fails, importing the same file again resumes after the last committed
+    chunk: the rows done are counted in parsed data rows (blank lines are
+    not rows), so the resumed run parses the file again and drops them.
+
+    Args:
+        source: Path or binary file object of the CSV (template columns)
+        name: File name recorded with the checkpoint
+        chunk_rows: Rows per chunk (and per transaction)
+        deduplicate: Skip duplicates (default: True)
+        db_path: Database path (defaults to DB_PATH)
+        progress_callback: Optional callback(rows_done) called after each
+            committed chunk (rows skipped on resume included)
+        loose_duplicates: Also skip rows whose (date, montant, categorie)
+            is already in the database
+
+    Returns:
+        ImportReport for the rows read by this call; invalid positions are
+        data row numbers in the file (0-based)
+
+    Raises:
+        DatabaseError: If a chunk cannot be written (earlier chunks stay
+            committed)
+    """
+    fingerprint = csv_fingerprint(source)
+    name = name or (os.path.basename(source) if isinstance(source, (str, os.PathLike)) else "")
+    rows_done = get_import_checkpoint(fingerprint, db_path)
+    report = ImportReport(resumed_from=rows_done)
+    if rows_done:
+        logger.info(f"Resuming CSV import of '{name}' after row {rows_done}")
+
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    to_skip = rows_done
+
+    with pd.read_csv(source, chunksize=chunk_rows, encoding="utf-8") as reader:
+        for chunk in reader:
+            # skiprows counts raw lines, blank ones included: drop parsed rows
+            if to_skip >= len(chunk):
+                to_skip -= len(chunk)
+                continue
+            chunk, to_skip = chunk.iloc[to_skip:], 0
+
+            transactions = csv_chunk_to_transactions(chunk)
+            try:
+                with db_connection(db_path) as conn:
+                    chunk_report = _write_batch(
+                        conn, transactions, deduplicate, IMPORT_CHUNK_SIZE, loose_duplicates=loose_duplicates
+                    )
+                    _save_checkpoint(conn, fingerprint, name, rows_done + len(chunk), finished=False)
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"CSV import of '{name}' failed after row {rows_done}: {e}")
+                raise DatabaseError(
+                    f"Échec de l'import à partir de la ligne {rows_done + 1} : {e}. "
+                    f"Relancez l'import du même fichier pour reprendre."
+                ) from e
+
+            report.merge(chunk_report, offset=rows_done)
+            rows_done += len(chunk)
+            report.rows_read += len(chunk)
+            if progress_callback:
+                progress_callback(rows_done)
+
+    with db_connection(db_path) as conn:
+        _save_checkpoint(conn, fingerprint, name, rows_done, finished=True)
+        conn.commit()
+
+    logger.info(
+        f"CSV import of '{name}': {report.rows_read} row(s) read, {report.inserted} inserted, "
+        f"{report.duplicates} duplicate(s), {len(report.invalid)} invalid"
+    )
+    return report
@@ -8,16 +8,16 @@ Ce module contient les fonctions pour ajouter des transactions :
 
 import streamlit as st
 import pandas as pd
-import io
 from datetime import datetime, date
 from config import TO_SCAN_DIR, REVENUS_A_TRAITER
 from shared.ui import (
-    load_transactions,
     insert_transaction_batch,
+    show_import_report,
     refresh_and_rerun
 )
+from shared.exceptions import DatabaseError
+from domains.transactions.import_service import import_csv, csv_fingerprint, get_import_checkpoint
 from shared.ui import toast_success, toast_error
-from shared.utils import safe_convert
 from domains.revenues import is_uber_transaction, process_uber_revenue
 from domains.transactions.service import normalize_category, normalize_subcategory
 
@@ -231,13 +231,26 @@ revenu,2024-01-15,freelance,mission,450.00,Projet X"""
             st.success(f"✅ Fichier '{uploaded_file.name}' chargé !")
 
             try:
-                # Lire le CSV
-                df_import = pd.read_csv(io.StringIO(uploaded_file.getvalue().decode('utf-8')))
+                # Aperçu : seules les premières lignes sont lues
+                uploaded_file.seek(0)
+                df_apercu = pd.read_csv(uploaded_file, nrows=10, encoding='utf-8')
+                # Estimation (lignes vides et champs multi-lignes faussent le compte) :
+                # le nombre exact est celui lu par import_csv
+                contenu = uploaded_file.getvalue()
+                nb_lignes = contenu.count(b"\n") - (1 if contenu.endswith(b"\n") else 0)
+                nb_lignes = max(nb_lignes, len(df_apercu))
 
                 st.markdown("#### 📊 Aperçu des données")
-                st.dataframe(df_import.head(10), use_container_width=True)
+                st.dataframe(df_apercu, use_container_width=True)
 
-                st.info(f"📈 **{len(df_import)}** transactions détectées dans le fichier")
+                st.info(f"📈 Environ **{nb_lignes}** transactions dans le fichier (estimation)")
+
+                deja_importees = get_import_checkpoint(csv_fingerprint(uploaded_file))
+                if deja_importees:
+                    st.warning(
+                        f"⏯️ Un import précédent de ce fichier s'est interrompu : "
+                        f"il reprendra après la ligne {deja_importees}."
+                    )
 
                 # Options d'import
                 col1, col2 = st.columns(2)
@@ -246,7 +259,8 @@ revenu,2024-01-15,freelance,mission,450.00,Projet X"""
                     ignorer_doublons = st.checkbox(
                         "🔒 Ignorer les doublons",
                         value=True,
-                        help="Évite d'importer plusieurs fois la même transaction"
+                        help="Ignore aussi les transactions de même date, montant et catégorie "
+                             "déjà enregistrées (les doublons exacts sont toujours ignorés)"
                     )
 
                 with col2:
@@ -254,63 +268,39 @@ revenu,2024-01-15,freelance,mission,450.00,Projet X"""
 
                 # Bouton d'import
                 if st.button("✅ Importer les transactions", type="primary", key="import_csv_depenses_btn"):
-                    with st.spinner("Import en cours..."):
-                        # Préparer les transactions
-                        transactions_a_importer = []
-
-                        for idx, row in df_import.iterrows():
-                            # Conversion sécurisée
-                            transaction = {
-                                "type": str(row.get('type', 'dépense')).strip().lower(),
-                                "date": str(row.get('date', datetime.now().date())),
-                                "categorie": str(row.get('categorie', 'Divers')).strip(),
-                                "sous_categorie": str(row.get('sous_categorie', 'Autre')).strip(),
-                                "montant": safe_convert(row.get('montant', 0)),
-                                "description": str(row.get('description', '')).strip() if pd.notna(row.get('description')) else "",
-                                "source": "CSV Import"
-                            }
-
-                            # Validation basique
-                            if transaction["montant"] > 0:
-                                transactions_a_importer.append(transaction)
-
-                        if transactions_a_importer:
-                            # Insertion
-                            if ignorer_doublons:
-                                # Charger transactions existantes pour vérifier doublons
-                                df_existant = load_transactions()
-                                nouvelles = []
-                                doublons = 0
-
-                                for trans in transactions_a_importer:
-                                    # Vérification doublon simple (même date, montant, catégorie)
-                                    est_doublon = False
-                                    if not df_existant.empty:
-                                        est_doublon = (
-                                            (df_existant['date'] == pd.Timestamp(trans['date'])) &
-                                            (df_existant['montant'] == trans['montant']) &
-                                            (df_existant['categorie'] == trans['categorie'])
-                                        ).any()
-
-                                    if not est_doublon:
-                                        nouvelles.append(trans)
-                                    else:
-                                        doublons += 1
-
-                                if nouvelles:
-                                    insert_transaction_batch(nouvelles)
-                                    toast_success(f"✅ {len(nouvelles)} transaction(s) importée(s) avec succès !")
-                                    if doublons > 0:
-                                        st.warning(f"⚠️ {doublons} doublon(s) ignoré(s)")
-                                else:
-                                    st.warning("⚠️ Toutes les transactions sont des doublons")
-                            else:
-                                insert_transaction_batch(transactions_a_importer)
-                                toast_success(f"✅ {len(transactions_a_importer)} transaction(s) importée(s) !")
-
+                    progression = st.progress(0.0, text="Import en cours...")
+
+                    def _avancer(lignes_faites: int) -> None:
+                        progression.progress(
+                            min(lignes_faites / max(nb_lignes, 1), 0.99),
+                            text=f"Import en cours... {lignes_faites} lignes lues (environ {nb_lignes})"
+                        )
+
+                    try:
+                        rapport = import_csv(
+                            uploaded_file,
+                            name=uploaded_file.name,
+                            loose_duplicates=ignorer_doublons,
+                            progress_callback=_avancer
+                        )
+                    except DatabaseError as e:
+                        progression.empty()
+                        toast_error(str(e))
+                    else:
+                        progression.progress(
+                            1.0,
+                            text=f"Import terminé : {rapport.resumed_from + rapport.rows_read} lignes lues"
+                        )
+                        if rapport.inserted > 0:
+                            show_import_report(rapport)
                             st.balloons()
                             st.info("💡 N'oubliez pas d'actualiser la page pour voir vos changements")
+                        elif rapport.duplicates > 0 and not rapport.invalid:
+                            st.warning("⚠️ Toutes les transactions sont des doublons")
+                        elif rapport.rows_read == 0 and rapport.resumed_from:
+                            st.info("ℹ️ Ce fichier avait déjà été importé jusqu'au bout")
                         else:
+                            show_import_report(rapport)
                             toast_error("Aucune transaction valide trouvée dans le fichier")
 
             except Exception as e:
@@ -4,19 +4,27 @@ Transactions Helpers - Fonctions utilitaires pour transactions.py
 Ce fichier contient les fonctions helper extraites du gros fichier transactions.py
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, Optional
+from shared.services.transaction_store import TransactionStore
 
 
-def get_transactions_for_fractal_code(code: str, hierarchy: Dict, df: pd.DataFrame) -> pd.DataFrame:
+def get_fractal_code_filters(code: str, hierarchy: Dict) -> Optional[Dict[str, str]]:
     """
-    Get transactions for a specific fractal code (category or subcategory).
+    Get the transaction filters matching a fractal code.
 
-    For subcategories (level 3), also filter by parent category to avoid getting
-    transactions from other categories that might have the same subcategory name.
+    For subcategories (level 3), the parent category and the type are part of
+    the filters to avoid getting transactions from other categories that
+    might have the same subcategory name.
+
+    Returns:
+        Dict of ``transaction_type`` / ``categorie`` / ``sous_categorie``
+        values to match ignoring case ({} for the root), or None for an
+        unknown code
     """
     if not code or code not in hierarchy:
-        return pd.DataFrame()
+        return None
 
     node = hierarchy[code]
     level = node.get('level', 0)
@@ -29,47 +37,63 @@ def get_transactions_for_fractal_code(code: str, hierarchy: Dict, df: pd.DataFra
         # Récupérer la catégorie parente
         if parent_code and parent_code in hierarchy:
             parent_node = hierarchy[parent_code]
-            category_name = parent_node.get('label', '')
             parent_parent_code = parent_node.get('parent', '')
 
             # Déterminer le type (revenu/dépense) à partir du grand-parent
-            transaction_type = 'revenu' if parent_parent_code == 'REVENUS' else 'dépense'
-
-            # Filtrer par type ET catégorie ET sous-catégorie pour éviter tout conflit
-            df_filtered = df[
-                (df['type'].str.lower() == transaction_type.lower()) &
-                (df['categorie'].str.lower() == category_name.lower()) &
-                (df['sous_categorie'].str.lower() == subcategory_name.lower())
-            ]
-            return df_filtered
-        else:
-            # Fallback si pas de parent (ne devrait pas arriver)
-            return df[df['sous_categorie'].str.lower() == subcategory_name.lower()]
-
-    # Niveau 2 (catégories) - afficher toutes les sous-catégories de cette catégorie
+            return {
+                'transaction_type': 'revenu' if parent_parent_code == 'REVENUS' else 'dépense',
+                'categorie': parent_node.get('label', ''),
+                'sous_categorie': subcategory_name,
+            }
+        # Fallback si pas de parent (ne devrait pas arriver)
+        return {'sous_categorie': subcategory_name}
+
+    # Niveau 2 (catégories) - toutes les sous-catégories, type donné par le parent (REVENUS/DEPENSES)
     elif level == 2:
-        category_name = node.get('label', '')
-        parent_code = node.get('parent', '')  # This is REVENUS or DEPENSES (level 1)
+        return {
+            'transaction_type': 'revenu' if node.get('parent', '') == 'REVENUS' else 'dépense',
+            'categorie': node.get('label', ''),
+        }
 
-        # Déterminer le type (revenu/dépense) directement depuis le parent
-        transaction_type = 'revenu' if parent_code == 'REVENUS' else 'dépense'
-
-        # Filtrer par catégorie ET type pour éviter les doublons si une catégorie existe dans les deux
-        return df[
-            (df['categorie'].str.lower() == category_name.lower()) &
-            (df['type'].str.lower() == transaction_type.lower())
-        ]
-
-    # Niveau 1 (type: Revenus/Dépenses) - afficher toutes les transactions du type
+    # Niveau 1 (type: Revenus/Dépenses) - toutes les transactions du type
     elif level == 1:
-        transaction_type = 'revenu' if code == 'REVENUS' else 'dépense'
-        return df[df['type'].str.lower() == transaction_type.lower()]
+        return {'transaction_type': 'revenu' if code == 'REVENUS' else 'dépense'}
 
-    # Niveau 0 (root) - afficher tout
+    # Niveau 0 (root) - tout
     elif level == 0:
-        return df
+        return {}
+
+    return None
+
+
+def get_fractal_code_mask(code: str, hierarchy: Dict, store: TransactionStore) -> np.ndarray:
+    """
+    Boolean mask of the store rows matching a fractal code.
+
+    Uses the pre-lowercased keys of the store instead of lowering every row.
+    """
+    filters = get_fractal_code_filters(code, hierarchy)
+    if filters is None:
+        return np.zeros(len(store), dtype=bool)
+    return store.mask(**filters)
+
+
+def get_transactions_for_fractal_code(code: str, hierarchy: Dict, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get transactions for a specific fractal code (category or subcategory).
+
+    For subcategories (level 3), also filter by parent category to avoid getting
+    transactions from other categories that might have the same subcategory name.
+    """
+    filters = get_fractal_code_filters(code, hierarchy)
+    if filters is None:
+        return pd.DataFrame()
 
-    return pd.DataFrame()
+    columns = {'transaction_type': 'type', 'categorie': 'categorie', 'sous_categorie': 'sous_categorie'}
+    mask = pd.Series(True, index=df.index)
+    for key, value in filters.items():
+        mask &= df[columns[key]].str.lower() == value.lower()
+    return df[mask]
 
 
 def render_graphique_section_v2(df: pd.DataFrame) -> None:
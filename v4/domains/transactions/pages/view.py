@@ -8,6 +8,7 @@ This module contains all transaction-related interface functions including:
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import io
 import os
@@ -18,6 +19,7 @@ from shared.database import get_db_connection
 from domains.transactions import TransactionRepository
 from shared.ui import (
     load_transactions,
+    load_transaction_store,
     insert_transaction_batch,
     refresh_and_rerun
 )
@@ -26,7 +28,7 @@ from shared.ui import (
     toast_success, toast_error, toast_warning,
     afficher_documents_associes, get_badge_icon
 )
-from shared.utils import safe_convert, safe_date_convert
+from shared.utils import from_cents, safe_convert, safe_date_convert
 from domains.revenues import is_uber_transaction, process_uber_revenue
 from shared.services import backfill_recurrences_to_today
 from domains.transactions.service import normalize_category, normalize_subcategory
@@ -41,7 +43,7 @@ from shared.ui.components.charts import render_evolution_chart
 from shared.ui.components.calendar_component import render_calendar, get_calendar_date_range
 
 
-from domains.transactions.pages.helpers import get_transactions_for_fractal_code
+from domains.transactions.pages.helpers import get_fractal_code_mask
 
 
 
@@ -111,46 +113,32 @@ def interface_voir_transactions() -> None:
     
     with col_calendar:
         st.subheader("📅 Calendrier")
-        selected_date = render_calendar(df, key='cal_transactions')
+        # Jours marqués lus dans le résumé par jour partagé (un par révision)
+        selected_date = render_calendar(key='cal_transactions')
 
     st.markdown("---")
 
     # =====================================================
     # APPLIQUER LES FILTRES (Calendrier + Fractale)
     # =====================================================
-    df_filtered = df.copy()
-    df_filtered["date"] = pd.to_datetime(df_filtered["date"])
+    # Filtres évalués sur le store typé (dates en jours, clés déjà en minuscules)
+    store = load_transaction_store()
 
-    # Filtre calendrier (date ou plage)
+    # Filtre calendrier (date ou plage ; None, None : pas de filtre de date)
     date_debut, date_fin = get_calendar_date_range(key='cal_transactions')
-    
-    if date_debut and date_fin:
-        # Plage complète
-        df_filtered = df_filtered[
-            (df_filtered["date"].dt.date >= date_debut) &
-            (df_filtered["date"].dt.date <= date_fin)
-        ]
-    elif date_debut:
-        # Seulement date de début (depuis cette date)
-        df_filtered = df_filtered[df_filtered["date"].dt.date >= date_debut]
-    elif date_fin:
-        # Seulement date de fin (jusqu'à cette date)
-        df_filtered = df_filtered[df_filtered["date"].dt.date <= date_fin]
-    # Sinon (None, None) : pas de filtre de date, afficher tout
-
-    # Filtre multi-select de l'arbre dynamique
+    mask = store.mask(start_date=date_debut, end_date=date_fin)
+
+    # Filtre multi-select de l'arbre dynamique (union des codes sélectionnés)
     if tree_result and tree_result.get('codes'):
-        selected_codes = tree_result['codes']
-        
-        # Filtrer pour chaque code sélectionné
-        df_tree_filtered = pd.DataFrame()
-        
-        for code in selected_codes:
-            df_code = get_transactions_for_fractal_code(code, hierarchy, df_filtered)
-            df_tree_filtered = pd.concat([df_tree_filtered, df_code], ignore_index=True)
-        
-        if not df_tree_filtered.empty:
-            df_filtered = df_tree_filtered.drop_duplicates(subset=['id'], keep='first')
+        tree_mask = np.zeros(len(store), dtype=bool)
+        for code in tree_result['codes']:
+            tree_mask |= get_fractal_code_mask(code, hierarchy, store)
+
+        if (mask & tree_mask).any():
+            mask &= tree_mask
+
+    df_filtered = df[df["id"].isin(store.ids(mask))].copy()
+    df_filtered["date"] = pd.to_datetime(df_filtered["date"])
 
     # Tri par date (plus récentes en premier)
     df_filtered = df_filtered.sort_values("date", ascending=False).reset_index(drop=True)
@@ -162,9 +150,11 @@ def interface_voir_transactions() -> None:
     # =====================================================
     # SECTION 2: MÉTRIQUES (milieu)
     # =====================================================
-    total_revenus = df_filtered[df_filtered["type"] == "revenu"]["montant"].sum()
-    total_depenses = df_filtered[df_filtered["type"] == "dépense"]["montant"].sum()
-    solde = total_revenus - total_depenses
+    # Sommes exactes en centimes sur les lignes retenues par le masque
+    revenus_cents = store.sum_cents(mask & store.key_mask("type", "revenu"))
+    depenses_cents = store.sum_cents(mask & store.key_mask("type", "dépense"))
+    total_revenus, total_depenses = from_cents(revenus_cents), from_cents(depenses_cents)
+    solde = from_cents(revenus_cents - depenses_cents)
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -186,7 +176,14 @@ def interface_voir_transactions() -> None:
 
     with col_graph:
         st.subheader("📈 Graphique")
-        render_evolution_chart(df_filtered, height=450)
+        if tree_result and tree_result.get('codes'):
+            render_evolution_chart(df_filtered, height=450)
+        else:
+            # Sans filtre de catégorie : totaux mensuels de monthly_rollup
+            render_evolution_chart(
+                TransactionRepository.monthly_totals(start_date=date_debut, end_date=date_fin),
+                height=450
+            )
 
     with col_table:
         # Toggle edit mode
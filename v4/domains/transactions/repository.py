@@ -1,16 +1,46 @@
 """Repository pattern for database operations."""
 
 import sqlite3
+import numpy as np
 import pandas as pd
-from typing import List, Optional, Dict, Any
-from datetime import date
-from shared.database import get_db_connection
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from datetime import date, timedelta
+from shared.database import db_connection
 from .models import Transaction
 from shared.exceptions import DatabaseError
+from shared.utils import cents_sql, from_cents, from_cents_series, safe_convert_series, to_cents
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Columns the aggregation queries may group by
+AGGREGATE_COLUMNS = ("type", "categorie", "sous_categorie", "source")
+
+# Length of the ISO date prefix for each aggregation period
+PERIOD_LENGTHS = {"day": 10, "month": 7, "year": 4}
+
+# Columns kept by the monthly_rollup table (migration 9)
+ROLLUP_COLUMNS = ("type", "categorie", "sous_categorie")
+
+# Empty and NULL sub-categories share one rollup key (see migration 9)
+_GROUP_EXPRESSIONS = {
+    "type": "type",
+    "categorie": "categorie",
+    "sous_categorie": "NULLIF(sous_categorie, '') AS sous_categorie",
+    "source": "source",
+}
+
+
+def _next_month(day: date) -> date:
+    """First day of the month after ``day``."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _has_rollup(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'monthly_rollup'"
+    ).fetchone() is not None
+
 
 class TransactionRepository:
     """Repository for transaction database operations."""
@@ -27,11 +57,10 @@ class TransactionRepository:
         Returns:
             DataFrame with all transactions
         """
-        conn = None
         try:
-            conn = get_db_connection()
-            query = "SELECT * FROM transactions"
-            df = pd.read_sql_query(query, conn)
+            with db_connection() as conn:
+                query = "SELECT * FROM transactions"
+                df = pd.read_sql_query(query, conn)
 
             if not df.empty and sort_by in df.columns:
                 df = df.sort_values(by=sort_by, ascending=ascending)
@@ -41,9 +70,6 @@ class TransactionRepository:
         except sqlite3.Error as e:
             logger.error(f"Error fetching transactions: {e}")
             return pd.DataFrame()
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def get_by_id(transaction_id: int) -> Optional[Transaction]:
@@ -56,12 +82,11 @@ class TransactionRepository:
         Returns:
             Transaction object or None
         """
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM transactions WHERE id = ?", (transaction_id,))
-            row = cursor.fetchone()
+            with db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM transactions WHERE id = ?", (transaction_id,))
+                row = cursor.fetchone()
 
             if row:
                 return Transaction.from_row(row)
@@ -70,8 +95,6 @@ class TransactionRepository:
         except sqlite3.Error as e:
             logger.error(f"Error fetching transaction {transaction_id}: {e}")
             return None
-        finally:
-            conn.close()
 
     @staticmethod
     def insert(transaction: Transaction) -> Optional[int]:
@@ -88,44 +111,38 @@ class TransactionRepository:
 
         logger.info(f"Inserting transaction: {transaction.description[:50] if transaction.description else 'N/A'}")
         
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Normalize category and subcategory
-            normalized_category = normalize_category(transaction.categorie)
-            normalized_subcategory = normalize_subcategory(transaction.sous_categorie)
-
-            cursor.execute("""
-                INSERT INTO transactions
-                (type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                transaction.type,
-                normalized_category,
-                normalized_subcategory,
-                transaction.description,
-                transaction.montant,
-                transaction.date.isoformat() if isinstance(transaction.date, date) else transaction.date,
-                transaction.source,
-                transaction.recurrence,
-                transaction.date_fin.isoformat() if transaction.date_fin and isinstance(transaction.date_fin, date) else transaction.date_fin
-            ))
-
-            conn.commit()
-            transaction_id = cursor.lastrowid
-            logger.info(f"Transaction inserted successfully: ID={transaction_id}, Amount={transaction.montant}€")
-            return transaction_id
+            with db_connection() as conn:
+                cursor = conn.cursor()
+
+                # Normalize category and subcategory
+                normalized_category = normalize_category(transaction.categorie)
+                normalized_subcategory = normalize_subcategory(transaction.sous_categorie)
+
+                cursor.execute("""
+                    INSERT INTO transactions
+                    (type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    transaction.type,
+                    normalized_category,
+                    normalized_subcategory,
+                    transaction.description,
+                    from_cents(to_cents(transaction.montant)),
+                    transaction.date.isoformat() if isinstance(transaction.date, date) else transaction.date,
+                    transaction.source,
+                    transaction.recurrence,
+                    transaction.date_fin.isoformat() if transaction.date_fin and isinstance(transaction.date_fin, date) else transaction.date_fin
+                ))
+
+                conn.commit()
+                transaction_id = cursor.lastrowid
+                logger.info(f"Transaction inserted successfully: ID={transaction_id}, Amount={transaction.montant}€")
+                return transaction_id
 
         except sqlite3.Error as e:
             logger.error(f"Error inserting transaction: {e}", exc_info=True)
-            if conn:
-                conn.rollback()
             raise DatabaseError(f"Failed to insert transaction: {e}") from e
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def insert_batch(transactions: List[Transaction]) -> int:
@@ -142,43 +159,37 @@ class TransactionRepository:
 
         logger.info(f"Inserting batch of {len(transactions)} transactions")
         
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Normalize categories for all transactions
-            data = [(
-                t.type,
-                normalize_category(t.categorie),
-                normalize_subcategory(t.sous_categorie),
-                t.description,
-                t.montant,
-                t.date.isoformat() if isinstance(t.date, date) else t.date,
-                t.source,
-                t.recurrence,
-                t.date_fin.isoformat() if t.date_fin and isinstance(t.date_fin, date) else t.date_fin
-            ) for t in transactions]
-
-            cursor.executemany("""
-                INSERT INTO transactions
-                (type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, data)
-
-            conn.commit()
-            count = cursor.rowcount
-            logger.info(f"Batch insert successful: {count} transactions added")
-            return count
+            with db_connection() as conn:
+                cursor = conn.cursor()
+
+                # Normalize categories for all transactions
+                data = [(
+                    t.type,
+                    normalize_category(t.categorie),
+                    normalize_subcategory(t.sous_categorie),
+                    t.description,
+                    from_cents(to_cents(t.montant)),
+                    t.date.isoformat() if isinstance(t.date, date) else t.date,
+                    t.source,
+                    t.recurrence,
+                    t.date_fin.isoformat() if t.date_fin and isinstance(t.date_fin, date) else t.date_fin
+                ) for t in transactions]
+
+                cursor.executemany("""
+                    INSERT INTO transactions
+                    (type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, data)
+
+                conn.commit()
+                count = cursor.rowcount
+                logger.info(f"Batch insert successful: {count} transactions added")
+                return count
 
         except sqlite3.Error as e:
             logger.error(f"Error inserting batch: {e}", exc_info=True)
-            if conn:
-                conn.rollback()
             raise DatabaseError(f"Failed to insert batch of {len(transactions)} transactions: {e}") from e
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def update(transaction: Transaction) -> bool:
@@ -199,49 +210,43 @@ class TransactionRepository:
 
         logger.info(f"Updating transaction ID={transaction.id}: {transaction.description[:50] if transaction.description else 'N/A'}")
         
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Normalize category and subcategory
-            normalized_category = normalize_category(transaction.categorie)
-            normalized_subcategory = normalize_subcategory(transaction.sous_categorie)
-
-            cursor.execute("""
-                UPDATE transactions
-                SET type = ?, categorie = ?, sous_categorie = ?, description = ?,
-                    montant = ?, date = ?, source = ?, recurrence = ?, date_fin = ?
-                WHERE id = ?
-            """, (
-                transaction.type,
-                normalized_category,
-                normalized_subcategory,
-                transaction.description,
-                transaction.montant,
-                transaction.date.isoformat() if isinstance(transaction.date, date) else transaction.date,
-                transaction.source,
-                transaction.recurrence,
-                transaction.date_fin.isoformat() if transaction.date_fin and isinstance(transaction.date_fin, date) else transaction.date_fin,
-                transaction.id
-            ))
-
-            conn.commit()
-            success = cursor.rowcount > 0
-            if success:
-                logger.info(f"Transaction ID={transaction.id} updated successfully")
-            else:
-                logger.warning(f"Transaction ID={transaction.id} not found for update")
-            return success
+            with db_connection() as conn:
+                cursor = conn.cursor()
+
+                # Normalize category and subcategory
+                normalized_category = normalize_category(transaction.categorie)
+                normalized_subcategory = normalize_subcategory(transaction.sous_categorie)
+
+                cursor.execute("""
+                    UPDATE transactions
+                    SET type = ?, categorie = ?, sous_categorie = ?, description = ?,
+                        montant = ?, date = ?, source = ?, recurrence = ?, date_fin = ?
+                    WHERE id = ?
+                """, (
+                    transaction.type,
+                    normalized_category,
+                    normalized_subcategory,
+                    transaction.description,
+                    from_cents(to_cents(transaction.montant)),
+                    transaction.date.isoformat() if isinstance(transaction.date, date) else transaction.date,
+                    transaction.source,
+                    transaction.recurrence,
+                    transaction.date_fin.isoformat() if transaction.date_fin and isinstance(transaction.date_fin, date) else transaction.date_fin,
+                    transaction.id
+                ))
+
+                conn.commit()
+                success = cursor.rowcount > 0
+                if success:
+                    logger.info(f"Transaction ID={transaction.id} updated successfully")
+                else:
+                    logger.warning(f"Transaction ID={transaction.id} not found for update")
+                return success
 
         except sqlite3.Error as e:
             logger.error(f"Error updating transaction: {e}", exc_info=True)
-            if conn:
-                conn.rollback()
             raise DatabaseError(f"Failed to update transaction ID={transaction.id}: {e}") from e
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def update_category(transaction_id: int, new_category: str, new_subcategory: str = None) -> bool:
@@ -262,41 +267,35 @@ class TransactionRepository:
             logger.error("Cannot update transaction without ID")
             return False
 
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Normalize categories
-            normalized_categorie = normalize_category(new_category)
-            normalized_sous_categorie = normalize_subcategory(new_subcategory) if new_subcategory else None
-
-            # Update only category fields
-            if normalized_sous_categorie:
-                cursor.execute("""
-                    UPDATE transactions
-                    SET categorie = ?, sous_categorie = ?
-                    WHERE id = ?
-                """, (normalized_categorie, normalized_sous_categorie, transaction_id))
-            else:
-                cursor.execute("""
-                    UPDATE transactions
-                    SET categorie = ?
-                    WHERE id = ?
-                """, (normalized_categorie, transaction_id))
-
-            conn.commit()
-            logger.info(f"Updated category for transaction ID {transaction_id} to {normalized_categorie}/{normalized_sous_categorie}")
-            return cursor.rowcount > 0
+            with db_connection() as conn:
+                cursor = conn.cursor()
+
+                # Normalize categories
+                normalized_categorie = normalize_category(new_category)
+                normalized_sous_categorie = normalize_subcategory(new_subcategory) if new_subcategory else None
+
+                # Update only category fields
+                if normalized_sous_categorie:
+                    cursor.execute("""
+                        UPDATE transactions
+                        SET categorie = ?, sous_categorie = ?
+                        WHERE id = ?
+                    """, (normalized_categorie, normalized_sous_categorie, transaction_id))
+                else:
+                    cursor.execute("""
+                        UPDATE transactions
+                        SET categorie = ?
+                        WHERE id = ?
+                    """, (normalized_categorie, transaction_id))
+
+                conn.commit()
+                logger.info(f"Updated category for transaction ID {transaction_id} to {normalized_categorie}/{normalized_sous_categorie}")
+                return cursor.rowcount > 0
 
         except sqlite3.Error as e:
             logger.error(f"Failed to update transaction category: {e}")
-            if conn:
-                conn.rollback()
             return False
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def delete(transaction_id: int, delete_files: bool = True) -> bool:
@@ -312,39 +311,34 @@ class TransactionRepository:
         """
         logger.info(f"Deleting transaction ID={transaction_id}, delete_files={delete_files}")
         
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Get transaction data before deleting (for file cleanup)
-            if delete_files:
-                transaction = TransactionRepository.get_by_id(transaction_id)
-                if transaction and transaction.source in ["OCR", "PDF"]:
-                    try:
-                        from shared.services import supprimer_fichiers_associes
-                        supprimer_fichiers_associes(transaction.to_dict())
-                        logger.info(f"Deleted associated files for transaction {transaction_id}")
-                    except Exception as e:
-                        logger.warning(f"Could not delete associated files: {e}")
-
-            cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
-            conn.commit()
-
-            success = cursor.rowcount > 0
-            if success:
-                logger.info(f"Transaction ID={transaction_id} deleted successfully")
-            else:
-                logger.warning(f"Transaction ID={transaction_id} not found for deletion")
-            return success
+            with db_connection() as conn:
+                cursor = conn.cursor()
+
+                # Get transaction data before deleting (for file cleanup)
+                if delete_files:
+                    transaction = TransactionRepository.get_by_id(transaction_id)
+                    if transaction and transaction.source in ["OCR", "PDF"]:
+                        try:
+                            from shared.services import supprimer_fichiers_associes
+                            supprimer_fichiers_associes(transaction.to_dict())
+                            logger.info(f"Deleted associated files for transaction {transaction_id}")
+                        except Exception as e:
+                            logger.warning(f"Could not delete associated files: {e}")
+
+                cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+                conn.commit()
+
+                success = cursor.rowcount > 0
+                if success:
+                    logger.info(f"Transaction ID={transaction_id} deleted successfully")
+                else:
+                    logger.warning(f"Transaction ID={transaction_id} not found for deletion")
+                return success
 
         except sqlite3.Error as e:
             logger.error(f"Error deleting transaction: {e}", exc_info=True)
-            if conn:
-                conn.rollback()
             raise DatabaseError(f"Failed to delete transaction ID={transaction_id}: {e}") from e
-        finally:
-            conn.close()
 
     @staticmethod
     def get_recurring() -> List[Transaction]:
@@ -354,25 +348,21 @@ class TransactionRepository:
         Returns:
             List of recurring transactions
         """
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            with db_connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT * FROM transactions
-                WHERE recurrence IS NOT NULL AND recurrence != 'Aucune'
-            """)
+                cursor.execute("""
+                    SELECT * FROM transactions
+                    WHERE recurrence IS NOT NULL AND recurrence != 'Aucune'
+                """)
 
-            rows = cursor.fetchall()
-            return [Transaction.from_row(row) for row in rows]
+                rows = cursor.fetchall()
+                return [Transaction.from_row(row) for row in rows]
 
         except sqlite3.Error as e:
             logger.error(f"Error fetching recurring transactions: {e}")
             return []
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def get_by_date_range(start_date: date, end_date: date) -> List[Transaction]:
@@ -386,23 +376,300 @@ class TransactionRepository:
         Returns:
             List of transactions
         """
-        conn = None
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            with db_connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT * FROM transactions
-                WHERE date BETWEEN ? AND ?
-                ORDER BY date DESC
-            """, (start_date.isoformat(), end_date.isoformat()))
+                cursor.execute("""
+                    SELECT * FROM transactions
+                    WHERE date BETWEEN ? AND ?
+                    ORDER BY date DESC
+                """, (start_date.isoformat(), end_date.isoformat()))
 
-            rows = cursor.fetchall()
-            return [Transaction.from_row(row) for row in rows]
+                rows = cursor.fetchall()
+                return [Transaction.from_row(row) for row in rows]
 
         except sqlite3.Error as e:
             logger.error(f"Error fetching transactions by date range: {e}")
             return []
-        finally:
-            if conn:
-                conn.close()
+
+    # ------------------------------------------------------------------
+    # Aggregations (computed by SQLite, for dashboards)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filters(transaction_type: Optional[str], categorie) -> Tuple[List[str], list]:
+        """Type and category clauses shared by the aggregation queries."""
+        clauses, params = [], []
+        if transaction_type is not None:
+            clauses.append("type = ?")
+            params.append(transaction_type)
+        if categorie is not None:
+            categories = [categorie] if isinstance(categorie, str) else list(categorie)
+            if not categories:
+                clauses.append("0")
+            else:
+                clauses.append(f"categorie IN ({', '.join('?' * len(categories))})")
+                params.extend(categories)
+        return clauses, params
+
+    @staticmethod
+    def _grouped_query(table: str, keys: List[str], clauses: List[str], cents: str, count: str) -> str:
+        select = ", ".join(keys + [f"{cents} AS montant_cents", f"{count} AS nombre"])
+        query = f"SELECT {select} FROM {table}"
+        if clauses:
+            query += f" WHERE {' AND '.join(clauses)}"
+        if keys:
+            order = ", ".join(str(i + 1) for i in range(len(keys)))
+            query += f" GROUP BY {order} ORDER BY {order}"
+        return query
+
+    @staticmethod
+    def _sum_rows(conn, group_by, period, transaction_type, categorie,
+                  start_date: Optional[date], end_date: Optional[date]) -> pd.DataFrame:
+        """Aggregate raw transactions over a date range (indexed ``date`` column)."""
+        clauses, params = TransactionRepository._filters(transaction_type, categorie)
+        if start_date is not None:
+            clauses.append("date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            # Exclusive upper bound: also matches dates stored with a time part
+            clauses.append("date < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+
+        keys = [_GROUP_EXPRESSIONS[c] for c in group_by]
+        if period is not None:
+            keys.append(f"substr(date, 1, {PERIOD_LENGTHS[period]}) AS periode")
+        query = TransactionRepository._grouped_query(
+            "transactions", keys, clauses, f"SUM({cents_sql()})", "COUNT(*)"
+        )
+        return pd.read_sql_query(query, conn, params=params)
+
+    @staticmethod
+    def _sum_rollup(conn, group_by, period, transaction_type, categorie,
+                    first_month: Optional[date], end_month: Optional[date]) -> pd.DataFrame:
+        """Aggregate ``monthly_rollup`` over the months in [first_month, end_month)."""
+        clauses, params = TransactionRepository._filters(transaction_type, categorie)
+        if first_month is not None:
+            clauses.append("mois >= ?")
+            params.append(first_month.isoformat()[:7])
+        if end_month is not None:
+            clauses.append("mois < ?")
+            params.append(end_month.isoformat()[:7])
+
+        keys = [_GROUP_EXPRESSIONS[c] for c in group_by]
+        if period is not None:
+            keys.append(f"substr(mois, 1, {PERIOD_LENGTHS[period]}) AS periode")
+        query = TransactionRepository._grouped_query(
+            "monthly_rollup", keys, clauses, "SUM(montant_cents)", "SUM(nombre)"
+        )
+        return pd.read_sql_query(query, conn, params=params)
+
+    @staticmethod
+    def _split_months(start_date: Optional[date], end_date: Optional[date]):
+        """
+        Split [start_date, end_date] into whole months and partial edges.
+
+        Returns:
+            ((first_month, end_month) or None, [(start, end) day ranges])
+        """
+        first_month = start_date
+        if start_date is not None and start_date.day != 1:
+            first_month = _next_month(start_date)
+        end_month = None
+        if end_date is not None:
+            end_month = end_date + timedelta(days=1)
+            if end_month.day != 1:
+                end_month = end_date.replace(day=1)
+
+        if first_month is not None and end_month is not None and first_month >= end_month:
+            return None, [(start_date, end_date)]
+
+        edges = []
+        if start_date is not None and start_date < first_month:
+            edges.append((start_date, first_month - timedelta(days=1)))
+        if end_date is not None and end_month <= end_date:
+            edges.append((end_month, end_date))
+        return (first_month, end_month), edges
+
+    @staticmethod
+    def sum_by(
+        group_by: Sequence[str] = ("type",),
+        transaction_type: Optional[str] = None,
+        categorie=None,
+        period: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        db_path: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Sum amounts per group, computed in SQL on integer cents.
+
+        Whole months of the range are read from the trigger-maintained
+        ``monthly_rollup`` table (migration 9) when the grouping allows it;
+        partial months at either end, day periods and ``source`` groups are
+        summed from the transactions matched by the indexed ``date`` column.
+        Empty and missing sub-categories are both reported as None. Parts
+        are added as int64 cents, so totals are exact and need no rounding.
+
+        Args:
+            group_by: Columns to group by (among AGGREGATE_COLUMNS)
+            transaction_type: Only 'revenu' or 'dépense' rows
+            categorie: Category or list of categories to keep
+            period: Also group by 'day', 'month' or 'year' (``periode``
+                column, ISO prefix such as '2024-01')
+            start_date: First day included
+            end_date: Last day included
+            db_path: Optional custom database path (for testing)
+
+        Returns:
+            DataFrame with the group columns, ``montant`` (sum in euros),
+            ``nombre`` (row count) and ``montant_cents`` (exact int64 sum),
+            ordered by the group columns
+        """
+        group_by = list(group_by)
+        unknown = [c for c in group_by if c not in AGGREGATE_COLUMNS]
+        if unknown or (period is not None and period not in PERIOD_LENGTHS):
+            raise ValueError(f"Invalid aggregation: group_by={group_by}, period={period}")
+        names = group_by + (["periode"] if period is not None else [])
+        repo = TransactionRepository
+
+        try:
+            with db_connection(db_path) as conn:
+                months, ranges = None, [(start_date, end_date)]
+                if period != "day" and all(c in ROLLUP_COLUMNS for c in group_by) and _has_rollup(conn):
+                    months, ranges = repo._split_months(start_date, end_date)
+
+                parts = []
+                if months is not None:
+                    parts.append(repo._sum_rollup(conn, group_by, period, transaction_type, categorie, *months))
+                for first, last in ranges:
+                    parts.append(repo._sum_rows(conn, group_by, period, transaction_type, categorie, first, last))
+        except sqlite3.Error as e:
+            logger.error(f"Error aggregating transactions: {e}")
+            return pd.DataFrame(columns=names + ["montant", "nombre", "montant_cents"])
+
+        parts = [part for part in parts if not part.empty] or parts[:1]
+        if len(parts) == 1:
+            df = parts[0]
+        elif names:
+            df = (pd.concat(parts, ignore_index=True)
+                  .groupby(names, dropna=False, sort=True)[["montant_cents", "nombre"]].sum()
+                  .reset_index())
+        else:
+            df = pd.concat(parts, ignore_index=True)[["montant_cents", "nombre"]].sum().to_frame().T
+
+        cents = df.pop("montant_cents").fillna(0).astype(np.int64)
+        df["montant"] = from_cents_series(cents)
+        df["nombre"] = df["nombre"].fillna(0).astype(int)
+        df["montant_cents"] = cents
+        return df
+
+    @staticmethod
+    def monthly_totals(
+        group_by: Sequence[str] = ("type",),
+        transaction_type: Optional[str] = None,
+        categorie=None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        db_path: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Monthly sums for charts, read from ``monthly_rollup``.
+
+        Cost grows with months x categories, not with transactions (only a
+        partial first or last month is summed from the transactions).
+
+        Args:
+            group_by: Columns to group by (type, categorie, sous_categorie)
+            transaction_type: Only 'revenu' or 'dépense' rows
+            categorie: Category or list of categories to keep
+            start_date: First day included
+            end_date: Last day included
+            db_path: Optional custom database path (for testing)
+
+        Returns:
+            DataFrame with ``periode`` ('2024-01'), the group columns,
+            ``montant``, ``nombre`` and ``montant_cents``, in chronological
+            order
+        """
+        df = TransactionRepository.sum_by(
+            group_by, transaction_type=transaction_type, categorie=categorie, period="month",
+            start_date=start_date, end_date=end_date, db_path=db_path
+        )
+        return df[["periode"] + list(group_by) + ["montant", "nombre", "montant_cents"]].sort_values(
+            ["periode"] + list(group_by), ignore_index=True
+        )
+
+    @staticmethod
+    def totals_by_type(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        categorie=None,
+        db_path: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Total revenues and expenses over a date range.
+
+        Args:
+            start_date: First day included (None for no lower bound)
+            end_date: Last day included (None for no upper bound)
+            categorie: Category or list of categories to keep
+            db_path: Optional custom database path (for testing)
+
+        Returns:
+            Dict with 'revenu' and 'dépense' totals (0.0 when absent)
+        """
+        df = TransactionRepository.sum_by(
+            ["type"], categorie=categorie, start_date=start_date, end_date=end_date, db_path=db_path
+        )
+        totals = {"revenu": 0.0, "dépense": 0.0}
+        totals.update((kind, from_cents(cents)) for kind, cents in zip(df["type"], df["montant_cents"]))
+        return totals
+
+    @staticmethod
+    def get_date_bounds(db_path: Optional[str] = None) -> Tuple[Optional[date], Optional[date]]:
+        """
+        Get the first and last transaction dates.
+
+        Args:
+            db_path: Optional custom database path (for testing)
+
+        Returns:
+            (first date, last date), or (None, None) without transactions
+        """
+        try:
+            with db_connection(db_path) as conn:
+                first, last = conn.execute("SELECT MIN(date), MAX(date) FROM transactions").fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching transaction date bounds: {e}")
+            return None, None
+
+        try:
+            return date.fromisoformat(first[:10]), date.fromisoformat(last[:10])
+        except (TypeError, ValueError):
+            return None, None
+
+    @staticmethod
+    def get_recent(limit: int = 5, db_path: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get the most recent transactions.
+
+        Args:
+            limit: Number of transactions
+            db_path: Optional custom database path (for testing)
+
+        Returns:
+            DataFrame of the latest transactions, most recent first
+        """
+        try:
+            with db_connection(db_path) as conn:
+                df = pd.read_sql_query(
+                    "SELECT * FROM transactions ORDER BY date DESC, id DESC LIMIT ?", conn, params=(limit,)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching recent transactions: {e}")
+            return pd.DataFrame()
+
+        df["montant"] = safe_convert_series(df["montant"], 0.0)
+        return df
@@ -36,10 +36,7 @@ from config import (
 # ==============================
 # IMPORTS - Database
 # ==============================
-from shared.database import (
-    init_db,
-    migrate_database_schema
-)
+from shared.database import init_db
 from domains.transactions import TransactionRepository
 
 # ==============================
@@ -68,9 +65,7 @@ logger = get_logger(__name__)
 # DATABASE INITIALIZATION
 # ==============================
 try:
-    init_db()
-    migrate_database_schema()
-    logger.info("Database initialized successfully")
+    init_db()  # Versioned migrations: no-op once the schema is up to date
 except Exception as e:
     logger.error(f"Database initialization failed: {e}")
     st.error(f"⚠️ Erreur d'initialisation de la base de données : {e}")
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark des conversions montant/date.
+
+Compare l'application ligne par ligne de safe_convert / safe_date_convert
+(``Series.apply``) avec les versions vectorisées safe_convert_series /
+safe_date_series sur des colonnes aux formats mélangés, et vérifie que les
+résultats sont identiques.
+
+Usage :
+    python scripts/bench_converters.py [--rows 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.utils.converters import (
+    safe_convert, safe_date_convert, safe_convert_series, safe_date_series
+)
+
+
+def make_amounts(rows: int) -> pd.Series:
+    rng = random.Random(42)
+    values = []
+    for _ in range(rows):
+        amount = rng.randint(1, 500_000) / 100
+        style = rng.random()
+        if style < 0.5:
+            values.append(f"{amount:.2f}")
+        elif style < 0.7:
+            values.append(f"{amount:,.2f}".replace(",", " ").replace(".", ",") + " €")
+        elif style < 0.85:
+            values.append(f"{amount:,.2f}")
+        elif style < 0.98:
+            values.append(f"{amount:.2f}".replace(".", ","))
+        else:
+            values.append(rng.choice(["", None, "n/a"]))
+    return pd.Series(values, dtype=object)
+
+
+def make_dates(rows: int) -> pd.Series:
+    rng = random.Random(7)
+    formats = ["%Y-%m-%d"] * 6 + ["%d/%m/%Y", "%d/%m/%y", "%d.%m.%Y", "%d-%m-%Y"]
+    start = date(2018, 1, 1)
+    return pd.Series([
+        (start + timedelta(days=rng.randint(0, 2500))).strftime(rng.choice(formats))
+        for _ in range(rows)
+    ])
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Nombre de lignes par colonne")
+    args = parser.parse_args()
+
+    amounts = make_amounts(args.rows)
+    dates = make_dates(args.rows)
+
+    scalar_amounts, scalar_amount_ms = timed(lambda s: s.apply(lambda x: safe_convert(x, float, 0.0)), amounts)
+    vector_amounts, vector_amount_ms = timed(safe_convert_series, amounts)
+
+    scalar_dates, scalar_date_ms = timed(lambda s: pd.to_datetime(s.apply(safe_date_convert)), dates)
+    vector_dates, vector_date_ms = timed(safe_date_series, dates)
+
+    amounts_equal = scalar_amounts.tolist() == vector_amounts.tolist()
+    dates_equal = scalar_dates.equals(vector_dates.astype(scalar_dates.dtype))
+
+    print("=" * 70)
+    print(f"CONVERSIONS ({args.rows} lignes, formats mélangés)")
+    print("=" * 70)
+    print(f"   Montants : apply={scalar_amount_ms:9.1f} ms  vectorisé={vector_amount_ms:8.1f} ms  "
+          f"(x{scalar_amount_ms / vector_amount_ms:.1f})  identiques={amounts_equal}")
+    print(f"   Dates    : apply={scalar_date_ms:9.1f} ms  vectorisé={vector_date_ms:8.1f} ms  "
+          f"(x{scalar_date_ms / vector_date_ms:.1f})  identiques={dates_equal}")
+
+    if not (amounts_equal and dates_equal):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
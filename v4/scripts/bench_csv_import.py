@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'import CSV de la page Ajouter.
+
+Compare l'ancien import (fichier entier décodé puis chargé en DataFrame,
+iterrows, un seul lot) à l'import par blocs (read_csv(chunksize), une
+transaction et un point de reprise par bloc) : durée et pic mémoire Python
+(tracemalloc). Travaille sur un relevé généré et deux bases temporaires ;
+vérifie que les tables obtenues sont identiques.
+
+Usage :
+    python scripts/bench_csv_import.py [--rows 100000] [--chunk 5000]
+"""
+
+import argparse
+import io
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.transactions.import_service import bulk_insert_transactions, import_csv
+from shared.database.schema import init_db
+from shared.utils import safe_convert_series
+
+CATEGORIES = {"alimentation": ["courses", "restaurant"], "transport": ["essence", "peage"],
+              "logement": ["loyer", "electricite"], "loisirs": ["cinema", "sport"]}
+
+
+def write_csv(path, rows, rng):
+    start = date.today() - timedelta(days=5 * 365)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("type,date,categorie,sous_categorie,montant,description\n")
+        for i in range(rows):
+            categorie = rng.choice(list(CATEGORIES))
+            day = start + timedelta(days=rng.randint(0, 5 * 365))
+            f.write(f"dépense,{day.isoformat()},{categorie},{rng.choice(CATEGORIES[categorie])},"
+                    f"{rng.randint(100, 50000) / 100:.2f},Opération {i}\n")
+
+
+def legacy_import(data, db_path):
+    """Ancien import de add.py (fichier entier, iterrows, un seul lot)."""
+    df_import = pd.read_csv(io.StringIO(data.decode("utf-8")))
+    montants = safe_convert_series(df_import["montant"])
+    transactions = []
+    for idx, row in df_import.iterrows():
+        transaction = {
+            "type": str(row.get("type", "dépense")).strip().lower(),
+            "date": str(row.get("date")),
+            "categorie": str(row.get("categorie", "Divers")).strip(),
+            "sous_categorie": str(row.get("sous_categorie", "Autre")).strip(),
+            "montant": float(montants.at[idx]),
+            "description": str(row.get("description", "")).strip() if pd.notna(row.get("description")) else "",
+            "source": "CSV Import",
+        }
+        if transaction["montant"] > 0:
+            transactions.append(transaction)
+    bulk_insert_transactions(transactions, db_path=db_path)
+
+
+def measure(func, tmp, name):
+    """Durée (sans traçage) puis pic mémoire (tracemalloc) sur une seconde base."""
+    timed, traced = os.path.join(tmp, f"{name}.db"), os.path.join(tmp, f"{name}_mem.db")
+    init_db(timed)
+    init_db(traced)
+    start = time.perf_counter()
+    func(timed)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(traced)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, timed
+
+
+def table(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("""
+        SELECT type, categorie, sous_categorie, description, montant, date FROM transactions ORDER BY id
+    """).fetchall()
+    conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import CSV par blocs")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunk", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "releve.csv")
+        write_csv(csv_path, args.rows, random.Random(42))
+        with open(csv_path, "rb") as f:
+            data = f.read()
+
+        print("=" * 70)
+        print(f"{args.rows} lignes ({len(data) / 1024 / 1024:.1f} Mo), blocs de {args.chunk}")
+        print("=" * 70)
+
+        old_time, old_peak, db_old = measure(lambda db: legacy_import(data, db), tmp, "old")
+        new_time, new_peak, db_new = measure(
+            lambda db: import_csv(io.BytesIO(data), chunk_rows=args.chunk, db_path=db), tmp, "new"
+        )
+
+        print(f"Fichier entier + iterrows : {old_time:6.2f} s | pic mémoire {old_peak:7.1f} Mo")
+        print(f"Par blocs + reprise       : {new_time:6.2f} s | pic mémoire {new_peak:7.1f} Mo "
+              f"(x{old_time / new_time:.1f}, /{old_peak / new_peak:.0f} mémoire)")
+        print(f"Tables identiques : {table(db_old) == table(db_new)}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la préparation des données des tableaux de bord.
+
+Compare, pour l'accueil, les métriques détaillées, le graphique des budgets et
+l'analyse des dépenses exceptionnelles, l'ancienne préparation (DataFrame
+complet de load_transactions, filtre pd.to_datetime(...).dt.date puis sommes
+pandas) aux agrégations SQL de TransactionRepository (GROUP BY / SUM sur la
+plage de dates indexée). L'ancienne version est mesurée à froid (premier
+chargement du cache) et à chaud (DataFrame déjà résident). Vérifie que les
+montants obtenus sont identiques.
+
+Usage :
+    python scripts/bench_dashboard_aggregation.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import logging
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.transactions.repository import TransactionRepository
+from shared.database.schema import init_db
+from shared.services.transaction_cache import TransactionFrameCache
+
+CATEGORIES = ["alimentation", "transport", "logement", "loisirs", "sante", "uber", "salaire"]
+BUDGETS = ["alimentation", "transport", "logement"]
+
+
+def fill(db_path, rows, rng):
+    """Transactions réparties sur 10 ans jusqu'à aujourd'hui."""
+    start = date.today() - timedelta(days=10 * 365)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO transactions (type, categorie, sous_categorie, montant, date, source) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            ("revenu" if c in ("uber", "salaire") else "dépense", c, "autre",
+             rng.randint(100, 50000) / 100, (start + timedelta(days=rng.randint(0, 10 * 365))).isoformat(), "manuel")
+            for c in (rng.choice(CATEGORIES) for _ in range(rows))
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_prep(cache, debut, fin, premier_jour_mois):
+    """Préparation des quatre pages telle qu'avant (un load_transactions par page)."""
+    # Accueil
+    df_trans = cache.get()
+    dates = pd.to_datetime(df_trans["date"]).dt.date
+    df_mois = df_trans[(dates >= debut) & (dates <= fin)]
+    accueil = (
+        df_mois[df_mois["type"] == "revenu"]["montant"].sum(),
+        df_mois[df_mois["type"] == "dépense"]["montant"].sum(),
+        df_trans[df_trans["type"] == "revenu"]["montant"].sum() - df_trans[df_trans["type"] == "dépense"]["montant"].sum(),
+    )
+    evolution = df_mois.assign(mois=pd.to_datetime(df_mois["date"]).dt.strftime("%Y-%m"))
+    evolution = evolution.groupby(["mois", "type"])["montant"].sum()
+    camembert = df_mois[df_mois["type"] == "dépense"].groupby("categorie")["montant"].sum()
+
+    # Métriques détaillées
+    df_trans = cache.get()
+    df_mois = df_trans[pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois]
+    metriques = (
+        df_mois[df_mois["type"] == "revenu"]["montant"].sum(),
+        df_mois[(df_mois["type"] == "dépense") & (df_mois["categorie"].isin(BUDGETS))]["montant"].sum(),
+        df_mois[(df_mois["type"] == "dépense") & (~df_mois["categorie"].isin(BUDGETS))]["montant"].sum(),
+    )
+
+    # Graphique budgets
+    df_trans = cache.get()
+    df_mois = df_trans[pd.to_datetime(df_trans["date"]).dt.date >= premier_jour_mois]
+    budgets = [df_mois[(df_mois["type"] == "dépense") & (df_mois["categorie"] == c)]["montant"].sum() for c in BUDGETS]
+
+    # Dépenses exceptionnelles
+    df_trans = cache.get()
+    df_trans["date"] = pd.to_datetime(df_trans["date"])
+    df_trans = df_trans[df_trans["date"].dt.date >= debut]
+    exceptionnelles = df_trans[(df_trans["type"] == "dépense") & (~df_trans["categorie"].isin(BUDGETS))]["montant"].sum()
+
+    return accueil, evolution.to_dict(), camembert.to_dict(), metriques, budgets, exceptionnelles
+
+
+def sql_prep(db_path, debut, fin, premier_jour_mois):
+    """Même préparation avec les agrégations de TransactionRepository."""
+    repo = TransactionRepository
+    # Accueil
+    df_mois = repo.sum_by(["type", "categorie"], start_date=debut, end_date=fin, db_path=db_path)
+    totaux = repo.totals_by_type(db_path=db_path)
+    accueil = (
+        df_mois[df_mois["type"] == "revenu"]["montant"].sum(),
+        df_mois[df_mois["type"] == "dépense"]["montant"].sum(),
+        totaux["revenu"] - totaux["dépense"],
+    )
+    evolution = repo.sum_by(["type"], period="month", start_date=debut, end_date=fin, db_path=db_path)
+    evolution = evolution.set_index(["periode", "type"])["montant"]
+    camembert = df_mois[df_mois["type"] == "dépense"].groupby("categorie")["montant"].sum()
+
+    # Métriques détaillées
+    df_mois = repo.sum_by(["type", "categorie"], start_date=premier_jour_mois, db_path=db_path)
+    metriques = (
+        df_mois[df_mois["type"] == "revenu"]["montant"].sum(),
+        df_mois[(df_mois["type"] == "dépense") & (df_mois["categorie"].isin(BUDGETS))]["montant"].sum(),
+        df_mois[(df_mois["type"] == "dépense") & (~df_mois["categorie"].isin(BUDGETS))]["montant"].sum(),
+    )
+
+    # Graphique budgets
+    depenses = repo.sum_by(["categorie"], transaction_type="dépense", start_date=premier_jour_mois,
+                           db_path=db_path).set_index("categorie")["montant"]
+    budgets = [float(depenses.get(c, 0.0)) for c in BUDGETS]
+
+    # Dépenses exceptionnelles
+    df = repo.sum_by(["type", "categorie"], start_date=debut, db_path=db_path)
+    exceptionnelles = df[(df["type"] == "dépense") & (~df["categorie"].isin(BUDGETS))]["montant"].sum()
+
+    return accueil, evolution.to_dict(), camembert.to_dict(), metriques, budgets, exceptionnelles
+
+
+def same(a, b):
+    """Comparaison des montants à 1e-6 près (ordre des additions différent)."""
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agrégations des tableaux de bord")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    today = date.today()
+    premier_jour_mois = today.replace(day=1)
+    debut = (premier_jour_mois - timedelta(days=60)).replace(day=1)  # « 3 mois »
+
+    print("=" * 70)
+    print("Préparation des données : accueil (3 mois), métriques, budgets, exceptionnelles")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = os.path.join(tmp, f"bench_{size}.db")
+            init_db(db_path)
+            fill(db_path, size, random.Random(42))
+
+            cache = TransactionFrameCache(db_path)
+            cold, legacy = timed(lambda: legacy_prep(cache, debut, today, premier_jour_mois))
+            warm, _ = timed(lambda: legacy_prep(cache, debut, today, premier_jour_mois))
+            sql_time, pushed = timed(lambda: sql_prep(db_path, debut, today, premier_jour_mois))
+
+            print(f"{size:>9} lignes | pandas à froid {cold * 1000:8.1f} ms | à chaud {warm * 1000:8.1f} ms"
+                  f" | SQL {sql_time * 1000:7.1f} ms (x{warm / sql_time:.1f} / chaud)"
+                  f" | identiques : {same(legacy, pushed)}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
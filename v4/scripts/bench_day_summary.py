@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du résumé par jour du calendrier.
+
+Compare, sur une base temporaire, l'ancien calcul des jours marqués du
+calendrier (copie du DataFrame, pd.to_datetime, masque du mois puis
+iterrows() à chaque affichage) au DaySummary : construction une fois par
+révision (GROUP BY jour x type dans SQLite) puis recherche du mois.
+Vérifie que les jours, compteurs et indicateurs sont identiques.
+
+Usage :
+    python scripts/bench_day_summary.py [--rows 200000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.database.schema import init_db
+from shared.services.day_summary import get_day_summary
+from shared.services.transaction_cache import TransactionFrameCache
+
+
+def fill(db_path, rows, rng):
+    start = date.today() - timedelta(days=5 * 365)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO transactions (type, categorie, montant, date) VALUES (?, ?, ?, ?)",
+        ((rng.choice(["revenu", "dépense", "dépense"]), "divers", rng.randint(100, 50000) / 100,
+          (start + timedelta(days=rng.randint(0, 5 * 365))).isoformat()) for _ in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_days(df, month):
+    """_get_days_with_transactions avant le résumé par jour."""
+    df_copy = df.copy()
+    df_copy["date"] = pd.to_datetime(df_copy["date"])
+    df_month = df_copy[(df_copy["date"].dt.year == month.year) & (df_copy["date"].dt.month == month.month)]
+    days_info = {}
+    for _, row in df_month.iterrows():
+        day = row["date"].day
+        if day not in days_info:
+            days_info[day] = {"has_revenue": False, "has_expense": False, "count": 0}
+        days_info[day]["count"] += 1
+        if row["type"] == "revenu":
+            days_info[day]["has_revenue"] = True
+        else:
+            days_info[day]["has_expense"] = True
+    return days_info
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark résumé par jour du calendrier")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    month = date.today().replace(day=1) - timedelta(days=200)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        init_db(db_path)
+        fill(db_path, args.rows, random.Random(42))
+        df = TransactionFrameCache(db_path).get()
+
+        print("=" * 70)
+        print(f"{args.rows} transactions sur 5 ans, mois affiché : {month:%m/%Y}")
+        print("=" * 70)
+        old_time, old = best_of(args.repeat, lambda: legacy_days(df, month))
+
+        start = time.perf_counter()
+        summary = get_day_summary(db_path)
+        build = time.perf_counter() - start
+        new_time, new = best_of(args.repeat, lambda: get_day_summary(db_path).month(month))
+        identical = old == {day: {k: info[k] for k in ("has_revenue", "has_expense", "count")}
+                            for day, info in new.items()}
+
+        print(f"Par affichage, copie + iterrows() : {old_time * 1000:8.1f} ms")
+        print(f"Construction du résumé            : {build * 1000:8.1f} ms ({len(summary)} jours, une fois par révision)")
+        print(f"Par affichage, résumé par jour    : {new_time * 1000:8.2f} ms (x{old_time / new_time:.0f}, "
+              f"jeton de révision compris) | identiques : {identical}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du coût de connexion SQLite par rendu de page.
+
+Compare l'ancienne stratégie (un sqlite3.connect + PRAGMA par appel du
+repository) avec le pool de connexions de shared.database.connection.
+Travaille sur une base temporaire : la base de production n'est pas touchée.
+
+Usage :
+    python scripts/bench_db_connections.py [--renders 50] [--calls 40]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.database.connection import ConnectionPool
+from shared.database.schema import init_db
+
+
+def legacy_connection(db_path: str) -> sqlite3.Connection:
+    """Reproduit l'ancien get_db_connection() (connexion neuve à chaque appel)."""
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA busy_timeout = 30000")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def simulate_call(conn: sqlite3.Connection) -> None:
+    """Requête typique d'un appel repository (lecture par ID)."""
+    conn.execute("SELECT * FROM transactions WHERE id = ?", (1,)).fetchone()
+
+
+def bench_legacy(db_path: str, renders: int, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(renders):
+        for _ in range(calls):
+            conn = legacy_connection(db_path)
+            simulate_call(conn)
+            conn.close()
+    return time.perf_counter() - start
+
+
+def bench_pool(db_path: str, renders: int, calls: int) -> float:
+    pool = ConnectionPool(db_path)
+    start = time.perf_counter()
+    for _ in range(renders):
+        for _ in range(calls):
+            with pool.connection() as conn:
+                simulate_call(conn)
+    elapsed = time.perf_counter() - start
+    pool.close_all()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=50, help="Nombre de rendus de page simulés")
+    parser.add_argument("--calls", type=int, default=40, help="Appels repository par rendu")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        init_db(db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                INSERT INTO transactions (type, categorie, sous_categorie, montant, date)
+                VALUES ('dépense', 'Alimentation', 'Courses', 12.5, '2024-01-01')
+            """)
+
+        legacy = bench_legacy(db_path, args.renders, args.calls)
+        pooled = bench_pool(db_path, args.renders, args.calls)
+
+        print("=" * 70)
+        print(f"CONNEXIONS PAR RENDU ({args.calls} appels x {args.renders} rendus)")
+        print("=" * 70)
+        print(f"   Ancien (connect par appel) : {legacy / args.renders * 1000:8.2f} ms / rendu")
+        print(f"   Pool (thread-local)        : {pooled / args.renders * 1000:8.2f} ms / rendu")
+        print(f"   Gain                       : x{legacy / pooled:.1f}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(db_path + suffix)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la recherche des fichiers associés aux transactions.
+
+Compare, sur une arborescence de tickets et une base temporaires, l'ancienne
+recherche (un listdir du dossier categorie/sous_categorie par transaction) à
+l'index des fichiers : recherche transaction par transaction, puis liste des
+transactions importées sans ticket (boucle Python vs une seule requête SQL).
+Vérifie que les résultats sont identiques.
+
+Usage :
+    python scripts/bench_file_lookup.py [--transactions 5000] [--categories 20] [--files 20000]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.transactions import export_service
+from shared.database.schema import init_db
+from shared.services import files
+from shared.services.file_index import FileIndex
+
+
+class _NoIndex:
+    """Aucun dossier indexé : trouver_fichiers_associes lit les dossiers."""
+
+    def is_indexed(self, base_dir):
+        return False
+
+
+def make_tree(tmp, args, rng):
+    sorted_dir, revenus_dir = os.path.join(tmp, "sorted"), os.path.join(tmp, "revenus")
+    folders = [(f"Categorie{c}", f"Sous{s}") for c in range(args.categories) for s in range(10)]
+    for base in (sorted_dir, revenus_dir):
+        for categorie, sous_categorie in folders:
+            os.makedirs(os.path.join(base, categorie, sous_categorie))
+
+    transactions = []
+    for tid in range(1, args.transactions + 1):
+        categorie, sous_categorie = rng.choice(folders)
+        kind = rng.choice(["dépense", "dépense", "dépense", "revenu"])
+        transactions.append((tid, kind, categorie, sous_categorie, 10.0, "2024-01-01", "import_csv"))
+
+    for i in range(args.files):
+        categorie, sous_categorie = rng.choice(folders[: len(folders) // 2])
+        base = sorted_dir if i % 4 else revenus_dir
+        name = f"{rng.randint(1, args.transactions * 2)}.jpg" if i % 3 else f"ticket_{i}.jpg"
+        open(os.path.join(base, categorie, sous_categorie, name), "wb").close()
+
+    # Dossiers d'archive : dernière modification il y a une heure
+    old = time.time() - 3600
+    for base in (sorted_dir, revenus_dir):
+        for root, _, _ in os.walk(base):
+            os.utime(root, (old, old))
+    return sorted_dir, revenus_dir, transactions
+
+
+def lookup_all(transactions):
+    keys = ("id", "type", "categorie", "sous_categorie", "montant", "date", "source")
+    start = time.perf_counter()
+    found = [files.trouver_fichiers_associes(dict(zip(keys, row))) for row in transactions]
+    return time.perf_counter() - start, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recherche fichiers associés")
+    parser.add_argument("--transactions", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--files", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        sorted_dir, revenus_dir, transactions = make_tree(tmp, args, random.Random(42))
+        db_path = os.path.join(tmp, "bench.db")
+        init_db(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.executemany("""
+            INSERT INTO transactions (id, type, categorie, sous_categorie, montant, date, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, transactions)
+        conn.commit()
+        conn.close()
+
+        for module in (files, export_service):
+            module.SORTED_DIR, module.REVENUS_TRAITES = sorted_dir, revenus_dir
+
+        print("=" * 70)
+        print(f"{len(transactions)} transactions, {args.files} fichiers, {args.categories * 10 * 2} dossiers")
+        print("=" * 70)
+
+        files.get_file_index = lambda: _NoIndex()
+        old_lookup, old_found = lookup_all(transactions)
+        start = time.perf_counter()
+        old_missing = sorted(row[0] for row, found in zip(transactions, old_found) if not found)
+        old_export = old_lookup + time.perf_counter() - start
+
+        index = FileIndex(base_dirs=[sorted_dir, revenus_dir], db_path=db_path)
+        files.get_file_index = export_service.get_file_index = lambda: index
+        start = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - start
+        new_lookup, new_found = lookup_all(transactions)
+        start = time.perf_counter()
+        new_missing = sorted(t["id"] for t in export_service.get_transactions_sans_tickets(db_path=db_path))
+        new_export = time.perf_counter() - start
+        fresh = FileIndex(base_dirs=[sorted_dir, revenus_dir], db_path=db_path)
+        export_service.get_file_index = lambda: fresh
+        start = time.perf_counter()
+        export_service.get_transactions_sans_tickets(db_path=db_path)
+        reload_export = time.perf_counter() - start
+
+        n = len(transactions)
+        print(f"Construction de l'index (à froid)    : {build * 1000:8.1f} ms")
+        print(f"Recherche, listdir par transaction   : {old_lookup / n * 1e6:8.1f} µs/transaction")
+        print(f"Recherche, index                     : {new_lookup / n * 1e6:8.1f} µs/transaction "
+              f"(x{old_lookup / new_lookup:.1f})")
+        print(f"Sans ticket, boucle Python           : {old_export * 1000:8.1f} ms")
+        print(f"Sans ticket, requête SQL + refresh   : {new_export * 1000:8.1f} ms (x{old_export / new_export:.1f})")
+        print(f"Sans ticket, nouveau processus       : {reload_export * 1000:8.1f} ms "
+              f"(x{old_export / reload_export:.1f}, index relu depuis la base)")
+        same = sum(sorted(a) == sorted(b) for a, b in zip(old_found, new_found))
+        print(f"Fichiers identiques : {same}/{n} | sans ticket identiques : {old_missing == new_missing} "
+              f"({len(new_missing)})")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
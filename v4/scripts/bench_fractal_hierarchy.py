@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la construction de la hiérarchie fractale.
+
+Compare l'ancienne construction (filtre + groupby par type puis par
+catégorie, itération iterrows) avec l'agrégation unique
+groupby(['type', 'categorie', 'sous_categorie']) et vérifie que les deux
+dictionnaires sont identiques (montants à l'arrondi flottant près).
+
+Usage :
+    python scripts/bench_fractal_hierarchy.py [--rows 200000] [--categories 500]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.services import fractal
+
+
+def legacy_hierarchy(df_all: pd.DataFrame) -> dict:
+    """Reproduit l'ancienne boucle imbriquée de _build_fractal_hierarchy_impl."""
+    hierarchy = {}
+    hierarchy['TR'] = {'code': 'TR', 'label': 'Univers Financier', 'total': float(df_all['montant'].sum()),
+                       'color': '#ffffff', 'parent': None, 'children': [], 'level': 0}
+    for tx_type in df_all['type'].unique():
+        df_type = df_all[df_all['type'] == tx_type]
+        type_total = df_type['montant'].sum()
+        type_code = 'REVENUS' if tx_type.lower() == 'revenu' else 'DEPENSES'
+        type_label = 'Revenus' if tx_type.lower() == 'revenu' else 'Dépenses'
+        hierarchy[type_code] = {'code': type_code, 'label': type_label, 'total': float(type_total),
+                                'color': fractal.get_type_color(tx_type), 'parent': 'TR', 'children': [], 'level': 1}
+        hierarchy['TR']['children'].append(type_code)
+
+        categories = df_type.groupby('categorie').agg({
+            'montant': ['sum', 'count'],
+            'sous_categorie': lambda x: x.notna().sum()
+        }).reset_index()
+        categories.columns = ['categorie', 'montant', 'count', 'subcategories']
+        categories = categories.sort_values('montant', ascending=False)
+
+        for _, cat_row in categories.iterrows():
+            cat_name = cat_row['categorie']
+            cat_amount = float(cat_row['montant'])
+            cat_code = f"CAT_{type_code}_{cat_name.upper().replace(' ', '_').replace('-', '_')}"
+            cat_color = fractal.get_category_color(cat_name, tx_type)
+            hierarchy[cat_code] = {
+                'code': cat_code, 'label': cat_name, 'amount': cat_amount,
+                'percentage': float((cat_amount / type_total * 100) if type_total > 0 else 0),
+                'color': cat_color, 'parent': type_code, 'children': [],
+                'transactions': int(cat_row['count']), 'level': 2
+            }
+            hierarchy[type_code]['children'].append(cat_code)
+
+            df_category = df_type[df_type['categorie'] == cat_name]
+            subcategories = df_category[df_category['sous_categorie'].notna()].groupby('sous_categorie').agg({
+                'montant': ['sum', 'count']
+            }).reset_index()
+            subcategories.columns = ['sous_categorie', 'montant', 'count']
+            subcategories = subcategories.sort_values('montant', ascending=False)
+
+            for _, subcat_row in subcategories.iterrows():
+                subcat_name = subcat_row['sous_categorie']
+                subcat_amount = float(subcat_row['montant'])
+                subcat_code = f"SUBCAT_{type_code}_{cat_name.upper().replace(' ', '_').replace('-', '_')}_" \
+                              f"{subcat_name.upper().replace(' ', '_').replace('-', '_')}"
+                hierarchy[subcat_code] = {
+                    'code': subcat_code, 'label': subcat_name, 'amount': subcat_amount,
+                    'percentage': float((subcat_amount / cat_amount * 100) if cat_amount > 0 else 0),
+                    'color': fractal._darken_color(cat_color, 0.85), 'parent': cat_code, 'children': [],
+                    'transactions': int(subcat_row['count']), 'level': 3
+                }
+                hierarchy[cat_code]['children'].append(subcat_code)
+    return hierarchy
+
+
+def make_frame(rows: int, nb_categories: int) -> pd.DataFrame:
+    rng = random.Random(3)
+    categories = [f"Categorie {i}" for i in range(nb_categories)]
+    records = []
+    for _ in range(rows):
+        categorie = rng.choice(categories)
+        records.append({
+            'type': 'revenu' if rng.random() < 0.1 else 'dépense',
+            'categorie': categorie,
+            'sous_categorie': None if rng.random() < 0.05 else f"{categorie} - sous {rng.randint(0, 5)}",
+            'montant': rng.randint(100, 100_000) / 100,
+        })
+    return pd.DataFrame(records)
+
+
+def same_hierarchy(expected: dict, actual: dict) -> bool:
+    if list(expected) != list(actual):
+        return False
+    for code, node in expected.items():
+        other = actual[code]
+        if node.keys() != other.keys():
+            return False
+        for key, value in node.items():
+            if isinstance(value, float):
+                if not math.isclose(value, other[key], rel_tol=1e-9, abs_tol=1e-9):
+                    return False
+            elif value != other[key]:
+                return False
+    return True
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Nombre de transactions")
+    parser.add_argument("--categories", type=int, default=500, help="Nombre de catégories")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.categories)
+    fractal.TransactionRepository.get_all = staticmethod(lambda: df.copy())
+
+    expected, legacy_ms = timed(legacy_hierarchy, df.copy())
+    actual, groupby_ms = timed(fractal._build_fractal_hierarchy_impl)
+
+    print("=" * 70)
+    print(f"HIÉRARCHIE FRACTALE ({args.rows} transactions, {args.categories} catégories)")
+    print("=" * 70)
+    print(f"   Noeuds                  : {len(actual)}")
+    print(f"   Boucles imbriquées      : {legacy_ms:9.1f} ms")
+    print(f"   groupby unique          : {groupby_ms:9.1f} ms  (x{legacy_ms / groupby_ms:.1f})")
+    identical = same_hierarchy(expected, actual)
+    print(f"   Dictionnaires identiques: {identical}")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
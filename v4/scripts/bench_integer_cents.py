@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark des montants en centimes entiers.
+
+Sur une base temporaire, compare les montants REAL aux centimes entiers :
+- recherche des doublons de l'import (égalité REAL sur idx(date, montant)
+  vs égalité entière sur l'index d'expression idx_transactions_date_cents)
+- sommes SQL par catégorie (SUM(montant) vs SUM des centimes) : temps et
+  nombre de totaux qui diffèrent du total exact au centime
+- sommes pandas par mois et type (float64 + round(2) vs int64)
+
+Usage :
+    python scripts/bench_integer_cents.py [--rows 1000000] [--keys 50000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.database.schema import init_db
+from shared.utils import cents_sql, to_cents_series
+
+CATEGORIES = ["alimentation", "transport", "logement", "loisirs", "sante", "cafe", "abonnements"]
+
+
+def fill(db_path, rows, rng):
+    start = date.today() - timedelta(days=10 * 365)
+    data = [(rng.choice(["revenu", "dépense"]), rng.choice(CATEGORIES), rng.randint(1, 50000) / 100,
+             (start + timedelta(days=rng.randint(0, 10 * 365))).isoformat()) for _ in range(rows)]
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO transactions (type, categorie, montant, date) VALUES (?, ?, ?, ?)", data)
+    conn.execute("CREATE INDEX idx_bench_date_montant ON transactions(date, montant)")
+    conn.commit()
+    conn.close()
+    return data
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def lookup(conn, keys, amount, index):
+    """Clés (date, montant) déjà présentes, comme _existing_positions."""
+    conn.execute("DROP TABLE IF EXISTS temp.k")
+    conn.execute("CREATE TEMP TABLE k (position INTEGER PRIMARY KEY, date TEXT, montant)")
+    conn.executemany("INSERT INTO k VALUES (?, ?, ?)", keys)
+    return [row[0] for row in conn.execute(f"""
+        SELECT k.position FROM k WHERE EXISTS (
+            SELECT 1 FROM transactions t INDEXED BY {index}
+            WHERE t.date = k.date AND {amount} = k.montant)
+    """)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark centimes entiers")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--keys", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        init_db(db_path)
+        data = fill(db_path, args.rows, rng)
+        sample = rng.sample(data, args.keys)
+        float_keys = [(i, row[3], row[2]) for i, row in enumerate(sample)]
+        cents_keys = [(i, row[3], round(row[2] * 100)) for i, row in enumerate(sample)]
+
+        print("=" * 70)
+        print(f"{args.rows} transactions, {args.keys} clés d'import à vérifier")
+        print("=" * 70)
+        conn = sqlite3.connect(db_path)
+        old_time, old = best_of(args.repeat, lambda: lookup(conn, float_keys, "t.montant", "idx_bench_date_montant"))
+        new_time, new = best_of(args.repeat, lambda: lookup(
+            conn, cents_keys, cents_sql("t.montant"), "idx_transactions_date_cents"))
+        print(f"Doublons, égalité REAL     : {old_time * 1000:7.1f} ms")
+        print(f"Doublons, égalité centimes : {new_time * 1000:7.1f} ms (x{old_time / new_time:.2f}) | "
+              f"mêmes lignes : {sorted(old) == sorted(new)}")
+        print("-" * 70)
+
+        exact = {}
+        for kind, categorie, montant, _ in data:
+            exact[(kind, categorie)] = exact.get((kind, categorie), Decimal(0)) + Decimal(str(montant))
+        old_time, floats = best_of(args.repeat, lambda: conn.execute(
+            "SELECT type, categorie, SUM(montant) FROM transactions GROUP BY 1, 2").fetchall())
+        new_time, cents = best_of(args.repeat, lambda: conn.execute(
+            f"SELECT type, categorie, SUM({cents_sql()}) FROM transactions GROUP BY 1, 2").fetchall())
+        float_off = sum(Decimal(repr(total)) != exact[(k, c)] for k, c, total in floats)
+        cents_off = sum(Decimal(total) / 100 != exact[(k, c)] for k, c, total in cents)
+        print(f"SUM SQL REAL     : {old_time * 1000:7.1f} ms | {float_off}/{len(floats)} totaux inexacts sans arrondi")
+        print(f"SUM SQL centimes : {new_time * 1000:7.1f} ms | {cents_off}/{len(cents)} totaux inexacts sans arrondi")
+        conn.close()
+        print("-" * 70)
+
+        df = pd.DataFrame(data, columns=["type", "categorie", "montant", "date"])
+        df["mois"] = df["date"].str[:7]
+        df["montant_cents"] = to_cents_series(df["montant"])
+        old_time, _ = best_of(args.repeat, lambda: df.groupby(["mois", "type"])["montant"].sum().round(2))
+        new_time, _ = best_of(args.repeat, lambda: df.groupby(["mois", "type"])["montant_cents"].sum() / 100)
+        print(f"pandas float64 + round(2) : {old_time * 1000:7.1f} ms")
+        print(f"pandas int64 / 100        : {new_time * 1000:7.1f} ms (x{old_time / new_time:.2f})")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la table monthly_rollup (sommes par mois tenues par triggers).
+
+Mesure, sur une base temporaire, les requêtes des graphiques mensuels et des
+soldes (évolution mois x type sur tout l'historique, dépenses par catégorie
+sur 12 mois entiers, solde global) : GROUP BY sur les transactions vs lecture
+de monthly_rollup. Mesure aussi le surcoût des triggers à l'insertion par lot
+et la durée d'une reconstruction complète. Vérifie que les sommes sont
+identiques.
+
+Usage :
+    python scripts/bench_monthly_rollup.py [--rows 1000000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.transactions.repository import TransactionRepository
+from shared.database import db_connection
+from shared.database.rollup import rebuild_monthly_rollup
+from shared.database.schema import init_db
+
+CATEGORIES = {"alimentation": ["courses", "restaurant"], "transport": ["essence", "peage"],
+              "logement": ["loyer", "electricite"], "loisirs": ["cinema", "sport"],
+              "sante": ["pharmacie", "medecin"], "salaire": ["net"], "uber": ["courses"]}
+
+
+def make_rows(count, rng):
+    """Transactions réparties sur 10 ans jusqu'à aujourd'hui."""
+    start = date.today() - timedelta(days=10 * 365)
+    rows = []
+    for _ in range(count):
+        categorie = rng.choice(list(CATEGORIES))
+        rows.append(("revenu" if categorie in ("salaire", "uber") else "dépense", categorie,
+                     rng.choice(CATEGORIES[categorie]), rng.randint(100, 50000) / 100,
+                     (start + timedelta(days=rng.randint(0, 10 * 365))).isoformat()))
+    return rows
+
+
+def insert(db_path, rows):
+    conn = sqlite3.connect(db_path)
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO transactions (type, categorie, sous_categorie, montant, date) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def same(a, b):
+    a, b = a.fillna(""), b.fillna("")
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    for column in a.columns:
+        for x, y in zip(a[column], b[column]):
+            if x != y and not (isinstance(x, float) and math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6)):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark monthly_rollup")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rows = make_rows(args.rows, random.Random(42))
+    today = date.today()
+    debut_12_mois = (today.replace(day=1) - timedelta(days=365)).replace(day=1)
+    fin_mois_dernier = today.replace(day=1) - timedelta(days=1)
+    queries = [
+        ("Évolution mois x type (tout)", dict(group_by=["type"], period="month")),
+        ("Dépenses par catégorie (12 mois)", dict(group_by=["categorie"], transaction_type="dépense",
+                                                  start_date=debut_12_mois, end_date=fin_mois_dernier)),
+        ("Solde global par type", dict(group_by=["type"])),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_plain, db_rollup = os.path.join(tmp, "plain.db"), os.path.join(tmp, "rollup.db")
+        for db_path in (db_plain, db_rollup):
+            init_db(db_path)
+        conn = sqlite3.connect(db_plain)
+        for trigger in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER trg_monthly_rollup_{trigger}")
+        conn.close()
+
+        print("=" * 70)
+        print(f"{args.rows} transactions sur 10 ans, {len(CATEGORIES)} catégories")
+        print("=" * 70)
+        plain_insert = insert(db_plain, rows)
+        rollup_insert = insert(db_rollup, rows)
+        start = time.perf_counter()
+        rollup_rows = rebuild_monthly_rollup(db_rollup)
+        rebuild = time.perf_counter() - start
+        print(f"Insertion par lot sans triggers : {plain_insert:6.2f} s")
+        print(f"Insertion par lot avec triggers : {rollup_insert:6.2f} s (+{(rollup_insert / plain_insert - 1) * 100:.0f} %)")
+        print(f"Reconstruction complète        : {rebuild:6.2f} s ({rollup_rows} lignes de rollup)")
+        print("-" * 70)
+
+        for label, kwargs in queries:
+            with db_connection(db_rollup) as conn:
+                raw_time, raw = best_of(args.repeat, lambda: TransactionRepository._sum_rows(
+                    conn, kwargs["group_by"], kwargs.get("period"), kwargs.get("transaction_type"), None,
+                    kwargs.get("start_date"), kwargs.get("end_date")))
+            rollup_time, rolled = best_of(args.repeat, lambda: TransactionRepository.sum_by(db_path=db_rollup, **kwargs))
+            print(f"{label:34} : transactions {raw_time * 1000:7.1f} ms | rollup {rollup_time * 1000:6.1f} ms "
+                  f"(x{raw_time / rollup_time:.0f}) | identiques : {same(raw, rolled[list(raw.columns)])}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark des moteurs OCR (pytesseract vs tesserocr).
+
+pytesseract lance l'exécutable tesseract et recharge le modèle fra+eng pour
+chaque image ; tesserocr garde une instance libtesseract chargée. Mesure,
+pour chaque moteur disponible, la latence à froid (création du moteur +
+première image) et la latence moyenne par image moteur chaud, et vérifie que
+les textes obtenus sont identiques.
+
+Usage :
+    python scripts/bench_ocr_engine.py [--images 20]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.ocr.preprocessing import preprocess_image
+from domains.ocr.scanner import PytesseractEngine, TesserocrEngine
+
+
+def make_receipt(rng):
+    lines, total = ["SUPERMARCHE", "12/03/2024 10:42"], 0.0
+    for i in range(rng.randint(6, 14)):
+        price = rng.randint(50, 2500) / 100
+        total += price
+        lines.append(f"ARTICLE {i + 1}   {price:.2f}".replace(".", ","))
+    lines.append(f"TOTAL TTC   {total:.2f}".replace(".", ","))
+    image = np.full((60 * len(lines) + 100, 900, 3), 245, dtype=np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(image, text, (40, 80 + i * 60), cv2.FONT_HERSHEY_SIMPLEX, 1.1, (20, 20, 20), 2)
+    processed, _ = preprocess_image(image)
+    return Image.fromarray(processed)
+
+
+def bench(engine_cls, images):
+    start = time.perf_counter()
+    engine = engine_cls()
+    first = engine.image_to_string(images[0])
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    texts = [first] + [engine.image_to_string(image) for image in images[1:]]
+    warm = (time.perf_counter() - start) / max(len(images) - 1, 1)
+    engine.close()
+    return cold, warm, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark moteurs OCR")
+    parser.add_argument("--images", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    images = [make_receipt(rng) for _ in range(args.images)]
+
+    print("=" * 70)
+    print(f"{len(images)} tickets prétraités (profil par défaut)")
+    print("=" * 70)
+
+    results = {}
+    for engine_cls in (PytesseractEngine, TesserocrEngine):
+        try:
+            cold, warm, texts = bench(engine_cls, images)
+        except Exception as e:
+            print(f"{engine_cls.name:12s} : indisponible ({type(e).__name__}: {str(e).splitlines()[0][:60]})")
+            continue
+        results[engine_cls.name] = (warm, texts)
+        print(f"{engine_cls.name:12s} : à froid {cold * 1000:8.1f} ms | chaud {warm * 1000:8.1f} ms/image")
+
+    if len(results) == 2:
+        (w_sub, t_sub), (w_api, t_api) = results["pytesseract"], results["tesserocr"]
+        same = [a.replace("\x0c", "").strip() == b.replace("\x0c", "").strip() for a, b in zip(t_sub, t_api)]
+        print(f"Gain moteur chaud : x{w_sub / w_api:.1f} | textes identiques : {sum(same)}/{len(same)}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
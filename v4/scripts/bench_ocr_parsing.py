@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la détection de montant OCR (méthodes A et B).
+
+Compare l'implémentation historique (un appel à get_montant_from_line par
+pattern YAML, nettoyage des lignes et re.search refaits à chaque appel) avec
+le jeu de patterns compilé de PatternManager, en tickets par seconde, et
+vérifie que les montants détectés sont identiques.
+
+Corpus : fichiers .txt d'un dossier (--corpus), sinon les textes enregistrés
+dans le cache OCR, sinon des tickets synthétiques.
+
+Usage :
+    python scripts/bench_ocr_parsing.py [--corpus DOSSIER] [--tickets 500] [--repeat 3]
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OCR_CACHE_DB
+from domains.ocr.parsers import _normalize_ocr_text, _detect_amount_method_a, _detect_amount_method_b
+from domains.ocr.pattern_manager import get_pattern_manager
+from shared.utils import safe_convert
+
+
+# ----------------------------------------------------------------------
+# Implémentation historique (référence)
+# ----------------------------------------------------------------------
+
+def legacy_get_montant_from_line(label_pattern, all_lines, allow_next_line=True):
+    montant_regex = r"(\d{1,5}[.,]?\d{0,2})\s*(?:€|eur|euros?)?"
+
+    def clean_ocr_text(txt):
+        txt = re.sub(r'(\d)[Oo](\d)', r'\g<1>0\g<2>', txt)
+        txt = re.sub(r'(\d)[Oo](?=\s|$|,|\.)', r'\g<1>0', txt)
+        txt = re.sub(r'(^|[\s,\.])[Oo](\d)', r'\g<1>0\g<2>', txt)
+        txt = re.sub(r'(\d)[Il](\d)', r'\g<1>1\g<2>', txt)
+        txt = re.sub(r'(\d)[Il](?=\s|$|,|\.)', r'\g<1>1', txt)
+        txt = re.sub(r'(^|[\s,\.])[Il](\d)', r'\g<1>1\g<2>', txt)
+        txt = re.sub(r"[\u200b\s]+", " ", txt)
+        return txt.strip()
+
+    for i, l in enumerate(all_lines):
+        l_clean = clean_ocr_text(l)
+        if re.search(label_pattern, l_clean, re.IGNORECASE):
+            found_same = re.findall(montant_regex, l_clean, re.IGNORECASE)
+            if found_same:
+                return (safe_convert(max(found_same, key=lambda x: safe_convert(x))), True)
+            if allow_next_line and i + 1 < len(all_lines):
+                next_line = clean_ocr_text(all_lines[i + 1])
+                found_next = re.findall(montant_regex, next_line, re.IGNORECASE)
+                if found_next:
+                    return (safe_convert(max(found_next, key=lambda x: safe_convert(x))), True)
+    return (0.0, False)
+
+
+def legacy_detect(lines):
+    pattern_mgr = get_pattern_manager()
+    montants = []
+    for pattern in pattern_mgr.get_amount_patterns():
+        montant, matched = legacy_get_montant_from_line(pattern, lines, allow_next_line=True)
+        if matched and montant > 0:
+            montants.append(round(montant, 2))
+
+    found = []
+    for line in lines:
+        if any(re.search(p, line, re.IGNORECASE) for p in pattern_mgr.get_payment_patterns()):
+            found.extend(safe_convert(v) for v in re.findall(r"(\d{1,5}[.,]\d{1,2})", line))
+    return montants, (round(sum(found), 2) if found else 0.0)
+
+
+def compiled_detect(lines):
+    montants, _ = _detect_amount_method_a(lines)
+    return montants, _detect_amount_method_b(lines)
+
+
+# ----------------------------------------------------------------------
+# Corpus
+# ----------------------------------------------------------------------
+
+def load_corpus(corpus_dir):
+    texts = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.lower().endswith(".txt"):
+            with open(os.path.join(corpus_dir, name), encoding="utf-8", errors="ignore") as f:
+                texts.append(f.read())
+    return texts
+
+
+def load_cached_texts():
+    if not os.path.exists(OCR_CACHE_DB):
+        return []
+    try:
+        conn = sqlite3.connect(OCR_CACHE_DB)
+        rows = conn.execute("SELECT text FROM ocr_cache WHERE length(text) > 0").fetchall()
+        conn.close()
+    except sqlite3.Error:
+        return []
+    return [row[0] for row in rows]
+
+
+def make_tickets(count):
+    rng = random.Random(42)
+    articles = ["PAIN", "LAIT 1L", "POMMES", "CAFE MOULU", "YAOURT X4", "PATES", "EAU 6X1.5L", "FROMAGE"]
+    tickets = []
+    for n in range(count):
+        lines = [rng.choice(["CARREFOUR MARKET", "E.LECLERC", "LIDL", "INTERMARCHE"]),
+                 "12 RUE DE LA REPUBLIQUE", f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2024 10:{rng.randint(10, 59)}"]
+        total = 0.0
+        for _ in range(rng.randint(5, 60)):
+            price = rng.randint(50, 2500) / 100
+            total += price
+            lines.append(f"{rng.choice(articles)} {price:.2f}".replace(".", ","))
+        total_str = f"{total:.2f}".replace(".", ",")
+        if rng.random() < 0.2:
+            total_str = total_str.replace("0", "O", 1)  # Erreur OCR typique
+        lines.append(rng.choice([f"TOTAL {len(lines) - 3} ARTICLES", "MONTANT REEL", "TOTAL TTC ="]) + f" {total_str} EUR")
+        lines.append(f"TVA 5,5% {total * 0.055:.2f}")
+        lines.append(f"CB {total:.2f}")
+        lines.append("MERCI DE VOTRE VISITE")
+        tickets.append("\n".join(lines))
+    return tickets
+
+
+def run(detect, corpus, repeat):
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [detect(lines) for lines in corpus]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark détection de montant OCR")
+    parser.add_argument("--corpus", help="Dossier de textes OCR (.txt)")
+    parser.add_argument("--tickets", type=int, default=500, help="Tickets synthétiques si aucun corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # Les méthodes journalisent chaque pattern trouvé
+
+    if args.corpus:
+        texts, source = load_corpus(args.corpus), args.corpus
+    else:
+        texts, source = load_cached_texts(), "cache OCR"
+        if not texts:
+            texts, source = make_tickets(args.tickets), "synthétique"
+    corpus = [_normalize_ocr_text(t) for t in texts]
+
+    print("=" * 70)
+    print(f"Corpus : {len(corpus)} tickets ({source}), "
+          f"{sum(len(c) for c in corpus) / max(len(corpus), 1):.0f} lignes en moyenne")
+    print(f"Patterns : {len(get_pattern_manager().get_amount_patterns())} montants, "
+          f"{len(get_pattern_manager().get_payment_patterns())} paiements")
+    print("=" * 70)
+
+    t_legacy, r_legacy = run(legacy_detect, corpus, args.repeat)
+    t_compiled, r_compiled = run(compiled_detect, corpus, args.repeat)
+
+    print(f"Historique : {len(corpus) / t_legacy:10.1f} tickets/s")
+    print(f"Compilé    : {len(corpus) / t_compiled:10.1f} tickets/s  (x{t_legacy / t_compiled:.1f})")
+    print(f"Résultats identiques : {r_legacy == r_compiled}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
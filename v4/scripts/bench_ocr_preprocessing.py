@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark des profils de prétraitement OCR.
+
+Pour chaque profil de OCR_PREPROCESSING_PROFILES : temps par étape, temps
+tesseract, latence de bout en bout, précision de détection du montant
+(parse_ticket_metadata_v2 comparé au montant attendu) et parité du montant
+détecté avec le profil 'legacy' (même montant, image par image).
+
+Corpus : images d'un dossier (--corpus) avec un fichier expected.json
+{"nom_image": montant}, sinon des photos de tickets synthétiques (12 MP,
+fond, ticket incliné). Sans tesseract installé, seuls les temps de
+prétraitement sont mesurés.
+
+Usage :
+    python scripts/bench_ocr_preprocessing.py [--corpus DOSSIER] [--tickets 10]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OCR_PREPROCESSING_PROFILES
+from domains.ocr.parsers import parse_ticket_metadata_v2
+from domains.ocr.preprocessing import preprocess_image
+from domains.ocr.scanner import OCR_LANG
+
+
+def make_photo(rng):
+    """Photo 4000x3000 d'un ticket incliné sur un fond sombre, et son total."""
+    lines, total = ["CARREFOUR MARKET", "12/03/2024 10:42"], 0.0
+    for i in range(rng.randint(6, 14)):
+        price = rng.randint(50, 2500) / 100
+        total += price
+        lines.append(f"ARTICLE {i + 1}   {price:.2f}".replace(".", ","))
+    lines += [f"TOTAL TTC   {total:.2f}".replace(".", ","), f"CB   {total:.2f}".replace(".", ",")]
+
+    paper = np.full((110 * len(lines) + 200, 1400), 245, dtype=np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(paper, text, (80, 160 + i * 110), cv2.FONT_HERSHEY_SIMPLEX, 2.2, 20, 5)
+
+    photo = np.full((4000, 3000), rng.randint(60, 110), dtype=np.uint8)
+    y, x = (4000 - paper.shape[0]) // 2, (3000 - paper.shape[1]) // 2
+    photo[y:y + paper.shape[0], x:x + paper.shape[1]] = paper
+    matrix = cv2.getRotationMatrix2D((1500, 2000), rng.uniform(-6, 6), 1.0)
+    photo = cv2.warpAffine(photo, matrix, (3000, 4000), borderMode=cv2.BORDER_REPLICATE)
+    noise = np.random.default_rng(rng.randint(0, 1000)).normal(0, 8, photo.shape)
+    photo = np.clip(photo + noise, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(photo, cv2.COLOR_GRAY2BGR), round(total, 2)
+
+
+def load_corpus(corpus_dir):
+    expected_path = os.path.join(corpus_dir, "expected.json")
+    expected = {}
+    if os.path.exists(expected_path):
+        with open(expected_path, encoding="utf-8") as f:
+            expected = json.load(f)
+    corpus = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.lower().endswith((".jpg", ".jpeg", ".png")):
+            image = cv2.imread(os.path.join(corpus_dir, name), cv2.IMREAD_COLOR)
+            if image is not None:
+                corpus.append((name, image, expected.get(name)))
+    return corpus
+
+
+def tesseract_available():
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prétraitement OCR")
+    parser.add_argument("--corpus", help="Dossier d'images de tickets (+ expected.json)")
+    parser.add_argument("--tickets", type=int, default=10, help="Tickets synthétiques si aucun corpus")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    if args.corpus:
+        corpus, source = load_corpus(args.corpus), args.corpus
+    else:
+        rng = random.Random(42)
+        corpus = [(f"synthetique_{i}", *make_photo(rng)) for i in range(args.tickets)]
+        source = "synthétique 12 MP"
+    with_ocr = tesseract_available()
+
+    print("=" * 70)
+    print(f"Corpus : {len(corpus)} images ({source})")
+    if not with_ocr:
+        print("tesseract introuvable : seuls les temps de prétraitement sont mesurés")
+    print("=" * 70)
+
+    # legacy d'abord : ses montants servent de référence pour la parité
+    profiles = sorted(OCR_PREPROCESSING_PROFILES, key=lambda p: p != "legacy")
+    reference = {}
+    for profile in profiles:
+        stages, t_ocr, correct, scored, same = {}, 0.0, 0, 0, 0
+        for name, image, expected in corpus:
+            processed, timings = preprocess_image(image, profile)
+            for stage, seconds in timings.items():
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+            if with_ocr:
+                start = time.perf_counter()
+                text = pytesseract.image_to_string(Image.fromarray(processed), lang=OCR_LANG)
+                t_ocr += time.perf_counter() - start
+                montant = parse_ticket_metadata_v2(text)["montant"]
+                reference.setdefault(name, montant)
+                same += abs(montant - reference[name]) < 0.01
+                if expected is not None:
+                    scored += 1
+                    correct += abs(montant - float(expected)) < 0.01
+
+        n = len(corpus)
+        t_pre = sum(stages.values())
+        print(f"\nProfil '{profile}' (sortie {processed.shape[1]}x{processed.shape[0]})")
+        for stage, seconds in stages.items():
+            print(f"  {stage:20s} {seconds / n * 1000:8.1f} ms/image")
+        print(f"  {'prétraitement':20s} {t_pre / n * 1000:8.1f} ms/image")
+        if with_ocr:
+            print(f"  {'tesseract':20s} {t_ocr / n * 1000:8.1f} ms/image")
+            print(f"  {'bout en bout':20s} {(t_pre + t_ocr) / n * 1000:8.1f} ms/image")
+            if scored:
+                print(f"  montant correct      {correct}/{scored} ({correct / scored * 100:.0f}%)")
+            if profile != "legacy":
+                print(f"  parité avec legacy   {same}/{n} ({same / n * 100:.0f}%)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'OCR par régions d'intérêt (ROI) vs OCR pleine page.
+
+Le mode ROI fait une passe de mise en page sur une image réduite, garde les
+lignes à mots-clés (total, paiement, TVA, date) et ne relit qu'elles en pleine
+résolution. Mesure, sur des tickets longs générés, la latence moyenne des deux
+modes, la part de pixels relue en ROI et vérifie que le montant détecté par
+parse_ticket_metadata est identique.
+
+Usage :
+    python scripts/bench_ocr_roi.py [--images 10] [--articles 40]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.ocr.preprocessing import preprocess_image
+from domains.ocr.parsers import parse_ticket_metadata_v2
+from domains.ocr.scanner import get_ocr_engine, get_roi_stats, _roi_ocr
+
+
+def make_receipt(rng, articles):
+    lines, total = ["SUPERMARCHE", "12/03/2024 10:42"], 0.0
+    for i in range(articles):
+        price = rng.randint(50, 2500) / 100
+        total += price
+        lines.append(f"ARTICLE {i + 1}   {price:.2f}".replace(".", ","))
+    lines += [f"TOTAL TTC   {total:.2f}".replace(".", ","), "CB", "MERCI DE VOTRE VISITE"]
+    image = np.full((60 * len(lines) + 100, 900, 3), 245, dtype=np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(image, text, (40, 80 + i * 60), cv2.FONT_HERSHEY_SIMPLEX, 1.1, (20, 20, 20), 2)
+    processed, _ = preprocess_image(image)
+    return processed, round(total, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR ROI")
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--articles", type=int, default=40)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    receipts = [make_receipt(rng, args.articles) for _ in range(args.images)]
+
+    print("=" * 70)
+    print(f"{len(receipts)} tickets de {args.articles} articles (profil par défaut)")
+    print("=" * 70)
+
+    try:
+        engine = get_ocr_engine()
+        engine.image_to_string(Image.fromarray(receipts[0][0]))  # Moteur chaud
+    except Exception as e:
+        print(f"Moteur OCR indisponible ({type(e).__name__}: {str(e).splitlines()[0][:60]})")
+        print("=" * 70)
+        return
+
+    full_time = roi_time = 0.0
+    fallbacks = same = correct = 0
+    for processed, expected in receipts:
+        start = time.perf_counter()
+        full_text = engine.image_to_string(Image.fromarray(processed))
+        full_time += time.perf_counter() - start
+
+        timings = {}
+        start = time.perf_counter()
+        roi_text = _roi_ocr(processed, engine, timings)
+        roi_time += time.perf_counter() - start
+        if roi_text is None:
+            fallbacks += 1
+            continue
+
+        montant = parse_ticket_metadata_v2(roi_text)["montant"]
+        same += parse_ticket_metadata_v2(full_text)["montant"] == montant
+        correct += abs(montant - expected) < 0.01
+
+    n = len(receipts)
+    share = get_roi_stats()["roi_pixel_share"] or 0.0
+    print(f"Pleine page : {full_time / n * 1000:8.1f} ms/ticket")
+    print(f"ROI         : {roi_time / n * 1000:8.1f} ms/ticket (mise en page + régions, "
+          f"{share * 100:.0f}% des pixels relus)")
+    print(f"Gain x{full_time / max(roi_time, 1e-9):.1f} | replis pleine page : {fallbacks}/{n}")
+    print(f"Montants ROI identiques au pleine page : {same}/{n - fallbacks} | "
+          f"égaux au total réel : {correct}/{n - fallbacks}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
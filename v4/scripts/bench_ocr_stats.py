@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'enregistrement des statistiques OCR.
+
+Compare, pour N scans journalisés, les anciennes mises à jour des fichiers
+JSON (lecture / modification / réécriture complète à chaque scan) avec le
+magasin SQLite à compteurs UPSERT, dans un dossier temporaire, et vérifie que
+les statistiques obtenues sont identiques.
+
+Usage :
+    python scripts/bench_ocr_stats.py [--scans 10000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.ocr.stats_store import OCRStatsStore
+
+DOCUMENT_TYPES = ["ticket", "facture", "uber", "fiche_paie"]
+PATTERNS = [f"PATTERN_{i}" for i in range(40)]
+LEVELS = ["exact"] * 7 + ["partial"] * 2 + ["failed"]
+
+
+# ----------------------------------------------------------------------
+# Implémentation historique (référence)
+# ----------------------------------------------------------------------
+
+def _load(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def _save(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def legacy_log_scan(json_dir, doc_type, patterns, level):
+    log_path = os.path.join(json_dir, "pattern_log.json")
+    data = _load(log_path)
+    data["ocr_success_fra+eng"] = data.get("ocr_success_fra+eng", 0) + 1
+    _save(log_path, data)
+
+    perf_path = os.path.join(json_dir, "performance_stats.json")
+    stats = _load(perf_path)
+    s = stats.setdefault(doc_type, {"total": 0, "success": 0, "partial": 0, "failed": 0,
+                                    "success_rate": 0.0, "correction_rate": 0.0})
+    s["total"] += 1
+    s[{"exact": "success", "partial": "partial"}.get(level, "failed")] += 1
+    s["success_rate"] = s["success"] / s["total"] * 100
+    s["correction_rate"] = s["failed"] / s["total"] * 100
+    _save(perf_path, stats)
+
+    pattern_path = os.path.join(json_dir, "pattern_stats.json")
+    stats = _load(pattern_path)
+    for pattern in patterns:
+        p = stats.setdefault(pattern, {"total_detections": 0, "success_count": 0, "partial_count": 0,
+                                       "failure_count": 0, "success_rate": 0.0, "reliability_score": 0.0})
+        p["total_detections"] += 1
+        p[{"exact": "success_count", "partial": "partial_count"}.get(level, "failure_count")] += 1
+        total = p["total_detections"]
+        p["success_rate"] = (p["success_count"] + p["partial_count"]) / total * 100
+        p["reliability_score"] = p["success_rate"] * min(total / 10, 1.0)
+    _save(pattern_path, stats)
+
+
+def store_log_scan(store, doc_type, patterns, level):
+    store.record_pattern_occurrence("ocr_success_fra+eng")
+    store.record_scan(doc_type, level)
+    store.record_patterns(patterns, level)
+
+
+def make_scans(count):
+    rng = random.Random(42)
+    return [
+        (rng.choice(DOCUMENT_TYPES), rng.sample(PATTERNS, rng.randint(1, 4)), rng.choice(LEVELS))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark statistiques OCR")
+    parser.add_argument("--scans", type=int, default=10_000)
+    args = parser.parse_args()
+
+    scans = make_scans(args.scans)
+
+    print("=" * 70)
+    print(f"{args.scans} scans journalisés, {len(PATTERNS)} patterns, {len(DOCUMENT_TYPES)} types")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir = os.path.join(tmp, "legacy")
+        store_dir = os.path.join(tmp, "store")
+        os.makedirs(legacy_dir)
+        os.makedirs(store_dir)
+
+        start = time.perf_counter()
+        for doc_type, patterns, level in scans:
+            legacy_log_scan(legacy_dir, doc_type, patterns, level)
+        t_legacy = time.perf_counter() - start
+
+        store = OCRStatsStore(db_path=os.path.join(store_dir, "ocr_stats.db"), json_dir=store_dir)
+        start = time.perf_counter()
+        for doc_type, patterns, level in scans:
+            store_log_scan(store, doc_type, patterns, level)
+        t_store = time.perf_counter() - start
+
+        legacy_perf = _load(os.path.join(legacy_dir, "performance_stats.json"))
+        legacy_perf.pop("last_updated", None)
+        store_perf = store.performance_stats()
+        store_perf.pop("last_updated", None)
+        identical = (
+            legacy_perf == store_perf
+            and _load(os.path.join(legacy_dir, "pattern_stats.json")) == store.pattern_stats()
+            and _load(os.path.join(legacy_dir, "pattern_log.json")) == store.pattern_occurrences()
+        )
+
+    print(f"JSON (lecture/réécriture) : {t_legacy:8.2f} s  ({t_legacy / args.scans * 1000:.2f} ms/scan)")
+    print(f"SQLite UPSERT             : {t_store:8.2f} s  ({t_store / args.scans * 1000:.2f} ms/scan)  (x{t_legacy / t_store:.1f})")
+    print(f"Statistiques identiques   : {identical}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
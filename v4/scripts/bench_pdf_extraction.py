@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'extraction de texte des PDF de revenus.
+
+Compare, sur un dossier de PDF (ou des relevés Uber / fiches de paie générés),
+l'ancienne extraction (pdfminer sur tout le document) à la lecture page par
+page limitée avec arrêt anticipé, à froid puis avec le cache par page. Vérifie
+que montant et date détectés sont identiques.
+
+Usage :
+    python scripts/bench_pdf_extraction.py [--folder DOSSIER] [--documents 20] [--pages 8]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.ocr import parsers_OLD_BACKUP as parsers
+from domains.ocr import pdf_text
+from domains.ocr.ocr_cache import OCRCache
+
+
+def write_pdf(path, pages):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        ops = "".join(f"BT /F1 10 Tf 40 {760 - 14 * i} Td ({line}) Tj ET\n" for i, line in enumerate(lines))
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}endstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    data, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def make_documents(folder, count, pages, rng):
+    """Relevés Uber et fiches de paie : champs en page 1, détail sur les suivantes."""
+    documents = []
+    for i in range(count):
+        month = rng.randint(1, 12)
+        detail = [[f"Ligne {p}-{j}   {rng.randint(100, 5000) / 100:.2f} EUR".replace(".", ",") for j in range(45)]
+                  for p in range(pages - 1)]
+        if i % 2 == 0:
+            first = ["Uber Eats - Releve", f"Periode de facturation : 01/{month:02d}/2025 - 28/{month:02d}/2025",
+                     f"Montant total a payer : {rng.randint(20000, 150000) / 100:.2f} EUR".replace(".", ",")]
+            kind = "uber"
+        else:
+            first = ["Bulletin de salaire", f"Periode 01/{month:02d}/2025 - 28/{month:02d}/2025",
+                     f"NET A PAYER {rng.randint(120000, 350000) / 100:.2f}".replace(".", ",")]
+            kind = "fiche_paie"
+        path = os.path.join(folder, f"{kind}_{i:03d}.pdf")
+        write_pdf(path, [first] + detail)
+        documents.append(path)
+    return documents
+
+
+def parse(path):
+    if "uber" in os.path.basename(path).lower():
+        return parsers.parse_uber_pdf(path)
+    return parsers.parse_fiche_paie(path)
+
+
+def run(documents, cache, legacy):
+    pdf_text.get_ocr_cache = lambda: cache
+    if legacy:
+        parsers.UBER_PDF_MAX_PAGES = parsers.FICHE_PAIE_MAX_PAGES = None
+        parsers._uber_fields_found = parsers._fiche_paie_fields_found = lambda text: False
+    start = time.perf_counter()
+    results = [parse(path) for path in documents]
+    return time.perf_counter() - start, [(r["montant"], r["date"]) for r in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction PDF")
+    parser.add_argument("--folder", help="Dossier de PDF (noms contenant 'uber' = relevé Uber)")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.folder:
+            documents = sorted(
+                os.path.join(args.folder, name) for name in os.listdir(args.folder) if name.lower().endswith(".pdf")
+            )
+        else:
+            documents = make_documents(tmp, args.documents, args.pages, random.Random(42))
+
+        print("=" * 70)
+        print(f"{len(documents)} PDF" + ("" if args.folder else f" générés ({args.pages} pages)"))
+        print("=" * 70)
+
+        new_cold, new_results = run(documents, None, legacy=False)
+        cache = OCRCache(db_path=os.path.join(tmp, "cache.db"))
+        run(documents, cache, legacy=False)
+        new_warm, _ = run(documents, cache, legacy=False)
+        old_time, old_results = run(documents, None, legacy=True)
+
+        n = len(documents)
+        print(f"Ancien (document entier)      : {old_time / n * 1000:8.1f} ms/PDF")
+        print(f"Pages + arrêt anticipé, froid : {new_cold / n * 1000:8.1f} ms/PDF (x{old_time / new_cold:.1f})")
+        print(f"Pages + arrêt anticipé, cache : {new_warm / n * 1000:8.1f} ms/PDF (x{old_time / new_warm:.1f})")
+        same = sum(a == b for a, b in zip(old_results, new_results))
+        print(f"Montant et date identiques : {same}/{n}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du backfill des récurrences.
+
+Compare l'ancienne boucle (un SELECT + un INSERT par occurrence) avec le
+backfill ensembliste à watermark, au premier passage et en régime établi
+(appel répété à chaque visite de page). Base temporaire uniquement.
+
+Usage :
+    python scripts/bench_recurrence_backfill.py [--recurrences 40] [--years 5]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.database.connection import get_pool
+from shared.database.migrations import run_migrations
+from shared.services.recurrence_generation import backfill_all_recurrences, _next_occurrence
+
+
+def legacy_backfill(db_path: str) -> int:
+    """Reproduit l'ancien backfill_all_recurrences (requête par occurrence)."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    today = date.today()
+    created = 0
+    recurrences = cursor.execute("""
+        SELECT type, categorie, sous_categorie, montant, date_debut, frequence, description
+        FROM recurrences WHERE statut = 'active'
+    """).fetchall()
+    for type_rec, categorie, sous_categorie, montant, date_debut, frequence, description in recurrences:
+        current = date.fromisoformat(date_debut)
+        while current is not None and current <= today:
+            existing = cursor.execute("""
+                SELECT id FROM transactions
+                WHERE categorie = ? AND sous_categorie = ?
+                  AND date = ? AND source = 'récurrente_auto'
+            """, (categorie, sous_categorie or '', current.isoformat())).fetchone()
+            if not existing:
+                cursor.execute("""
+                    INSERT INTO transactions
+                    (type, categorie, sous_categorie, montant, date, source, description)
+                    VALUES (?, ?, ?, ?, ?, 'récurrente_auto', ?)
+                """, (type_rec, categorie, sous_categorie or '', montant, current.isoformat(), description))
+                created += 1
+            current = _next_occurrence(current, frequence)
+    conn.commit()
+    conn.close()
+    return created
+
+
+def create_db(nb_recurrences: int, years: int) -> str:
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    run_migrations(db_path)
+    start = (date.today() - timedelta(days=365 * years)).isoformat()
+    conn = sqlite3.connect(db_path)
+    conn.executemany("""
+        INSERT INTO recurrences (type, categorie, sous_categorie, montant, date_debut, frequence, statut)
+        VALUES ('dépense', ?, ?, 9.99, ?, 'hebdomadaire', 'active')
+    """, [(f"Categorie {i}", f"Sous {i}", start) for i in range(nb_recurrences)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recurrences", type=int, default=40, help="Nombre de récurrences hebdomadaires")
+    parser.add_argument("--years", type=int, default=5, help="Ancienneté des récurrences (années)")
+    args = parser.parse_args()
+
+    legacy_db = create_db(args.recurrences, args.years)
+    batch_db = create_db(args.recurrences, args.years)
+    try:
+        created_legacy, legacy_first = timed(legacy_backfill, legacy_db)
+        _, legacy_steady = timed(legacy_backfill, legacy_db)
+
+        created_batch, batch_first = timed(backfill_all_recurrences, db_path=batch_db)
+        _, batch_steady = timed(backfill_all_recurrences, db_path=batch_db)
+
+        print("=" * 70)
+        print(f"BACKFILL ({args.recurrences} récurrences hebdomadaires sur {args.years} ans)")
+        print("=" * 70)
+        print(f"   Occurrences créées      : ancien={created_legacy}  ensembliste={created_batch}")
+        print(f"   Premier passage         : ancien={legacy_first:9.1f} ms  ensembliste={batch_first:9.1f} ms")
+        print(f"   Régime établi (visite)  : ancien={legacy_steady:9.1f} ms  ensembliste={batch_steady:9.1f} ms")
+    finally:
+        for db_path in (legacy_db, batch_db):
+            get_pool(db_path).close_all()
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.unlink(db_path + suffix)
+                except OSError:
+                    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'import d'un dossier de PDF de revenus.
+
+Compare l'ancienne boucle de la page Revenus (parsing séquentiel sur le thread
+Streamlit, un commit par revenu) au pipeline par lot (parsing dans un pool de
+processus, écrivain unique avec un seul commit). Travaille sur une base et
+des PDF temporaires, sans cache de pages : la base de production n'est pas
+touchée.
+
+Usage :
+    python scripts/bench_revenue_ingestion.py [--documents 40] [--pages 8] [--workers 4]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pdf_extraction import make_documents
+from domains.ocr import pdf_text
+from domains.revenues import revenues_service
+from domains.revenues.revenues_db import save_revenue_to_database
+from domains.revenues.revenues_service import (
+    process_single_revenue, process_revenues_batch, save_revenues_batch, prepare_revenue_for_db
+)
+from shared.database.schema import init_db
+
+
+def bench_sequential(files, db_path):
+    start = time.perf_counter()
+    revenues = [process_single_revenue(path) for path in files]
+    parsed = time.perf_counter() - start
+    for revenue in revenues:
+        save_revenue_to_database(prepare_revenue_for_db(revenue), db_path=db_path)
+    return parsed, time.perf_counter() - start, revenues
+
+
+def bench_batch(files, db_path, workers):
+    start = time.perf_counter()
+    results = sorted(process_revenues_batch(files, max_workers=workers), key=lambda r: r[0])
+    parsed = time.perf_counter() - start
+    revenues = [revenue for _, _, revenue, _ in results]
+    save_revenues_batch(revenues, bulk=True, db_path=db_path)
+    return parsed, time.perf_counter() - start, revenues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import des revenus")
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    pdf_text.get_ocr_cache = lambda: None  # Hérité par les workers (fork)
+    revenues_service.move_revenue_file = lambda *a, **k: None
+    revenues_service.log_revenue_scan = lambda *a, **k: None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = make_documents(tmp, args.documents, args.pages, random.Random(42))
+        db_old, db_new = os.path.join(tmp, "old.db"), os.path.join(tmp, "new.db")
+        init_db(db_old)
+        init_db(db_new)
+
+        print("=" * 70)
+        print(f"{len(files)} PDF de {args.pages} pages, {args.workers} worker(s)")
+        print("=" * 70)
+
+        old_parse, old_total, old_revenues = bench_sequential(files, db_old)
+        new_parse, new_total, new_revenues = bench_batch(files, db_new, args.workers)
+
+        print(f"Séquentiel, commit par revenu : parsing {old_parse:6.2f} s | total {old_total:6.2f} s")
+        print(f"Pool + écrivain unique        : parsing {new_parse:6.2f} s | total {new_total:6.2f} s "
+              f"(x{old_total / new_total:.1f})")
+        same = sum((a.montant, a.date) == (b.montant, b.date) for a, b in zip(old_revenues, new_revenues))
+        print(f"Montant et date identiques : {same}/{len(files)}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
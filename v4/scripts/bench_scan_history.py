@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la lecture de l'historique des scans OCR.
+
+Compare l'ancienne lecture (parsing complet de scan_history.jsonl à chaque
+rendu) avec la lecture par la fin et le filtrage par index de ScanHistory,
+sur un historique temporaire de N scans.
+
+Usage :
+    python scripts/bench_scan_history.py [--scans 50000] [--limit 50]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.ocr.scan_history import ScanHistory
+
+
+def legacy_history(path, document_type, limit):
+    scans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                scan = json.loads(line)
+                if document_type is None or scan.get("document_type") == document_type:
+                    scans.append(scan)
+            except json.JSONDecodeError:
+                continue
+    return scans[-limit:][::-1]  # Les plus récents d'abord, comme ScanHistory.tail
+
+
+def timed(func, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark historique des scans")
+    parser.add_argument("--scans", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    start_day = datetime(2023, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Segments assez grands pour garder un seul fichier actif, comme l'ancien format
+        history = ScanHistory(path=os.path.join(tmp, "scan_history.jsonl"), segment_max_bytes=1 << 40)
+        for i in range(args.scans):
+            history.append({
+                "timestamp": (start_day + timedelta(minutes=20 * i)).isoformat(),
+                "document_type": "revenu" if rng.random() < 0.05 else "ticket",
+                "filename": f"ticket_{i}.jpg",
+                "montants_detectes": [round(rng.uniform(1, 200), 2)],
+                "montant_choisi": round(rng.uniform(1, 200), 2),
+                "categorie": "Alimentation",
+                "sous_categorie": "Courses",
+                "patterns_detectes": ["TOTAL", "CB"],
+                "success_level": "exact",
+            })
+
+        print("=" * 70)
+        print(f"Historique : {args.scans} scans, {os.path.getsize(history.path) / 1e6:.1f} Mo, limite {args.limit}")
+        print("=" * 70)
+
+        for label, document_type in (("Tous les types", None), ("Filtre 'revenu'", "revenu")):
+            t_legacy, r_legacy = timed(legacy_history, history.path, document_type, args.limit)
+            t_tail, r_tail = timed(history.tail, args.limit, document_type)
+            print(f"{label:16s} : parsing complet {t_legacy * 1000:8.1f} ms | ScanHistory {t_tail * 1000:6.1f} ms "
+                  f"(x{t_legacy / t_tail:.0f}) | identiques : {r_legacy == r_tail}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'insertion par lot des transactions (import CSV).
+
+Compare l'ancienne boucle de insert_transaction_batch (validation, nettoyage,
+SELECT COUNT(*) de doublon puis INSERT ligne par ligne) au moteur d'import
+(normalisation par colonnes, une jointure de doublons sur table temporaire,
+executemany par blocs, un seul commit). Travaille sur deux bases temporaires
+pré-remplies ; vérifie que les tables obtenues sont identiques.
+
+Usage :
+    python scripts/bench_transaction_import.py [--rows 20000] [--existing 20000]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.revenues import process_uber_revenue
+from domains.transactions.import_service import bulk_insert_transactions
+from domains.transactions.service import normalize_category, normalize_subcategory
+from shared.database import db_connection
+from shared.database.schema import init_db
+from shared.utils import safe_convert, safe_date_convert, validate_transaction_data
+
+CATEGORIES = {
+    "alimentation": ["courses", "restaurant"], "transport": ["essence", "peage"],
+    "logement": ["loyer", "electricite"], "loisirs": ["cinema", "sport"], "uber": ["courses"],
+}
+
+
+def make_rows(count, rng):
+    """Lignes d'un relevé bancaire de 5 ans (montants et dates au format CSV)."""
+    start = date.today() - timedelta(days=5 * 365)
+    rows = []
+    for _ in range(count):
+        categorie = rng.choice(list(CATEGORIES))
+        rows.append({
+            "type": "revenu" if categorie == "uber" else "dépense",
+            "categorie": categorie,
+            "sous_categorie": rng.choice(CATEGORIES[categorie]),
+            "description": f"Opération {rng.randint(1, 999)}",
+            "montant": f"{rng.randint(100, 20000) / 100:.2f}".replace(".", ","),
+            "date": (start + timedelta(days=rng.randint(0, 5 * 365))).strftime("%d/%m/%Y"),
+            "source": "CSV Import",
+        })
+    return rows
+
+
+def legacy_insert(transactions, db_path):
+    """Ancienne boucle de insert_transaction_batch, sans l'affichage."""
+    with db_connection(db_path) as conn:
+        cur = conn.cursor()
+        for t in transactions:
+            if validate_transaction_data(t):
+                continue
+            clean_t = {
+                "type": str(t["type"]).strip().lower(),
+                "categorie": normalize_category(str(t.get("categorie", "")).strip()),
+                "sous_categorie": normalize_subcategory(str(t.get("sous_categorie", "")).strip()),
+                "description": str(t.get("description", "")).strip(),
+                "montant": safe_convert(t["montant"]),
+                "date": safe_date_convert(t["date"]).isoformat(),
+                "source": str(t.get("source", "manuel")).strip(),
+                "recurrence": str(t.get("recurrence", "")).strip(),
+                "date_fin": safe_date_convert(t.get("date_fin")).isoformat() if t.get("date_fin") else ""
+            }
+            if clean_t["type"] == "revenu":
+                clean_t, _ = process_uber_revenue(clean_t)
+            cur.execute("""
+                SELECT COUNT(*) FROM transactions
+                WHERE type = ? AND categorie = ? AND sous_categorie = ? AND montant = ? AND date = ?
+            """, (clean_t["type"], clean_t["categorie"], clean_t["sous_categorie"],
+                  float(clean_t["montant"]), clean_t["date"]))
+            if cur.fetchone()[0] > 0:
+                continue
+            cur.execute("""
+                INSERT INTO transactions
+                (type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, tuple(clean_t[k] for k in (
+                "type", "categorie", "sous_categorie", "description", "montant",
+                "date", "source", "recurrence", "date_fin")))
+        conn.commit()
+
+
+def table(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("""
+        SELECT type, categorie, sous_categorie, description, montant, date, source
+        FROM transactions ORDER BY id
+    """).fetchall()
+    conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import de transactions")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--existing", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    existing = make_rows(args.existing, rng)
+    # Un quart du fichier est déjà en base (réimport partiel)
+    rows = rng.sample(existing, args.rows // 4) + make_rows(args.rows - args.rows // 4, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_old, db_new = os.path.join(tmp, "old.db"), os.path.join(tmp, "new.db")
+        for db_path in (db_old, db_new):
+            init_db(db_path)
+            bulk_insert_transactions(existing, db_path=db_path)
+
+        print("=" * 70)
+        print(f"{len(rows)} lignes importées dans une base de {len(table(db_old))} transactions")
+        print("=" * 70)
+
+        start = time.perf_counter()
+        legacy_insert(rows, db_old)
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = bulk_insert_transactions(rows, db_path=db_new)
+        new_time = time.perf_counter() - start
+
+        print(f"Boucle ligne par ligne : {old_time:6.2f} s")
+        print(f"Moteur d'import        : {new_time:6.2f} s (x{old_time / new_time:.1f})")
+        print(f"Insérées {report.inserted} | doublons {report.duplicates} | invalides {len(report.invalid)}")
+        print(f"Tables identiques : {table(db_old) == table(db_new)}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
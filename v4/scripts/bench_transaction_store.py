@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du store typé des transactions (colonnes catégorielles).
+
+Compare, sur une base temporaire, le DataFrame de load_transactions (texte en
+chaînes, filtres .str.lower() ligne à ligne) au TransactionStore (catégories,
+clés déjà en minuscules, dates en datetime64[D]) : mémoire, temps de
+construction et filtres de la page Voir Transactions (plage du calendrier +
+plusieurs codes de l'arbre fractal). Vérifie que les lignes retenues sont
+identiques.
+
+Usage :
+    python scripts/bench_transaction_store.py [--rows 200000] [--categories 40] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domains.transactions.pages.helpers import get_fractal_code_mask, get_transactions_for_fractal_code
+from shared.database.schema import init_db
+from shared.services.transaction_cache import TransactionFrameCache
+from shared.services.transaction_store import TransactionStore
+
+
+def fill(db_path, rows, categories, rng):
+    start = date.today() - timedelta(days=5 * 365)
+    noms = [(f"Categorie{c}", [f"Sous{c}_{s}" for s in range(5)]) for c in range(categories)]
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO transactions (type, categorie, sous_categorie, montant, date, source, recurrence) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            ("revenu" if c < categories // 8 else "dépense", noms[c][0], rng.choice(noms[c][1]),
+             rng.randint(100, 50000) / 100, (start + timedelta(days=rng.randint(0, 5 * 365))).isoformat(),
+             rng.choice(["manuel", "OCR", "CSV Import"]), rng.choice([None, "mensuelle"]))
+            for c in (rng.randrange(categories) for _ in range(rows))
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def hierarchy_for(categories):
+    hierarchy = {"TR": {"level": 0, "label": "Univers"},
+                 "DEPENSES": {"level": 1, "label": "Dépenses", "parent": "TR"},
+                 "REVENUS": {"level": 1, "label": "Revenus", "parent": "TR"}}
+    for c in range(categories):
+        parent = "REVENUS" if c < categories // 8 else "DEPENSES"
+        hierarchy[f"C{c}"] = {"level": 2, "label": f"CATEGORIE{c}", "parent": parent}
+        for s in range(5):
+            hierarchy[f"C{c}_{s}"] = {"level": 3, "label": f"sous{c}_{s}", "parent": f"C{c}"}
+    return hierarchy
+
+
+def legacy_filter(df, hierarchy, codes, debut, fin):
+    """Filtres de interface_voir_transactions avant le store."""
+    df_filtered = df.copy()
+    df_filtered["date"] = pd.to_datetime(df_filtered["date"])
+    df_filtered = df_filtered[(df_filtered["date"].dt.date >= debut) & (df_filtered["date"].dt.date <= fin)]
+    df_tree_filtered = pd.DataFrame()
+    for code in codes:
+        df_code = get_transactions_for_fractal_code(code, hierarchy, df_filtered)
+        df_tree_filtered = pd.concat([df_tree_filtered, df_code], ignore_index=True)
+    if not df_tree_filtered.empty:
+        df_filtered = df_tree_filtered.drop_duplicates(subset=["id"], keep="first")
+    return df_filtered
+
+
+def store_filter(df, store, hierarchy, codes, debut, fin):
+    """Mêmes filtres sur le store typé."""
+    mask = store.mask(start_date=debut, end_date=fin)
+    tree_mask = np.zeros(len(store), dtype=bool)
+    for code in codes:
+        tree_mask |= get_fractal_code_mask(code, hierarchy, store)
+    if (mask & tree_mask).any():
+        mask &= tree_mask
+    df_filtered = df[df["id"].isin(store.ids(mask))].copy()
+    df_filtered["date"] = pd.to_datetime(df_filtered["date"])
+    return df_filtered
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark store typé des transactions")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--categories", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    hierarchy = hierarchy_for(args.categories)
+    fin = date.today()
+    debut = fin - timedelta(days=365)
+    scenarios = [
+        ("1 sous-catégorie", ["C10_2"]),
+        ("3 catégories", ["C10", "C11", "C12"]),
+        ("Dépenses + 6 codes", ["DEPENSES", "C1", "C2_0", "C3_1", "C20", "C30_4"]),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        init_db(db_path)
+        fill(db_path, args.rows, args.categories, random.Random(42))
+        df = TransactionFrameCache(db_path).get()
+        build, store = best_of(args.repeat, lambda: TransactionStore(df))
+
+        print("=" * 70)
+        print(f"{args.rows} transactions, {args.categories} catégories x 5 sous-catégories")
+        print("=" * 70)
+        frame_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+        store_mb = store.memory_usage() / 1024 / 1024
+        print(f"Mémoire DataFrame load_transactions : {frame_mb:7.1f} Mo")
+        print(f"Mémoire TransactionStore            : {store_mb:7.1f} Mo (/{frame_mb / store_mb:.1f})")
+        print(f"Construction du store               : {build * 1000:7.1f} ms (une fois par version)")
+        print("-" * 70)
+        for label, codes in scenarios:
+            old_time, old = best_of(args.repeat, lambda: legacy_filter(df, hierarchy, codes, debut, fin))
+            new_time, new = best_of(args.repeat, lambda: store_filter(df, store, hierarchy, codes, debut, fin))
+            identical = sorted(old["id"]) == sorted(new["id"])
+            print(f"{label:20} : .str.lower() {old_time * 1000:7.1f} ms | store {new_time * 1000:6.1f} ms "
+                  f"(x{old_time / new_time:.1f}) | {len(new)} lignes, identiques : {identical}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Reconstruit la table monthly_rollup (sommes par mois, type et catégorie).
+
+La table est tenue à jour par des triggers ; la reconstruire n'est utile
+qu'après des écritures faites sans eux (sauvegarde restaurée, base modifiée
+par un outil externe) ou pour effacer les écarts d'arrondi des sommes.
+Applique d'abord les migrations en attente.
+
+Usage :
+    python scripts/rebuild_monthly_rollup.py [--db chemin/vers/finances.db]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.database import run_migrations
+from shared.database.rollup import rebuild_monthly_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruction de monthly_rollup")
+    parser.add_argument("--db", default=None, help="Base à traiter (par défaut : DB_PATH de la config)")
+    args = parser.parse_args()
+
+    run_migrations(args.db)
+    start = time.perf_counter()
+    rows = rebuild_monthly_rollup(args.db)
+    print(f"monthly_rollup reconstruite : {rows} lignes en {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
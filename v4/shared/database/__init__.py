@@ -1,9 +1,28 @@
 # Shared Database Module
-from .connection import get_db_connection
+from .connection import (
+    get_db_connection,
+    db_connection,
+    committed_connection,
+    get_pool,
+    close_all_connections,
+    ConnectionPool
+)
 from .schema import init_db, migrate_database_schema
+from .migrations import run_migrations, get_schema_version
+from .revision import get_change_token
+from .rollup import rebuild_monthly_rollup
 
 __all__ = [
     'get_db_connection',
+    'db_connection',
+    'committed_connection',
+    'get_pool',
+    'close_all_connections',
+    'ConnectionPool',
     'init_db',
-    'migrate_database_schema'
+    'migrate_database_schema',
+    'run_migrations',
+    'get_schema_version',
+    'get_change_token',
+    'rebuild_monthly_rollup'
 ]
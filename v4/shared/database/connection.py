@@ -1,16 +1,365 @@
-"""Database connection management."""
+"""Database connection management.
 
+Connections are served from a per-database :class:`ConnectionPool`. Each
+thread (Streamlit runs every script run in its own thread) keeps a home
+connection that is reused by all nested ``get_db_connection()`` calls, so a
+page render pays ``sqlite3.connect`` and the PRAGMA setup once instead of once
+per repository call. Calling ``close()`` on a pooled connection hands it back
+to the pool rather than closing the underlying SQLite handle.
+
+A nested acquisition made while the connection has an open transaction runs
+inside its own SAVEPOINT: ``commit()`` and ``rollback()`` at that level only
+release or undo its changes (an error in a nested helper no longer discards
+the caller's writes), and the caller that opened the transaction commits or
+rolls it back. Without an open transaction there is nothing to protect, so a
+nested level commits for real; a level that was never released (e.g. a page
+interrupted by ``st.rerun()``) therefore cannot turn later commits into
+savepoint releases.
+"""
+
+import os
+import atexit
 import sqlite3
 import logging
-from typing import Optional
-from config.database_config import DATABASE_PATH, DATABASE_TIMEOUT
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from config.database_config import DATABASE_PATH, DATABASE_TIMEOUT, DATABASE_POOL_SIZE
 
 logger = logging.getLogger(__name__)
 
 
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose ``close()`` returns it to its pool."""
+
+    _pool: Optional["ConnectionPool"] = None
+    _overflow: bool = False
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def commit(self) -> None:
+        """Commit, or release the current nested level's savepoint."""
+        depth = self._savepoint_depth()
+        if depth:
+            self._end_savepoint(depth, rollback=False)
+            self._begin_savepoint(depth)
+        else:
+            super().commit()
+
+    def rollback(self) -> None:
+        """Roll back, or undo only the current nested level's changes."""
+        depth = self._savepoint_depth()
+        if depth:
+            self._end_savepoint(depth, rollback=True)
+            self._begin_savepoint(depth)
+        else:
+            super().rollback()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        # sqlite3.Connection.__exit__ bypasses the overridden commit/rollback
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def _savepoint_depth(self) -> int:
+        """Depth of the current level if it runs in a savepoint, else 0."""
+        pool = self._pool
+        if pool is None or getattr(pool._local, "conn", None) is not self:
+            return 0
+        depth = pool._local.depth
+        return depth if depth in pool._local.savepoints else 0
+
+    def _begin_savepoint(self, depth: int) -> None:
+        self.execute(f"SAVEPOINT pool_level_{depth}")
+
+    def _end_savepoint(self, depth: int, rollback: bool) -> None:
+        try:
+            if rollback:
+                self.execute(f"ROLLBACK TO pool_level_{depth}")
+            self.execute(f"RELEASE pool_level_{depth}")
+        except sqlite3.OperationalError as e:
+            # Already ended by an explicit COMMIT/ROLLBACK statement
+            logger.debug(f"Savepoint pool_level_{depth} already closed: {e}")
+
+    def discard(self) -> None:
+        """Really close the underlying SQLite handle."""
+        self._pool = None
+        try:
+            super().close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing connection: {e}")
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections with thread-local reuse.
+
+    - The first acquisition in a thread checks a connection out of the pool
+      (or opens one) and pins it to that thread; nested acquisitions in the
+      same thread reuse it and only the outermost release hands it back.
+    - A nested acquisition made inside an open transaction opens a SAVEPOINT:
+      its ``commit()``/``rollback()`` only release/undo its own changes, and
+      its release merges what it left uncommitted into the enclosing level.
+      Outside a transaction a nested level commits and rolls back for real.
+    - Connections pinned to threads that have exited are reclaimed.
+    - At most ``pool_size`` connections are kept open; beyond that, overflow
+      connections are opened on demand and closed on release.
+    - PRAGMAs are applied once, when the connection is opened, and a cheap
+      ``SELECT 1`` health check runs before a connection is handed out.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = DATABASE_POOL_SIZE,
+        timeout: float = DATABASE_TIMEOUT
+    ):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owned: Dict[int, PooledConnection] = {}
+        self._idle: List[PooledConnection] = []
+        self._stats = {"opened": 0, "reused": 0, "overflow": 0, "discarded": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self) -> PooledConnection:
+        """
+        Get a connection for the current thread.
+
+        Returns:
+            Pooled SQLite connection (release with ``close()``)
+
+        Raises:
+            sqlite3.Error: If a new connection cannot be opened
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+
+        if conn is not None and local.depth > 0:
+            if conn.in_transaction:
+                conn._begin_savepoint(local.depth + 1)
+                local.savepoints.add(local.depth + 1)
+            local.depth += 1
+            return conn
+
+        if conn is not None and not self._is_healthy(conn):
+            self._forget(conn)
+            conn = None
+
+        if conn is None:
+            conn = self._checkout()
+        else:
+            with self._lock:
+                self._stats["reused"] += 1
+
+        local.conn = conn
+        local.depth = 1
+        local.savepoints = set()
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """
+        Release a connection acquired by the current thread.
+
+        Uncommitted work is rolled back on the outermost release, matching the
+        behaviour of closing a plain sqlite3 connection. A nested release
+        leaves it to the enclosing level (releasing its savepoint if any).
+
+        Args:
+            conn: Connection returned by :meth:`acquire`
+        """
+        local = self._local
+        if getattr(local, "conn", None) is not conn or local.depth <= 0:
+            logger.debug("Ignoring release of a connection not held by this thread")
+            return
+
+        if local.depth > 1:
+            if local.depth in local.savepoints:
+                local.savepoints.discard(local.depth)
+                conn._end_savepoint(local.depth, rollback=False)
+            local.depth -= 1
+            return
+        local.depth = 0
+        local.savepoints.clear()
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Rollback on release failed, discarding connection: {e}")
+            self._forget(conn)
+            local.conn = None
+            return
+
+        if conn._overflow:
+            conn.discard()
+            local.conn = None
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """
+        Context manager yielding a pooled connection.
+
+        Rolls back on exception and releases the connection on exit.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error as e:
+                logger.error(f"Rollback failed: {e}")
+            raise
+        finally:
+            self.release(conn)
+
+    def in_transaction(self) -> bool:
+        """Whether the current thread holds a connection with an open transaction."""
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and self._local.depth > 0 and conn.in_transaction
+
+    def close_all(self) -> None:
+        """Close every connection kept by the pool."""
+        with self._lock:
+            conns = list(self._owned.values()) + self._idle
+            self._owned.clear()
+            self._idle.clear()
+        for conn in conns:
+            conn.discard()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dictionary with opened/reused/overflow/discarded counters and the
+            number of connections currently kept open
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open"] = len(self._owned) + len(self._idle)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=max(self.timeout, 30.0),
+            factory=PooledConnection,
+            check_same_thread=False  # Reclaimed connections move between threads
+        )
+        conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
+        conn.execute("PRAGMA journal_mode = WAL")  # Enable WAL mode for concurrent access
+        conn.execute("PRAGMA busy_timeout = 30000")  # 30 second busy timeout
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        conn._pool = self
+        self._stats["opened"] += 1
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: PooledConnection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _checkout(self) -> PooledConnection:
+        ident = threading.get_ident()
+        with self._lock:
+            self._reap_dead_threads()
+
+            # Thread idents are recycled: a stale entry belongs to a dead thread
+            stale = self._owned.pop(ident, None)
+            if stale is not None:
+                self._idle.append(stale)
+
+            while self._idle:
+                conn = self._idle.pop()
+                if self._is_healthy(conn):
+                    self._owned[ident] = conn
+                    self._stats["reused"] += 1
+                    return conn
+                self._stats["discarded"] += 1
+                conn.discard()
+
+            overflow = len(self._owned) >= self.pool_size
+            conn = self._connect()
+            if overflow:
+                conn._overflow = True
+                self._stats["overflow"] += 1
+                logger.warning(f"Connection pool exhausted ({self.pool_size}), opening overflow connection")
+            else:
+                self._owned[ident] = conn
+            return conn
+
+    def _reap_dead_threads(self) -> None:
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._owned if i not in alive]:
+            conn = self._owned.pop(ident)
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.append(conn)
+            except sqlite3.Error:
+                self._stats["discarded"] += 1
+                conn.discard()
+
+    def _forget(self, conn: PooledConnection) -> None:
+        with self._lock:
+            for ident, owned in list(self._owned.items()):
+                if owned is conn:
+                    del self._owned[ident]
+            self._stats["discarded"] += 1
+        conn.discard()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Optional[str] = None, timeout: float = DATABASE_TIMEOUT) -> ConnectionPool:
+    """
+    Get (or create) the connection pool for a database file.
+
+    Args:
+        db_path: Optional custom database path. If None, uses DATABASE_PATH from config.
+        timeout: Connection timeout in seconds, used when the pool is created
+
+    Returns:
+        ConnectionPool shared by all callers of that database
+    """
+    actual_db_path = db_path if db_path is not None else DATABASE_PATH
+    with _pools_lock:
+        pool = _pools.get(actual_db_path)
+        if pool is None:
+            pool = ConnectionPool(actual_db_path, timeout=timeout)
+            _pools[actual_db_path] = pool
+        return pool
+
+
 def get_db_connection(timeout: float = DATABASE_TIMEOUT, db_path: Optional[str] = None) -> sqlite3.Connection:
     """
-    Get a SQLite database connection.
+    Get a SQLite database connection from the pool.
+
+    The connection is shared with any other caller on the same thread and
+    must be released with ``close()`` (or use :func:`db_connection`).
 
     Args:
         timeout: Connection timeout in seconds
@@ -22,21 +371,92 @@ def get_db_connection(timeout: float = DATABASE_TIMEOUT, db_path: Optional[str]
     Raises:
         sqlite3.Error: If connection fails
     """
-    # Use custom path if provided (for tests), otherwise use production DATABASE_PATH
-    actual_db_path = db_path if db_path is not None else DATABASE_PATH
-    
     try:
-        conn = sqlite3.connect(actual_db_path, timeout=max(timeout, 30.0))
-        conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
-        conn.execute("PRAGMA journal_mode = WAL")  # Enable WAL mode for concurrent access
-        conn.execute("PRAGMA busy_timeout = 30000")  # 30 second busy timeout
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        return conn
+        return get_pool(db_path, timeout).acquire()
     except sqlite3.Error as e:
         logger.error(f"Database connection failed: {e}")
         raise
 
 
+@contextmanager
+def db_connection(db_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Context manager around :func:`get_db_connection`.
+
+    Uncommitted changes are rolled back if the block raises, and the
+    connection is released back to the pool on exit.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Example:
+        >>> with db_connection() as conn:
+        ...     conn.execute("UPDATE transactions SET montant = ? WHERE id = ?", (10.0, 1))
+        ...     conn.commit()
+    """
+    with get_pool(db_path).connection() as conn:
+        yield conn
+
+
+@contextmanager
+def committed_connection(db_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Connection that only sees committed data, for process-wide caches.
+
+    Inside a caller's open transaction the pooled connection would also see
+    its uncommitted writes, which may be rolled back later (and their change
+    log ids reused). In that case a private, read-only connection is opened
+    instead; otherwise the pooled connection is used.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+    """
+    pool = get_pool(db_path)
+    if not pool.in_transaction():
+        with pool.connection() as conn:
+            yield conn
+        return
+
+    conn = sqlite3.connect(pool.db_path, timeout=max(pool.timeout, 30.0))
+    try:
+        conn.execute("PRAGMA query_only = ON")  # Never wait on the caller's write lock
+        conn.row_factory = sqlite3.Row
+        yield conn
+    finally:
+        conn.close()
+
+
+def close_all_connections() -> None:
+    """Close every pooled connection (called automatically at exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+atexit.register(close_all_connections)
+
+
+_inherited_pools: List[ConnectionPool] = []
+
+
+def _reset_pools_after_fork() -> None:
+    """Give a forked child (e.g. an OCR worker) its own, empty pools.
+
+    SQLite handles must not be used across ``fork()``. The inherited pools
+    are kept referenced, never closed, so the child cannot finalize
+    connections that still belong to the parent.
+    """
+    global _pools_lock
+    _inherited_pools.extend(_pools.values())
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
 def close_connection(conn: Optional[sqlite3.Connection]) -> None:
     """
     Safely close a database connection.
@@ -71,26 +491,21 @@ def execute_query(
     Returns:
         Query results or None
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
 
-        if commit:
-            conn.commit()
+            if commit:
+                conn.commit()
 
-        if fetch_one:
-            return cursor.fetchone()
-        elif fetch_all:
-            return cursor.fetchall()
+            if fetch_one:
+                return cursor.fetchone()
+            elif fetch_all:
+                return cursor.fetchall()
 
-        return cursor
+            return cursor
 
     except sqlite3.Error as e:
         logger.error(f"Query execution failed: {e}")
-        if conn:
-            conn.rollback()
         raise
-    finally:
-        close_connection(conn)
@@ -0,0 +1,508 @@
+"""Versioned schema migrations.
+
+The schema version is stored in ``PRAGMA user_version``. Each migration runs
+once, in order, inside its own ``BEGIN IMMEDIATE`` transaction together with
+the version bump, so a crash never leaves a half-applied step and two
+Streamlit sessions starting at the same time cannot apply a step twice.
+
+Once a database is up to date, startup costs a single ``PRAGMA user_version``
+read instead of a series of DDL probes.
+
+To change the schema, append a new ``(version, description, function)`` entry
+to ``MIGRATIONS``; never edit a migration that has already shipped.
+"""
+
+import sqlite3
+import logging
+from typing import Callable, List, Optional, Tuple
+from .connection import db_connection
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> List[str]:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [col[1] for col in cursor.fetchall()]
+
+
+def _add_column_if_missing(cursor: sqlite3.Cursor, table: str, column: str, definition: str) -> None:
+    if column not in _columns(cursor, table):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        logger.info(f"Added '{column}' column to {table} table")
+
+
+# ==============================
+# MIGRATIONS
+# ==============================
+
+def _001_transactions_table(cursor: sqlite3.Cursor) -> None:
+    """Create ``transactions`` and bring pre-V4 databases to the current columns."""
+    columns = _columns(cursor, "transactions")
+
+    # Legacy French column names (Catégorie, Sous-catégorie, Date, ...)
+    if "Catégorie" in columns or "Sous-catégorie" in columns:
+        logger.info("Migrating legacy transactions column names...")
+        cursor.execute("""
+            CREATE TABLE transactions_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                type TEXT NOT NULL,
+                categorie TEXT NOT NULL,
+                sous_categorie TEXT,
+                description TEXT,
+                montant REAL NOT NULL,
+                date TEXT NOT NULL,
+                source TEXT DEFAULT 'Manuel',
+                recurrence TEXT,
+                date_fin TEXT
+            )
+        """)
+        cursor.execute("""
+            INSERT INTO transactions_new
+            (id, type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
+            SELECT
+                id,
+                type,
+                "Catégorie" AS categorie,
+                "Sous-catégorie" AS sous_categorie,
+                description,
+                montant,
+                "Date" AS date,
+                COALESCE("Source", 'Manuel') AS source,
+                COALESCE("Récurrence", 'Aucune') AS recurrence,
+                date_fin
+            FROM transactions
+        """)
+        cursor.execute("DROP TABLE transactions")
+        cursor.execute("ALTER TABLE transactions_new RENAME TO transactions")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            categorie TEXT NOT NULL,
+            sous_categorie TEXT,
+            description TEXT,
+            montant REAL NOT NULL,
+            date TEXT NOT NULL,
+            source TEXT DEFAULT 'Manuel',
+            recurrence TEXT,
+            date_fin TEXT
+        )
+    """)
+
+    _add_column_if_missing(cursor, "transactions", "source", "TEXT DEFAULT 'Manuel'")
+    _add_column_if_missing(cursor, "transactions", "recurrence", "TEXT DEFAULT 'Aucune'")
+    _add_column_if_missing(cursor, "transactions", "date_fin", "TEXT DEFAULT ''")
+
+
+def _002_portfolio_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the portfolio tables (budgets, objectifs, échéances, récurrences)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS budgets_categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            categorie TEXT UNIQUE NOT NULL,
+            budget_mensuel REAL NOT NULL,
+            date_creation TEXT,
+            date_modification TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS objectifs_financiers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type_objectif TEXT NOT NULL,
+            titre TEXT NOT NULL,
+            montant_cible REAL,
+            date_limite TEXT,
+            periodicite TEXT,
+            statut TEXT DEFAULT 'en_cours',
+            date_creation TEXT,
+            date_modification TEXT,
+            date_atteint TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS echeances (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            categorie TEXT NOT NULL,
+            sous_categorie TEXT,
+            montant REAL NOT NULL,
+            date_echeance TEXT NOT NULL,
+            recurrence TEXT,
+            statut TEXT DEFAULT 'active',
+            type_echeance TEXT DEFAULT 'prévue',
+            description TEXT,
+            recurrence_id INTEGER,
+            date_creation TEXT,
+            date_modification TEXT
+        )
+    """)
+    _add_column_if_missing(cursor, "echeances", "type_echeance", "TEXT DEFAULT 'prévue'")
+    _add_column_if_missing(cursor, "echeances", "recurrence_id", "INTEGER")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS recurrences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            categorie TEXT NOT NULL,
+            sous_categorie TEXT,
+            montant REAL NOT NULL,
+            date_debut TEXT NOT NULL,
+            date_fin TEXT,
+            frequence TEXT NOT NULL,
+            description TEXT,
+            statut TEXT DEFAULT 'active',
+            date_creation TEXT,
+            date_modification TEXT
+        )
+    """)
+
+
+def _003_query_indexes(cursor: sqlite3.Cursor) -> None:
+    """Indexes matching the hot query shapes."""
+    # get_by_date_range, dashboards: WHERE date BETWEEN ? AND ? ORDER BY date
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_date
+        ON transactions(date)
+    """)
+
+    # backfill_all_recurrences existence check:
+    # WHERE source = 'récurrente_auto' AND categorie = ? AND sous_categorie = ? AND date = ?
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_source_categorie_date
+        ON transactions(source, categorie, sous_categorie, date)
+    """)
+
+    # sync_recurrences_to_echeances existence check
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_echeances_recurrence_date
+        ON echeances(recurrence_id, date_echeance)
+    """)
+
+    # cleanup_past_echeances: WHERE date_echeance < ? AND type_echeance = ?
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_echeances_date_type
+        ON echeances(date_echeance, type_echeance)
+    """)
+
+    # Every recurrence job starts with WHERE statut = 'active'
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_recurrences_statut
+        ON recurrences(statut)
+    """)
+
+
+def _004_recurrence_watermark(cursor: sqlite3.Cursor) -> None:
+    """Last occurrence date generated per recurrence (backfill watermark)."""
+    _add_column_if_missing(cursor, "recurrences", "derniere_generation", "TEXT")
+
+
+def _005_transactions_change_log(cursor: sqlite3.Cursor) -> None:
+    """Trigger-maintained log of modified transaction ids (incremental caches)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS transactions_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transaction_id INTEGER NOT NULL,
+            operation TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_log_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO transactions_changes (transaction_id, operation) VALUES (NEW.id, 'I');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_log_update
+        AFTER UPDATE ON transactions
+        BEGIN
+            INSERT INTO transactions_changes (transaction_id, operation) VALUES (NEW.id, 'U');
+            INSERT INTO transactions_changes (transaction_id, operation)
+            SELECT OLD.id, 'D' WHERE OLD.id != NEW.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_log_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            INSERT INTO transactions_changes (transaction_id, operation) VALUES (OLD.id, 'D');
+        END
+    """)
+
+
+def _006_file_index(cursor: sqlite3.Cursor) -> None:
+    """Index of the files under the sorted folders (see shared.services.file_index)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fichiers_index (
+            chemin TEXT PRIMARY KEY,
+            base TEXT NOT NULL,
+            categorie TEXT NOT NULL,
+            sous_categorie TEXT NOT NULL,
+            nom TEXT NOT NULL,
+            transaction_id INTEGER,
+            eligible INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fichiers_index_dossier
+        ON fichiers_index(categorie, sous_categorie, base)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fichiers_index_transaction ON fichiers_index(transaction_id)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fichiers_index_dossiers (
+            chemin TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL
+        )
+    """)
+
+
+def _007_csv_import_checkpoints(cursor: sqlite3.Cursor) -> None:
+    """Rows committed by each CSV import, to resume an interrupted one."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS imports_csv (
+            empreinte TEXT PRIMARY KEY,
+            nom TEXT,
+            lignes_importees INTEGER NOT NULL DEFAULT 0,
+            termine INTEGER NOT NULL DEFAULT 0,
+            mis_a_jour TEXT NOT NULL
+        )
+    """)
+
+
+def _008_import_dedup_index(cursor: sqlite3.Cursor) -> None:
+    """Duplicate lookup of the bulk import (date then amount)."""
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_date_montant
+        ON transactions(date, montant)
+    """)
+
+
+def _009_monthly_rollup(cursor: sqlite3.Cursor) -> None:
+    """Trigger-maintained month x type x category sums (see shared.database.rollup)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS monthly_rollup (
+            mois TEXT NOT NULL,
+            type TEXT NOT NULL,
+            categorie TEXT NOT NULL,
+            sous_categorie TEXT NOT NULL,
+            montant REAL NOT NULL,
+            nombre INTEGER NOT NULL,
+            PRIMARY KEY (mois, type, categorie, sous_categorie)
+        ) WITHOUT ROWID
+    """)
+    # NULL sub-categories are stored as '' (NULL never matches a primary key)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_monthly_rollup_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant, nombre)
+            VALUES (substr(NEW.date, 1, 7), NEW.type, NEW.categorie, COALESCE(NEW.sous_categorie, ''),
+                    NEW.montant, 1)
+            ON CONFLICT (mois, type, categorie, sous_categorie)
+            DO UPDATE SET montant = montant + excluded.montant, nombre = nombre + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_monthly_rollup_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            UPDATE monthly_rollup SET montant = montant - OLD.montant, nombre = nombre - 1
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '');
+            DELETE FROM monthly_rollup
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '') AND nombre <= 0;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_monthly_rollup_update
+        AFTER UPDATE OF date, type, categorie, sous_categorie, montant ON transactions
+        BEGIN
+            UPDATE monthly_rollup SET montant = montant - OLD.montant, nombre = nombre - 1
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '');
+            DELETE FROM monthly_rollup
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '') AND nombre <= 0;
+            INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant, nombre)
+            VALUES (substr(NEW.date, 1, 7), NEW.type, NEW.categorie, COALESCE(NEW.sous_categorie, ''),
+                    NEW.montant, 1)
+            ON CONFLICT (mois, type, categorie, sous_categorie)
+            DO UPDATE SET montant = montant + excluded.montant, nombre = nombre + 1;
+        END
+    """)
+    cursor.execute("DELETE FROM monthly_rollup")
+    cursor.execute("""
+        INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant, nombre)
+        SELECT substr(date, 1, 7), type, categorie, COALESCE(sous_categorie, ''), SUM(montant), COUNT(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def _010_integer_cents(cursor: sqlite3.Cursor) -> None:
+    """Amounts on the cent grid, rollup sums in integer cents, cents dedup index."""
+    # Rollup first: its triggers would otherwise fire on the normalization below
+    for trigger in ("insert", "delete", "update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_monthly_rollup_{trigger}")
+    cursor.execute("DROP TABLE IF EXISTS monthly_rollup")
+
+    # Every stored amount becomes the float nearest to a whole number of cents,
+    # so CAST(ROUND(x * 100) AS INTEGER) gives it back exactly
+    for table, column in (("transactions", "montant"), ("recurrences", "montant"),
+                          ("echeances", "montant"), ("budgets_categories", "budget_mensuel")):
+        cursor.execute(f"""
+            UPDATE {table} SET {column} = CAST(ROUND({column} * 100) AS INTEGER) / 100.0
+            WHERE {column} != CAST(ROUND({column} * 100) AS INTEGER) / 100.0
+        """)
+
+    cursor.execute("""
+        CREATE TABLE monthly_rollup (
+            mois TEXT NOT NULL,
+            type TEXT NOT NULL,
+            categorie TEXT NOT NULL,
+            sous_categorie TEXT NOT NULL,
+            montant_cents INTEGER NOT NULL,
+            nombre INTEGER NOT NULL,
+            PRIMARY KEY (mois, type, categorie, sous_categorie)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_monthly_rollup_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant_cents, nombre)
+            VALUES (substr(NEW.date, 1, 7), NEW.type, NEW.categorie, COALESCE(NEW.sous_categorie, ''),
+                    CAST(ROUND(NEW.montant * 100) AS INTEGER), 1)
+            ON CONFLICT (mois, type, categorie, sous_categorie)
+            DO UPDATE SET montant_cents = montant_cents + excluded.montant_cents, nombre = nombre + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_monthly_rollup_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            UPDATE monthly_rollup
+            SET montant_cents = montant_cents - CAST(ROUND(OLD.montant * 100) AS INTEGER), nombre = nombre - 1
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '');
+            DELETE FROM monthly_rollup
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '') AND nombre <= 0;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_monthly_rollup_update
+        AFTER UPDATE OF date, type, categorie, sous_categorie, montant ON transactions
+        BEGIN
+            UPDATE monthly_rollup
+            SET montant_cents = montant_cents - CAST(ROUND(OLD.montant * 100) AS INTEGER), nombre = nombre - 1
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '');
+            DELETE FROM monthly_rollup
+            WHERE mois = substr(OLD.date, 1, 7) AND type = OLD.type AND categorie = OLD.categorie
+              AND sous_categorie = COALESCE(OLD.sous_categorie, '') AND nombre <= 0;
+            INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant_cents, nombre)
+            VALUES (substr(NEW.date, 1, 7), NEW.type, NEW.categorie, COALESCE(NEW.sous_categorie, ''),
+                    CAST(ROUND(NEW.montant * 100) AS INTEGER), 1)
+            ON CONFLICT (mois, type, categorie, sous_categorie)
+            DO UPDATE SET montant_cents = montant_cents + excluded.montant_cents, nombre = nombre + 1;
+        END
+    """)
+    cursor.execute("""
+        INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant_cents, nombre)
+        SELECT substr(date, 1, 7), type, categorie, COALESCE(sous_categorie, ''),
+               SUM(CAST(ROUND(montant * 100) AS INTEGER)), COUNT(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+    """)
+
+    # Duplicate lookup of the bulk import on integer equality (shared.utils.cents_sql)
+    cursor.execute("DROP INDEX IF EXISTS idx_transactions_date_montant")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_date_cents
+        ON transactions(date, CAST(ROUND(montant * 100) AS INTEGER))
+    """)
+
+
+Migration = Tuple[int, str, Callable[[sqlite3.Cursor], None]]
+
+MIGRATIONS: List[Migration] = [
+    (1, "transactions table and legacy columns", _001_transactions_table),
+    (2, "portfolio tables", _002_portfolio_tables),
+    (3, "query indexes", _003_query_indexes),
+    (4, "recurrence backfill watermark", _004_recurrence_watermark),
+    (5, "transactions change log", _005_transactions_change_log),
+    (6, "file index", _006_file_index),
+    (7, "csv import checkpoints", _007_csv_import_checkpoints),
+    (8, "import dedup index", _008_import_dedup_index),
+    (9, "monthly rollup", _009_monthly_rollup),
+    (10, "integer cents", _010_integer_cents),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ==============================
+# ENGINE
+# ==============================
+
+def get_schema_version(db_path: Optional[str] = None) -> int:
+    """
+    Get the schema version stored in the database.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        Current ``PRAGMA user_version`` (0 for a database never migrated)
+    """
+    with db_connection(db_path) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(db_path: Optional[str] = None) -> int:
+    """
+    Apply every pending migration, in order.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        Number of migrations applied
+
+    Raises:
+        sqlite3.Error: If a migration fails (it is rolled back)
+    """
+    with db_connection(db_path) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= LATEST_VERSION:
+            return 0
+
+        applied = 0
+        cursor = conn.cursor()
+        for version, description, migrate in MIGRATIONS:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-read under the write lock: another session may have migrated
+                current = cursor.execute("PRAGMA user_version").fetchone()[0]
+                if version <= current:
+                    conn.rollback()
+                    continue
+
+                logger.info(f"Applying migration {version}: {description}")
+                migrate(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+                applied += 1
+            except sqlite3.Error as e:
+                logger.error(f"Migration {version} ({description}) failed: {e}")
+                conn.rollback()
+                raise
+
+        if applied:
+            cursor.execute("PRAGMA optimize")
+            logger.info(f"Schema migrated to version {LATEST_VERSION} ({applied} migration(s) applied)")
+        return applied
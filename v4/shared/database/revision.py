@@ -0,0 +1,44 @@
+"""Cheap change tokens for cache keys.
+
+A change token is a small hashable value that changes whenever the
+``transactions`` table is written. Caches key their entries on it instead of
+re-reading the table (or clearing every cache) to find out whether data
+changed.
+
+The token is the head of the trigger-maintained ``transactions_changes`` log
+(migration 5): one indexed ``MAX(id)`` lookup, and since the log uses
+AUTOINCREMENT it never goes backwards, pruning included. Databases without
+the log fall back to ``(COUNT(*), MAX(id))``, which misses in-place updates.
+
+The token only describes committed data: inside a caller's open transaction
+an uncommitted log id may be rolled back and reused by a later, different
+write, so it is read on :func:`committed_connection`. Caches built inside
+such a transaction must not be stored (see ``ConnectionPool.in_transaction``).
+"""
+
+import sqlite3
+from typing import Optional, Tuple
+from .connection import committed_connection
+
+
+def get_change_token(db_path: Optional[str] = None) -> Tuple:
+    """
+    Get a token that changes on every write to the transactions table.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        Hashable tuple, e.g. ``('log', 1234)``; compare with ``==`` only
+
+    Example:
+        >>> token = get_change_token()
+        >>> hierarchy = _build_cached(date_debut, date_fin, token)
+    """
+    with committed_connection(db_path) as conn:
+        try:
+            head = conn.execute("SELECT MAX(id) FROM transactions_changes").fetchone()[0]
+            return ("log", head or 0)
+        except sqlite3.OperationalError:
+            count, max_id = conn.execute("SELECT COUNT(*), MAX(id) FROM transactions").fetchone()
+            return ("rows", count, max_id)
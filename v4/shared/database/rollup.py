@@ -0,0 +1,52 @@
+"""Monthly rollup of the transactions table.
+
+``monthly_rollup`` (migrations 9 and 10) holds one row per month x type x
+category x sub-category with the sum in integer cents and the count of the
+matching transactions. Triggers on ``transactions`` keep it up to date on
+every insert, update and delete, so monthly charts and totals read
+O(months x categories) rows instead of every transaction (see
+``TransactionRepository.sum_by``).
+
+The migration fills the table for existing databases. Rebuild it after
+writes made with the triggers missing (restored backup, database edited by
+an external tool). Sums are integers, so repeated updates leave no rounding
+drift.
+"""
+
+import sqlite3
+from typing import Optional
+from shared.utils.money import cents_sql
+from .connection import db_connection
+
+
+def rebuild_monthly_rollup(db_path: Optional[str] = None) -> int:
+    """
+    Recompute ``monthly_rollup`` from the transactions table.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        Number of rollup rows written
+
+    Raises:
+        sqlite3.Error: If the table is missing (database not migrated)
+    """
+    with db_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute("DELETE FROM monthly_rollup")
+            cursor.execute(f"""
+                INSERT INTO monthly_rollup (mois, type, categorie, sous_categorie, montant_cents, nombre)
+                SELECT substr(date, 1, 7), type, categorie, COALESCE(sous_categorie, ''),
+                       SUM({cents_sql()}), COUNT(*)
+                FROM transactions
+                GROUP BY 1, 2, 3, 4
+            """)
+            rows = cursor.rowcount
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        return rows
@@ -6,7 +6,9 @@ from .files import (
     supprimer_fichiers_associes,
     trouver_fichiers_associes
 )
+from .file_index import FileIndex, get_file_index
 from .fractal import build_fractal_hierarchy
+from .day_summary import DaySummary, get_day_summary
 
 __all__ = [
     # Recurrence
@@ -16,7 +18,13 @@ __all__ = [
     'deplacer_fichiers_associes',
     'supprimer_fichiers_associes',
     'trouver_fichiers_associes',
+    'FileIndex',
+    'get_file_index',
     
     # Fractal
-    'build_fractal_hierarchy'
+    'build_fractal_hierarchy',
+    
+    # Day summary
+    'DaySummary',
+    'get_day_summary'
 ]
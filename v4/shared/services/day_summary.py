@@ -0,0 +1,167 @@
+"""
+Day Summary - Per-day counts and sums of the transactions.
+
+The calendar used to copy the whole frame, re-parse every date, mask one
+month and walk it with ``iterrows()`` on each rerender. A :class:`DaySummary`
+holds one row per day with transactions (count, revenue/expense flags and
+sums in integer cents), built with a single GROUP BY day x type in SQLite
+(``TransactionRepository.sum_by(period="day")``) and a vectorized pivot.
+
+It is rebuilt once per data revision: ``get_day_summary`` keys the
+process-wide instance on ``get_change_token`` (migration 5 change log), so
+every session and page reads the same summary until the next write. A
+summary built inside a caller's open transaction may include uncommitted
+rows and is returned without being cached. Lookups by month or date range
+slice a sorted day array.
+"""
+
+import threading
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from domains.transactions import TransactionRepository
+from shared.database import get_change_token, get_pool
+from shared.utils import from_cents, to_cents_series
+from shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class DaySummary:
+    """Immutable per-day summary of the transactions."""
+
+    def __init__(self, daily: pd.DataFrame):
+        """
+        Build the summary from day x type sums.
+
+        Args:
+            daily: Frame with ``periode`` ('2024-01-15'), ``type``,
+                ``nombre`` and ``montant_cents`` columns, as returned by
+                ``TransactionRepository.sum_by(["type"], period="day")``
+        """
+        days = pd.to_datetime(daily["periode"], format="%Y-%m-%d", errors="coerce")
+        revenue = (daily["type"] == "revenu").to_numpy()
+        frame = pd.DataFrame({
+            "jour": days,
+            "nombre": daily["nombre"].to_numpy(dtype=np.int64),
+            "revenus_cents": np.where(revenue, daily["montant_cents"], 0).astype(np.int64),
+            "depenses_cents": np.where(revenue, 0, daily["montant_cents"]).astype(np.int64),
+            "nb_revenus": np.where(revenue, daily["nombre"], 0).astype(np.int64),
+        })[days.notna().to_numpy()]
+        # Several types (or unparsable date suffixes) may share a day
+        self.frame = frame.groupby("jour", sort=True).sum()
+        self._days = self.frame.index.to_numpy(dtype="datetime64[D]")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DaySummary":
+        """
+        Build the summary of an in-memory frame (e.g. already filtered).
+
+        Args:
+            df: Frame with 'date' and 'type' columns ('montant' optional)
+
+        Returns:
+            DaySummary of the frame rows
+        """
+        dates = pd.to_datetime(df["date"], format="mixed", errors="coerce")
+        cents = to_cents_series(df["montant"]) if "montant" in df.columns else pd.Series(0, index=df.index)
+        daily = (
+            pd.DataFrame({"periode": dates.dt.strftime("%Y-%m-%d"), "type": df["type"], "montant_cents": cents})
+            .groupby(["periode", "type"])["montant_cents"].agg(nombre="size", montant_cents="sum")
+            .reset_index()
+        )
+        return cls(daily)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _slice(self, start_date: Optional[date], end_date: Optional[date]) -> pd.DataFrame:
+        """Rows of the days in [start_date, end_date] (None: unbounded)."""
+        lo = 0 if start_date is None else np.searchsorted(self._days, np.datetime64(start_date, "D"))
+        hi = len(self._days) if end_date is None else np.searchsorted(
+            self._days, np.datetime64(end_date, "D"), side="right"
+        )
+        return self.frame.iloc[lo:hi]
+
+    def month(self, month: date) -> Dict[int, Dict]:
+        """
+        Days of a month having transactions.
+
+        Args:
+            month: Any day of the month
+
+        Returns:
+            Dict[day] = {'count', 'has_revenue', 'has_expense', 'revenus',
+            'depenses'} (sums in euros)
+        """
+        first = month.replace(day=1)
+        last = (pd.Timestamp(first) + pd.offsets.MonthEnd(1)).date()
+        rows = self._slice(first, last)
+        return {
+            day.day: {
+                "count": int(count),
+                "has_revenue": bool(nb_revenus > 0),
+                "has_expense": bool(count > nb_revenus),
+                "revenus": from_cents(revenus),
+                "depenses": from_cents(depenses),
+            }
+            for day, count, nb_revenus, revenus, depenses in zip(
+                rows.index, rows["nombre"], rows["nb_revenus"], rows["revenus_cents"], rows["depenses_cents"]
+            )
+        }
+
+    def totals(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, float]:
+        """
+        Count and sums over a date range.
+
+        Args:
+            start_date: First day included (None for no lower bound)
+            end_date: Last day included (None for no upper bound)
+
+        Returns:
+            Dict with 'count', 'revenu' and 'dépense' (sums in euros)
+        """
+        rows = self._slice(start_date, end_date)
+        return {
+            "count": int(rows["nombre"].sum()),
+            "revenu": from_cents(rows["revenus_cents"].sum()),
+            "dépense": from_cents(rows["depenses_cents"].sum()),
+        }
+
+
+_summaries: Dict[Optional[str], Tuple[Tuple, DaySummary]] = {}
+_summaries_lock = threading.Lock()
+
+
+def get_day_summary(db_path: Optional[str] = None) -> DaySummary:
+    """
+    Get the per-day summary of the current data revision.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        DaySummary shared by all sessions (rebuilt after each write)
+
+    Example:
+        >>> jours = get_day_summary().month(date(2024, 1, 1))
+        >>> jours[15]["count"]
+        3
+    """
+    if get_pool(db_path).in_transaction():
+        # Uncommitted rows may be rolled back: never cache them under the token
+        return DaySummary(TransactionRepository.sum_by(["type"], period="day", db_path=db_path))
+
+    token = get_change_token(db_path)
+    with _summaries_lock:
+        cached = _summaries.get(db_path)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
+        summary = DaySummary(TransactionRepository.sum_by(["type"], period="day", db_path=db_path))
+        _summaries[db_path] = (token, summary)
+        logger.debug(f"Day summary rebuilt: {len(summary)} day(s) for revision {token}")
+        return summary
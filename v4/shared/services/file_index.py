@@ -0,0 +1,391 @@
+"""Index of the documents filed under the sorted ticket and revenue folders.
+
+``trouver_fichiers_associes`` used to list ``base/categorie/sous_categorie``
+for every transaction it was asked about, so pages and exports that loop over
+transactions paid one directory scan per row. The index keeps the documents
+of those folders in memory (by folder and by transaction id) and in the
+``fichiers_index`` table, where the export of transactions without documents
+is a single query.
+
+Only folders up to ``base/categorie/sous_categorie`` are indexed, as they are
+the only ones looked up. The index is kept current in two ways:
+
+- the file service functions that move or delete documents update it
+- files added by hand are picked up by :meth:`FileIndex.refresh`, which stats
+  the indexed folders (at most every ``FILE_INDEX_REFRESH_SECONDS``) and only
+  rescans those whose modification time changed
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from config import REVENUS_TRAITES, SORTED_DIR
+from config.database_config import FILE_INDEX_REFRESH_SECONDS
+from shared.database import db_connection
+from shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ATTACHMENT_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.pdf')
+
+# Numbered copies ({id}_{n}.ext) are never matched by category
+_NUMBERED_COPY = re.compile(r'^\d+_\d+\.')
+
+# A folder modified this recently may still change within its mtime tick:
+# its mtime is not trusted and it is rescanned on the next refresh
+_RACY_NS = 2_000_000_000
+
+# (base, categorie, sous_categorie); '' for the levels above
+FolderKey = Tuple[str, str, str]
+
+
+def folder_key(base_dir: str, categorie: str, sous_categorie: str) -> FolderKey:
+    """
+    Key of the folder ``os.path.join(base_dir, categorie, sous_categorie)``.
+
+    Args:
+        base_dir: Sorted folder (SORTED_DIR, REVENUS_TRAITES...)
+        categorie: Category folder (may be empty)
+        sous_categorie: Subcategory folder (may be empty)
+
+    Returns:
+        Normalized (base, categorie, sous_categorie) tuple
+    """
+    parts = [part for part in (categorie, sous_categorie) if part]
+    parts += [''] * (2 - len(parts))
+    return os.path.normpath(base_dir), parts[0], parts[1]
+
+
+def _folder_path(key: FolderKey) -> str:
+    return os.path.join(key[0], *[part for part in key[1:] if part])
+
+
+def _transaction_id(nom: str) -> Optional[int]:
+    stem = os.path.splitext(nom)[0]
+    return int(stem) if stem.isdigit() and str(int(stem)) == stem else None
+
+
+def _is_attachment(nom: str) -> bool:
+    return nom.lower().endswith(ATTACHMENT_EXTENSIONS)
+
+
+class FileIndex:
+    """In-memory and SQLite index of the documents of the sorted folders."""
+
+    def __init__(
+        self,
+        base_dirs: Optional[List[str]] = None,
+        db_path: Optional[str] = None,
+        refresh_interval: float = FILE_INDEX_REFRESH_SECONDS
+    ):
+        self.base_dirs = [os.path.normpath(d) for d in (base_dirs or [SORTED_DIR, REVENUS_TRAITES])]
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._last_refresh: Optional[float] = None
+        self._folders: Dict[FolderKey, Set[str]] = {}
+        self._by_id: Dict[int, Set[Tuple[FolderKey, str]]] = {}
+        self._mtimes: Dict[FolderKey, int] = {}
+        self._listings: Dict[FolderKey, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def is_indexed(self, base_dir: str) -> bool:
+        """Tell whether a base folder is covered by the index."""
+        return os.path.normpath(base_dir) in self.base_dirs
+
+    def id_files(self, transaction_id: int, base_dir: str, categorie: str, sous_categorie: str) -> List[str]:
+        """
+        Get the documents named ``{transaction_id}.ext`` in a folder.
+
+        Args:
+            transaction_id: Transaction ID
+            base_dir: Indexed base folder
+            categorie: Category folder
+            sous_categorie: Subcategory folder
+
+        Returns:
+            Sorted full paths
+        """
+        key = folder_key(base_dir, categorie, sous_categorie)
+        with self._lock:
+            self._ensure_fresh()
+            names = sorted(nom for folder, nom in self._by_id.get(transaction_id, ()) if folder == key)
+        return [os.path.join(_folder_path(key), nom) for nom in names]
+
+    def folder_files(self, base_dir: str, categorie: str, sous_categorie: str) -> List[str]:
+        """
+        Get the documents of a folder, numbered copies excluded.
+
+        Args:
+            base_dir: Indexed base folder
+            categorie: Category folder
+            sous_categorie: Subcategory folder
+
+        Returns:
+            Sorted full paths
+        """
+        key = folder_key(base_dir, categorie, sous_categorie)
+        with self._lock:
+            self._ensure_fresh()
+            listing = self._listings.get(key)
+            if listing is None:
+                folder = _folder_path(key)
+                listing = self._listings[key] = [
+                    os.path.join(folder, nom)
+                    for nom in sorted(self._folders.get(key, ())) if not _NUMBERED_COPY.match(nom)
+                ]
+        return list(listing)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """
+        Pick up changes made outside the file service (files added by hand).
+
+        Stats every indexed folder and rescans those whose modification time
+        changed since the last refresh; folders that disappeared are dropped.
+
+        Returns:
+            Number of folders rescanned or dropped
+        """
+        with self._lock:
+            self._load()
+            current = dict(self._walk_folders())
+            changed = [key for key, mtime in current.items() if self._mtimes.get(key) != mtime or mtime == 0]
+            removed = [key for key in self._mtimes if key not in current]
+
+            scanned = {key: self._scan_folder(key) for key in changed}
+            for key in removed:
+                self._set_folder(key, set())
+                self._mtimes.pop(key, None)
+            for key, names in scanned.items():
+                self._set_folder(key, names)
+                self._mtimes[key] = current[key]
+            self._last_refresh = time.monotonic()
+
+            if changed or removed:
+                self._persist_folders(scanned, removed, current)
+                logger.info(f"[FILE-INDEX] {len(changed)} folder(s) rescanned, {len(removed)} dropped")
+            return len(changed) + len(removed)
+
+    def rebuild(self) -> int:
+        """
+        Forget every folder and index the sorted folders again.
+
+        Returns:
+            Number of folders indexed
+        """
+        with self._lock:
+            self._load()
+            with db_connection(self.db_path) as conn:
+                conn.executemany("DELETE FROM fichiers_index WHERE base = ?", [(b,) for b in self.base_dirs])
+                conn.executemany(
+                    "DELETE FROM fichiers_index_dossiers WHERE chemin = ?",
+                    [(_folder_path(key),) for key in self._mtimes]
+                )
+                conn.commit()
+            self._folders.clear()
+            self._by_id.clear()
+            self._listings.clear()
+            self._mtimes.clear()
+            return self.refresh()
+
+    def add(self, path: str) -> None:
+        """Record a document written under an indexed folder."""
+        located = self._locate(path)
+        if located is None:
+            return
+        key, nom = located
+        with self._lock:
+            self._load()
+            names = set(self._folders.get(key, ()))
+            names.add(nom)
+            self._set_folder(key, names)
+            with db_connection(self.db_path) as conn:
+                self._insert_files(conn, key, [nom])
+                conn.commit()
+
+    def remove(self, path: str) -> None:
+        """Forget a document deleted or moved away from an indexed folder."""
+        located = self._locate(path)
+        if located is None:
+            return
+        key, nom = located
+        with self._lock:
+            self._load()
+            names = set(self._folders.get(key, ()))
+            names.discard(nom)
+            self._set_folder(key, names)
+            with db_connection(self.db_path) as conn:
+                conn.execute("DELETE FROM fichiers_index WHERE chemin = ?", (os.path.join(_folder_path(key), nom),))
+                conn.commit()
+
+    def move(self, old_path: str, new_path: str) -> None:
+        """Record a document moved or renamed by the file service."""
+        self.remove(old_path)
+        self.add(new_path)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_fresh(self) -> None:
+        if (not self._loaded or self._last_refresh is None
+                or time.monotonic() - self._last_refresh >= self.refresh_interval):
+            self.refresh()
+
+    def _locate(self, path: str) -> Optional[Tuple[FolderKey, str]]:
+        """Folder key and name of a document path, None if it is not indexed."""
+        if not _is_attachment(path):
+            return None
+        path = os.path.normpath(path)
+        for base in self.base_dirs:
+            try:
+                relative = os.path.relpath(path, base)
+            except ValueError:  # Other drive (Windows)
+                continue
+            if relative.startswith(os.pardir):
+                continue
+            parts = relative.split(os.sep)
+            if len(parts) > 3:
+                return None
+            return folder_key(base, *(parts[:-1] + ['', ''])[:2]), parts[-1]
+        return None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with db_connection(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT base, categorie, sous_categorie, nom FROM fichiers_index "
+                f"WHERE base IN ({','.join('?' * len(self.base_dirs))})",
+                self.base_dirs
+            ).fetchall()
+            folders = conn.execute("SELECT chemin, mtime_ns FROM fichiers_index_dossiers").fetchall()
+
+        loaded: Dict[FolderKey, Set[str]] = {}
+        for base, categorie, sous_categorie, nom in rows:
+            loaded.setdefault((base, categorie, sous_categorie), set()).add(nom)
+        for key, names in loaded.items():
+            self._set_folder(key, names)
+
+        paths = {chemin: mtime for chemin, mtime in folders}
+        for key in self._known_keys(paths):
+            self._mtimes[key] = paths[_folder_path(key)]
+        self._loaded = True
+
+    def _known_keys(self, paths: Dict[str, int]) -> Iterator[FolderKey]:
+        for chemin in paths:
+            for base in self.base_dirs:
+                relative = os.path.relpath(chemin, base)
+                if relative.startswith(os.pardir):
+                    continue
+                parts = [] if relative == os.curdir else relative.split(os.sep)
+                if len(parts) <= 2:
+                    yield folder_key(base, *(parts + ['', ''])[:2])
+                break
+
+    def _walk_folders(self) -> Iterator[Tuple[FolderKey, int]]:
+        """Yield every indexed folder with its modification time (0 if too recent)."""
+        now = time.time_ns()
+
+        def _mtime(stat: os.stat_result) -> int:
+            return 0 if now - stat.st_mtime_ns < _RACY_NS else stat.st_mtime_ns
+
+        for base in self.base_dirs:
+            if not os.path.isdir(base):
+                continue
+            yield folder_key(base, '', ''), _mtime(os.stat(base))
+            with os.scandir(base) as categories:
+                for categorie in categories:
+                    if not categorie.is_dir():
+                        continue
+                    yield folder_key(base, categorie.name, ''), _mtime(categorie.stat())
+                    with os.scandir(categorie.path) as sous_categories:
+                        for sous_categorie in sous_categories:
+                            if sous_categorie.is_dir():
+                                yield folder_key(base, categorie.name, sous_categorie.name), _mtime(sous_categorie.stat())
+
+    @staticmethod
+    def _scan_folder(key: FolderKey) -> Set[str]:
+        try:
+            with os.scandir(_folder_path(key)) as entries:
+                return {entry.name for entry in entries if _is_attachment(entry.name) and entry.is_file()}
+        except OSError:
+            return set()
+
+    def _set_folder(self, key: FolderKey, names: Set[str]) -> None:
+        self._listings.pop(key, None)
+        for nom in self._folders.get(key, set()) - names:
+            tid = _transaction_id(nom)
+            if tid is not None:
+                self._by_id.get(tid, set()).discard((key, nom))
+        for nom in names:
+            tid = _transaction_id(nom)
+            if tid is not None:
+                self._by_id.setdefault(tid, set()).add((key, nom))
+        if names:
+            self._folders[key] = names
+        else:
+            self._folders.pop(key, None)
+
+    def _persist_folders(
+        self,
+        scanned: Dict[FolderKey, Set[str]],
+        removed: List[FolderKey],
+        mtimes: Dict[FolderKey, int]
+    ) -> None:
+        with db_connection(self.db_path) as conn:
+            for key in list(scanned) + removed:
+                conn.execute(
+                    "DELETE FROM fichiers_index WHERE base = ? AND categorie = ? AND sous_categorie = ?", key
+                )
+            conn.executemany(
+                "DELETE FROM fichiers_index_dossiers WHERE chemin = ?", [(_folder_path(key),) for key in removed]
+            )
+            for key, names in scanned.items():
+                self._insert_files(conn, key, names)
+            conn.executemany("""
+                INSERT INTO fichiers_index_dossiers (chemin, mtime_ns) VALUES (?, ?)
+                ON CONFLICT(chemin) DO UPDATE SET mtime_ns = excluded.mtime_ns
+            """, [(_folder_path(key), mtimes[key]) for key in scanned])
+            conn.commit()
+
+    @staticmethod
+    def _insert_files(conn, key: FolderKey, names) -> None:
+        folder = _folder_path(key)
+        conn.executemany("""
+            INSERT OR REPLACE INTO fichiers_index
+                (chemin, base, categorie, sous_categorie, nom, transaction_id, eligible)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (os.path.join(folder, nom), *key, nom, _transaction_id(nom), 0 if _NUMBERED_COPY.match(nom) else 1)
+            for nom in names
+        ])
+
+
+_index: Optional[FileIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_file_index() -> FileIndex:
+    """
+    Get the process-wide index of SORTED_DIR and REVENUS_TRAITES.
+
+    Returns:
+        FileIndex instance
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FileIndex()
+        return _index
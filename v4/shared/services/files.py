@@ -12,6 +12,7 @@ from typing import List, Dict, Any, Optional
 from config import REVENUS_TRAITES, SORTED_DIR
 from shared.database import get_db_connection
 from shared.logging_config import get_logger
+from .file_index import get_file_index, ATTACHMENT_EXTENSIONS
 
 logger = get_logger(__name__)
 
@@ -66,7 +67,6 @@ def trouver_fichiers_associes(
     transaction_id = transaction.get("id")
     categorie = transaction.get("categorie", "").strip()
     sous_categorie = (transaction.get("sous_categorie") or "").strip()
-    date_transaction = transaction.get("date", "")
     source = transaction.get("source", "")
 
     # Determine search folder based on source
@@ -77,25 +77,21 @@ def trouver_fichiers_associes(
     else:
         dossiers_recherche = base_dirs
 
+    index = get_file_index()
+
     # MÉTHODE 1: Recherche par ID de transaction (nouveau système)
     if transaction_id:
         for base_dir in dossiers_recherche:
-            if not os.path.exists(base_dir):
+            if index.is_indexed(base_dir):
+                fichiers_trouves.extend(index.id_files(int(transaction_id), base_dir, categorie, sous_categorie))
                 continue
-                
-            # Construire le chemin attendu
+
+            # Dossier hors index : lecture directe
             chemin_attendu = os.path.join(base_dir, categorie, sous_categorie)
-            
-            if os.path.exists(chemin_attendu):
-                # Chercher le fichier nommé exactement {id}.{extension}
-                for fichier in os.listdir(chemin_attendu):
-                    # Extraire le nom sans extension
-                    nom_sans_ext, ext = os.path.splitext(fichier)
-                    
-                    # Vérifier si le nom correspond exactement à l'ID (format: {id}.extension)
-                    if nom_sans_ext == str(transaction_id) and ext.lower() in ('.jpg', '.jpeg', '.png', '.pdf'):
-                        chemin_complet = os.path.join(chemin_attendu, fichier)
-                        fichiers_trouves.append(chemin_complet)
+            for fichier in _lister_documents(chemin_attendu):
+                # Vérifier si le nom correspond exactement à l'ID (format: {id}.extension)
+                if os.path.splitext(fichier)[0] == str(transaction_id):
+                    fichiers_trouves.append(os.path.join(chemin_attendu, fichier))
     
     # Si des fichiers ont été trouvés avec l'ID, les retourner
     if fichiers_trouves:
@@ -104,39 +100,25 @@ def trouver_fichiers_associes(
     # MÉTHODE 2: Fallback sur l'ancien système (catégorie/sous-catégorie)
     # Pour compatibilité avec les anciens fichiers non encore migrés
     for base_dir in dossiers_recherche:
-        if not os.path.exists(base_dir):
+        if index.is_indexed(base_dir):
+            fichiers_trouves.extend(index.folder_files(base_dir, categorie, sous_categorie))
             continue
 
-        # Build expected path: base/categorie/sous_categorie/
         chemin_attendu = os.path.join(base_dir, categorie, sous_categorie)
-
-        if os.path.exists(chemin_attendu):
-            # Search for all files in the directory
-            for fichier in os.listdir(chemin_attendu):
-                if fichier.lower().endswith(('.jpg', '.jpeg', '.png', '.pdf')):
-                    # Ne pas inclure les fichiers déjà nommés avec un ID (éviter doublons)
-                    if not re.match(r'^\d+_\d+\.', fichier):
-                        chemin_complet = os.path.join(chemin_attendu, fichier)
-
-                        # Optional: additional date verification
-                        if date_transaction:
-                            try:
-                                # Extract date from filename if possible
-                                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', fichier)
-                                if date_match:
-                                    date_fichier = date_match.group(1)
-                                    if date_fichier in date_transaction:
-                                        fichiers_trouves.append(chemin_complet)
-                                        continue
-                            except Exception:
-                                pass
-
-                        # If no date match, add anyway
-                        fichiers_trouves.append(chemin_complet)
+        for fichier in _lister_documents(chemin_attendu):
+            # Ne pas inclure les fichiers déjà nommés avec un ID (éviter doublons)
+            if not re.match(r'^\d+_\d+\.', fichier):
+                fichiers_trouves.append(os.path.join(chemin_attendu, fichier))
 
     return fichiers_trouves[:5]  # Limit to 5 files maximum
 
 
+def _lister_documents(chemin: str) -> List[str]:
+    """List the documents (.jpg, .jpeg, .png, .pdf) of a folder outside the file index."""
+    if not os.path.isdir(chemin):
+        return []
+    return sorted(f for f in os.listdir(chemin) if f.lower().endswith(ATTACHMENT_EXTENSIONS))
+
 
 def supprimer_fichiers_associes(transaction: Dict[str, Any]) -> int:
     """
@@ -176,6 +158,7 @@ def supprimer_fichiers_associes(transaction: Dict[str, Any]) -> int:
         try:
             if os.path.exists(fichier):
                 os.remove(fichier)
+                get_file_index().remove(fichier)
                 nb_supprimes += 1
                 logger.info(f"Fichier supprimé : {fichier}")
 
@@ -277,6 +260,7 @@ def deplacer_fichiers_associes(
 
                 # Move the file
                 shutil.move(fichier, nouveau_fichier)
+                get_file_index().move(fichier, nouveau_fichier)
                 nb_deplaces += 1
                 logger.info(f"Fichier déplacé : {fichier} -> {nouveau_fichier}")
 
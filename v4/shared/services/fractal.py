@@ -11,11 +11,12 @@ This service constructs the complete hierarchy needed by the fractal component:
 @date: 2025-11-22
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import pandas as pd
 import streamlit as st
 from domains.transactions import TransactionRepository
+from shared.database import get_change_token, get_pool
 from shared.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -46,12 +47,13 @@ def _darken_color(hex_color: str, factor: float = 0.85) -> str:
         return hex_color
 
 
-@st.cache_data
+@st.cache_data(max_entries=32)
 def _build_fractal_hierarchy_cached(
     date_debut: Optional[str] = None,
-    date_fin: Optional[str] = None
+    date_fin: Optional[str] = None,
+    change_token: Tuple = ()
 ) -> Dict[str, Any]:
-    """Internal cached version of build_fractal_hierarchy."""
+    """Internal cached version of build_fractal_hierarchy (keyed on the change token)."""
     return _build_fractal_hierarchy_impl(date_debut, date_fin)
 
 
@@ -114,18 +116,14 @@ def build_fractal_hierarchy(
             }
         }
     """
-    # Smart cache invalidation: only rebuild if transaction count changes
-    if 'last_transaction_count' not in st.session_state:
-        st.session_state.last_transaction_count = len(TransactionRepository.get_all())
-
-    current_count = len(TransactionRepository.get_all())
+    # Inside a caller's open transaction the rows may include uncommitted
+    # writes: build without caching them under the committed token
+    if get_pool().in_transaction():
+        return _build_fractal_hierarchy_impl(date_debut, date_fin)
 
-    if current_count != st.session_state.last_transaction_count:
-        st.cache_data.clear()
-        st.session_state.last_transaction_count = current_count
-
-    # Use cached implementation
-    return _build_fractal_hierarchy_cached(date_debut, date_fin)
+    # The token changes on every write: a stale entry is simply never hit again
+    # (and ages out of max_entries); other cached functions are left untouched
+    return _build_fractal_hierarchy_cached(date_debut, date_fin, get_change_token())
 
 
 def _build_fractal_hierarchy_impl(
@@ -153,34 +151,59 @@ def _build_fractal_hierarchy_impl(
                 logger.warning("No transactions found for the given date range")
                 return _get_empty_hierarchy()
 
+        # Single aggregation at leaf level; NaN keys are kept so every row
+        # still counts in its type (and category) totals
+        leaves = (
+            df_all.groupby(['type', 'categorie', 'sous_categorie'], dropna=False, sort=True)['montant']
+            .agg(['sum', 'count'])
+            .reset_index()
+        )
+        type_totals = leaves.groupby('type', sort=False)['sum'].sum()
+
+        categorized = leaves[leaves['categorie'].notna()]
+        categories = categorized.groupby(['type', 'categorie'], sort=True)[['sum', 'count']].sum().reset_index()
+
+        # Same sort call as the per-type frames had, so ties keep their order
+        categories_by_type: Dict[Any, List[tuple]] = {}
+        for tx_type, type_categories in categories.groupby('type', sort=False):
+            type_categories = type_categories.sort_values('sum', ascending=False)
+            categories_by_type[tx_type] = list(zip(
+                type_categories['categorie'], type_categories['sum'], type_categories['count']
+            ))
+
+        subcategories_by_category: Dict[tuple, List[tuple]] = {}
+        named = categorized[categorized['sous_categorie'].notna()]
+        for tx_type, cat_name, subcat_name, subcat_sum, subcat_count in zip(
+            named['type'], named['categorie'], named['sous_categorie'], named['sum'], named['count']
+        ):
+            subcategories_by_category.setdefault((tx_type, cat_name), []).append(
+                (subcat_name, float(subcat_sum), int(subcat_count))
+            )
+
         # Initialize hierarchy
         hierarchy: Dict[str, Any] = {}
 
-        # Calculate global totals
-        total_all = df_all['montant'].sum()
-
         # ROOT NODE: TR (Transaction Root)
         hierarchy['TR'] = {
             'code': 'TR',
             'label': 'Univers Financier',
-            'total': float(total_all),
+            'total': float(type_totals.sum()),
             'color': '#ffffff',
             'parent': None,
             'children': [],
             'level': 0
         }
 
-        # LEVEL 1: Types (Revenus, Dépenses)
+        # LEVEL 1: Types (Revenus, Dépenses), in order of appearance
         for tx_type in df_all['type'].unique():
-            df_type = df_all[df_all['type'] == tx_type]
-            type_total = df_type['montant'].sum()
+            type_total = float(type_totals[tx_type])
             type_code = 'REVENUS' if tx_type.lower() == 'revenu' else 'DEPENSES'
             type_label = 'Revenus' if tx_type.lower() == 'revenu' else 'Dépenses'
 
             hierarchy[type_code] = {
                 'code': type_code,
                 'label': type_label,
-                'total': float(type_total),
+                'total': type_total,
                 'color': get_type_color(tx_type),
                 'parent': 'TR',
                 'children': [],
@@ -190,21 +213,11 @@ def _build_fractal_hierarchy_impl(
             # Add to root
             hierarchy['TR']['children'].append(type_code)
 
-            # LEVEL 2: Categories
-            categories = df_type.groupby('categorie').agg({
-                'montant': ['sum', 'count'],
-                'sous_categorie': lambda x: x.notna().sum()
-            }).reset_index()
-
-            categories.columns = ['categorie', 'montant', 'count', 'subcategories']
-            categories = categories.sort_values('montant', ascending=False)
-
-            for idx, (_, cat_row) in enumerate(categories.iterrows()):
-                cat_name = cat_row['categorie']
-                cat_amount = float(cat_row['montant'])
-                cat_count = int(cat_row['count'])
+            # LEVEL 2: Categories (largest first)
+            for cat_name, cat_amount, cat_count in categories_by_type.get(tx_type, []):
+                cat_amount, cat_count = float(cat_amount), int(cat_count)
                 # Include type_code in category code to make it unique (avoid collisions if same category exists in REVENUS and DEPENSES)
-                cat_code = f"CAT_{type_code}_{cat_name.upper().replace(' ', '_').replace('-', '_')}"
+                cat_code = f"CAT_{type_code}_{_code_fragment(cat_name)}"
                 cat_color = get_category_color(cat_name, tx_type)
 
                 cat_percentage = (cat_amount / type_total * 100) if type_total > 0 else 0
@@ -224,23 +237,14 @@ def _build_fractal_hierarchy_impl(
                 # Add to parent type
                 hierarchy[type_code]['children'].append(cat_code)
 
-                # LEVEL 3: Sub-categories
-                df_category = df_type[df_type['categorie'] == cat_name]
-
-                subcategories = df_category[df_category['sous_categorie'].notna()].groupby('sous_categorie').agg({
-                    'montant': ['sum', 'count']
-                }).reset_index()
+                # LEVEL 3: Sub-categories (largest first, ties in alphabetical order)
+                subcategories = sorted(
+                    subcategories_by_category.get((tx_type, cat_name), []), key=lambda c: -c[1]
+                )
 
-                subcategories.columns = ['sous_categorie', 'montant', 'count']
-                subcategories = subcategories.sort_values('montant', ascending=False)
-
-                for subcat_idx, (_, subcat_row) in enumerate(subcategories.iterrows()):
-                    subcat_name = subcat_row['sous_categorie']
-                    subcat_amount = float(subcat_row['montant'])
-                    subcat_count = int(subcat_row['count'])
+                for subcat_name, subcat_amount, subcat_count in subcategories:
                     # Include type_code in subcategory code to make it unique (avoid collisions)
-                    subcat_code = f"SUBCAT_{type_code}_{cat_name.upper().replace(' ', '_').replace('-', '_')}_" \
-                                 f"{subcat_name.upper().replace(' ', '_').replace('-', '_')}"
+                    subcat_code = f"SUBCAT_{type_code}_{_code_fragment(cat_name)}_{_code_fragment(subcat_name)}"
 
                     # Use slightly darker shade of category color
                     subcat_color = _darken_color(cat_color, 0.85)
@@ -415,6 +419,11 @@ def _darken_color(hex_color: str, factor: float = 0.8) -> str:
         return hex_color
 
 
+def _code_fragment(name: str) -> str:
+    """Turn a category label into a node code fragment (e.g. 'Vie courante' -> 'VIE_COURANTE')."""
+    return name.upper().replace(' ', '_').replace('-', '_')
+
+
 def _get_empty_hierarchy() -> Dict[str, Any]:
     """
     Return an empty hierarchy structure.
@@ -32,5 +32,5 @@ def backfill_recurrences_to_today(db_path: Optional[str] = None) -> None:
         - Logs toutes les transactions insérées
     """
     # Utiliser la nouvelle fonction backfill
-    count = backfill_all_recurrences()
+    count = backfill_all_recurrences(db_path=db_path)
     logger.info(f"Recurrence backfill completed: {count} transactions created")
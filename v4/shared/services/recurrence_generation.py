@@ -6,15 +6,39 @@ Handles automatic generation of recurring transactions.
 
 import sqlite3
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 from dateutil.relativedelta import relativedelta
 
-from shared.database import get_db_connection
+from shared.database import db_connection
 from shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+def _next_occurrence(current: date, frequence: str) -> Optional[date]:
+    """
+    Calcule l'occurrence suivante d'une récurrence.
+
+    Les occurrences forment une chaîne (chaque date = précédente + pas), ce qui
+    permet de reprendre la génération à partir de n'importe quelle occurrence
+    déjà générée (watermark) en obtenant exactement les mêmes dates.
+
+    Args:
+        current: Occurrence courante
+        frequence: 'hebdomadaire', 'mensuelle' ou 'annuelle'
+
+    Returns:
+        Date suivante, ou None pour une fréquence inconnue (occurrence unique)
+    """
+    if frequence == 'hebdomadaire':
+        return current + timedelta(weeks=1)
+    elif frequence == 'mensuelle':
+        return current + relativedelta(months=1)
+    elif frequence == 'annuelle':
+        return current + relativedelta(years=1)
+    return None
+
+
 def generate_occurrences_for_recurrence(
     recurrence_id: int,
     start_date: date,
@@ -34,17 +58,13 @@ def generate_occurrences_for_recurrence(
     Returns:
         Liste de dictionnaires représentant les transactions à créer
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Récupérer la récurrence
-    rec = cursor.execute("""
-        SELECT type, categorie, sous_categorie, montant, date_debut, date_fin, frequence, description
-        FROM recurrences
-        WHERE id = ? AND statut = 'active'
-    """, (recurrence_id,)).fetchone()
-    
-    conn.close()
+    with db_connection() as conn:
+        # Récupérer la récurrence
+        rec = conn.execute("""
+            SELECT type, categorie, sous_categorie, montant, date_debut, date_fin, frequence, description
+            FROM recurrences
+            WHERE id = ? AND statut = 'active'
+        """, (recurrence_id,)).fetchone()
     
     if not rec:
         return []
@@ -80,76 +100,155 @@ def generate_occurrences_for_recurrence(
         })
         
         # Calculer prochaine occurrence
-        if frequence == 'hebdomadaire':
-            current_date += timedelta(weeks=1)
-        elif frequence == 'mensuelle':
-            current_date += relativedelta(months=1)
-        elif frequence == 'annuelle':
-            current_date += relativedelta(years=1)
-        else:
+        current_date = _next_occurrence(current_date, frequence)
+        if current_date is None:
             break
     
     return occurrences
 
 
-def backfill_all_recurrences() -> int:
+def _pending_occurrence_dates(
+    date_debut: date,
+    date_fin_rec: Optional[date],
+    frequence: str,
+    watermark: Optional[date],
+    end_date: date
+) -> List[date]:
+    """
+    Dates d'occurrence postérieures au watermark, jusqu'à end_date incluse.
+
+    Args:
+        date_debut: Première occurrence de la récurrence
+        date_fin_rec: Date de fin de la récurrence (optionnelle)
+        frequence: Fréquence de la récurrence
+        watermark: Dernière occurrence déjà générée (None = jamais)
+        end_date: Borne haute (aujourd'hui pour le backfill)
+
+    Returns:
+        Liste ordonnée des dates à vérifier/générer
+    """
+    if watermark is None:
+        current = date_debut
+    else:
+        current = _next_occurrence(watermark, frequence)
+
+    limit = min(end_date, date_fin_rec) if date_fin_rec else end_date
+    dates = []
+    while current is not None and current <= limit:
+        dates.append(current)
+        current = _next_occurrence(current, frequence)
+    return dates
+
+
+def backfill_all_recurrences(
+    recurrence_ids: Optional[List[int]] = None,
+    db_path: Optional[str] = None
+) -> int:
     """
     Génère toutes les occurrences manquantes pour toutes les récurrences actives.
     
     IMPORTANT : Ne génère que les transactions PASSÉES (jusqu'à aujourd'hui).
+
+    Traitement ensembliste en une seule transaction :
+    1. Les dates d'occurrence sont calculées en mémoire, à partir du watermark
+       ``recurrences.derniere_generation`` (dernière occurrence générée)
+    2. Une seule requête récupère les transactions 'récurrente_auto' déjà
+       présentes sur la plage concernée
+    3. Les manquantes sont insérées via un unique ``executemany`` et les
+       watermarks avancés
+
+    En régime établi (rien de nouveau depuis le dernier appel), le coût se
+    limite à la lecture de la table recurrences. Pour forcer une nouvelle
+    vérification complète d'une récurrence, remettre son watermark à NULL.
+
+    Args:
+        recurrence_ids: Limiter le backfill à ces récurrences (défaut: toutes)
+        db_path: Chemin optionnel de la base de données (tests)
     
     Returns:
         Nombre de transactions créées
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Récupérer toutes les récurrences actives
-    recurrences = cursor.execute("""
-        SELECT id, date_debut, date_fin
-        FROM recurrences
-        WHERE statut = 'active'
-    """).fetchall()
-    
+    from dateutil.parser import parse
+
     today = date.today()
-    total_created = 0
-    
-    for rec_id, date_debut_str, date_fin_str in recurrences:
-        from dateutil.parser import parse
-        date_debut = parse(date_debut_str).date()
-        
-        # IMPORTANT : Générer seulement jusqu'à aujourd'hui
-        occurrences = generate_occurrences_for_recurrence(rec_id, date_debut, today)
-        
-        # Vérifier quelles occurrences existent déjà
-        for occ in occurrences:
-            # Check if transaction already exists
-            # Check if transaction already exists
-            existing = cursor.execute("""
-                SELECT id FROM transactions
-                WHERE categorie = ? AND sous_categorie = ? 
-                  AND date = ? AND source = 'récurrente_auto'
-            """, (occ['categorie'], occ['sous_categorie'], occ['date'])).fetchone()
-            
-            if not existing:
-                # Créer la transaction avec source=récurrente_auto
-                cursor.execute("""
-                    INSERT INTO transactions
-                    (type, categorie, sous_categorie, montant, date, source, description)
-                    VALUES (?, ?, ?, ?, ?, 'récurrente_auto', ?)
-                """, (
-                    occ['type'],
-                    occ['categorie'],
-                    occ['sous_categorie'],
-                    occ['montant'],
-                    occ['date'],
-                    occ['description']
-                ))
-                total_created += 1
-    
-    conn.commit()
-    conn.close()
-    
+
+    with db_connection(db_path) as conn:
+        cursor = conn.cursor()
+
+        query = """
+            SELECT id, type, categorie, sous_categorie, montant, date_debut, date_fin,
+                   frequence, description, derniere_generation
+            FROM recurrences
+            WHERE statut = 'active'
+        """
+        params: Tuple = ()
+        if recurrence_ids is not None:
+            if not recurrence_ids:
+                return 0
+            query += f" AND id IN ({','.join('?' * len(recurrence_ids))})"
+            params = tuple(recurrence_ids)
+
+        # 1. Calcul en mémoire des occurrences à vérifier
+        candidates = []  # Lignes prêtes à insérer
+        watermarks = {}  # rec_id -> (première, dernière) date traitée
+        for rec in cursor.execute(query, params).fetchall():
+            (rec_id, type_rec, categorie, sous_categorie, montant, date_debut_str,
+             date_fin_str, frequence, description, watermark_str) = rec
+
+            dates = _pending_occurrence_dates(
+                parse(date_debut_str).date(),
+                parse(date_fin_str).date() if date_fin_str else None,
+                frequence,
+                parse(watermark_str).date() if watermark_str else None,
+                today
+            )
+            if not dates:
+                continue
+
+            sous_categorie = sous_categorie or ''
+            description = description or f'Récurrence auto - {categorie}'
+            candidates.extend(
+                (type_rec, categorie, sous_categorie, montant, d.isoformat(), description)
+                for d in dates
+            )
+            watermarks[rec_id] = (dates[0].isoformat(), dates[-1].isoformat())
+
+        if not candidates:
+            return 0
+
+        # 2. Une seule requête pour les occurrences déjà présentes
+        min_date = min(first for first, _ in watermarks.values())
+        existing: Set[Tuple[str, str, str]] = {
+            (row[0], row[1], row[2])
+            for row in cursor.execute("""
+                SELECT categorie, sous_categorie, date FROM transactions
+                WHERE source = 'récurrente_auto' AND date BETWEEN ? AND ?
+            """, (min_date, today.isoformat()))
+        }
+
+        # 3. Insertion groupée des manquantes (dédupliquées aussi entre elles)
+        to_insert = []
+        for row in candidates:
+            key = (row[1], row[2], row[4])  # categorie, sous_categorie, date
+            if key in existing:
+                continue
+            existing.add(key)
+            to_insert.append(row)
+
+        cursor.executemany("""
+            INSERT INTO transactions
+            (type, categorie, sous_categorie, montant, date, source, description)
+            VALUES (?, ?, ?, ?, ?, 'récurrente_auto', ?)
+        """, to_insert)
+
+        cursor.executemany(
+            "UPDATE recurrences SET derniere_generation = ? WHERE id = ?",
+            [(last, rec_id) for rec_id, (_, last) in watermarks.items()]
+        )
+
+        conn.commit()
+
+    total_created = len(to_insert)
     logger.info(f"Backfill completed: {total_created} transactions created")
     return total_created
 
@@ -167,43 +266,42 @@ def generate_future_occurrences(months_ahead: int = 12) -> int:
     today = date.today()
     end_date = today + relativedelta(months=months_ahead)
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with db_connection() as conn:
+        cursor = conn.cursor()
     
-    recurrences = cursor.execute("""
-        SELECT id FROM recurrences WHERE statut = 'active'
-    """).fetchall()
+        recurrences = cursor.execute("""
+            SELECT id FROM recurrences WHERE statut = 'active'
+        """).fetchall()
     
-    total_created = 0
+        total_created = 0
     
-    for (rec_id,) in recurrences:
-        occurrences = generate_occurrences_for_recurrence(rec_id, today, end_date)
+        for (rec_id,) in recurrences:
+            occurrences = generate_occurrences_for_recurrence(rec_id, today, end_date)
         
-        for occ in occurrences:
-            existing = cursor.execute("""
-                SELECT id FROM transactions
-                WHERE categorie = ? AND sous_categorie = ? 
-                  AND date = ? AND source = 'récurrente'
-            """, (occ['categorie'], occ['sous_categorie'], occ['date'])).fetchone()
+            for occ in occurrences:
+                existing = cursor.execute("""
+                    SELECT id FROM transactions
+                    WHERE categorie = ? AND sous_categorie = ?
+                      AND date = ? AND source = 'récurrente'
+                """, (occ['categorie'], occ['sous_categorie'], occ['date'])).fetchone()
             
-            if not existing:
-                cursor.execute("""
-                    INSERT INTO transactions
-                    (type, categorie, sous_categorie, montant, date, source, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    occ['type'],
-                    occ['categorie'],
-                    occ['sous_categorie'],
-                    occ['montant'],
-                    occ['date'],
-                    occ['source'],
-                    occ['description']
-                ))
-                total_created += 1
-    
-    conn.commit()
-    conn.close()
+                if not existing:
+                    cursor.execute("""
+                        INSERT INTO transactions
+                        (type, categorie, sous_categorie, montant, date, source, description)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        occ['type'],
+                        occ['categorie'],
+                        occ['sous_categorie'],
+                        occ['montant'],
+                        occ['date'],
+                        occ['source'],
+                        occ['description']
+                    ))
+                    total_created += 1
+
+        conn.commit()
     
     logger.info(f"Future generation completed: {total_created} transactions created")
     return total_created
@@ -223,72 +321,66 @@ def sync_recurrences_to_echeances() -> int:
     # Générer jusqu'à la fin du mois suivant
     fin_mois_suivant = (today.replace(day=1) + relativedelta(months=2)) - timedelta(days=1)
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with db_connection() as conn:
+        cursor = conn.cursor()
     
-    # Récupérer toutes les récurrences actives
-    recurrences = cursor.execute("""
-        SELECT id, type, categorie, sous_categorie, montant, 
-               date_debut, date_fin, frequence, description
-        FROM recurrences
-        WHERE statut = 'active'
-    """).fetchall()
+        # Récupérer toutes les récurrences actives
+        recurrences = cursor.execute("""
+            SELECT id, type, categorie, sous_categorie, montant,
+                   date_debut, date_fin, frequence, description
+            FROM recurrences
+            WHERE statut = 'active'
+        """).fetchall()
     
-    total_created = 0
+        total_created = 0
     
-    for rec in recurrences:
-        rec_id, type_rec, categorie, sous_cat, montant, date_debut_str, date_fin_str, frequence, description = rec
+        for rec in recurrences:
+            rec_id, type_rec, categorie, sous_cat, montant, date_debut_str, date_fin_str, frequence, description = rec
         
-        from dateutil.parser import parse
-        date_debut = parse(date_debut_str).date()
-        date_fin_rec = parse(date_fin_str).date() if date_fin_str else None
+            from dateutil.parser import parse
+            date_debut = parse(date_debut_str).date()
+            date_fin_rec = parse(date_fin_str).date() if date_fin_str else None
         
-        # Générer les occurrences futures
-        current = date_debut
-        while current <= fin_mois_suivant:
-            # Seulement les dates futures (>= aujourd'hui)
-            if current >= today:
-                # Vérifier date de fin
-                if date_fin_rec and current > date_fin_rec:
-                    break
+            # Générer les occurrences futures
+            current = date_debut
+            while current <= fin_mois_suivant:
+                # Seulement les dates futures (>= aujourd'hui)
+                if current >= today:
+                    # Vérifier date de fin
+                    if date_fin_rec and current > date_fin_rec:
+                        break
                 
-                # Vérifier si déjà présent dans echeances
-                existing = cursor.execute("""
-                    SELECT id FROM echeances
-                    WHERE categorie = ? AND date_echeance = ? 
-                      AND type_echeance = 'récurrente'
-                      AND recurrence_id = ?
-                """, (categorie, current.isoformat(), rec_id)).fetchone()
+                    # Vérifier si déjà présent dans echeances
+                    existing = cursor.execute("""
+                        SELECT id FROM echeances
+                        WHERE categorie = ? AND date_echeance = ?
+                          AND type_echeance = 'récurrente'
+                          AND recurrence_id = ?
+                    """, (categorie, current.isoformat(), rec_id)).fetchone()
                 
-                if not existing:
-                    cursor.execute("""
-                        INSERT INTO echeances 
-                        (type, categorie, sous_categorie, montant, date_echeance, 
-                         type_echeance, description, statut, recurrence_id)
-                        VALUES (?, ?, ?, ?, ?, 'récurrente', ?, 'active', ?)
-                    """, (
-                        type_rec,
-                        categorie,
-                        sous_cat or '',
-                        montant,
-                        current.isoformat(),
-                        description or f'Récurrence {frequence}',
-                        rec_id
-                    ))
-                    total_created += 1
+                    if not existing:
+                        cursor.execute("""
+                            INSERT INTO echeances
+                            (type, categorie, sous_categorie, montant, date_echeance,
+                             type_echeance, description, statut, recurrence_id)
+                            VALUES (?, ?, ?, ?, ?, 'récurrente', ?, 'active', ?)
+                        """, (
+                            type_rec,
+                            categorie,
+                            sous_cat or '',
+                            montant,
+                            current.isoformat(),
+                            description or f'Récurrence {frequence}',
+                            rec_id
+                        ))
+                        total_created += 1
             
-            # Avancer selon la fréquence
-            if frequence == 'hebdomadaire':
-                current += timedelta(weeks=1)
-            elif frequence == 'mensuelle':
-                current += relativedelta(months=1)
-            elif frequence == 'annuelle':
-                current += relativedelta(years=1)
-            else:
-                break
-    
-    conn.commit()
-    conn.close()
+                # Avancer selon la fréquence
+                current = _next_occurrence(current, frequence)
+                if current is None:
+                    break
+
+        conn.commit()
     
     logger.info(f"Sync recurrences to echeances: {total_created} created")
     return total_created
@@ -303,31 +395,30 @@ def cleanup_past_echeances() -> int:
     """
     today = date.today()
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with db_connection() as conn:
+        cursor = conn.cursor()
     
-    # Supprimer les échéances récurrentes passées
-    cursor.execute("""
-        DELETE FROM echeances
-        WHERE date_echeance < ?
-          AND type_echeance = 'récurrente'
-    """, (today.isoformat(),))
+        # Supprimer les échéances récurrentes passées
+        cursor.execute("""
+            DELETE FROM echeances
+            WHERE date_echeance < ?
+              AND type_echeance = 'récurrente'
+        """, (today.isoformat(),))
     
-    deleted_recurrentes = cursor.rowcount
+        deleted_recurrentes = cursor.rowcount
     
-    # Optionnel: Marquer les échéances prévues passées comme 'expirée'
-    cursor.execute("""
-        UPDATE echeances
-        SET statut = 'expirée'
-        WHERE date_echeance < ?
-          AND type_echeance = 'prévue'
-          AND statut = 'active'
-    """, (today.isoformat(),))
+        # Optionnel: Marquer les échéances prévues passées comme 'expirée'
+        cursor.execute("""
+            UPDATE echeances
+            SET statut = 'expirée'
+            WHERE date_echeance < ?
+              AND type_echeance = 'prévue'
+              AND statut = 'active'
+        """, (today.isoformat(),))
     
-    expired_prevues = cursor.rowcount
+        expired_prevues = cursor.rowcount
     
-    conn.commit()
-    conn.close()
+        conn.commit()
     
     logger.info(f"Cleanup: {deleted_recurrentes} récurrentes supprimées, {expired_prevues} prévues expirées")
     return deleted_recurrentes + expired_prevues
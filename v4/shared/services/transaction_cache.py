@@ -0,0 +1,230 @@
+"""
+Transaction Frame Cache - Incremental, resident DataFrame of all transactions.
+
+Instead of re-reading and re-parsing the whole ``transactions`` table after
+every write, the cache keeps the typed DataFrame in memory and follows the
+``transactions_changes`` log (maintained by triggers, see migration 5):
+
+- revision = highest ``transactions_changes.id`` applied to the frame
+- on access, rows changed since that revision are re-fetched by id and
+  patched into the frame (re-fetched rows that no longer exist are deletions)
+- a full reload happens only on first use, when the log was pruned past the
+  cache's revision, or when the log is unavailable (database not migrated)
+
+The cache is process-wide (one per database file), shared by all Streamlit
+sessions, and guarded by a lock.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from shared.database import committed_connection
+from shared.services.transaction_store import TransactionStore
+from shared.utils import safe_convert_series, safe_date_series
+from shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Change-log entries kept after being applied (other processes may lag behind)
+CHANGE_LOG_RETENTION = 10_000
+
+
+def convert_transaction_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the safe type conversions used for every transaction frame.
+
+    Args:
+        df: Raw rows from the transactions table
+
+    Returns:
+        DataFrame with float ``montant`` and datetime64 ``date``
+    """
+    if df.empty:
+        return df
+
+    df["montant"] = safe_convert_series(df["montant"], 0.0)
+    df["date"] = safe_date_series(df["date"])
+    return df
+
+
+class TransactionFrameCache:
+    """Resident, incrementally patched DataFrame of the transactions table."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._revision: Optional[int] = None
+        self._sorted: Dict[Tuple[str, bool], Tuple[int, pd.DataFrame]] = {}
+        self._store: Optional[Tuple[int, TransactionStore]] = None
+        self._generation = 0  # Bumped every time the frame changes
+        self.stats = {"full_loads": 0, "incremental": 0, "rows_patched": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, sort_by: str = "date", ascending: bool = False) -> pd.DataFrame:
+        """
+        Get an up-to-date copy of all transactions.
+
+        Args:
+            sort_by: Column to sort by
+            ascending: Sort order
+
+        Returns:
+            Typed DataFrame (callers may modify it freely)
+        """
+        with self._lock:
+            self._sync()
+            frame = self._frame
+            if frame.empty or sort_by not in frame.columns:
+                return frame.copy()
+
+            key = (sort_by, ascending)
+            cached = self._sorted.get(key)
+            if cached is None or cached[0] != self._generation:
+                cached = (self._generation, frame.sort_values(by=sort_by, ascending=ascending))
+                self._sorted[key] = cached
+            return cached[1].copy()
+
+    def store(self) -> TransactionStore:
+        """
+        Get the typed, columnar store of the current transactions.
+
+        Built once per version of the resident frame and shared by every
+        caller (read-only).
+
+        Returns:
+            TransactionStore instance
+        """
+        with self._lock:
+            self._sync()
+            if self._store is None or self._store[0] != self._generation:
+                self._store = (self._generation, TransactionStore(self._frame))
+            return self._store[1]
+
+    @property
+    def revision(self) -> Optional[int]:
+        """Last change-log id applied to the frame (None if untracked)."""
+        return self._revision
+
+    def invalidate(self) -> None:
+        """Drop the resident frame; the next access reloads the table."""
+        with self._lock:
+            self._frame = None
+            self._revision = None
+            self._sorted.clear()
+            self._store = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _sync(self) -> None:
+        # Shared by every session: never absorb a caller's uncommitted writes
+        with committed_connection(self.db_path) as conn:
+            head, oldest = self._read_log_bounds(conn)
+
+            if (
+                self._frame is None
+                or head is None
+                or self._revision is None
+                or (oldest is not None and oldest > self._revision + 1)
+            ):
+                self._full_load(conn, head)
+                return
+
+            if head == self._revision:
+                return
+
+            changed_ids = [
+                row[0] for row in conn.execute(
+                    "SELECT DISTINCT transaction_id FROM transactions_changes WHERE id > ? AND id <= ?",
+                    (self._revision, head)
+                )
+            ]
+            self._patch(conn, changed_ids)
+            self._revision = head
+            self._prune_log(conn, head, oldest)
+
+    @staticmethod
+    def _read_log_bounds(conn: sqlite3.Connection) -> Tuple[Optional[int], Optional[int]]:
+        try:
+            head, oldest = conn.execute(
+                "SELECT MAX(id), MIN(id) FROM transactions_changes"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None, None  # Change log missing: no incremental tracking
+        return (head or 0), oldest
+
+    def _full_load(self, conn: sqlite3.Connection, head: Optional[int]) -> None:
+        # Revision is read before the rows: concurrent writes are re-applied next time
+        df = pd.read_sql_query("SELECT * FROM transactions ORDER BY id", conn)
+        self._frame = convert_transaction_frame(df)
+        self._revision = head
+        self._generation += 1
+        self.stats["full_loads"] += 1
+        logger.debug(f"Transaction cache: full load ({len(df)} rows, revision={head})")
+
+    def _patch(self, conn: sqlite3.Connection, changed_ids: List[int]) -> None:
+        if not changed_ids:
+            return
+
+        fresh_parts = []
+        for start in range(0, len(changed_ids), 500):
+            chunk = changed_ids[start:start + 500]
+            fresh_parts.append(pd.read_sql_query(
+                f"SELECT * FROM transactions WHERE id IN ({','.join('?' * len(chunk))})",
+                conn,
+                params=chunk
+            ))
+        fresh = convert_transaction_frame(pd.concat(fresh_parts, ignore_index=True))
+
+        kept = self._frame[~self._frame["id"].isin(changed_ids)]
+        parts = [part for part in (kept, fresh) if not part.empty]
+        frame = pd.concat(parts, ignore_index=True) if parts else fresh
+        if not frame.empty:
+            frame = frame.sort_values(by="id").reset_index(drop=True)
+
+        self._frame = frame
+        self._generation += 1
+        self.stats["incremental"] += 1
+        self.stats["rows_patched"] += len(changed_ids)
+        logger.debug(f"Transaction cache: patched {len(changed_ids)} row(s)")
+
+    @staticmethod
+    def _prune_log(conn: sqlite3.Connection, head: int, oldest: Optional[int]) -> None:
+        if oldest is None or head - oldest < 2 * CHANGE_LOG_RETENTION:
+            return
+        try:
+            conn.execute("DELETE FROM transactions_changes WHERE id <= ?", (head - CHANGE_LOG_RETENTION,))
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            # Read-only connection inside a caller's transaction: prune next time
+            logger.debug(f"Change log pruning skipped: {e}")
+
+
+_caches: Dict[Optional[str], TransactionFrameCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_transaction_cache(db_path: Optional[str] = None) -> TransactionFrameCache:
+    """
+    Get the process-wide transaction cache for a database.
+
+    Args:
+        db_path: Optional custom database path (for testing)
+
+    Returns:
+        TransactionFrameCache instance
+    """
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = TransactionFrameCache(db_path)
+            _caches[db_path] = cache
+        return cache
@@ -0,0 +1,133 @@
+"""Typed, columnar view of the transactions for repeated filtering.
+
+The frame served by ``load_transactions`` keeps its text columns as plain
+strings, and filters such as the fractal navigation compare
+``df[col].str.lower()`` row by row for every selected code. A
+:class:`TransactionStore` is built once per version of the resident frame
+(see ``TransactionFrameCache.store``) and holds:
+
+- ``type``, ``categorie``, ``sous_categorie``, ``source`` and ``recurrence``
+  as categoricals (one small dictionary + integer codes)
+- pre-lowercased lookup keys for those columns: a case-insensitive match is
+  a dictionary lookup followed by an integer comparison
+- ``date`` as a ``datetime64[D]`` array, ``montant`` as ``float64`` and the
+  amounts as an int64 array of cents for exact sums
+
+Filters return boolean masks that can be combined, then rows or ids.
+"""
+
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from shared.utils import to_cents_series
+
+# Low-cardinality text columns stored as categoricals
+CATEGORICAL_COLUMNS = ("type", "categorie", "sous_categorie", "source", "recurrence")
+
+_NO_MATCH = -2  # Key code of a value absent from the store (codes start at -1 for NaN)
+
+
+class TransactionStore:
+    """Immutable typed snapshot of the transactions with filter accessors."""
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Build the store from a converted transaction frame.
+
+        Args:
+            frame: Frame as produced by ``convert_transaction_frame``
+        """
+        typed = frame.copy()
+        self._keys: Dict[str, np.ndarray] = {}
+        self._lookups: Dict[str, Dict[str, int]] = {}
+        for column in CATEGORICAL_COLUMNS:
+            if column not in typed.columns:
+                continue
+            typed[column] = typed[column].astype("category")
+            lowered = pd.Index(typed[column].cat.categories.astype(str).str.lower())
+            vocabulary = lowered.unique()
+            remap = np.append(vocabulary.get_indexer(lowered), -1).astype(np.int32)
+            # Category code -1 (missing) maps to the last remap entry, key -1
+            self._keys[column] = remap[typed[column].cat.codes.to_numpy()]
+            self._lookups[column] = {value: code for code, value in enumerate(vocabulary)}
+
+        self._cents = np.array([], dtype=np.int64)
+        if "montant" in typed.columns:
+            typed["montant"] = typed["montant"].astype(np.float64)
+            self._cents = to_cents_series(typed["montant"]).to_numpy()
+        if "date" in typed.columns and not typed.empty:
+            self._days = typed["date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+        else:
+            self._days = np.array([], dtype="datetime64[D]")
+        self.frame = typed
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def key_mask(self, column: str, value: Optional[str]) -> np.ndarray:
+        """
+        Case-insensitive equality on a categorical column.
+
+        Args:
+            column: One of CATEGORICAL_COLUMNS
+            value: Value to match (None matches missing values)
+
+        Returns:
+            Boolean mask over the store rows
+        """
+        if value is None:
+            return self._keys[column] == -1
+        return self._keys[column] == self._lookups[column].get(str(value).lower(), _NO_MATCH)
+
+    def mask(
+        self,
+        transaction_type: Optional[str] = None,
+        categorie: Optional[str] = None,
+        sous_categorie: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> np.ndarray:
+        """
+        Combine the common filters (text filters ignore case).
+
+        Args:
+            transaction_type: 'revenu' or 'dépense'
+            categorie: Category name
+            sous_categorie: Sub-category name
+            start_date: First day included
+            end_date: Last day included
+
+        Returns:
+            Boolean mask over the store rows (all True without filters)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, value in (("type", transaction_type), ("categorie", categorie),
+                              ("sous_categorie", sous_categorie)):
+            if value is not None:
+                mask &= self.key_mask(column, value)
+        if start_date is not None:
+            mask &= self._days >= np.datetime64(start_date, "D")
+        if end_date is not None:
+            mask &= self._days <= np.datetime64(end_date, "D")
+        return mask
+
+    def select(self, mask: np.ndarray) -> pd.DataFrame:
+        """Rows of the typed frame selected by a mask."""
+        return self.frame[mask]
+
+    def ids(self, mask: np.ndarray) -> np.ndarray:
+        """Transaction ids selected by a mask."""
+        return self.frame["id"].to_numpy()[mask]
+
+    def sum_cents(self, mask: np.ndarray) -> int:
+        """Exact sum, in cents, of the amounts selected by a mask."""
+        return int(self._cents[mask].sum())
+
+    def memory_usage(self) -> int:
+        """Bytes used by the typed frame, the lookup keys and the cents."""
+        keys = sum(array.nbytes for array in self._keys.values())
+        arrays = keys + self._days.nbytes + self._cents.nbytes
+        return int(self.frame.memory_usage(deep=True).sum()) + arrays
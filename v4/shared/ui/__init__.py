@@ -3,7 +3,9 @@ from .styles import load_all_styles
 from .helpers import (
     refresh_and_rerun,
     insert_transaction_batch,
-    load_transactions
+    show_import_report,
+    load_transactions,
+    load_transaction_store
 )
 from .error_handler import display_error
 from .toast_components import (
@@ -22,7 +24,9 @@ __all__ = [
     # Helpers
     'refresh_and_rerun',
     'insert_transaction_batch',
+    'show_import_report',
     'load_transactions',
+    'load_transaction_store',
     
     # Errors
     'display_error',
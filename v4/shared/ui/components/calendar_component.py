@@ -11,9 +11,11 @@ from datetime import datetime, date, timedelta
 from typing import Optional, Dict, Set
 import calendar
 
+from shared.services.day_summary import DaySummary, get_day_summary
+
 
 def render_calendar(
-    df: pd.DataFrame,
+    df: Optional[pd.DataFrame] = None,
     key: str = "calendar",
     selected_month: Optional[date] = None
 ) -> Optional[date]:
@@ -21,7 +23,8 @@ def render_calendar(
     Affiche un calendrier interactif mensuel.
     
     Args:
-        df: DataFrame avec colonne 'date' et 'type'
+        df: DataFrame avec colonnes 'date' et 'type' à marquer ; None pour le
+            résumé par jour partagé de toutes les transactions (get_day_summary)
         key: Clé unique pour les widgets Streamlit
         selected_month: Mois à afficher (défaut: mois en cours)
     
@@ -74,7 +77,8 @@ def render_calendar(
             st.rerun()
     
     # Calculer les jours avec transactions
-    days_with_transactions = _get_days_with_transactions(df, current_month)
+    summary = get_day_summary() if df is None else DaySummary.from_frame(df)
+    days_with_transactions = summary.month(current_month)
     
     # Afficher la grille du calendrier
     _render_calendar_grid(current_month, days_with_transactions, key)
@@ -112,44 +116,6 @@ def render_calendar(
     return st.session_state[f"{key}_selected_date"]
 
 
-def _get_days_with_transactions(df: pd.DataFrame, month: date) -> Dict[int, Dict]:
-    """
-    Récupère les jours du mois ayant des transactions.
-    
-    Returns:
-        Dict[jour] = {'has_revenue': bool, 'has_expense': bool, 'count': int}
-    """
-    if df.empty:
-        return {}
-    
-    df_copy = df.copy()
-    df_copy["date"] = pd.to_datetime(df_copy["date"])
-    
-    # Filtrer sur le mois
-    mask = (
-        (df_copy["date"].dt.year == month.year) &
-        (df_copy["date"].dt.month == month.month)
-    )
-    df_month = df_copy[mask]
-    
-    if df_month.empty:
-        return {}
-    
-    days_info = {}
-    for _, row in df_month.iterrows():
-        day = row["date"].day
-        if day not in days_info:
-            days_info[day] = {"has_revenue": False, "has_expense": False, "count": 0}
-        
-        days_info[day]["count"] += 1
-        if row["type"] == "revenu":
-            days_info[day]["has_revenue"] = True
-        else:
-            days_info[day]["has_expense"] = True
-    
-    return days_info
-
-
 def _render_calendar_grid(month: date, days_info: Dict[int, Dict], key: str) -> None:
     """Affiche la grille du calendrier."""
     
@@ -9,6 +9,8 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 
+from shared.utils import to_cents_series
+
 
 def render_evolution_chart(df: pd.DataFrame, height: int = 400) -> None:
     """
@@ -18,23 +20,36 @@ def render_evolution_chart(df: pd.DataFrame, height: int = 400) -> None:
     Utilisé par: Accueil + Voir Transactions
     
     Args:
-        df: DataFrame avec colonnes 'date', 'type', 'montant'
+        df: DataFrame avec colonnes 'date', 'type', 'montant', ou totaux
+            mensuels déjà calculés ('periode', 'type', 'montant', voir
+            TransactionRepository.monthly_totals)
         height: Hauteur du graphique en pixels
     """
     if df.empty:
         st.info("Aucune donnée disponible pour le graphique")
         return
     
-    # Préparer les données mensuelles
+    # Sommes en centimes entiers (int64) : totaux et solde exacts, sans arrondi
     df_copy = df.copy()
-    df_copy["date"] = pd.to_datetime(df_copy["date"])
-    df_copy["mois_str"] = df_copy["date"].dt.strftime("%b %Y")
+    if "montant_cents" not in df_copy.columns:
+        df_copy["montant_cents"] = to_cents_series(df_copy["montant"])
     
-    # Grouper par mois et type
-    df_evolution = df_copy.groupby(["mois_str", "type"])["montant"].sum().unstack(fill_value=0)
-    df_evolution = df_evolution.reindex(
-        sorted(df_evolution.index, key=lambda x: pd.to_datetime(x, format='%b %Y'))
-    )
+    if "periode" in df_copy.columns:
+        # Totaux mensuels lus dans monthly_rollup (mois ISO, déjà triés)
+        df_evolution = df_copy.pivot_table(
+            index="periode", columns="type", values="montant_cents", aggfunc="sum", fill_value=0
+        )
+        df_evolution.index = pd.to_datetime(df_evolution.index, format="%Y-%m").strftime("%b %Y")
+    else:
+        # Préparer les données mensuelles
+        df_copy["date"] = pd.to_datetime(df_copy["date"])
+        df_copy["mois_str"] = df_copy["date"].dt.strftime("%b %Y")
+        
+        # Grouper par mois et type
+        df_evolution = df_copy.groupby(["mois_str", "type"])["montant_cents"].sum().unstack(fill_value=0)
+        df_evolution = df_evolution.reindex(
+            sorted(df_evolution.index, key=lambda x: pd.to_datetime(x, format='%b %Y'))
+        )
     
     # S'assurer que les colonnes existent
     if "revenu" not in df_evolution.columns:
@@ -42,12 +57,9 @@ def render_evolution_chart(df: pd.DataFrame, height: int = 400) -> None:
     if "dépense" not in df_evolution.columns:
         df_evolution["dépense"] = 0
     
-    # Arrondir les valeurs
-    df_evolution["dépense"] = df_evolution["dépense"].round(2)
-    df_evolution["revenu"] = df_evolution["revenu"].round(2)
-    
-    # Calculer le solde
-    solde = (df_evolution["revenu"] - df_evolution["dépense"]).round(2)
+    # Calculer le solde, puis repasser en euros
+    solde = (df_evolution["revenu"] - df_evolution["dépense"]) / 100
+    df_evolution = df_evolution / 100
     
     # Créer le graphique
     fig = go.Figure()
@@ -4,18 +4,16 @@ This module contains utilities for loading transactions, handling recurrent
 transactions, and batch inserting transactions into the database.
 """
 
-import sqlite3
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import pandas as pd
 import streamlit as st
 
-from config import DB_PATH
-from shared.utils import safe_convert, safe_date_convert
-from shared.utils import validate_transaction_data
-from domains.revenues import process_uber_revenue
-from domains.transactions.service import normalize_category, normalize_subcategory
-from shared.database import get_db_connection
+from domains.transactions.import_service import ImportReport, bulk_insert_transactions
+from shared.database import db_connection
+from shared.exceptions import DatabaseError
+from shared.services.transaction_cache import get_transaction_cache
+from shared.services.transaction_store import TransactionStore
 from .toast_components import toast_success, toast_error
 
 logger = logging.getLogger(__name__)
@@ -36,23 +34,20 @@ def get_transaction_count() -> int:
         Count of transactions (uncached)
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM transactions")
-        count = cur.fetchone()[0]
-        conn.close()
-        return count
+        with db_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
     except Exception as e:
         logger.error(f"Error counting transactions: {e}")
         return 0
 
 
-@st.cache_data
 def load_transactions(sort_by: str = "date", ascending: bool = False) -> pd.DataFrame:
     """
     Load all transactions from the database with safe conversions.
 
-    Loads transactions, applies safe type conversions, and sorts them.
+    Served by the process-wide TransactionFrameCache: the typed frame stays
+    resident and only rows changed since the last call (tracked by the
+    transactions_changes log) are re-read and converted.
     Default sorting is by date (most recent first).
 
     Args:
@@ -71,38 +66,47 @@ def load_transactions(sort_by: str = "date", ascending: bool = False) -> pd.Data
         dtype('float64')
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query("SELECT * FROM transactions", conn)
-        conn.close()
+        return get_transaction_cache().get(sort_by=sort_by, ascending=ascending)
 
-        if df.empty:
-            return df
+    except Exception as e:
+        logger.error(f"Error loading transactions: {e}")
+        st.error(f"Erreur lors du chargement des transactions: {e}")
+        return pd.DataFrame()
 
-        # Safe conversions
-        df["montant"] = df["montant"].apply(lambda x: safe_convert(x, float, 0.0))
-        df["date"] = df["date"].apply(lambda x: safe_date_convert(x))
 
-        # Convert for pandas
-        df["date"] = pd.to_datetime(df["date"])
+def load_transaction_store() -> TransactionStore:
+    """
+    Load the typed, columnar store of all transactions.
 
-        # Default sort: Most recent first
-        df = df.sort_values(by=sort_by, ascending=ascending)
+    Built once per change of the resident TransactionFrameCache frame and
+    shared by all sessions. Use it for repeated filters (fractal codes,
+    date ranges) instead of string comparisons on ``load_transactions()``.
 
-        return df
+    Returns:
+        TransactionStore (empty if the transactions cannot be loaded)
+
+    Example:
+        >>> store = load_transaction_store()
+        >>> ids = store.ids(store.mask(transaction_type="dépense", categorie="alimentation"))
+    """
+    try:
+        return get_transaction_cache().store()
 
     except Exception as e:
-        logger.error(f"Error loading transactions: {e}")
+        logger.error(f"Error loading transaction store: {e}")
         st.error(f"Erreur lors du chargement des transactions: {e}")
-        return pd.DataFrame()
+        return TransactionStore(pd.DataFrame(columns=[
+            "id", "type", "categorie", "sous_categorie", "description",
+            "montant", "date", "source", "recurrence", "date_fin"
+        ]))
 
 
-@st.cache_data(ttl=300)
 def load_recurrent_transactions() -> pd.DataFrame:
     """
     Load recurrent transactions from the database with caching.
 
     Loads only transactions marked as automatically recurring
-    (source='récurrente_auto') with a 5-minute cache.
+    (source='récurrente_auto'), filtered from the transaction cache.
 
     Returns:
         DataFrame containing recurrent transactions, sorted by date (descending)
@@ -113,27 +117,12 @@ def load_recurrent_transactions() -> pd.DataFrame:
         array(['récurrente_auto'], dtype=object)
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query(
-            "SELECT * FROM transactions WHERE source='récurrente_auto'",
-            conn
-        )
-        conn.close()
+        df = get_transaction_cache().get(sort_by="date", ascending=False)
 
         if df.empty:
             return df
 
-        # Safe conversions
-        df["montant"] = df["montant"].apply(lambda x: safe_convert(x, float, 0.0))
-        df["date"] = df["date"].apply(lambda x: safe_date_convert(x))
-
-        # Convert for pandas
-        df["date"] = pd.to_datetime(df["date"])
-
-        # Sort by date descending
-        df = df.sort_values(by="date", ascending=False)
-
-        return df
+        return df[df["source"] == "récurrente_auto"]
 
     except Exception as e:
         logger.error(f"Error loading recurrent transactions: {e}")
@@ -147,6 +136,8 @@ def refresh_and_rerun() -> None:
 
     This function clears all cached data and forces a complete
     re-execution of the Streamlit app, useful after database modifications.
+    The transaction frame cache is not affected: it patches itself from the
+    change log on the next load.
 
     Side effects:
         - Clears st.cache_data
@@ -163,7 +154,10 @@ def refresh_and_rerun() -> None:
 # 💾 BATCH OPERATIONS
 # ==============================
 
-def insert_transaction_batch(transactions: List[Dict[str, Any]]) -> None:
+def insert_transaction_batch(
+    transactions: List[Dict[str, Any]],
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> ImportReport:
     """
     Insert multiple transactions into the database with validation and deduplication.
 
@@ -174,6 +168,10 @@ def insert_transaction_batch(transactions: List[Dict[str, Any]]) -> None:
     4. Checking for duplicates before insertion
     5. Inserting valid, non-duplicate transactions
 
+    The work is done by ``bulk_insert_transactions`` (column-wise
+    normalization, one duplicate join, chunked inserts in one transaction);
+    this function displays its report.
+
     Args:
         transactions: List of transaction dictionaries, each containing:
             - type: 'revenu' or 'dépense'
@@ -185,6 +183,10 @@ def insert_transaction_batch(transactions: List[Dict[str, Any]]) -> None:
             - source: Source identifier (default: 'manuel')
             - recurrence: Recurrence pattern (optional)
             - date_fin: End date for recurring transactions (optional)
+        progress_callback: Optional callback(rows_inserted, rows_to_insert)
+
+    Returns:
+        ImportReport (inserted, duplicates, invalid rows with their errors)
 
     Side effects:
         - Inserts transactions into database
@@ -204,93 +206,37 @@ def insert_transaction_batch(transactions: List[Dict[str, Any]]) -> None:
         ...         'source': 'manuel'
         ...     }
         ... ]
-        >>> insert_transaction_batch(transactions)
+        >>> insert_transaction_batch(transactions).inserted
+        1
     """
     if not transactions:
-        return
-
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    inserted, skipped, uber_processed = 0, 0, 0
-    uber_messages = []
-
-    for t in transactions:
-        try:
-            # Validate data
-            errors = validate_transaction_data(t)
-            if errors:
-                logger.warning(f"Transaction validation failed: {errors}")
-                skipped += 1
-                continue
-
-            # Clean data
-            clean_t = {
-                "type": str(t["type"]).strip().lower(),
-                "categorie": normalize_category(str(t.get("categorie", "")).strip()),
-                "sous_categorie": normalize_subcategory(str(t.get("sous_categorie", "")).strip()),
-                "description": str(t.get("description", "")).strip(),
-                "montant": safe_convert(t["montant"]),
-                "date": safe_date_convert(t["date"]).isoformat(),
-                "source": str(t.get("source", "manuel")).strip(),
-                "recurrence": str(t.get("recurrence", "")).strip(),
-                "date_fin": safe_date_convert(t.get("date_fin")).isoformat() if t.get("date_fin") else ""
-            }
-
-            # Process Uber revenue
-            if clean_t["type"] == "revenu":
-                clean_t, uber_msg = process_uber_revenue(clean_t)
-                if uber_msg:
-                    uber_processed += 1
-                    uber_messages.append(uber_msg)
-
-            # Check for duplicates
-            cur.execute("""
-                SELECT COUNT(*) FROM transactions
-                WHERE type = ? AND categorie = ? AND sous_categorie = ?
-                      AND montant = ? AND date = ?
-            """, (
-                clean_t["type"],
-                clean_t.get("categorie", ""),
-                clean_t.get("sous_categorie", ""),
-                float(clean_t["montant"]),
-                clean_t["date"]
-            ))
-
-            if cur.fetchone()[0] > 0:
-                skipped += 1
-                continue
-
-            # Insert transaction
-            cur.execute("""
-                INSERT INTO transactions
-                (type, categorie, sous_categorie, description, montant, date, source, recurrence, date_fin)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                clean_t["type"],
-                clean_t.get("categorie", ""),
-                clean_t.get("sous_categorie", ""),
-                clean_t.get("description", ""),
-                float(clean_t["montant"]),
-                clean_t["date"],
-                clean_t.get("source", "manuel"),
-                clean_t.get("recurrence", ""),
-                clean_t.get("date_fin", "")
-            ))
-            inserted += 1
-
-        except Exception as e:
-            logger.error(f"Error inserting transaction {t}: {e}")
-
-    conn.commit()
-    conn.close()
-
-    # Display results
-    if inserted > 0:
-        toast_success(f"{inserted} transaction(s) insérée(s).")
-        if uber_processed > 0:
-            st.info(f"🚗 {uber_processed} revenu(s) Uber traité(s) avec application de la fiscalité (79%)")
-            for msg in uber_messages:
+        return ImportReport()
+
+    try:
+        report = bulk_insert_transactions(transactions, progress_callback=progress_callback)
+    except DatabaseError as e:
+        toast_error(str(e))
+        return ImportReport()
+
+    show_import_report(report)
+    return report
+
+
+def show_import_report(report: ImportReport) -> None:
+    """
+    Display the outcome of an import (toasts and info messages).
+
+    Args:
+        report: Report returned by the import service
+    """
+    if report.inserted > 0:
+        toast_success(f"{report.inserted} transaction(s) insérée(s).")
+        if report.uber_messages:
+            st.info(f"🚗 {len(report.uber_messages)} revenu(s) Uber traité(s) avec application de la fiscalité (79%)")
+            for msg in report.uber_messages:
                 st.success(msg)
-    if skipped > 0:
-        st.info(f"ℹ️ {skipped} doublon(s) détecté(s) et ignoré(s).")
+    if report.duplicates > 0:
+        st.info(f"ℹ️ {report.duplicates} doublon(s) détecté(s) et ignoré(s).")
+    if report.invalid:
+        st.warning(f"⚠️ {len(report.invalid)} transaction(s) invalide(s) ignorée(s).")
+
@@ -13,6 +13,7 @@ import pandas as pd
 from PIL import Image
 
 from shared.services import trouver_fichiers_associes
+from shared.utils import from_cents_series, to_cents_series
 
 logger = logging.getLogger(__name__)
 
@@ -415,6 +416,8 @@ def calculate_category_stats(df: pd.DataFrame) -> pd.DataFrame:
 
     df_copy = df.copy()
     df_copy['type'] = df_copy['type'].str.lower().str.strip()
+    # Exact int64 sums in cents, converted back once
+    df_copy['montant'] = to_cents_series(df_copy['montant'])
 
     stats = df_copy.groupby('categorie', as_index=False).agg({
         'montant': ['sum', 'count'],
@@ -422,7 +425,7 @@ def calculate_category_stats(df: pd.DataFrame) -> pd.DataFrame:
     }).reset_index(drop=True)
 
     stats.columns = ['categorie', 'montant', 'count', 'type_predominant']
-    stats['montant'] = stats['montant'].round(2)
+    stats['montant'] = from_cents_series(stats['montant'])
 
     total = stats['montant'].sum()
     stats['pct'] = (stats['montant'] / total * 100).round(1)
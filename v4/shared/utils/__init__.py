@@ -1,16 +1,25 @@
 """Utility functions module."""
 
-from .converters import safe_convert, safe_date_convert
+from .converters import safe_convert, safe_date_convert, safe_convert_series, safe_date_series
 from .validators import validate_transaction_data
 from .formatters import numero_to_mois, mois_to_numero
 from .constants import MONTHS_DICT, MONTHS_REVERSE
+from .money import Cents, cents_sql, to_cents, from_cents, to_cents_series, from_cents_series
 
 __all__ = [
     'safe_convert',
     'safe_date_convert',
+    'safe_convert_series',
+    'safe_date_series',
     'validate_transaction_data',
     'numero_to_mois',
     'mois_to_numero',
     'MONTHS_DICT',
-    'MONTHS_REVERSE'
+    'MONTHS_REVERSE',
+    'Cents',
+    'cents_sql',
+    'to_cents',
+    'from_cents',
+    'to_cents_series',
+    'from_cents_series'
 ]
@@ -2,6 +2,7 @@
 
 import re
 import logging
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from dateutil import parser
@@ -138,3 +139,135 @@ def safe_date_convert(
     except Exception:
         logger.warning(f"Date conversion failed for '{date_str}', using default")
         return default
+
+
+# ==============================
+# VECTORIZED CONVERSIONS
+# ==============================
+
+DATE_FORMATS = [
+    "%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y",
+    "%Y/%m/%d", "%d-%m-%Y", "%d-%m-%y",
+    "%d.%m.%Y", "%d.%m.%y"
+]
+
+
+def _round_cents(values: pd.Series) -> pd.Series:
+    """Round to 2 decimals exactly like the builtin ``round`` (ties included)."""
+    rounded = values.round(2)
+    # numpy rounds x*100, which can flip near-half values: defer those to round()
+    scaled = values * 100
+    ties = (scaled - np.floor(scaled) - 0.5).abs() < 1e-6
+    if ties.any():
+        rounded[ties] = values[ties].map(lambda x: round(x, 2))
+    return rounded
+
+
+def safe_convert_series(series: pd.Series, default: float = 0.0) -> pd.Series:
+    """
+    Vectorized ``safe_convert(x, float, default)`` for a whole column.
+
+    Applies the same rules with pandas string operations: strip spaces,
+    currency symbols and quotes, treat the LAST separator (. or ,) as the
+    decimal one, drop everything but digits/dot/minus, round to 2 decimals.
+    Numeric columns skip the string pass. Only rows that still fail to parse
+    go through the scalar function (which also logs them).
+
+    Args:
+        series: Column of amounts (strings, numbers or NaN)
+        default: Value for empty or unparsable entries
+
+    Returns:
+        float64 Series aligned on the input index
+
+    Examples:
+        >>> safe_convert_series(pd.Series(["1.234,56", "1,234.56", "", None])).tolist()
+        [1234.56, 1234.56, 0.0, 0.0]
+    """
+    if series.empty:
+        return series.astype("float64")
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return _round_cents(series.astype("float64")).fillna(default)
+
+    missing = series.isna()
+    values = series.where(~missing, "").astype(str).str.strip()
+    empty = missing | (values == "")
+
+    values = values.str.replace(r"[ €\"']", "", regex=True)
+    # Last separator is a comma (no dot after it) / a dot (no comma after it)
+    european = values.str.contains(r",[^.]*$", regex=True)
+    american = values.str.contains(r"\.[^,]*$", regex=True)
+    values = values.mask(european, values.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    values = values.mask(american, values.str.replace(",", "", regex=False))
+    values = values.str.replace(r"[^\d.-]", "", regex=True)
+
+    result = _round_cents(pd.to_numeric(values, errors="coerce"))
+
+    residual = result.isna() & ~empty
+    if residual.any():
+        result[residual] = series[residual].apply(lambda x: safe_convert(x, float, default))
+
+    return result.fillna(default).astype("float64")
+
+
+# datetime64[ns] range, midnight-aligned: dates outside it saturate
+_MIN_DATE = pd.Timestamp.min.ceil("D")
+_MAX_DATE = pd.Timestamp.max.floor("D")
+
+
+def _as_ns(dates: pd.Series) -> pd.Series:
+    """Cast parsed dates to datetime64[ns], clamping those outside its range."""
+    if dates.dtype == "datetime64[ns]":
+        return dates
+    return dates.clip(lower=_MIN_DATE, upper=_MAX_DATE).astype("datetime64[ns]")
+
+
+def safe_date_series(series: pd.Series, default: Optional[datetime] = None) -> pd.Series:
+    """
+    Vectorized ``safe_date_convert`` for a whole column.
+
+    Each format of ``DATE_FORMATS`` is tried in order with ``pd.to_datetime``
+    on the rows not parsed yet; only the leftovers go through the scalar
+    function (dateutil fuzzy parsing).
+
+    Args:
+        series: Column of dates (strings, dates or NaN)
+        default: Date for empty or unparsable entries (defaults to today)
+
+    Returns:
+        datetime64 Series (midnight) aligned on the input index
+
+    Examples:
+        >>> safe_date_series(pd.Series(["2025-01-15", "15/01/2025"])).dt.date.tolist()
+        [datetime.date(2025, 1, 15), datetime.date(2025, 1, 15)]
+    """
+    if default is None:
+        default = datetime.now().date()
+
+    if series.empty:
+        return pd.to_datetime(series)
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.normalize().fillna(pd.Timestamp(default))
+
+    missing = series.isna()
+    values = series.where(~missing, "").astype(str).str.strip()
+    empty = missing | (values == "")
+
+    result = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    pending = ~empty
+    for fmt in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed = _as_ns(pd.to_datetime(values[pending], format=fmt, errors="coerce"))
+        matched = parsed.notna()
+        result[matched[matched].index] = parsed[matched]
+        pending &= result.isna()
+
+    if pending.any():
+        result[pending] = _as_ns(pd.to_datetime(
+            series[pending].apply(lambda x: safe_date_convert(x, default))
+        ))
+
+    return result.fillna(pd.Timestamp(default))
@@ -0,0 +1,93 @@
+"""Integer-cent money helpers.
+
+Amounts are entered and displayed in euros, but sums and comparisons are
+done on integer cents: adding int64 values is exact, two amounts are equal
+when their cents are equal, and a total needs no rounding pass afterwards.
+
+``to_cents`` rounds half away from zero exactly like SQLite's
+``CAST(ROUND(x * 100) AS INTEGER)`` (see ``cents_sql``), so the cents
+computed in Python match the ones computed in queries and indexes.
+"""
+
+from typing import Any, NewType
+
+import numpy as np
+import pandas as pd
+
+from .converters import safe_convert, safe_convert_series
+
+Cents = NewType("Cents", int)
+
+
+def cents_sql(column: str = "montant") -> str:
+    """
+    SQL expression of an amount column in integer cents.
+
+    The text must stay identical to the one of the expression index
+    ``idx_transactions_date_cents`` (migration 10) for SQLite to use it.
+
+    Args:
+        column: Column holding an amount in euros (REAL)
+
+    Returns:
+        SQL expression such as ``CAST(ROUND(montant * 100) AS INTEGER)``
+    """
+    return f"CAST(ROUND({column} * 100) AS INTEGER)"
+
+
+def to_cents(value: Any, default: float = 0.0) -> Cents:
+    """
+    Convert an amount (number or text such as "1.234,56 €") to cents.
+
+    Args:
+        value: Amount in euros
+        default: Amount used when the value cannot be parsed
+
+    Returns:
+        Integer number of cents
+
+    Examples:
+        >>> to_cents("45,50")
+        4550
+        >>> to_cents(-0.125)
+        -13
+    """
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool) and not pd.isna(value):
+        scaled = float(value) * 100
+    else:
+        scaled = float(safe_convert(value, float, default)) * 100
+    if scaled >= 0:
+        return Cents(int(scaled + 0.5))
+    return Cents(-int(-scaled + 0.5))
+
+
+def from_cents(cents: int) -> float:
+    """Amount in euros of a number of cents (nearest float, no rounding needed)."""
+    return int(cents) / 100
+
+
+def to_cents_series(series: pd.Series, default: float = 0.0) -> pd.Series:
+    """
+    Vectorized ``to_cents`` for a whole column.
+
+    Args:
+        series: Column of amounts (numbers or text)
+        default: Amount for empty or unparsable entries
+
+    Returns:
+        int64 Series aligned on the input index
+    """
+    if series.empty:
+        return pd.Series([], index=series.index, dtype=np.int64)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.astype("float64").fillna(default).to_numpy()
+    else:
+        values = safe_convert_series(series, default).to_numpy(dtype=np.float64)
+    scaled = values * 100
+    cents = np.where(scaled >= 0, np.floor(scaled + 0.5), -np.floor(-scaled + 0.5))
+    return pd.Series(cents.astype(np.int64), index=series.index)
+
+
+def from_cents_series(cents: pd.Series) -> pd.Series:
+    """Amounts in euros (float64) of a column of cents."""
+    return cents.astype(np.int64) / 100
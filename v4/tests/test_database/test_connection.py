@@ -0,0 +1,189 @@
+"""
+Unit Tests for the SQLite Connection Pool
+
+Tests thread-local reuse, release semantics and reclaiming of connections.
+"""
+
+import sqlite3
+import threading
+import pytest
+from shared.database.connection import ConnectionPool
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestConnectionPool:
+    """Test suite for ConnectionPool."""
+
+    def test_same_thread_reuses_connection(self, temp_db):
+        """Test sequential acquisitions on one thread reuse the connection."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+
+        # Act
+        conn1 = pool.acquire()
+        conn1.close()
+        conn2 = pool.acquire()
+        conn2.close()
+
+        # Assert
+        assert conn1 is conn2
+        assert pool.stats()["opened"] == 1
+        pool.close_all()
+
+
+    def test_nested_acquire_shares_connection(self, temp_db):
+        """Test nested acquisitions only release on the outermost close."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+        outer = pool.acquire()
+        outer.execute(
+            "INSERT INTO transactions (type, categorie, montant, date) VALUES ('dépense', 'Test', 1.0, '2024-01-01')"
+        )
+
+        # Act
+        with pool.connection() as inner:
+            same = inner is outer
+
+        # Assert - inner release must not roll back the outer transaction
+        assert same
+        assert outer.in_transaction
+        outer.commit()
+        outer.close()
+        pool.close_all()
+
+
+    def test_nested_rollback_keeps_outer_changes(self, temp_db):
+        """Test a nested helper's error path only undoes its own writes."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+        insert = "INSERT INTO transactions (type, categorie, montant, date) VALUES ('dépense', ?, 1.0, '2024-01-01')"
+        outer = pool.acquire()
+        outer.execute(insert, ("Outer",))
+
+        # Act
+        with pytest.raises(ValueError):
+            with pool.connection() as inner:
+                inner.execute(insert, ("Inner",))
+                raise ValueError("helper failed")
+        outer.commit()
+
+        # Assert
+        assert [row[0] for row in outer.execute("SELECT categorie FROM transactions")] == ["Outer"]
+        outer.close()
+        pool.close_all()
+
+
+    def test_only_outermost_commit_ends_the_transaction(self, temp_db):
+        """Test a nested commit is undone when the outer caller rolls back."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+        insert = "INSERT INTO transactions (type, categorie, montant, date) VALUES ('dépense', ?, 1.0, '2024-01-01')"
+
+        # Act
+        with pool.connection() as outer:
+            outer.execute(insert, ("Outer",))
+            with pool.connection() as inner:
+                inner.execute(insert, ("Inner",))
+                inner.commit()
+            outer.rollback()
+            discarded = outer.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+            with pool.connection() as inner:
+                inner.execute(insert, ("Alone",))
+                inner.commit()
+
+        with pool.connection() as conn:
+            kept = [row[0] for row in conn.execute("SELECT categorie FROM transactions")]
+
+        # Assert
+        assert discarded == 0
+        assert kept == ["Alone"]
+        pool.close_all()
+
+
+    def test_unreleased_level_does_not_defer_later_commits(self, temp_db):
+        """Test a page connection never closed (st.rerun) keeps later commits visible."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+        insert = "INSERT INTO transactions (type, categorie, montant, date) VALUES ('dépense', ?, 1.0, '2024-01-01')"
+        other = sqlite3.connect(temp_db, timeout=0.1)
+
+        # Act - each run: helper write, then a form commit on a page connection left open
+        for run in range(4):
+            with pool.connection() as helper:
+                helper.execute(insert, (f"Helper {run}",))
+                helper.commit()
+            page = pool.acquire()
+            page.execute(insert, (f"Form {run}",))
+            page.commit()
+        visible = other.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        other.execute(insert, ("Other",))
+        other.commit()
+
+        # Assert
+        assert visible == 8
+        other.close()
+        pool.close_all()
+
+
+    def test_release_rolls_back_uncommitted_work(self, temp_db):
+        """Test closing without commit discards changes like a plain connection."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+
+        # Act
+        with pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO transactions (type, categorie, montant, date) VALUES ('dépense', 'Test', 1.0, '2024-01-01')"
+            )
+
+        with pool.connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+        # Assert
+        assert count == 0
+        pool.close_all()
+
+
+    def test_connection_of_finished_thread_is_reclaimed(self, temp_db):
+        """Test connections pinned to dead threads are reused by new threads."""
+        # Arrange
+        pool = ConnectionPool(temp_db, pool_size=1)
+        seen = []
+
+        def worker():
+            conn = pool.acquire()
+            seen.append(conn)
+            conn.close()
+
+        # Act
+        for _ in range(3):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        # Assert
+        assert seen[0] is seen[1] is seen[2]
+        assert pool.stats()["opened"] == 1
+        assert pool.stats()["overflow"] == 0
+        pool.close_all()
+
+
+    def test_closed_connection_fails_health_check(self, temp_db):
+        """Test a broken connection is replaced on next acquisition."""
+        # Arrange
+        pool = ConnectionPool(temp_db)
+        conn = pool.acquire()
+        conn.close()
+        pool.close_all()
+
+        # Act
+        fresh = pool.acquire()
+        count = fresh.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        fresh.close()
+
+        # Assert
+        assert fresh is not conn
+        assert count == 0
+        pool.close_all()
@@ -0,0 +1,142 @@
+"""
+Unit Tests for Versioned Schema Migrations
+
+Tests PRAGMA user_version tracking, idempotence, the hot-path indexes and
+the integer-cents upgrade.
+"""
+
+import sqlite3
+import pytest
+from shared.database.migrations import run_migrations, get_schema_version, LATEST_VERSION, MIGRATIONS
+
+
+def _index_names(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    return names
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestMigrations:
+    """Test suite for the migration engine."""
+
+    def test_migrates_existing_database_to_latest(self, temp_db):
+        """Test a database created without user_version is brought up to date."""
+        # Act
+        applied = run_migrations(temp_db)
+
+        # Assert
+        assert applied == LATEST_VERSION
+        assert get_schema_version(temp_db) == LATEST_VERSION
+
+
+    def test_second_run_is_noop(self, temp_db):
+        """Test migrations are applied only once."""
+        # Arrange
+        run_migrations(temp_db)
+
+        # Act
+        applied = run_migrations(temp_db)
+
+        # Assert
+        assert applied == 0
+
+
+    def test_creates_portfolio_tables_and_columns(self, temp_db):
+        """Test échéances gets the columns previously added ad-hoc by the portfolio page."""
+        # Act
+        run_migrations(temp_db)
+
+        # Assert
+        conn = sqlite3.connect(temp_db)
+        columns = [col[1] for col in conn.execute("PRAGMA table_info(echeances)")]
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        assert {"type_echeance", "recurrence_id"} <= set(columns)
+        assert {"budgets_categories", "objectifs_financiers", "recurrences"} <= tables
+
+
+    def test_recurrence_lookup_uses_index(self, temp_db):
+        """Test the backfill existence check no longer full-scans transactions."""
+        # Arrange
+        run_migrations(temp_db)
+
+        # Act
+        conn = sqlite3.connect(temp_db)
+        plan = " ".join(row[-1] for row in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT id FROM transactions
+            WHERE categorie = ? AND sous_categorie = ? AND date = ? AND source = 'récurrente_auto'
+        """, ("Logement", "Loyer", "2024-01-01")))
+        conn.close()
+
+        # Assert
+        assert "idx_transactions_source_categorie_date" in plan
+        assert {"idx_transactions_date", "idx_echeances_recurrence_date"} <= _index_names(temp_db)
+
+
+    def test_renames_legacy_french_columns(self, tmp_path):
+        """Test pre-V4 databases with French column names are migrated."""
+        # Arrange
+        db_path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT, "Catégorie" TEXT,
+                "Sous-catégorie" TEXT, description TEXT, montant REAL, "Date" TEXT,
+                "Source" TEXT, "Récurrence" TEXT, date_fin TEXT
+            )
+        """)
+        conn.execute("""
+            INSERT INTO transactions (type, "Catégorie", "Sous-catégorie", montant, "Date")
+            VALUES ('dépense', 'Alimentation', 'Courses', 12.5, '2024-01-01')
+        """)
+        conn.commit()
+        conn.close()
+
+        # Act
+        run_migrations(db_path)
+
+        # Assert
+        conn = sqlite3.connect(db_path)
+        row = conn.execute("SELECT categorie, sous_categorie, date, source FROM transactions").fetchone()
+        conn.close()
+        assert row == ("Alimentation", "Courses", "2024-01-01", "Manuel")
+
+
+    def test_integer_cents_migration_normalizes_amounts(self, temp_db):
+        """Test migration 10 puts amounts on the cent grid and the rollup in cents."""
+        # Arrange: database at version 9 with off-grid amounts
+        conn = sqlite3.connect(temp_db)
+        for _, _, migrate in MIGRATIONS[:9]:
+            migrate(conn.cursor())
+        conn.execute("PRAGMA user_version = 9")
+        conn.execute("""
+            INSERT INTO transactions (type, categorie, montant, date)
+            VALUES ('dépense', 'Café', 1.239999, '2024-01-02'), ('dépense', 'Café', 0.1, '2024-01-03')
+        """)
+        conn.execute("INSERT INTO budgets_categories (categorie, budget_mensuel) VALUES ('Café', 30.005)")
+        conn.commit()
+        conn.close()
+
+        # Act
+        applied = run_migrations(temp_db)
+
+        # Assert
+        conn = sqlite3.connect(temp_db)
+        amounts = [row[0] for row in conn.execute("SELECT montant FROM transactions ORDER BY id")]
+        budget = conn.execute("SELECT budget_mensuel FROM budgets_categories").fetchone()[0]
+        rollup = conn.execute("SELECT montant_cents, nombre FROM monthly_rollup").fetchall()
+        plan = " ".join(row[-1] for row in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT id FROM transactions WHERE date = ? AND CAST(ROUND(montant * 100) AS INTEGER) = ?
+        """, ("2024-01-02", 124)))
+        conn.close()
+        assert applied == 1
+        assert amounts == [1.24, 0.1]
+        assert budget == 30.01
+        assert rollup == [(134, 2)]
+        assert "idx_transactions_date_cents" in plan
+        assert "idx_transactions_date_montant" not in _index_names(temp_db)
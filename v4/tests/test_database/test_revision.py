@@ -0,0 +1,87 @@
+"""
+Unit Tests for Change Tokens
+
+Tests that the token moves on every kind of write.
+"""
+
+import sqlite3
+import pytest
+from shared.database import db_connection
+from shared.database.migrations import run_migrations
+from shared.database.revision import get_change_token
+
+
+def _execute(db_path, query):
+    conn = sqlite3.connect(db_path)
+    conn.execute(query)
+    conn.commit()
+    conn.close()
+
+
+INSERT = """
+    INSERT INTO transactions (type, categorie, sous_categorie, montant, date)
+    VALUES ('dépense', 'Alimentation', 'Courses', 12.5, '2024-01-10')
+"""
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestChangeToken:
+    """Test suite for get_change_token."""
+
+    def test_token_changes_on_insert_update_delete(self, temp_db):
+        """Test each write produces a new token."""
+        # Arrange
+        run_migrations(temp_db)
+        tokens = [get_change_token(temp_db)]
+
+        # Act
+        for query in (INSERT, "UPDATE transactions SET montant = 1.0", "DELETE FROM transactions"):
+            _execute(temp_db, query)
+            tokens.append(get_change_token(temp_db))
+
+        # Assert
+        assert len(set(tokens)) == 4
+
+
+    def test_token_is_stable_without_writes(self, temp_db):
+        """Test reading twice gives the same token."""
+        # Arrange
+        run_migrations(temp_db)
+        _execute(temp_db, INSERT)
+
+        # Act / Assert
+        assert get_change_token(temp_db) == get_change_token(temp_db)
+
+
+    def test_uncommitted_write_does_not_move_the_token(self, temp_db):
+        """Test a token read inside a rolled-back write cannot match a later, different write."""
+        # Arrange
+        run_migrations(temp_db)
+        before = get_change_token(temp_db)
+        with db_connection(temp_db) as conn:
+            conn.execute(INSERT)
+            inside = get_change_token(temp_db)
+            conn.rollback()
+
+        # Act
+        _execute(temp_db, "INSERT INTO transactions (type, categorie, montant, date) "
+                          "VALUES ('revenu', 'Salaire', 2000.0, '2024-01-01')")
+        after = get_change_token(temp_db)
+
+        # Assert
+        assert inside == before
+        assert after != inside
+
+
+    def test_fallback_without_change_log(self, temp_db):
+        """Test an unmigrated database still detects inserts."""
+        # Arrange
+        before = get_change_token(temp_db)
+
+        # Act
+        _execute(temp_db, INSERT)
+
+        # Assert
+        assert get_change_token(temp_db) != before
+        assert before[0] == "rows"
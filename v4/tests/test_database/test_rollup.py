@@ -0,0 +1,124 @@
+"""
+Unit Tests for the Monthly Rollup
+
+Tests that the triggers keep monthly_rollup equal to a GROUP BY over the
+transactions, that its integer-cent sums stay exact, and that repository
+sums read from it match the raw rows.
+"""
+
+import sqlite3
+from datetime import date
+import pytest
+from domains.transactions.repository import TransactionRepository
+from shared.database.migrations import run_migrations
+from shared.database.rollup import rebuild_monthly_rollup
+
+ROWS = [
+    ("dépense", "Alimentation", "Courses", 12.5, "2024-01-10"),
+    ("dépense", "Alimentation", None, 7.5, "2024-01-20"),
+    ("dépense", "Logement", "Loyer", 800.0, "2024-02-01"),
+    ("revenu", "Salaire", "Net", 2000.0, "2024-02-28"),
+    ("dépense", "Alimentation", "Courses", 30.0, "2024-03-15"),
+]
+
+EXPECTED = """
+    SELECT substr(date, 1, 7), type, categorie, COALESCE(sous_categorie, ''),
+           SUM(CAST(ROUND(montant * 100) AS INTEGER)), COUNT(*)
+    FROM transactions GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4
+"""
+
+
+def _execute(db_path, query, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.executemany(query, params) if params else conn.execute(query)
+    conn.commit()
+    conn.close()
+
+
+def _fetch(db_path, query):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(query).fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.fixture
+def rollup_db(temp_db):
+    run_migrations(temp_db)
+    _execute(temp_db, """
+        INSERT INTO transactions (type, categorie, sous_categorie, montant, date) VALUES (?, ?, ?, ?, ?)
+    """, ROWS)
+    return temp_db
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestMonthlyRollup:
+    """Test suite for the monthly_rollup triggers and rebuild."""
+
+    def test_triggers_follow_insert_update_delete(self, rollup_db):
+        """Test the rollup equals a fresh GROUP BY after each kind of write."""
+        # Arrange
+        writes = [
+            "UPDATE transactions SET montant = montant + 1 WHERE categorie = 'Alimentation'",
+            "UPDATE transactions SET date = '2024-03-01', categorie = 'Maison' WHERE categorie = 'Logement'",
+            "DELETE FROM transactions WHERE sous_categorie IS NULL",
+        ]
+
+        for query in writes:
+            # Act
+            _execute(rollup_db, query)
+
+            # Assert
+            assert _fetch(rollup_db, "SELECT * FROM monthly_rollup ORDER BY 1, 2, 3, 4") == _fetch(rollup_db, EXPECTED)
+
+
+    def test_rebuild_restores_rows_written_without_triggers(self, rollup_db):
+        """Test rebuild_monthly_rollup recomputes the table from scratch."""
+        # Arrange
+        _execute(rollup_db, "DELETE FROM monthly_rollup WHERE mois = '2024-02'")
+
+        # Act
+        rows = rebuild_monthly_rollup(rollup_db)
+
+        # Assert
+        assert rows == 5
+        assert _fetch(rollup_db, "SELECT * FROM monthly_rollup ORDER BY 1, 2, 3, 4") == _fetch(rollup_db, EXPECTED)
+
+
+    def test_repository_sums_combine_rollup_and_partial_months(self, rollup_db):
+        """Test whole months from the rollup plus partial edges equal the raw sums."""
+        # Arrange
+        _execute(rollup_db, "DELETE FROM monthly_rollup WHERE mois = '2024-02'")  # Visible if read
+
+        # Act
+        partial = TransactionRepository.sum_by(
+            ["type"], start_date=date(2024, 1, 15), end_date=date(2024, 3, 20), db_path=rollup_db
+        )
+        whole = TransactionRepository.monthly_totals(
+            ["categorie"], transaction_type="dépense", start_date=date(2024, 1, 1), db_path=rollup_db
+        )
+
+        # Assert
+        assert partial[["type", "montant", "nombre"]].values.tolist() == [["dépense", 37.5, 2]]
+        assert whole[["periode", "categorie", "montant"]].values.tolist() == [
+            ["2024-01", "Alimentation", 20.0], ["2024-03", "Alimentation", 30.0]
+        ]
+
+
+    def test_cent_sums_do_not_drift(self, rollup_db):
+        """Test repeated float amounts add up to exact totals."""
+        # Arrange
+        _execute(rollup_db, """
+            INSERT INTO transactions (type, categorie, sous_categorie, montant, date) VALUES (?, ?, ?, ?, ?)
+        """, [("dépense", "Café", None, 0.1, "2024-04-02")] * 1000)
+
+        # Act
+        _execute(rollup_db, "UPDATE transactions SET montant = 0.2 WHERE categorie = 'Café' AND id % 2 = 0")
+        totals = TransactionRepository.sum_by(["categorie"], transaction_type="dépense", db_path=rollup_db)
+
+        # Assert
+        cafe = totals[totals["categorie"] == "Café"].iloc[0]
+        assert cafe["montant_cents"] == 15000
+        assert cafe["montant"] == 150.0
+        assert _fetch(rollup_db, "SELECT montant_cents FROM monthly_rollup WHERE categorie = 'Café'") == [(15000,)]
@@ -0,0 +1,89 @@
+"""
+Unit Tests for the OCR Result Cache
+
+Tests content-addressed lookups, LRU eviction and the full_ocr integration.
+"""
+
+import time
+import cv2
+import numpy as np
+import pytest
+from domains.ocr import scanner
+from domains.ocr.ocr_cache import OCRCache, make_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache stored in a temporary database."""
+    return OCRCache(str(tmp_path / "ocr_cache.db"), max_bytes=15)
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestOCRCache:
+    """Test suite for OCRCache."""
+
+    def test_miss_then_hit_are_counted(self, cache):
+        """Test a stored text is returned and hits/misses are recorded."""
+        # Arrange
+        key = make_cache_key(b"image bytes", "params")
+
+        # Act
+        first = cache.get(key)
+        cache.put(key, "TOTAL")
+        second = cache.get(key)
+
+        # Assert
+        assert first is None
+        assert second == "TOTAL"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+    def test_key_depends_on_settings(self):
+        """Test the same bytes with other settings get another key."""
+        # Act / Assert
+        assert make_cache_key(b"x", "fra+eng|5.3") != make_cache_key(b"x", "fra|5.3")
+
+
+    def test_least_recently_used_is_evicted(self, cache):
+        """Test exceeding the size budget evicts the oldest accessed entry."""
+        # Arrange
+        for key in ("a", "b"):
+            cache.put(key, "123456")
+            time.sleep(0.01)
+        cache.get("a")  # "b" is now the least recently used
+        time.sleep(0.01)
+
+        # Act
+        cache.put("c", "123456")
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") == "123456"
+        assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestFullOcrCache:
+    """Test suite for the cache in full_ocr."""
+
+    def test_second_call_skips_tesseract(self, tmp_path, monkeypatch):
+        """Test an unchanged image is only OCR'd once."""
+        # Arrange
+        image_path = tmp_path / "ticket.png"
+        cv2.imwrite(str(image_path), np.full((20, 20, 3), 255, dtype=np.uint8))
+        calls = []
+        monkeypatch.setattr(scanner, "get_ocr_cache", lambda: OCRCache(str(tmp_path / "cache.db")))
+        monkeypatch.setattr(scanner, "log_pattern_occurrence", lambda name: None)
+        monkeypatch.setattr(scanner.pytesseract, "image_to_string",
+                            lambda img, lang: calls.append(lang) or "TOTAL 12,50")
+
+        # Act
+        first = scanner.full_ocr(str(image_path))
+        second = scanner.full_ocr(str(image_path))
+
+        # Assert
+        assert first == second == "TOTAL 12,50"
+        assert len(calls) == 1
@@ -5,7 +5,9 @@ Tests OCR text parsing using public interfaces.
 """
 
 import pytest
-from domains.ocr.parsers import _normalize_ocr_text, parse_ticket_metadata_v2
+from domains.ocr.parsers import _normalize_ocr_text, parse_ticket_metadata_v2, is_keyword_line
+from domains.ocr.parsers_OLD_BACKUP import get_montant_from_line, get_montants_from_lines
+from domains.ocr.pattern_manager import get_pattern_manager
 
 
 @pytest.mark.unit
@@ -167,3 +169,38 @@ class TestOCRParsers:
         
         # Assert
         assert result['montant'] > 0
+    
+    
+    def test_compiled_amount_search_matches_per_pattern_search(self):
+        """Test the single-pass amount search agrees with get_montant_from_line."""
+        # Arrange
+        lines = _normalize_ocr_text(
+            "CARREFOUR\nTOTAL 3 ARTICLES\n1O,5O €\nMONTANT REEL : 21,4O EUR\n"
+            "TVA 5.5% 1,12\nNET A PAYER\nCB 21.40\nMONTANT"
+        )
+        compiled = get_pattern_manager().get_compiled_patterns()
+        expected = []
+        for pattern, _ in compiled.amount:
+            montant, matched = get_montant_from_line(pattern, lines, allow_next_line=True)
+            if matched:
+                expected.append((pattern, montant))
+        
+        # Act
+        result = get_montants_from_lines(compiled, lines)
+        
+        # Assert
+        assert result == expected
+        assert len(result) > 1
+    
+    
+    def test_keyword_lines_for_region_of_interest(self):
+        """Test the layout pass keeps totals, payment, VAT and date lines only."""
+        # Arrange
+        lines = ["TOTAL TTC 21,40", "CB 21.40", "TVA 5.5% 1,12", "12/03/2024 14:02",
+                 "CARREFOUR MARKET", "2 X YAOURT NATURE"]
+        
+        # Act
+        result = [is_keyword_line(line) for line in lines]
+        
+        # Assert
+        assert result == [True, True, True, True, False, False]
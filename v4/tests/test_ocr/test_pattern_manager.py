@@ -101,3 +101,50 @@ class TestPatternManager:
         # Assert - Should have default config
         assert config is not None
         assert isinstance(config, dict)
+    
+    
+    def test_compiled_patterns_rebuilt_after_changes(self, tmp_path):
+        """Test the compiled pattern set is cached and invalidated on edits."""
+        # Arrange
+        config_path = tmp_path / "patterns.yml"
+        config_path.write_text(
+            "amount_patterns:\n"
+            "  - pattern: 'TOTAL'\n"
+            "    priority: 1\n"
+            "    enabled: true\n"
+            "payment_patterns:\n"
+            "  - 'CB'\n",
+            encoding="utf-8"
+        )
+        manager = PatternManager(config_path=str(config_path))
+        first = manager.get_compiled_patterns()
+        
+        # Act
+        manager.add_amount_pattern("NET\\s*A\\s*PAYER", priority=0)
+        second = manager.get_compiled_patterns()
+        manager.reload()
+        third = manager.get_compiled_patterns()
+        
+        # Assert
+        assert manager.get_compiled_patterns() is third
+        assert [source for source, _ in first.amount] == ["TOTAL"]
+        assert [source for source, _ in second.amount] == ["NET\\s*A\\s*PAYER", "TOTAL"]
+        assert third is not second
+        assert second.is_payment_line("Paiement cb 12,00")
+    
+    
+    def test_backreference_patterns_are_not_combined(self, tmp_path):
+        """Test patterns that cannot share an alternation still all apply."""
+        # Arrange
+        manager = PatternManager(config_path=str(tmp_path / "missing.yml"))
+        manager.config['amount_patterns'] = [
+            {'pattern': r"(T)OTAL\1?", 'priority': 1},
+            {'pattern': "MONTANT", 'priority': 2},
+        ]
+        
+        # Act
+        compiled = manager.get_compiled_patterns()
+        
+        # Assert
+        assert compiled.amount_any is None
+        assert compiled.amount_candidates(["x", "montant 3", "y"]) == [0, 1, 2]
@@ -0,0 +1,118 @@
+"""
+Unit Tests for the Page-Streaming PDF Extractor
+
+Tests page iteration, early stop and the per-page cache.
+"""
+
+import pytest
+from pdfminer.high_level import extract_text
+from domains.ocr import pdf_text
+from domains.ocr.ocr_cache import OCRCache
+from domains.ocr.parsers_OLD_BACKUP import parse_fiche_paie
+
+
+def write_pdf(path, pages):
+    """Write a minimal PDF with one Helvetica text line per entry of each page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        ops = "".join(f"BT /F1 12 Tf 50 {750 - 20 * i} Td ({line}) Tj ET\n" for i, line in enumerate(lines))
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}endstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    data, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestPDFText:
+    """Test suite for iter_pdf_pages and extract_pdf_text."""
+
+    def test_pages_concatenate_to_extract_text(self, tmp_path, monkeypatch):
+        """Test the streamed pages match pdfminer's whole-document text."""
+        # Arrange
+        monkeypatch.setattr(pdf_text, "get_ocr_cache", lambda: None)
+        pdf = write_pdf(tmp_path / "doc.pdf", [["Page one", "Total 10,00"], ["Page two"], ["Page three"]])
+
+        # Act
+        pages = list(pdf_text.iter_pdf_pages(str(pdf)))
+
+        # Assert
+        assert len(pages) == 3
+        assert "".join(pages) == extract_text(str(pdf))
+
+
+    def test_stops_after_the_fields_are_found(self, tmp_path, monkeypatch):
+        """Test reading stops at the page that satisfies the predicate."""
+        # Arrange
+        monkeypatch.setattr(pdf_text, "get_ocr_cache", lambda: None)
+        pdf = write_pdf(tmp_path / "doc.pdf", [["Intro"], ["NET A PAYER 1850,25"], ["Annexe"], ["Annexe"]])
+        laid_out = []
+        layout_pages = pdf_text._layout_pages
+
+        def counting(raw, start):
+            for text in layout_pages(raw, start):
+                laid_out.append(text)
+                yield text
+
+        monkeypatch.setattr(pdf_text, "_layout_pages", counting)
+
+        # Act
+        text = pdf_text.extract_pdf_text(str(pdf), max_pages=3, stop_when=lambda t: "NET A PAYER" in t)
+
+        # Assert
+        assert "NET A PAYER" in text and "Annexe" not in text
+        assert len(laid_out) == 2
+
+
+    def test_cached_pages_skip_layout(self, tmp_path, monkeypatch):
+        """Test a second read is served from the cache, page count included."""
+        # Arrange
+        cache = OCRCache(db_path=str(tmp_path / "cache.db"))
+        monkeypatch.setattr(pdf_text, "get_ocr_cache", lambda: cache)
+        pdf = write_pdf(tmp_path / "doc.pdf", [["Page one"], ["Page two"]])
+        first = list(pdf_text.iter_pdf_pages(str(pdf)))
+
+        def no_layout(raw, start):
+            raise AssertionError("page laid out again")
+
+        monkeypatch.setattr(pdf_text, "_layout_pages", no_layout)
+
+        # Act
+        second = list(pdf_text.iter_pdf_pages(str(pdf)))
+
+        # Assert
+        assert second == first
+
+
+    def test_fiche_paie_reads_only_the_first_pages(self, tmp_path, monkeypatch):
+        """Test the payslip parser finds its fields without reading the annexes."""
+        # Arrange
+        monkeypatch.setattr(pdf_text, "get_ocr_cache", lambda: None)
+        pdf = write_pdf(tmp_path / "paie.pdf", [
+            ["Periode 01/07/2025 - 31/07/2025", "NET A PAYER 1850,25"],
+            ["Annexe 9999,99"],
+            ["Annexe 9999,99"],
+        ])
+
+        # Act
+        result = parse_fiche_paie(str(pdf))
+
+        # Assert
+        assert result["montant"] == 1850.25
+        assert result["date"].isoformat() == "2025-07-31"
+        assert "Annexe" not in result["preview_text"]
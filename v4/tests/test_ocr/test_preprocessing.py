@@ -0,0 +1,95 @@
+"""
+Unit Tests for OCR Image Preprocessing
+
+Tests the stages and profiles applied before tesseract.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from domains.ocr import preprocessing
+from domains.ocr.preprocessing import (
+    get_profile, preprocess_image, profile_signature, _resize, _deskew, _text_angle, _crop_receipt
+)
+
+
+def _receipt(angle=0.0):
+    """White page with printed lines, optionally rotated."""
+    image = np.full((800, 600), 255, dtype=np.uint8)
+    for i in range(15):
+        cv2.putText(image, f"ARTICLE {i} 12,50", (60, 80 + i * 45), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    matrix = cv2.getRotationMatrix2D((300, 400), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (600, 800), borderValue=255)
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestPreprocessing:
+    """Test suite for the preprocessing pipeline."""
+
+    def test_resize_only_downscales(self):
+        """Test large photos are reduced and small images left untouched."""
+        # Arrange
+        photo = np.zeros((4000, 3000), dtype=np.uint8)
+        small = np.zeros((500, 400), dtype=np.uint8)
+
+        # Act / Assert
+        assert _resize(photo, max_side=2000).shape == (2000, 1500)
+        assert _resize(small, max_side=2000) is small
+
+
+    def test_deskew_straightens_rotated_text(self):
+        """Test a rotated receipt comes out with horizontal lines."""
+        # Arrange
+        rotated = _receipt(angle=6.0)
+
+        # Act
+        straightened = _deskew(rotated)
+
+        # Assert
+        assert abs(_text_angle(rotated) - 6.0) < 0.5
+        assert abs(_text_angle(straightened)) < 0.5
+
+
+    def test_crop_receipt_keeps_the_paper(self):
+        """Test the photo background around the receipt is removed."""
+        # Arrange
+        photo = np.full((2000, 1500), 90, dtype=np.uint8)
+        photo[300:1100, 400:1000] = _receipt()
+
+        # Act
+        cropped = _crop_receipt(photo, margin=10)
+
+        # Assert
+        assert cropped.shape == (820, 620)
+
+
+    def test_profile_runs_every_stage_with_timings(self):
+        """Test a profile returns a binary image and one timing per stage."""
+        # Arrange
+        photo = cv2.cvtColor(_receipt(angle=3.0), cv2.COLOR_GRAY2BGR)
+
+        # Act
+        processed, timings = preprocess_image(photo, "receipt")
+
+        # Assert
+        assert processed.ndim == 2
+        assert set(np.unique(processed)) <= {0, 255}
+        assert list(timings) == [stage for stage, _ in get_profile("receipt")]
+
+
+    def test_signature_follows_profile_settings(self, monkeypatch):
+        """Test the cache signature changes with the profile parameters."""
+        # Arrange
+        before = profile_signature("standard")
+        profiles = {"standard": [("grayscale", {}), ("resize", {"max_side": 1600}), ("otsu", {})]}
+        monkeypatch.setattr(preprocessing, "OCR_PREPROCESSING_PROFILES", profiles)
+
+        # Act
+        after = profile_signature("standard")
+
+        # Assert
+        assert after == "standard:grayscale|resize(max_side=1600)|otsu"
+        assert after != before
+        with pytest.raises(ValueError):
+            get_profile("unknown")
@@ -0,0 +1,70 @@
+"""
+Unit Tests for the Scan History Store
+
+Tests tail reads, indexed filters, rotation and compaction.
+"""
+
+import json
+import pytest
+from domains.ocr.scan_history import ScanHistory
+
+
+def _scan(i, document_type="ticket", day="2024-12-01"):
+    return {"timestamp": f"{day}T10:00:{i % 60:02d}", "document_type": document_type, "filename": f"scan_{i}.jpg"}
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestScanHistory:
+    """Test suite for ScanHistory."""
+
+    def test_tail_returns_newest_first(self, tmp_path):
+        """Test the tail read returns the last records, most recent first."""
+        # Arrange
+        history = ScanHistory(path=str(tmp_path / "scan_history.jsonl"))
+        for i in range(20):
+            history.append(_scan(i))
+
+        # Act
+        scans = history.tail(3)
+
+        # Assert
+        assert [s["filename"] for s in scans] == ["scan_19.jpg", "scan_18.jpg", "scan_17.jpg"]
+
+
+    def test_filters_use_index_and_catch_up_legacy_lines(self, tmp_path):
+        """Test filtered reads, including lines written without the index."""
+        # Arrange
+        path = tmp_path / "scan_history.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(_scan(0, "revenu", "2024-11-30")) + "\n")
+            f.write("not json\n")
+        history = ScanHistory(path=str(path))
+        history.append(_scan(1, "ticket", "2024-12-01"))
+        history.append(_scan(2, "revenu", "2024-12-02"))
+
+        # Act
+        revenus = history.tail(10, document_type="revenu")
+        december = history.tail(10, since="2024-12-01", until="2024-12-01")
+
+        # Assert
+        assert [s["filename"] for s in revenus] == ["scan_2.jpg", "scan_0.jpg"]
+        assert [s["filename"] for s in december] == ["scan_1.jpg"]
+        assert history.count() == 3
+
+
+    def test_rotation_and_compaction_keep_every_record(self, tmp_path):
+        """Test rotated segments are read in order and compacted without loss."""
+        # Arrange
+        history = ScanHistory(path=str(tmp_path / "scan_history.jsonl"), segment_max_bytes=300, max_segments=2)
+
+        # Act
+        for i in range(30):
+            history.append(_scan(i))
+
+        # Assert
+        assert len(history.segments()) <= 3
+        assert history.count() == 30
+        scans = history.tail(30)
+        assert [s["filename"] for s in scans] == [f"scan_{i}.jpg" for i in reversed(range(30))]
+        assert len(history.tail(30, document_type="ticket")) == 30
@@ -0,0 +1,176 @@
+"""
+Unit Tests for the OCR Engine Selection
+
+Tests the engine abstraction used by full_ocr.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from domains.ocr import scanner
+
+
+class FakeEngine(scanner.OCREngine):
+    """Engine counting its calls instead of running tesseract."""
+
+    name = "fake"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def image_to_string(self, image):
+        self.calls += 1
+        return "TOTAL 8,90\x0c"
+
+    def image_to_lines(self, image):
+        self.calls += 1
+        return [("TOTAL 8,90", (0, 0, 40, 10))]
+
+    def version(self):
+        return "1.0"
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestOCREngine:
+    """Test suite for get_ocr_engine and its use in full_ocr."""
+
+    def test_auto_falls_back_to_pytesseract(self, monkeypatch):
+        """Test a missing tesserocr binding selects the subprocess engine once."""
+        # Arrange
+        def unavailable(*args, **kwargs):
+            raise ImportError("No module named 'tesserocr'")
+
+        monkeypatch.setattr(scanner, "_engine", None)
+        monkeypatch.setattr(scanner, "OCR_ENGINE", "auto")
+        monkeypatch.setattr(scanner, "TesserocrEngine", unavailable)
+        monkeypatch.setattr(scanner.PytesseractEngine, "version", lambda self: "5.3.0")
+
+        # Act
+        engine = scanner.get_ocr_engine()
+
+        # Assert
+        assert isinstance(engine, scanner.PytesseractEngine)
+        assert scanner.get_ocr_engine() is engine
+
+
+    def test_full_ocr_uses_the_process_engine(self, tmp_path, monkeypatch):
+        """Test full_ocr sends the preprocessed image to the shared engine."""
+        # Arrange
+        image_path = tmp_path / "ticket.png"
+        cv2.imwrite(str(image_path), np.full((40, 40, 3), 255, dtype=np.uint8))
+        engine = FakeEngine()
+        monkeypatch.setattr(scanner, "_engine", engine)
+        monkeypatch.setattr(scanner, "get_ocr_cache", lambda: None)
+        monkeypatch.setattr(scanner, "log_pattern_occurrence", lambda name: None)
+
+        # Act
+        text = scanner.full_ocr(str(image_path))
+
+        # Assert
+        assert text == "TOTAL 8,90"
+        assert engine.calls == 1
+
+
+    def test_incomplete_engine_cannot_be_instantiated(self):
+        """Test an engine missing a recognition method fails when built, not mid-scan."""
+        # Arrange
+        class NoRecognition(scanner.OCREngine):
+            name = "incomplete"
+
+        class NoLines(scanner.OCREngine):
+            name = "incomplete"
+
+            def image_to_string(self, image):
+                return ""
+
+        # Act / Assert
+        with pytest.raises(TypeError):
+            NoRecognition()
+        with pytest.raises(TypeError):
+            NoLines()
+
+
+    def test_fork_reset_drops_the_engine(self, monkeypatch):
+        """Test a forked worker builds its own engine."""
+        # Arrange
+        monkeypatch.setattr(scanner, "_engine", FakeEngine())
+
+        # Act
+        scanner._reset_engine_after_fork()
+
+        # Assert
+        assert scanner._engine is None
+
+
+class FakeLayoutEngine(FakeEngine):
+    """Engine returning a fixed layout and recording the crops it reads."""
+
+    def __init__(self, lines):
+        super().__init__()
+        self.lines = lines
+        self.layout_sizes = []
+        self.crop_sizes = []
+
+    def image_to_lines(self, image):
+        self.layout_sizes.append(image.size)
+        return self.lines
+
+    def image_to_string(self, image):
+        self.crop_sizes.append(image.size)
+        return super().image_to_string(image)
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestRegionOfInterestOCR:
+    """Test suite for the two-pass (layout + keyword strips) OCR mode."""
+
+    def test_only_keyword_strips_are_read(self, monkeypatch):
+        """Test the keyword line and the next one are read at full resolution."""
+        # Arrange
+        monkeypatch.setattr(scanner, "OCR_ROI_LAYOUT_MAX_SIDE", 500)
+        monkeypatch.setattr(scanner, "OCR_ROI_CONTEXT_LINES", 1)
+        processed = np.full((2000, 1000), 255, dtype=np.uint8)
+        engine = FakeLayoutEngine([
+            ("TOTAL TTC", (20, 200, 100, 10)),
+            ("CARREFOUR MARKET", (20, 10, 200, 10)),
+            ("8,90", (20, 215, 40, 10)),
+            ("Merci de votre visite", (20, 300, 200, 10)),
+        ])
+        timings = {}
+
+        # Act
+        text = scanner._roi_ocr(processed, engine, timings)
+
+        # Assert
+        assert text == "TOTAL 8,90"
+        assert engine.layout_sizes == [(250, 500)]
+        assert len(engine.crop_sizes) == 1
+        width, height = engine.crop_sizes[0]
+        assert width == 1000
+        assert 100 <= height <= 150  # Layout rows 200-225, padded, scaled x4
+        assert {"layout", "roi_ocr"} <= set(timings)
+
+
+    def test_full_ocr_falls_back_without_keyword_lines(self, tmp_path, monkeypatch):
+        """Test a layout without keyword lines runs the full OCR."""
+        # Arrange
+        image_path = tmp_path / "ticket.png"
+        cv2.imwrite(str(image_path), np.full((40, 40, 3), 255, dtype=np.uint8))
+        engine = FakeLayoutEngine([("CARREFOUR MARKET", (0, 0, 30, 5))])
+        occurrences = []
+        monkeypatch.setattr(scanner, "_engine", engine)
+        monkeypatch.setattr(scanner, "get_ocr_cache", lambda: None)
+        monkeypatch.setattr(scanner, "log_pattern_occurrence", occurrences.append)
+        fallbacks = scanner.get_roi_stats()["roi_fallbacks"]
+
+        # Act
+        text = scanner.full_ocr(str(image_path), roi=True)
+
+        # Assert
+        assert text == "TOTAL 8,90"
+        assert engine.crop_sizes == [(40, 40)]
+        assert "ocr_roi_fallback" in occurrences
+        assert scanner.get_roi_stats()["roi_fallbacks"] == fallbacks + 1
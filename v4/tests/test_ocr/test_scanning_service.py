@@ -0,0 +1,67 @@
+"""
+Unit Tests for Batch Ticket Scanning
+
+Tests result streaming, error isolation and progress reporting of
+process_tickets_batch.
+"""
+
+import pytest
+from domains.ocr import scanning_service
+from domains.ocr.scanning_service import process_tickets_batch, TicketData
+
+
+def _fake_process(file_path):
+    if "broken" in file_path:
+        raise ValueError("unreadable")
+    return TicketData(filename=file_path, path=file_path, montant=1.0)
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestProcessTicketsBatch:
+    """Test suite for process_tickets_batch."""
+
+    def test_errors_are_reported_per_file(self, monkeypatch):
+        """Test a failing file does not abort the batch."""
+        # Arrange
+        monkeypatch.setattr(scanning_service, "process_single_ticket", _fake_process)
+        files = ["a.jpg", "broken.jpg", "c.jpg"]
+
+        # Act
+        results = list(process_tickets_batch(files, max_workers=1))
+
+        # Assert
+        assert [index for index, _, _, _ in results] == [0, 1, 2]
+        assert isinstance(results[1][3], ValueError)
+        assert results[2][2].montant == 1.0
+
+
+    def test_progress_callback_counts_every_file(self, monkeypatch):
+        """Test progress is reported once per completed file."""
+        # Arrange
+        monkeypatch.setattr(scanning_service, "process_single_ticket", _fake_process)
+        calls = []
+
+        # Act
+        list(process_tickets_batch(["a.jpg", "b.jpg"], max_workers=1,
+                                   progress_callback=lambda done, total, name: calls.append((done, total))))
+
+        # Assert
+        assert calls == [(1, 2), (2, 2)]
+
+
+    def test_process_pool_returns_every_file(self, tmp_path):
+        """Test the pool path yields one result per file with its original index."""
+        # Arrange
+        files = []
+        for i in range(5):
+            path = tmp_path / f"ticket_{i}.png"
+            path.write_bytes(b"not an image")
+            files.append(str(path))
+
+        # Act
+        results = list(process_tickets_batch(files, max_workers=2, max_in_flight=2))
+
+        # Assert
+        assert sorted(index for index, _, _, _ in results) == list(range(5))
+        assert all(ticket is not None and ticket.ocr_text == "" for _, _, ticket, _ in results)
@@ -0,0 +1,97 @@
+"""
+Unit Tests for the OCR Statistics Store
+
+Tests UPSERT counters, derived rates and the JSON import/export.
+"""
+
+import json
+import threading
+import pytest
+from domains.ocr.stats_store import OCRStatsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store backed by a temporary database and JSON directory."""
+    return OCRStatsStore(db_path=str(tmp_path / "ocr_stats.db"), json_dir=str(tmp_path))
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+class TestOCRStatsStore:
+    """Test suite for OCRStatsStore."""
+
+    def test_counters_and_derived_rates(self, store):
+        """Test counters accumulate and rates match the JSON formulas."""
+        # Arrange
+        levels = ["exact", "exact", "partial", "failed"]
+
+        # Act
+        for level in levels:
+            store.record_scan("ticket", level)
+            store.record_patterns(["TOTAL"], level)
+        store.record_pattern_occurrence("ocr_success_fra+eng")
+        store.record_pattern_occurrence("ocr_success_fra+eng")
+
+        # Assert
+        perf = store.performance_stats()["ticket"]
+        assert (perf["total"], perf["success"], perf["partial"], perf["failed"]) == (4, 2, 1, 1)
+        assert perf["success_rate"] == 50.0
+        assert perf["correction_rate"] == 25.0
+        pattern = store.pattern_stats()["TOTAL"]
+        assert pattern["success_rate"] == 75.0
+        assert pattern["reliability_score"] == pytest.approx(75.0 * 0.4)
+        assert store.pattern_occurrences() == {"ocr_success_fra+eng": 2}
+
+
+    def test_concurrent_updates_are_not_lost(self, store):
+        """Test parallel writers do not overwrite each other's increments."""
+        # Arrange
+        def worker():
+            for _ in range(50):
+                store.record_scan("ticket", "exact")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+
+        # Act
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Assert
+        assert store.performance_stats()["ticket"]["total"] == 200
+
+
+    def test_existing_json_imported_once(self, tmp_path):
+        """Test statistics from the legacy JSON files are carried over."""
+        # Arrange
+        (tmp_path / "pattern_log.json").write_text(json.dumps({"TOTAL": 7}), encoding="utf-8")
+        (tmp_path / "performance_stats.json").write_text(json.dumps({
+            "ticket": {"total": 3, "success": 2, "partial": 0, "failed": 1},
+            "last_updated": "2024-12-17T10:00:00"
+        }), encoding="utf-8")
+        db_path = str(tmp_path / "ocr_stats.db")
+
+        # Act
+        OCRStatsStore(db_path=db_path, json_dir=str(tmp_path)).record_scan("ticket", "exact")
+        store = OCRStatsStore(db_path=db_path, json_dir=str(tmp_path))
+
+        # Assert
+        assert store.pattern_occurrences() == {"TOTAL": 7}
+        assert store.performance_stats()["ticket"]["total"] == 4
+
+
+    def test_export_json_writes_snapshots(self, store, tmp_path):
+        """Test export writes the historical JSON files."""
+        # Arrange
+        store.record_scan("ticket", "exact")
+
+        # Act
+        written = store.export_json()
+
+        # Assert
+        assert len(written) == 3
+        perf = json.loads((tmp_path / "performance_stats.json").read_text(encoding="utf-8"))
+        assert perf["ticket"]["success"] == 1
+        assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,129 @@
+"""
+Unit Tests for the Day Summary
+
+Tests the per-day counts and sums used by the calendar and the home page,
+and their rebuild once per data revision.
+"""
+
+import sqlite3
+from datetime import date
+import pandas as pd
+import pytest
+from shared.database import db_connection
+from shared.database.migrations import run_migrations
+from shared.services.day_summary import DaySummary, get_day_summary
+
+ROWS = [
+    ('dépense', 'Alimentation', 12.5, '2024-01-10'),
+    ('dépense', 'Transport', 7.25, '2024-01-10'),
+    ('revenu', 'Salaire', 2000.0, '2024-01-10'),
+    ('revenu', 'Remboursement', 20.1, '2024-01-31'),
+    ('dépense', 'Alimentation', 3.0, '2024-02-01 18:30:00'),
+]
+
+
+@pytest.fixture
+def summary_db(temp_db):
+    """Migrated database with transactions around a month boundary."""
+    run_migrations(temp_db)
+    conn = sqlite3.connect(temp_db)
+    conn.executemany("""
+        INSERT INTO transactions (type, categorie, montant, date, source) VALUES (?, ?, ?, ?, 'manuel')
+    """, ROWS)
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestDaySummary:
+    """Test suite for DaySummary and get_day_summary."""
+
+    def test_month_lists_days_with_flags_and_sums(self, summary_db):
+        """Test a month lookup returns only its days, with counts, flags and sums."""
+        # Act
+        days = get_day_summary(summary_db).month(date(2024, 1, 15))
+
+        # Assert
+        assert days == {
+            10: {"count": 3, "has_revenue": True, "has_expense": True, "revenus": 2000.0, "depenses": 19.75},
+            31: {"count": 1, "has_revenue": True, "has_expense": False, "revenus": 20.1, "depenses": 0.0},
+        }
+        assert list(get_day_summary(summary_db).month(date(2024, 2, 1))) == [1]
+
+
+    def test_totals_over_a_date_range(self, summary_db):
+        """Test range totals include both bounds and match the frame-built summary."""
+        # Arrange
+        summary = get_day_summary(summary_db)
+        conn = sqlite3.connect(summary_db)
+        from_frame = DaySummary.from_frame(pd.read_sql_query("SELECT * FROM transactions", conn))
+        conn.close()
+
+        # Act
+        totals = summary.totals(date(2024, 1, 10), date(2024, 1, 31))
+
+        # Assert
+        assert totals == {"count": 4, "revenu": 2020.1, "dépense": 19.75}
+        assert summary.totals() == from_frame.totals()
+        assert summary.month(date(2024, 1, 1)) == from_frame.month(date(2024, 1, 1))
+        assert summary.totals(date(2023, 1, 1), date(2023, 12, 31))["count"] == 0
+
+
+    def test_summary_is_rebuilt_once_per_revision(self, summary_db):
+        """Test the shared summary is reused until the next write."""
+        # Arrange
+        first = get_day_summary(summary_db)
+
+        # Act
+        same = get_day_summary(summary_db)
+        conn = sqlite3.connect(summary_db)
+        conn.execute("DELETE FROM transactions WHERE date = '2024-01-31'")
+        conn.commit()
+        conn.close()
+        updated = get_day_summary(summary_db)
+
+        # Assert
+        assert same is first
+        assert updated is not first
+        assert 31 not in updated.month(date(2024, 1, 1))
+
+
+    def test_rolled_back_write_is_not_cached(self, temp_db):
+        """Test a summary read inside a rolled-back write does not outlive it."""
+        # Arrange
+        run_migrations(temp_db)
+        insert = "INSERT INTO transactions (type, categorie, montant, date) VALUES (?, 'Test', ?, ?)"
+        with db_connection(temp_db) as conn:
+            conn.execute(insert, ("dépense", 1.0, "2024-03-05"))
+            inside = get_day_summary(temp_db).month(date(2024, 3, 1))
+            conn.rollback()
+        after_rollback = get_day_summary(temp_db).month(date(2024, 3, 1))
+
+        # Act
+        conn = sqlite3.connect(temp_db)
+        conn.execute(insert, ("revenu", 2.0, "2024-03-07"))
+        conn.commit()
+        conn.close()
+        days = get_day_summary(temp_db).month(date(2024, 3, 1))
+
+        # Assert
+        assert list(inside) == [5]
+        assert after_rollback == {}
+        assert list(days) == [7]
+        assert days[7]["revenus"] == 2.0
+
+
+    def test_empty_database(self, temp_db):
+        """Test a database without transactions gives an empty summary."""
+        # Arrange
+        run_migrations(temp_db)
+
+        # Act
+        summary = get_day_summary(temp_db)
+
+        # Assert
+        assert len(summary) == 0
+        assert summary.month(date(2024, 1, 1)) == {}
+        assert summary.totals() == {"count": 0, "revenu": 0.0, "dépense": 0.0}
@@ -0,0 +1,130 @@
+"""
+Unit Tests for the Associated-File Index
+
+Tests lookups through the index, refresh of hand-added files and the
+single-query export of transactions without documents.
+"""
+
+import os
+import sqlite3
+import pytest
+from domains.transactions import export_service
+from shared.database.migrations import run_migrations
+from shared.services import files
+from shared.services.file_index import FileIndex
+
+
+@pytest.fixture
+def indexed(temp_db, tmp_path, monkeypatch):
+    """Migrated database, sorted folders and an index over them."""
+    run_migrations(temp_db)
+    sorted_dir, revenus_dir = tmp_path / "sorted", tmp_path / "revenus"
+    (sorted_dir / "Alimentation" / "Courses").mkdir(parents=True)
+    (revenus_dir / "Salaire" / "Net").mkdir(parents=True)
+    index = FileIndex(base_dirs=[str(sorted_dir), str(revenus_dir)], db_path=temp_db, refresh_interval=0)
+    for module in (files, export_service):
+        monkeypatch.setattr(module, "get_file_index", lambda: index)
+    monkeypatch.setattr(files, "SORTED_DIR", str(sorted_dir))
+    monkeypatch.setattr(files, "REVENUS_TRAITES", str(revenus_dir))
+    monkeypatch.setattr(export_service, "SORTED_DIR", str(sorted_dir))
+    monkeypatch.setattr(export_service, "REVENUS_TRAITES", str(revenus_dir))
+    return index, sorted_dir, revenus_dir, temp_db
+
+
+def _touch(path):
+    path.write_bytes(b"%PDF")
+    return str(path)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestFileIndex:
+    """Test suite for FileIndex and its use by the file and export services."""
+
+    def test_id_named_document_is_found(self, indexed):
+        """Test a {id}.ext document is returned before the folder fallback."""
+        # Arrange
+        index, sorted_dir, _, _ = indexed
+        folder = sorted_dir / "Alimentation" / "Courses"
+        ticket = _touch(folder / "42.jpg")
+        _touch(folder / "ticket_carrefour.jpg")
+        transaction = {"id": 42, "categorie": "Alimentation", "sous_categorie": "Courses",
+                       "type": "dépense", "source": "OCR"}
+
+        # Act
+        result = files.trouver_fichiers_associes(transaction)
+
+        # Assert
+        assert result == [ticket]
+
+
+    def test_folder_fallback_skips_numbered_copies(self, indexed):
+        """Test the category fallback ignores {id}_{n}.ext copies and other files."""
+        # Arrange
+        index, sorted_dir, _, _ = indexed
+        folder = sorted_dir / "Alimentation" / "Courses"
+        legacy = _touch(folder / "ticket.png")
+        _touch(folder / "7_1.png")
+        (folder / "notes.txt").write_text("x")
+        transaction = {"id": 99, "categorie": "Alimentation", "sous_categorie": "Courses",
+                       "type": "dépense", "source": "OCR"}
+
+        # Act
+        result = files.trouver_fichiers_associes(transaction)
+
+        # Assert
+        assert result == [legacy]
+
+
+    def test_refresh_sees_hand_added_files_and_moves(self, indexed):
+        """Test files added by hand appear after a refresh and moves update the index."""
+        # Arrange
+        index, sorted_dir, _, _ = indexed
+        assert index.id_files(5, str(sorted_dir), "Alimentation", "Courses") == []
+        old = _touch(sorted_dir / "Alimentation" / "Courses" / "5.pdf")
+        os.utime(sorted_dir / "Alimentation" / "Courses", ns=(1, 1))
+        new = str(sorted_dir / "Alimentation" / "5.pdf")
+
+        # Act
+        index.refresh()
+        found = index.id_files(5, str(sorted_dir), "Alimentation", "Courses")
+        os.rename(old, new)
+        index.move(old, new)
+
+        # Assert
+        assert found == [old]
+        assert index.id_files(5, str(sorted_dir), "Alimentation", "Courses") == []
+        assert index.id_files(5, str(sorted_dir), "Alimentation", "") == [new]
+
+
+    def test_export_lists_only_transactions_without_documents(self, indexed):
+        """Test the export query matches trouver_fichiers_associes row by row."""
+        # Arrange
+        index, sorted_dir, revenus_dir, db_path = indexed
+        _touch(sorted_dir / "Alimentation" / "Courses" / "1.jpg")
+        _touch(revenus_dir / "Salaire" / "Net" / "bulletin.pdf")
+        _touch(sorted_dir / "Alimentation" / "Courses" / "3_1.jpg")
+        conn = sqlite3.connect(db_path)
+        conn.executemany("""
+            INSERT INTO transactions (id, type, categorie, sous_categorie, montant, date, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (1, 'dépense', 'Alimentation', 'Courses', 10.0, '2024-01-01', 'import_csv'),
+            (2, 'revenu', 'Salaire', 'Net', 2000.0, '2024-01-02', 'import_csv'),
+            (3, 'dépense', 'Transport', '', 5.0, '2024-01-03', 'import_csv'),
+            (4, 'revenu', 'Alimentation', 'Courses', 5.0, '2024-01-04', 'import_csv'),
+            (5, 'dépense', 'Transport', '', 5.0, '2024-01-05', 'manuel'),
+        ])
+        conn.commit()
+        rows = [dict(zip(("id", "type", "categorie", "sous_categorie", "source"), row))
+                for row in conn.execute("SELECT id, type, categorie, sous_categorie, source FROM transactions")]
+        conn.close()
+
+        # Act
+        result = export_service.get_transactions_sans_tickets(db_path=db_path)
+
+        # Assert
+        expected = sorted(r["id"] for r in rows
+                          if r["source"] == "import_csv" and not files.trouver_fichiers_associes(r))
+        assert sorted(r["id"] for r in result) == expected == [3, 4]
+        assert "cat" not in result[0]
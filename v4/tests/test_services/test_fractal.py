@@ -0,0 +1,59 @@
+"""
+Unit Tests for the Fractal Hierarchy
+
+Tests the single-pass aggregation behind _build_fractal_hierarchy_impl.
+"""
+
+import pytest
+import pandas as pd
+from shared.services import fractal
+
+
+@pytest.fixture
+def transactions_frame(monkeypatch):
+    """Patch the repository with a small mixed frame."""
+    df = pd.DataFrame([
+        {'type': 'dépense', 'categorie': 'Alimentation', 'sous_categorie': 'Courses', 'montant': 30.0},
+        {'type': 'dépense', 'categorie': 'Alimentation', 'sous_categorie': 'Restaurant', 'montant': 50.0},
+        {'type': 'dépense', 'categorie': 'Alimentation', 'sous_categorie': None, 'montant': 20.0},
+        {'type': 'revenu', 'categorie': 'Salaire', 'sous_categorie': 'Net', 'montant': 2000.0},
+        {'type': 'dépense', 'categorie': 'Vie courante', 'sous_categorie': 'Téléphone', 'montant': 100.0},
+        {'type': 'dépense', 'categorie': None, 'sous_categorie': None, 'montant': 5.0},
+    ])
+    monkeypatch.setattr(fractal.TransactionRepository, 'get_all', staticmethod(lambda: df.copy()))
+    return df
+
+
+@pytest.mark.unit
+class TestBuildFractalHierarchy:
+    """Test suite for _build_fractal_hierarchy_impl."""
+
+    def test_totals_roll_up_from_leaves(self, transactions_frame):
+        """Test type totals include uncategorized rows and categories sum their sub-categories."""
+        # Act
+        hierarchy = fractal._build_fractal_hierarchy_impl()
+
+        # Assert
+        assert hierarchy['TR']['total'] == 2205.0
+        assert hierarchy['TR']['children'] == ['DEPENSES', 'REVENUS']
+        assert hierarchy['DEPENSES']['total'] == 205.0
+        alimentation = hierarchy['CAT_DEPENSES_ALIMENTATION']
+        assert alimentation['amount'] == 100.0
+        assert alimentation['transactions'] == 3
+        assert alimentation['percentage'] == pytest.approx(100.0 / 205.0 * 100)
+
+
+    def test_children_sorted_by_amount(self, transactions_frame):
+        """Test categories and sub-categories are ordered largest first."""
+        # Act
+        hierarchy = fractal._build_fractal_hierarchy_impl()
+
+        # Assert
+        assert hierarchy['DEPENSES']['children'] == [
+            'CAT_DEPENSES_ALIMENTATION', 'CAT_DEPENSES_VIE_COURANTE'
+        ]
+        assert hierarchy['CAT_DEPENSES_ALIMENTATION']['children'] == [
+            'SUBCAT_DEPENSES_ALIMENTATION_RESTAURANT', 'SUBCAT_DEPENSES_ALIMENTATION_COURSES'
+        ]
+        assert hierarchy['SUBCAT_DEPENSES_ALIMENTATION_RESTAURANT']['percentage'] == 50.0
+        assert hierarchy['SUBCAT_DEPENSES_ALIMENTATION_RESTAURANT']['level'] == 3
@@ -0,0 +1,127 @@
+"""
+Unit Tests for Recurrence Generation
+
+Tests the set-based backfill engine and its per-recurrence watermark.
+"""
+
+import sqlite3
+import pytest
+from datetime import date, timedelta
+from shared.database.migrations import run_migrations
+from shared.services.recurrence_generation import backfill_all_recurrences, _pending_occurrence_dates
+
+
+@pytest.fixture
+def recurrence_db(temp_db):
+    """Temporary database migrated to the latest schema."""
+    run_migrations(temp_db)
+    return temp_db
+
+
+def _add_recurrence(db_path, date_debut, frequence='hebdomadaire', categorie='Logement', sous_categorie='Loyer'):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute("""
+        INSERT INTO recurrences (type, categorie, sous_categorie, montant, date_debut, frequence, statut)
+        VALUES ('dépense', ?, ?, 10.0, ?, ?, 'active')
+    """, (categorie, sous_categorie, date_debut.isoformat(), frequence))
+    conn.commit()
+    rec_id = cursor.lastrowid
+    conn.close()
+    return rec_id
+
+
+def _auto_dates(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT date FROM transactions WHERE source = 'récurrente_auto' ORDER BY date"
+    ).fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestBackfillAllRecurrences:
+    """Test suite for backfill_all_recurrences."""
+
+    def test_generates_past_occurrences_only(self, recurrence_db):
+        """Test every weekly occurrence up to today is created, none in the future."""
+        # Arrange
+        start = date.today() - timedelta(weeks=3)
+        _add_recurrence(recurrence_db, start)
+
+        # Act
+        created = backfill_all_recurrences(db_path=recurrence_db)
+
+        # Assert
+        assert created == 4
+        assert _auto_dates(recurrence_db)[-1] == date.today().isoformat()
+
+
+    def test_steady_state_is_noop_and_sets_watermark(self, recurrence_db):
+        """Test a second call creates nothing and the watermark is the last occurrence."""
+        # Arrange
+        start = date.today() - timedelta(weeks=2)
+        rec_id = _add_recurrence(recurrence_db, start)
+        backfill_all_recurrences(db_path=recurrence_db)
+
+        # Act
+        created = backfill_all_recurrences(db_path=recurrence_db)
+
+        # Assert
+        conn = sqlite3.connect(recurrence_db)
+        watermark = conn.execute(
+            "SELECT derniere_generation FROM recurrences WHERE id = ?", (rec_id,)
+        ).fetchone()[0]
+        conn.close()
+        assert created == 0
+        assert watermark == date.today().isoformat()
+
+
+    def test_existing_occurrences_are_not_duplicated(self, recurrence_db):
+        """Test rows already present (no watermark yet) are diffed out."""
+        # Arrange
+        start = date.today() - timedelta(weeks=1)
+        _add_recurrence(recurrence_db, start)
+        conn = sqlite3.connect(recurrence_db)
+        conn.execute("""
+            INSERT INTO transactions (type, categorie, sous_categorie, montant, date, source)
+            VALUES ('dépense', 'Logement', 'Loyer', 10.0, ?, 'récurrente_auto')
+        """, (start.isoformat(),))
+        conn.commit()
+        conn.close()
+
+        # Act
+        created = backfill_all_recurrences(db_path=recurrence_db)
+
+        # Assert
+        assert created == 1
+        assert len(_auto_dates(recurrence_db)) == 2
+
+
+    def test_limited_to_given_recurrences(self, recurrence_db):
+        """Test recurrence_ids restricts the backfill."""
+        # Arrange
+        start = date.today() - timedelta(weeks=1)
+        rec_id = _add_recurrence(recurrence_db, start)
+        _add_recurrence(recurrence_db, start, categorie='Abonnements', sous_categorie='Streaming')
+
+        # Act
+        created = backfill_all_recurrences([rec_id], db_path=recurrence_db)
+
+        # Assert
+        assert created == 2
+
+
+    def test_monthly_chain_resumes_from_watermark(self):
+        """Test resuming from a watermark yields the same dates as a full walk."""
+        # Arrange
+        start = date(2024, 1, 31)
+        end = date(2024, 12, 31)
+        full = _pending_occurrence_dates(start, None, 'mensuelle', None, end)
+
+        # Act
+        resumed = _pending_occurrence_dates(start, None, 'mensuelle', full[4], end)
+
+        # Assert
+        assert resumed == full[5:]
@@ -0,0 +1,111 @@
+"""
+Unit Tests for Batch Revenue Processing
+
+Tests parallel parsing results and the single-writer bulk save of revenues.
+"""
+
+import sqlite3
+import pytest
+from datetime import date
+from domains.revenues import revenues_service
+from domains.revenues.revenues_service import process_revenues_batch, save_revenues_batch, RevenueData
+from domains.revenues.revenues_db import save_revenues_to_database
+
+
+def _fake_process(file_path):
+    if "broken" in file_path:
+        raise ValueError("unreadable")
+    return _revenue(file_path, 100.0)
+
+
+def _revenue(path, montant):
+    return RevenueData(
+        filename=path, path=path, categorie="Salaire", sous_categorie="Juillet",
+        montant=montant, montant_initial=montant, date=date(2025, 7, 31)
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestRevenuesBatch:
+    """Test suite for process_revenues_batch and save_revenues_batch."""
+
+    def test_parse_errors_are_reported_per_file(self, monkeypatch):
+        """Test a failing PDF does not abort the batch and progress counts every file."""
+        # Arrange
+        monkeypatch.setattr(revenues_service, "process_single_revenue", _fake_process)
+        calls = []
+
+        # Act
+        results = list(process_revenues_batch(
+            ["a.pdf", "broken.pdf", "c.pdf"], max_workers=1,
+            progress_callback=lambda done, total, name: calls.append((done, total))
+        ))
+
+        # Assert
+        assert [index for index, _, _, _ in results] == [0, 1, 2]
+        assert isinstance(results[1][3], ValueError)
+        assert results[2][2].montant == 100.0
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+
+
+    def test_bulk_save_commits_valid_revenues_once(self, temp_db, monkeypatch):
+        """Test valid revenues are saved and filed, invalid ones only reported."""
+        # Arrange
+        moved = []
+        monkeypatch.setattr(revenues_service, "move_revenue_file", lambda path, *args: moved.append(path))
+        monkeypatch.setattr(revenues_service, "log_revenue_scan", lambda *args: None)
+        revenues = [_revenue("a.pdf", 1850.25), _revenue("zero.pdf", 0.0), _revenue("c.pdf", 420.0)]
+
+        # Act
+        results = save_revenues_batch(revenues, bulk=True, db_path=temp_db)
+
+        # Assert
+        assert [tx_id is not None for _, tx_id, _ in results] == [True, False, True]
+        assert results[1][2] == ["Le montant doit être supérieur à 0"]
+        assert moved == ["a.pdf", "c.pdf"]
+        conn = sqlite3.connect(temp_db)
+        rows = conn.execute("SELECT montant FROM transactions ORDER BY id").fetchall()
+        conn.close()
+        assert rows == [(1850.25,), (420.0,)]
+
+
+    def test_failed_preparation_is_reported_for_that_revenue(self, temp_db, monkeypatch):
+        """Test an exception while preparing one revenue does not abort the confirmed batch."""
+        # Arrange
+        monkeypatch.setattr(revenues_service, "move_revenue_file", lambda path, *args: None)
+        monkeypatch.setattr(revenues_service, "log_revenue_scan", lambda *args: None)
+        prepare = revenues_service.prepare_revenue_for_db
+
+        def failing_uber(revenue, apply_uber_tax=False):
+            if revenue.path == "uber.pdf":
+                raise KeyError("montant_brut")
+            return prepare(revenue, apply_uber_tax)
+
+        monkeypatch.setattr(revenues_service, "prepare_revenue_for_db", failing_uber)
+        revenues = [_revenue("a.pdf", 1850.25), _revenue("uber.pdf", 300.0), _revenue("c.pdf", 420.0)]
+
+        # Act
+        results = save_revenues_batch(revenues, bulk=True, db_path=temp_db)
+
+        # Assert
+        assert [tx_id is not None for _, tx_id, _ in results] == [True, False, True]
+        assert results[1][2] == ["'montant_brut'"]
+
+
+    def test_failed_insert_keeps_the_rest_of_the_batch(self, temp_db):
+        """Test one failing insert does not roll back the other revenues."""
+        # Arrange
+        good = {"categorie": "Salaire", "sous_categorie": "Juillet", "montant": 10.0,
+                "date": "2025-07-31", "source": "PDF"}
+        broken = {"montant": 5.0}
+
+        # Act
+        results = save_revenues_to_database([good, broken, good], bulk=True, db_path=temp_db)
+
+        # Assert
+        assert [tx_id is not None for tx_id, _ in results] == [True, False, True]
+        conn = sqlite3.connect(temp_db)
+        count = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        conn.close()
+        assert count == 2
@@ -0,0 +1,138 @@
+"""
+Unit Tests for the Transaction Frame Cache
+
+Tests incremental patching from the trigger-maintained change log.
+"""
+
+import sqlite3
+import pytest
+from shared.database import db_connection
+from shared.database.migrations import run_migrations
+from shared.services.transaction_cache import TransactionFrameCache
+
+
+@pytest.fixture
+def cache_db(temp_db):
+    """Migrated database with two transactions."""
+    run_migrations(temp_db)
+    conn = sqlite3.connect(temp_db)
+    conn.executemany("""
+        INSERT INTO transactions (type, categorie, sous_categorie, montant, date, source)
+        VALUES (?, ?, ?, ?, ?, 'manuel')
+    """, [
+        ('dépense', 'Alimentation', 'Courses', 12.5, '2024-01-10'),
+        ('revenu', 'Salaire', 'Net', 2000.0, '2024-01-01'),
+    ])
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+def _execute(db_path, query, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(query, params)
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestTransactionFrameCache:
+    """Test suite for TransactionFrameCache."""
+
+    def test_initial_load_is_typed_and_sorted(self, cache_db):
+        """Test the first access loads and converts the whole table."""
+        # Arrange
+        cache = TransactionFrameCache(cache_db)
+
+        # Act
+        df = cache.get()
+
+        # Assert
+        assert list(df["montant"]) == [12.5, 2000.0]
+        assert str(df["date"].dtype).startswith("datetime64")
+        assert cache.stats["full_loads"] == 1
+
+
+    def test_insert_update_delete_are_patched_incrementally(self, cache_db):
+        """Test writes are applied without reloading the table."""
+        # Arrange
+        cache = TransactionFrameCache(cache_db)
+        cache.get()
+        _execute(cache_db, """
+            INSERT INTO transactions (type, categorie, sous_categorie, montant, date)
+            VALUES ('dépense', 'Transport', 'Essence', 60.0, '2024-02-01')
+        """)
+        _execute(cache_db, "UPDATE transactions SET montant = 15.0 WHERE categorie = 'Alimentation'")
+        _execute(cache_db, "DELETE FROM transactions WHERE categorie = 'Salaire'")
+
+        # Act
+        df = cache.get(sort_by="id", ascending=True)
+
+        # Assert
+        assert list(df["categorie"]) == ["Alimentation", "Transport"]
+        assert list(df["montant"]) == [15.0, 60.0]
+        assert cache.stats["full_loads"] == 1
+        assert cache.stats["incremental"] == 1
+
+
+    def test_unchanged_database_does_not_requery_rows(self, cache_db):
+        """Test a second access without writes only checks the log head."""
+        # Arrange
+        cache = TransactionFrameCache(cache_db)
+        cache.get()
+
+        # Act
+        cache.get()
+
+        # Assert
+        assert cache.stats == {"full_loads": 1, "incremental": 0, "rows_patched": 0}
+
+
+    def test_pruned_log_triggers_full_reload(self, cache_db):
+        """Test the cache reloads when entries it has not seen were pruned."""
+        # Arrange
+        cache = TransactionFrameCache(cache_db)
+        cache.get()
+        _execute(cache_db, "UPDATE transactions SET montant = 1.0")
+        _execute(cache_db, "UPDATE transactions SET montant = 2.0")
+        _execute(cache_db, "DELETE FROM transactions_changes WHERE id <= (SELECT MAX(id) - 1 FROM transactions_changes)")
+
+        # Act
+        df = cache.get()
+
+        # Assert
+        assert cache.stats["full_loads"] == 2
+        assert set(df["montant"]) == {2.0}
+
+
+    def test_returned_frame_is_a_copy(self, cache_db):
+        """Test callers cannot corrupt the resident frame."""
+        # Arrange
+        cache = TransactionFrameCache(cache_db)
+        df = cache.get()
+
+        # Act
+        df["montant"] = 0.0
+
+        # Assert
+        assert list(cache.get()["montant"]) == [12.5, 2000.0]
+
+
+    def test_rolled_back_write_is_not_cached(self, temp_db):
+        """Test a sync inside a caller's transaction ignores writes that are later rolled back."""
+        # Arrange
+        run_migrations(temp_db)
+        cache = TransactionFrameCache(temp_db)
+        insert = "INSERT INTO transactions (type, categorie, montant, date) VALUES ('dépense', 'Test', ?, '2024-01-01')"
+        with db_connection(temp_db) as conn:
+            conn.execute(insert, (1.0,))
+            cache.get()
+            conn.rollback()
+        _execute(temp_db, insert, (2.0,))
+
+        # Act
+        df = cache.get()
+
+        # Assert
+        assert df[["id", "montant"]].to_dict("records") == [{"id": 1, "montant": 2.0}]
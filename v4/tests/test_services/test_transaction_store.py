@@ -0,0 +1,126 @@
+"""
+Unit Tests for the Typed Transaction Store
+
+Tests categorical encoding, case-insensitive filters and the per-version
+store of the transaction cache.
+"""
+
+import sqlite3
+from datetime import date
+import pandas as pd
+import pytest
+from domains.transactions.pages.helpers import (
+    get_fractal_code_mask,
+    get_transactions_for_fractal_code
+)
+from shared.database.migrations import run_migrations
+from shared.services.transaction_cache import TransactionFrameCache
+from shared.services.transaction_store import TransactionStore
+
+ROWS = [
+    ('dépense', 'Alimentation', 'Courses', 12.5, '2024-01-10'),
+    ('dépense', 'alimentation', 'courses', 7.5, '2024-02-10'),
+    ('dépense', 'Alimentation', None, 3.0, '2024-02-11'),
+    ('revenu', 'Salaire', 'Net', 2000.0, '2024-01-01'),
+    ('revenu', 'Alimentation', 'Remboursement', 20.0, '2024-03-01'),
+]
+
+HIERARCHY = {
+    'TR': {'level': 0, 'label': 'Univers'},
+    'DEPENSES': {'level': 1, 'label': 'Dépenses', 'parent': 'TR'},
+    'REVENUS': {'level': 1, 'label': 'Revenus', 'parent': 'TR'},
+    'DEP_ALIM': {'level': 2, 'label': 'ALIMENTATION', 'parent': 'DEPENSES'},
+    'DEP_ALIM_COURSES': {'level': 3, 'label': 'Courses', 'parent': 'DEP_ALIM'},
+    'REV_SAL': {'level': 2, 'label': 'Salaire', 'parent': 'REVENUS'},
+}
+
+
+@pytest.fixture
+def store_db(temp_db):
+    """Migrated database with mixed-case categories."""
+    run_migrations(temp_db)
+    conn = sqlite3.connect(temp_db)
+    conn.executemany("""
+        INSERT INTO transactions (type, categorie, sous_categorie, montant, date, source)
+        VALUES (?, ?, ?, ?, ?, 'manuel')
+    """, ROWS)
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestTransactionStore:
+    """Test suite for TransactionStore and its fractal filters."""
+
+    def test_columns_are_typed(self, store_db):
+        """Test text columns become categoricals and dates day arrays."""
+        # Act
+        store = TransactionFrameCache(store_db).store()
+
+        # Assert
+        assert isinstance(store.frame["categorie"].dtype, pd.CategoricalDtype)
+        assert store.frame["montant"].dtype == "float64"
+        assert store.memory_usage() > 0
+
+
+    def test_fractal_masks_match_the_string_filters(self, store_db):
+        """Test every fractal code selects the same rows as the lowercase comparison."""
+        # Arrange
+        cache = TransactionFrameCache(store_db)
+        store, df = cache.store(), cache.get(sort_by="id", ascending=True)
+
+        for code in list(HIERARCHY) + ['UNKNOWN']:
+            # Act
+            ids = sorted(store.ids(get_fractal_code_mask(code, HIERARCHY, store)))
+            expected = get_transactions_for_fractal_code(code, HIERARCHY, df)
+
+            # Assert
+            assert ids == (sorted(expected["id"]) if not expected.empty else [])
+
+
+    def test_mask_combines_text_and_date_filters(self, store_db):
+        """Test text filters ignore case and dates are inclusive."""
+        # Arrange
+        store = TransactionFrameCache(store_db).store()
+
+        # Act
+        mask = store.mask(transaction_type="DÉPENSE", categorie="alimentation",
+                          start_date=date(2024, 2, 1), end_date=date(2024, 2, 10))
+
+        # Assert
+        assert store.select(mask)["montant"].tolist() == [7.5]
+        assert store.key_mask("sous_categorie", None).sum() == 1
+        assert store.sum_cents(store.key_mask("type", "dépense")) == 2300
+        assert not store.mask(categorie="inconnue").any()
+
+
+    def test_store_is_rebuilt_only_when_the_frame_changes(self, store_db):
+        """Test the cache hands out one store per version of its frame."""
+        # Arrange
+        cache = TransactionFrameCache(store_db)
+        first = cache.store()
+
+        # Act
+        same = cache.store()
+        conn = sqlite3.connect(store_db)
+        conn.execute("UPDATE transactions SET categorie = 'Maison' WHERE id = 1")
+        conn.commit()
+        conn.close()
+        updated = cache.store()
+
+        # Assert
+        assert same is first
+        assert updated is not first
+        assert updated.ids(updated.mask(categorie="maison")).tolist() == [1]
+
+
+    def test_empty_store(self):
+        """Test an empty frame gives empty masks."""
+        # Act
+        store = TransactionStore(pd.DataFrame(columns=["id", "type", "categorie", "sous_categorie", "montant", "date"]))
+
+        # Assert
+        assert len(store) == 0
+        assert store.mask(categorie="x", start_date=date(2024, 1, 1)).tolist() == []
@@ -0,0 +1,203 @@
+"""
+Unit Tests for the Bulk Transaction Import
+
+Tests validation, normalization, deduplication, chunked insertion and the
+resumable CSV import.
+"""
+
+import sqlite3
+import pytest
+from domains.transactions import import_service
+from domains.transactions.import_service import bulk_insert_transactions, import_csv, prepare_transactions
+from shared.database.migrations import run_migrations
+
+
+def _tx(**overrides):
+    transaction = {
+        "type": "dépense", "categorie": "alimentation", "sous_categorie": "courses",
+        "description": " Carrefour ", "montant": "45,50", "date": "15/01/2024", "source": "CSV Import"
+    }
+    transaction.update(overrides)
+    return transaction
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT type, categorie, sous_categorie, montant, date, description FROM transactions ORDER BY id"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestBulkImport:
+    """Test suite for bulk_insert_transactions and prepare_transactions."""
+
+    def test_rows_are_normalized_like_the_single_insert(self):
+        """Test amounts, dates and names are cleaned column-wise."""
+        # Act
+        df, invalid = prepare_transactions([_tx(), _tx(sous_categorie="", date_fin="2024-12-31")])
+
+        # Assert
+        assert invalid == []
+        assert df.loc[0, ["categorie", "sous_categorie", "montant", "date", "description"]].tolist() == [
+            "Alimentation", "Courses", 45.5, "2024-01-15", "Carrefour"
+        ]
+        assert df.loc[1, "sous_categorie"] is None
+        assert df["date_fin"].tolist() == ["", "2024-12-31"]
+
+
+    def test_invalid_rows_are_reported_with_their_errors(self, temp_db):
+        """Test invalid rows are skipped and listed by position."""
+        # Arrange
+        transactions = [_tx(), _tx(type="virement", montant=0), _tx(categorie=" ", date="2999-01-01")]
+
+        # Act
+        report = bulk_insert_transactions(transactions, db_path=temp_db)
+
+        # Assert
+        assert report.inserted == 1
+        assert report.invalid == [
+            (1, ["Type must be 'revenu' or 'dépense'", "Montant must be positive"]),
+            (2, ["Catégorie is required", "Date cannot be in the future"]),
+        ]
+
+
+    def test_duplicates_in_database_and_batch_are_skipped(self, temp_db):
+        """Test rows matching an existing row or an earlier row of the batch are skipped."""
+        # Arrange
+        bulk_insert_transactions([_tx(), _tx(sous_categorie=None, montant=10)], db_path=temp_db)
+        batch = [
+            _tx(description="same key, other description"),
+            _tx(sous_categorie=None, montant=10),
+            _tx(montant="12.00"),
+            _tx(montant="12,00"),
+        ]
+
+        # Act
+        report = bulk_insert_transactions(batch, db_path=temp_db, chunk_size=1)
+
+        # Assert
+        assert (report.inserted, report.duplicates, report.skipped) == (1, 3, 3)
+        assert _rows(temp_db)[-1] == ("dépense", "Alimentation", "Courses", 12.0, "2024-01-15", "Carrefour")
+        assert len(_rows(temp_db)) == 3
+
+
+    def test_uber_tax_applies_before_deduplication(self, temp_db):
+        """Test Uber revenues are stored net of tax and deduplicated on the net amount."""
+        # Arrange
+        uber = _tx(type="revenu", categorie="uber", sous_categorie="courses", montant=100)
+        progress = []
+
+        # Act
+        first = bulk_insert_transactions([uber], db_path=temp_db, progress_callback=lambda *p: progress.append(p))
+        second = bulk_insert_transactions([uber], db_path=temp_db)
+
+        # Assert
+        assert len(first.uber_messages) == 1 and progress == [(1, 1)]
+        assert second.duplicates == 1
+        assert _rows(temp_db)[0][3] == 79.0
+
+
+def _write_csv(path, count):
+    lines = ["type,date,categorie,sous_categorie,montant,description"]
+    lines += [f"dépense,2024-01-{i % 28 + 1:02d},alimentation,courses,\"{i + 1},50\",Achat {i}" for i in range(count)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestCsvImport:
+    """Test suite for import_csv."""
+
+    def test_chunks_are_committed_with_progress(self, temp_db, tmp_path):
+        """Test every chunk is written and reported, invalid rows by file position."""
+        # Arrange
+        run_migrations(temp_db)
+        csv_path = _write_csv(tmp_path / "releve.csv", 5)
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write("virement,2024-02-01,banque,,10,Invalide\n")
+        progress = []
+
+        # Act
+        report = import_csv(csv_path, chunk_rows=2, db_path=temp_db, progress_callback=progress.append)
+
+        # Assert
+        assert progress == [2, 4, 6]
+        assert (report.rows_read, report.inserted) == (6, 5)
+        assert [position for position, _ in report.invalid] == [5]
+        assert len(_rows(temp_db)) == 5
+
+
+    def test_failed_import_resumes_after_last_committed_chunk(self, temp_db, tmp_path, monkeypatch):
+        """Test a second run skips the committed chunks and finishes the file."""
+        # Arrange
+        run_migrations(temp_db)
+        csv_path = _write_csv(tmp_path / "releve.csv", 7)
+        write_batch = import_service._write_batch
+        calls = []
+
+        def failing_third_chunk(conn, transactions, *args, **kwargs):
+            calls.append(len(transactions))
+            if len(calls) == 3:
+                raise sqlite3.OperationalError("disk I/O error")
+            return write_batch(conn, transactions, *args, **kwargs)
+
+        monkeypatch.setattr(import_service, "_write_batch", failing_third_chunk)
+        with pytest.raises(import_service.DatabaseError):
+            import_csv(csv_path, chunk_rows=2, deduplicate=False, db_path=temp_db)
+        monkeypatch.setattr(import_service, "_write_batch", write_batch)
+
+        # Act
+        report = import_csv(csv_path, chunk_rows=2, deduplicate=False, db_path=temp_db)
+
+        # Assert
+        assert (report.resumed_from, report.rows_read) == (4, 3)
+        assert [row[5] for row in _rows(temp_db)] == [f"Achat {i}" for i in range(7)]
+        assert import_service.get_import_checkpoint(import_service.csv_fingerprint(csv_path), temp_db) == 0
+
+
+    def test_resume_counts_parsed_rows_not_blank_lines(self, temp_db, tmp_path, monkeypatch):
+        """Test blank lines before the checkpoint do not make a resumed run re-read committed rows."""
+        # Arrange
+        run_migrations(temp_db)
+        csv_path = tmp_path / "releve.csv"
+        rows = open(_write_csv(csv_path, 5), encoding="utf-8").read().splitlines()
+        # Blank line inside the first chunk, as in bank exports
+        csv_path.write_text("\n".join(rows[:2] + [""] + rows[2:4] + ["", ""] + rows[4:]) + "\n", encoding="utf-8")
+        write_batch = import_service._write_batch
+
+        def failing_second_chunk(conn, transactions, *args, **kwargs):
+            if transactions["description"].iloc[0] == "Achat 2":
+                raise sqlite3.OperationalError("disk I/O error")
+            return write_batch(conn, transactions, *args, **kwargs)
+
+        monkeypatch.setattr(import_service, "_write_batch", failing_second_chunk)
+        with pytest.raises(import_service.DatabaseError):
+            import_csv(str(csv_path), chunk_rows=2, deduplicate=False, db_path=temp_db)
+        monkeypatch.setattr(import_service, "_write_batch", write_batch)
+
+        # Act
+        report = import_csv(str(csv_path), chunk_rows=2, deduplicate=False, db_path=temp_db)
+
+        # Assert
+        assert (report.resumed_from, report.rows_read) == (2, 3)
+        assert [row[5] for row in _rows(temp_db)] == [f"Achat {i}" for i in range(5)]
+
+
+    def test_loose_duplicates_match_date_amount_and_category(self, temp_db, tmp_path):
+        """Test the page option also skips rows differing only by sub-category."""
+        # Arrange
+        run_migrations(temp_db)
+        bulk_insert_transactions([_tx(date="2024-01-01", montant="1,50", sous_categorie="marché")], db_path=temp_db)
+        csv_path = _write_csv(tmp_path / "releve.csv", 2)
+
+        # Act
+        report = import_csv(csv_path, loose_duplicates=True, db_path=temp_db)
+
+        # Assert
+        assert (report.inserted, report.duplicates) == (1, 1)
+        assert [row[5] for row in _rows(temp_db)] == ["Carrefour", "Achat 1"]
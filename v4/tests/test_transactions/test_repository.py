@@ -0,0 +1,94 @@
+"""
+Unit Tests for the Transaction Repository Aggregations
+
+Tests the SQL-side sums used by the dashboards against the same sums
+computed in pandas.
+"""
+
+import sqlite3
+from datetime import date
+import pandas as pd
+import pytest
+from domains.transactions.repository import TransactionRepository
+
+
+ROWS = [
+    ("revenu", "salaire", 2000.0, "2024-01-05"),
+    ("dépense", "alimentation", 45.5, "2024-01-15"),
+    ("dépense", "alimentation", 20.0, "2024-01-31 18:30:00"),
+    ("dépense", "logement", 800.0, "2024-02-01"),
+    ("revenu", "uber", 150.0, "2024-02-10"),
+    ("dépense", "transport", 60.0, "2023-12-31"),
+]
+
+
+@pytest.fixture
+def filled_db(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO transactions (type, categorie, montant, date) VALUES (?, ?, ?, ?)", ROWS
+    )
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestAggregations:
+    """Test suite for sum_by and the dashboard helpers."""
+
+    def test_sum_by_matches_pandas_on_a_date_range(self, filled_db):
+        """Test grouped sums over an inclusive date range equal the pandas filter."""
+        # Arrange
+        df = pd.DataFrame(ROWS, columns=["type", "categorie", "montant", "date"])
+        dates = pd.to_datetime(df["date"], format="ISO8601").dt.date
+        expected = df[(dates >= date(2024, 1, 1)) & (dates <= date(2024, 1, 31))]
+        expected = expected.groupby(["type", "categorie"])["montant"].sum()
+
+        # Act
+        result = TransactionRepository.sum_by(
+            ["type", "categorie"], start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), db_path=filled_db
+        )
+
+        # Assert
+        assert result.set_index(["type", "categorie"])["montant"].to_dict() == expected.to_dict()
+        assert result["nombre"].tolist() == [2, 1]
+
+
+    def test_sum_by_period_and_filters(self, filled_db):
+        """Test monthly grouping with type and category filters."""
+        # Act
+        result = TransactionRepository.sum_by(
+            [], transaction_type="dépense", categorie=["alimentation", "logement"],
+            period="month", db_path=filled_db
+        )
+
+        # Assert
+        assert result[["periode", "montant"]].values.tolist() == [["2024-01", 65.5], ["2024-02", 800.0]]
+
+
+    def test_totals_bounds_and_recent(self, filled_db):
+        """Test type totals, date bounds and latest rows."""
+        # Act
+        totals = TransactionRepository.totals_by_type(start_date=date(2024, 2, 1), db_path=filled_db)
+        bounds = TransactionRepository.get_date_bounds(db_path=filled_db)
+        recent = TransactionRepository.get_recent(2, db_path=filled_db)
+
+        # Assert
+        assert totals == {"revenu": 150.0, "dépense": 800.0}
+        assert bounds == (date(2023, 12, 31), date(2024, 2, 10))
+        assert recent["categorie"].tolist() == ["uber", "logement"]
+
+
+    def test_empty_database_and_invalid_grouping(self, temp_db):
+        """Test empty results and rejection of unknown group columns."""
+        # Act
+        totals = TransactionRepository.totals_by_type(db_path=temp_db)
+        bounds = TransactionRepository.get_date_bounds(db_path=temp_db)
+
+        # Assert
+        assert totals == {"revenu": 0.0, "dépense": 0.0}
+        assert bounds == (None, None)
+        with pytest.raises(ValueError):
+            TransactionRepository.sum_by(["montant; DROP TABLE transactions"], db_path=temp_db)
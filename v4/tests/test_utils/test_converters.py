@@ -0,0 +1,93 @@
+"""
+Unit Tests for Converters
+
+Tests the vectorized conversions against their scalar counterparts.
+"""
+
+import pytest
+import pandas as pd
+from datetime import date
+from shared.utils.converters import (
+    safe_convert, safe_date_convert, safe_convert_series, safe_date_series
+)
+
+
+AMOUNTS = [
+    "1.234,56", "1,234.56", "12,5", "12.50", " 45 € ", "'7,10'", "-3,456",
+    "", None, float("nan"), "abc", "1.2.3", "--5", "100"
+]
+
+DATES = [
+    "2025-01-15", "15/01/2025", "15/01/25", "2025/01/15", "15-01-2025",
+    "15-01-25", "15.01.2025", "15.01.25", "2025-01-15 10:30:00", "5/1/2025"
+]
+
+
+@pytest.mark.unit
+class TestSafeConvertSeries:
+    """Test suite for safe_convert_series."""
+
+    def test_matches_scalar_conversion(self):
+        """Test every mixed-format value converts like safe_convert."""
+        # Arrange
+        series = pd.Series(AMOUNTS, dtype=object)
+
+        # Act
+        result = safe_convert_series(series)
+
+        # Assert
+        expected = [safe_convert(value, float, 0.0) for value in AMOUNTS]
+        assert result.tolist() == expected
+
+
+    def test_numeric_column_is_rounded(self):
+        """Test numeric input skips the string pass."""
+        # Arrange
+        series = pd.Series([12.345, None, 7])
+
+        # Act
+        result = safe_convert_series(series, default=-1.0)
+
+        # Assert
+        assert result.tolist() == [12.35, -1.0, 7.0]
+
+
+@pytest.mark.unit
+class TestSafeDateSeries:
+    """Test suite for safe_date_series."""
+
+    def test_matches_scalar_conversion(self):
+        """Test every supported format parses like safe_date_convert."""
+        # Arrange
+        series = pd.Series(DATES)
+
+        # Act
+        result = safe_date_series(series)
+
+        # Assert
+        assert result.dt.date.tolist() == [safe_date_convert(value) for value in DATES]
+
+
+    def test_empty_values_use_default(self):
+        """Test missing dates fall back to the default."""
+        # Arrange
+        series = pd.Series([None, "", "2024-03-01"])
+
+        # Act
+        result = safe_date_series(series, default=date(2020, 1, 1))
+
+        # Assert
+        assert result.dt.date.tolist() == [date(2020, 1, 1), date(2020, 1, 1), date(2024, 3, 1)]
+
+
+    def test_out_of_range_dates_saturate(self):
+        """Test dates beyond datetime64[ns] are clamped instead of failing."""
+        # Arrange
+        series = pd.Series(["2999-01-01", "15/01/2024", date(3000, 1, 1)])
+
+        # Act
+        result = safe_date_series(series)
+
+        # Assert
+        assert result.dtype == "datetime64[ns]"
+        assert result.dt.year.tolist() == [2262, 2024, 2262]
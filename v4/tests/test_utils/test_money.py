@@ -0,0 +1,60 @@
+"""
+Unit Tests for Money Helpers
+
+Tests the integer-cent conversions against SQLite's cents expression.
+"""
+
+import sqlite3
+import pytest
+import pandas as pd
+from shared.utils.money import cents_sql, from_cents, from_cents_series, to_cents, to_cents_series
+
+
+AMOUNTS = [0.1, 0.125, -0.125, 1.005, 2.675, 12.5, 45.5, 1234.56, -3.46, 0.0, 99999999.99]
+
+
+@pytest.mark.unit
+class TestMoney:
+    """Test suite for the cents conversions."""
+
+    def test_cents_match_the_sql_expression(self):
+        """Test Python rounds half away from zero like CAST(ROUND(x * 100) AS INTEGER)."""
+        # Arrange
+        conn = sqlite3.connect(":memory:")
+
+        # Act
+        expected = [conn.execute(f"SELECT {cents_sql('?')}", (amount,)).fetchone()[0] for amount in AMOUNTS]
+        conn.close()
+
+        # Assert
+        assert [to_cents(amount) for amount in AMOUNTS] == expected
+        assert to_cents_series(pd.Series(AMOUNTS)).tolist() == expected
+
+
+    def test_text_amounts_use_the_safe_conversion(self):
+        """Test text amounts are parsed like safe_convert before scaling."""
+        # Arrange
+        series = pd.Series(["1.234,56", "45,50 €", "", None], dtype=object)
+
+        # Act
+        result = to_cents_series(series)
+
+        # Assert
+        assert result.dtype == "int64"
+        assert result.tolist() == [123456, 4550, 0, 0]
+        assert to_cents("1.234,56") == 123456
+
+
+    def test_round_trip_is_exact(self):
+        """Test cents converted to euros and back are unchanged, and sums are exact."""
+        # Arrange
+        cents = pd.Series([10] * 1000 + [1, 2, 999999999])
+
+        # Act
+        euros = from_cents_series(cents)
+
+        # Assert
+        assert to_cents_series(euros).tolist() == cents.tolist()
+        assert from_cents(to_cents_series(euros).sum()) == 10000100.02
+        assert sum([0.1] * 1000) != 100.0
+        assert from_cents(to_cents_series(pd.Series([0.1] * 1000)).sum()) == 100.0